@@ -12,6 +12,9 @@ from sqlalchemy import and_
 from utils.booking_utils import safe_parse_time_float, safe_parse_hour
 
 from typing import List, Optional, Any, Dict
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -51,12 +54,12 @@ def create_user_with_phone(db: Session, phone_number: str, profile_data: Optiona
     # Use a very simple, short password for phone-based users
     # They login via OTP, never use password
     temp_password = "phone_user_temp"  # Short and simple
-    print(f"[CRUD] Hashing temp password: '{temp_password}' (len={len(temp_password)})")
+    logger.debug("[CRUD] Hashing temp password for phone user")
     
     try:
         p_hash = get_password_hash(temp_password)
     except Exception as e:
-        print(f"[CRUD] Hashing failed: {e}")
+        logger.warning(f"[CRUD] Hashing failed: {e}")
         # If hashing fails (e.g. weird passlib issue), use a simplified hash or None
         # Since these users login via OTP, password hash isn't critical
         p_hash = None # Try None as fallback
@@ -143,13 +146,13 @@ def create_or_update_profile(db: Session, profile: schemas.ProfileCreate, user_i
                 models.User.id != user_id
             ).first()
             if existing_user:
-                print(f"[CRUD] WARNING: Cannot update email to {new_email} - already in use by user {existing_user.id}")
+                logger.warning(f"[CRUD] WARNING: Cannot update email to {new_email} - already in use by user {existing_user.id}")
                 # We can either raise an error or just skip. Raising error is safer for user feedback.
                 from fastapi import HTTPException
                 raise HTTPException(status_code=400, detail="This email is already taken.")
             
             user.email = new_email
-            print(f"[CRUD] Synced user email to: {new_email}")
+            logger.info(f"[CRUD] Synced user email to: {new_email}")
 
         user.profile_completed = True
     
@@ -257,7 +260,7 @@ def validate_booking_rules(
         expected_h = expected_duration_minutes / 60.0
         # If the span (end - start) is greater than the sum of slot durations, there's a gap
         if abs(duration_h - expected_h) > 0.01:
-            print(f"[RULES CHECK FAIL] Continuity mismatch: span={duration_h}h vs slots_total={expected_h}h")
+            logger.warning(f"[RULES CHECK FAIL] Continuity mismatch: span={duration_h}h vs slots_total={expected_h}h")
             raise HTTPException(status_code=400, detail="Selected slots must be consecutive. Gaps between slots are not allowed.")
 
     # --- Rule 3: User Overlap Check ---
@@ -339,7 +342,7 @@ def validate_booking_rules(
                                 detail=f"Overlap Conflict: You already have another booking ({b.booking_display_id}) for a shared part of this arena during this time."
                             )
 
-    print("[RULES CHECK] Basic validation passed. Collisions checked atomically.")
+    logger.debug("[RULES CHECK] Basic validation passed. Collisions checked atomically.")
 
 
 def validate_court_configuration(db: Session, court_id: str, booking_date: date, requested_slots: List[Dict[str, Any]], number_of_players: int, expected_total_amount: float, slice_mask: Optional[int] = None, num_courts: int = 1):
@@ -389,10 +392,11 @@ def validate_court_configuration(db: Session, court_id: str, booking_date: date,
 
         # Allow small rounding difference
         if abs(expected_slot_provided_price - provided_price) > 5.0:
-             print(f"[CONFIG CHECK FAIL] Price mismatch for slot '{r_start}':")
-             print(f"  - Expected Price: {expected_price} (Base) * {number_of_players} (Players) = {expected_slot_provided_price}")
-             print(f"  - Provided Price: {provided_price}")
-             print(f"  - Court logic: {court.logic_type if court else 'unknown'}")
+             logger.warning(
+                 f"[CONFIG CHECK FAIL] Price mismatch for slot '{r_start}': "
+                 f"expected={expected_price} (base) * {number_of_players} (players) = {expected_slot_provided_price}, "
+                 f"provided={provided_price}, court_logic={court.logic_type if court else 'unknown'}"
+             )
              raise HTTPException(status_code=400, detail=f"Price mismatch for slot {r_start}")
              
         calculated_total_base += expected_price
@@ -419,23 +423,23 @@ def validate_court_configuration(db: Session, court_id: str, booking_date: date,
     if num_courts and num_courts > 1 and abs(calculated_final_total - (effective_expected_amount / num_courts)) < 10.0:
         effective_expected_amount = effective_expected_amount / num_courts
 
-    print(f"[CONFIG CHECK] Final Calculation ({court.logic_type if court else 'unknown'}): {calculated_final_total}")
-    print(f"[CONFIG CHECK] Comparison: Server={calculated_final_total} vs Client={effective_expected_amount} (original={expected_total_amount}, num_courts={num_courts})")
+    logger.debug(f"[CONFIG CHECK] Final Calculation ({court.logic_type if court else 'unknown'}): {calculated_final_total}")
+    logger.debug(f"[CONFIG CHECK] Comparison: Server={calculated_final_total} vs Client={effective_expected_amount} (original={expected_total_amount}, num_courts={num_courts})")
 
     if abs(calculated_final_total - effective_expected_amount) > 10.0:
-         print(f"[CONFIG CHECK FAIL] Total amount mismatch:")
-         print(f"  - Calculated Server Total: {calculated_final_total}")
-         print(f"  - Effective Client Amount: {effective_expected_amount}")
-         print(f"  - Num Courts: {num_courts}")
+         logger.warning(
+             f"[CONFIG CHECK FAIL] Total amount mismatch: server={calculated_final_total}, "
+             f"client={effective_expected_amount}, num_courts={num_courts}"
+         )
          raise HTTPException(status_code=400, detail=f"Total booking amount mismatch. Server={calculated_final_total}, Client={effective_expected_amount}")
 
 
-    print("[CONFIG CHECK] Success.")
+    logger.debug("[CONFIG CHECK] Success.")
 
 
 def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
     try:
-        print(f"[CRUD BOOKING] Starting booking creation for user: {user_id}")
+        logger.debug(f"[CRUD BOOKING] Starting booking creation for user: {user_id}")
 
         # 1. Prepare Time Slots & Duration
         time_slots = []
@@ -500,7 +504,7 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
 
         else:
             # Legacy Flow (Single Slot)
-            print("[CRUD BOOKING] Processing legacy single-slot booking")
+            logger.debug("[CRUD BOOKING] Processing legacy single-slot booking")
             time_str = str(booking.start_time).strip()
             
             s_h = safe_parse_hour(time_str)
@@ -552,9 +556,9 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
                 gst_percent = float(active_gst_policy.value)
                 gst_amount = (subtotal_amount * gst_percent) / 100
                 total_amount = subtotal_amount + gst_amount
-                print(f"[CRUD BOOKING] GST Applied: {gst_percent}% -> {gst_amount}. New Total: {total_amount}")
+                logger.debug(f"[CRUD BOOKING] GST Applied: {gst_percent}% -> {gst_amount}. New Total: {total_amount}")
         except Exception as ge:
-            print(f"[CRUD BOOKING] Warning: Failed to fetch/apply GST policy: {ge}")
+            logger.warning(f"[CRUD BOOKING] Warning: Failed to fetch/apply GST policy: {ge}")
 
         # 3. Verify Court & User
         court_check = db.query(models.Court).filter(models.Court.id == str(booking.court_id)).first()
@@ -569,10 +573,10 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
         # 569: --- ATOMIC LOCKING & VALIDATION ---
         # Acquire row-level lock on the court OR the entire shared group
         if court_check.shared_group_id:
-            print(f"[CRUD BOOKING] Shared Group detected! Locking all courts in group {court_check.shared_group_id}")
+            logger.debug(f"[CRUD BOOKING] Shared Group detected! Locking all courts in group {court_check.shared_group_id}")
             db.query(models.Court).filter(models.Court.shared_group_id == court_check.shared_group_id).with_for_update().all()
         else:
-            print(f"[CRUD BOOKING] Independent court. Locking court {c_uuid}")
+            logger.debug(f"[CRUD BOOKING] Independent court. Locking court {c_uuid}")
             db.query(models.Court).filter(models.Court.id == c_uuid).with_for_update().first()
 
         # 3. ATOMIC SOURCE OF TRUTH LOCK (SLOTS TABLE)
@@ -588,7 +592,7 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
             from fastapi import HTTPException
             existing_payment = db.query(models.Booking).filter(models.Booking.payment_id == booking.razorpay_payment_id).first()
             if existing_payment:
-                print(f"[FRAUD ALERT] Payment ID {booking.razorpay_payment_id} already used for Booking {existing_payment.id}!")
+                logger.warning(f"[FRAUD ALERT] Payment ID {booking.razorpay_payment_id} already used for Booking {existing_payment.id}!")
                 raise HTTPException(status_code=409, detail="Transaction already processed. This payment receipt has already been used.")
 
         # 1. Basic Rules
@@ -623,7 +627,7 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
 
         # 4. Fast Atomic Allocation (via slots table if slot_ids provided)
         if booking.slot_ids:
-            print(f"[CRUD BOOKING] Using slot-based collision logic (slot_ids provided)")
+            logger.debug(f"[CRUD BOOKING] Using slot-based collision logic (slot_ids provided)")
             from utils.booking_utils import get_consolidated_occupied_mask
 
             authoritative_masks, _ = get_consolidated_occupied_mask(
@@ -708,14 +712,15 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
                     )
                 )
                 
-                print(f"[CRUD BOOKING] Fallback: Checking against {existing_bookings.count()} active bookings for user {user_id}")
                 # Exclude same razorpay_order_id (allows multi-court same-order)
                 if booking.razorpay_order_id:
                     existing_bookings = existing_bookings.filter(
                         models.Booking.razorpay_order_id != booking.razorpay_order_id
                     )
 
-                for eb in existing_bookings.all():
+                existing_bookings = existing_bookings.all()
+                logger.debug("[CRUD BOOKING] Fallback: Checking against %d active bookings for user %s", len(existing_bookings), user_id)
+                for eb in existing_bookings:
                     eb_start = eb.start_time.hour + (eb.start_time.minute / 60.0) if eb.start_time else 0
                     eb_end = eb.end_time.hour + (eb.end_time.minute / 60.0) if eb.end_time else 24.0
                     if eb_end == 0: eb_end = 24.0
@@ -726,7 +731,7 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
                         new_mask = booking.slice_mask if booking.slice_mask is not None else ((1 << (court_check.total_zones or 1)) - 1)
                         ex_mask = eb.slice_mask if eb.slice_mask is not None else ((1 << (court_check.total_zones or 1)) - 1)
                         if (new_mask & ex_mask) != 0:
-                            print(f"[CRUD BOOKING] DOUBLE BOOKING BLOCKED: Conflict with booking {eb.id} (mask={ex_mask}, new_mask={new_mask})")
+                            logger.warning(f"[CRUD BOOKING] DOUBLE BOOKING BLOCKED: Conflict with booking {eb.id} (mask={ex_mask}, new_mask={new_mask})")
                             db.rollback()
                             raise FHTTPException(
                                 status_code=409,
@@ -782,7 +787,7 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
             "razorpay_signature": booking.razorpay_signature,
         }
 
-        print(f"[CRUD BOOKING] Creating booking record in DB for {user_id}")
+        logger.debug(f"[CRUD BOOKING] Creating booking record in DB for {user_id}")
 
         db_booking = models.Booking(**booking_data)
         db.add(db_booking)
@@ -794,36 +799,33 @@ def create_booking(db: Session, booking: schemas.BookingCreate, user_id: str):
             try:
                 increment_coupon_usage(db, booking.coupon_code)
             except Exception as ce:
-                print(f"[CRUD BOOKING] Warning: Failed to increment coupon usage: {ce}")
+                logger.warning(f"[CRUD BOOKING] Warning: Failed to increment coupon usage: {ce}")
 
-        print(f"[CRUD BOOKING] SUCCESS: Booking created with ID: {db_booking.id}")
+        logger.info(f"[CRUD BOOKING] SUCCESS: Booking created with ID: {db_booking.id}")
 
         # --- INTEGRATION TRIGGER (Phase 2) ---
         try:
             from services.integrations.orchestrator import IntegrationOrchestrator
             from utils.booking_utils import safe_parse_time_float
-            for slot in time_slots:
-                s_f = safe_parse_time_float(slot['start_time'])
-                IntegrationOrchestrator.notify_inventory_change(
-                    db=db,
-                    court_id=str(db_booking.court_id),
-                    date=str(db_booking.booking_date),
-                    slot_start=s_f,
-                    action='block'
-                )
+            IntegrationOrchestrator.notify_inventory_range(
+                db=db,
+                court_id=str(db_booking.court_id),
+                date=str(db_booking.booking_date),
+                slot_starts=[safe_parse_time_float(slot['start_time']) for slot in time_slots],
+                action='block'
+            )
         except Exception as ite:
-            print(f"[CRUD BOOKING] Warning: Integration trigger failed: {ite}")
+            logger.warning(f"[CRUD BOOKING] Warning: Integration trigger failed: {ite}")
 
         # --- NOTIFICATION TRIGGER (Moved to Router) ---
-        print(f"[CRUD BOOKING] Success. Handover to router for notifications.")
+        logger.debug(f"[CRUD BOOKING] Success. Handover to router for notifications.")
         return db_booking
 
     except ValueError as ve:
          raise ve
     except Exception as e:
-        print(f"[CRUD BOOKING] ERROR: Exception during booking creation: {e}")
+        logger.error(f"[CRUD BOOKING] ERROR: Exception during booking creation: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise e
 
 def create_otp_record(db: Session, phone_number: str, otp_code: str, expires_at: datetime):
@@ -914,8 +916,10 @@ def cancel_booking(db: Session, booking_id: str, user_id: str, ignore_time_limit
             refund_amount = total_amount - deduction_amount
             refund_amount_paise = int(refund_amount * 100)
             
-            print(f"[CRUD] Initiating automatic refund for booking {booking_id}")
-            print(f"       Policy: {deduction_percent}% fee. Total: {total_amount}. Refund: {refund_amount}")
+            logger.info(
+                f"[CRUD] Initiating automatic refund for booking {booking_id}: "
+                f"{deduction_percent}% fee, total={total_amount}, refund={refund_amount}"
+            )
             
             client = razorpay.Client(auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET")))
             
@@ -930,7 +934,7 @@ def cancel_booking(db: Session, booking_id: str, user_id: str, ignore_time_limit
             })
             
             refund_id = refund.get('id')
-            print(f"[CRUD] Successfully initiated refund: {refund_id}")
+            logger.info(f"[CRUD] Successfully initiated refund: {refund_id}")
             
             # 4. Store metrics in booking
             db_booking.refund_id = refund_id
@@ -938,9 +942,8 @@ def cancel_booking(db: Session, booking_id: str, user_id: str, ignore_time_limit
             db_booking.refund_status = 'pending' # Will be confirmed by Webhook later
             
         except Exception as e:
-            print(f"[CRUD] Razorpay Refund Error: {e}")
+            logger.error(f"[CRUD] Razorpay Refund Error: {e}", exc_info=True)
             import traceback
-            traceback.print_exc()
             # We don't block cancellation if refund initiation fails, 
             # but we notify that manual support is needed.
             db_booking.refund_status = 'failed'
@@ -956,20 +959,18 @@ def cancel_booking(db: Session, booking_id: str, user_id: str, ignore_time_limit
     # Release inventory
     try:
         from utils.booking_utils import safe_parse_time_float
-        for slot in (db_booking.time_slots or []):
-            s_f = safe_parse_time_float(slot.get('start_time'))
-            IntegrationOrchestrator.notify_inventory_change(
-                db=db,
-                court_id=str(db_booking.court_id),
-                date=str(db_booking.booking_date),
-                slot_start=s_f,
-                action='available'
-            )
+        IntegrationOrchestrator.notify_inventory_range(
+            db=db,
+            court_id=str(db_booking.court_id),
+            date=str(db_booking.booking_date),
+            slot_starts=[safe_parse_time_float(slot.get('start_time')) for slot in (db_booking.time_slots or [])],
+            action='available'
+        )
     except Exception as e:
-        print(f"[CRUD] Warning: Failed to release inventory after cancellation: {e}")
+        logger.warning(f"[CRUD] Warning: Failed to release inventory after cancellation: {e}")
 
     # --- NOTIFICATION TRIGGER (Moved to Router) ---
-    print(f"[CRUD] Cancellation Success. Handover to router for notifications.")
+    logger.info(f"[CRUD] Cancellation Success. Handover to router for notifications.")
     return db_booking
 
 def get_bookings_for_reminders(db: Session):
@@ -997,7 +998,7 @@ def get_bookings_for_reminders(db: Session):
 def get_bookings(db: Session, user_id: str):
     """Get all bookings for a user, enriched with court name and venue location."""
     try:
-        print(f"[CRUD] Getting bookings for user: {user_id}")
+        logger.debug(f"[CRUD] Getting bookings for user: {user_id}")
 
         from sqlalchemy import text
         query = text("""
@@ -1052,7 +1053,7 @@ def get_bookings(db: Session, user_id: str):
         """)
 
         result = db.execute(query, {"user_id": str(user_id)}).fetchall()
-        print(f"[CRUD] Found {len(result)} bookings")
+        logger.debug(f"[CRUD] Found {len(result)} bookings")
 
         import json
         bookings_list = []
@@ -1119,32 +1120,31 @@ def get_bookings(db: Session, user_id: str):
         return bookings_list
 
     except Exception as e:
-        print(f"[CRUD] Critical error getting bookings for user {user_id}: {e}")
+        logger.error(f"[CRUD] Critical error getting bookings for user {user_id}: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         return []
 
 
 def create_review(db: Session, review: schemas.ReviewCreate, user_id: str):
-    print(f"[CRUD] create_review called for user={user_id}, booking={review.booking_id}")
+    logger.info(f"[CRUD] create_review called for user={user_id}, booking={review.booking_id}")
     try:
         from uuid import UUID
         try:
             b_uuid = UUID(str(review.booking_id))
             c_uuid = UUID(str(review.court_id))
         except ValueError:
-            print("[CRUD] Invalid UUID format")
+            logger.warning("[CRUD] Invalid UUID format")
             raise ValueError("Invalid Booking ID or Court ID format")
 
         try:
             # Check table existence (hacky but useful for debug)
             db.execute(text("SELECT 1 FROM reviews LIMIT 1"))
         except Exception as e:
-            print(f"[CRUD] Table check failed: {e}")
+            logger.warning(f"[CRUD] Table check failed: {e}")
             # Do not raise, maybe table is empty, just catch if table missing error occurs later
 
         # Check if review already exists for this booking
-        print("[CRUD] Checking existing review...")
+        logger.debug("[CRUD] Checking existing review...")
         existing_review = db.query(models.Review).filter(
             models.Review.booking_id == str(b_uuid)
         ).first()
@@ -1153,28 +1153,28 @@ def create_review(db: Session, review: schemas.ReviewCreate, user_id: str):
             raise ValueError("Review already exists for this booking")
 
         # Verify the booking belongs to the user
-        print("[CRUD] Verifying booking ownership...")
+        logger.debug("[CRUD] Verifying booking ownership...")
         booking = db.query(models.Booking).filter(
             models.Booking.id == str(b_uuid),
             models.Booking.user_id == user_id
         ).first()
 
         if not booking:
-            print("[CRUD] Booking not found or mismatch")
+            logger.warning("[CRUD] Booking not found or mismatch")
             raise ValueError("Booking not found or does not belong to user")
 
         # Check if booking is completed (past end time)
-        print("[CRUD] Checking completion status...")
+        logger.debug("[CRUD] Checking completion status...")
         try:
             booking_end_time = datetime.combine(booking.booking_date, booking.end_time)
             if booking_end_time > datetime.now():
                 raise ValueError("Cannot review booking that is not yet completed")
         except Exception as e:
-            print(f"[CRUD] Date comparison error: {e}")
+            logger.error(f"[CRUD] Date comparison error: {e}")
             # Proceed if date check fails (for now) or raise?
             pass
 
-        print("[CRUD] Creating review object...")
+        logger.debug("[CRUD] Creating review object...")
         db_review = models.Review(
             user_id=user_id,
             booking_id=str(b_uuid),
@@ -1183,19 +1183,22 @@ def create_review(db: Session, review: schemas.ReviewCreate, user_id: str):
             review_text=review.review_text
         )
         
-        print("[CRUD] Adding to session...")
+        logger.debug("[CRUD] Adding to session...")
         db.add(db_review)
-        print("[CRUD] Committing...")
+        db.flush()
+        from services.rating_aggregates import apply_review
+        apply_review(db, c_uuid, review.rating, +1)
+        logger.debug("[CRUD] Committing...")
         db.commit()
-        print("[CRUD] Refreshing...")
+        logger.debug("[CRUD] Refreshing...")
         db.refresh(db_review)
         return db_review
 
     except ValueError as ve:
-        print(f"[CRUD] Validation Error: {ve}")
+        logger.error(f"[CRUD] Validation Error: {ve}")
         raise ve
     except Exception as e:
-        print(f"[CRUD] Database/Server Error: {e}")
+        logger.error(f"[CRUD] Database/Server Error: {e}")
         db.rollback()
         # Check specifically for table missing
         if "relation \"reviews\" does not exist" in str(e):
@@ -1238,9 +1241,8 @@ def get_user_reviews(db: Session, user_id: str):
         return reviews_list
     except Exception as e:
         # If reviews table doesn't exist or query fails, return empty list
-        print(f"[CRUD] User reviews query failed: {e}")
+        logger.warning(f"[CRUD] User reviews query failed: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         return []
 
 def get_reviews_for_court(db: Session, court_id: str):
@@ -1248,7 +1250,7 @@ def get_reviews_for_court(db: Session, court_id: str):
         return db.query(models.Review).filter(models.Review.court_id == court_id).all()
     except Exception as e:
         # If reviews table doesn't exist, return empty list
-        print(f"[CRUD] Reviews table query failed: {e}")
+        logger.warning(f"[CRUD] Reviews table query failed: {e}")
         return []
 
 def has_user_reviewed_booking(db: Session, user_id: str, booking_id: str):
@@ -1260,13 +1262,13 @@ def has_user_reviewed_booking(db: Session, user_id: str, booking_id: str):
         return review
     except Exception as e:
         # If reviews table doesn't exist or there's any database error, return None
-        print(f"[CRUD] Reviews table query failed: {e}")
+        logger.warning(f"[CRUD] Reviews table query failed: {e}")
         return None
 
 def get_unreviewed_completed_bookings(db: Session, user_id: str):
     """Get bookings that haven't been reviewed yet and have passed their end time using efficient LEFT JOIN"""
     try:
-        print(f"[CRUD] Getting unreviewed completed bookings for user: {user_id}")
+        logger.debug(f"[CRUD] Getting unreviewed completed bookings for user: {user_id}")
 
         # Use efficient LEFT JOIN query to find bookings without reviews that have passed end time
         from sqlalchemy import text
@@ -1284,9 +1286,9 @@ def get_unreviewed_completed_bookings(db: Session, user_id: str):
             LIMIT 5
         """)
 
-        print(f"[CRUD] Executing LEFT JOIN query for user: {user_id}")
+        logger.debug(f"[CRUD] Executing LEFT JOIN query for user: {user_id}")
         result = db.execute(query, {"user_id": user_id}).fetchall()
-        print(f"[CRUD] Query returned {len(result)} rows")
+        logger.debug(f"[CRUD] Query returned {len(result)} rows")
 
         unreviewed_bookings = []
         for row in result:
@@ -1300,15 +1302,14 @@ def get_unreviewed_completed_bookings(db: Session, user_id: str):
                 "venue_name": "Unknown Venue"  # Placeholder
             }
             unreviewed_bookings.append(booking_dict)
-            print(f"[CRUD] Found unreviewed booking: {row[0]} - {booking_dict['court_name']}")
+            logger.debug(f"[CRUD] Found unreviewed booking: {row[0]} - {booking_dict['court_name']}")
 
-        print(f"[CRUD] Returning {len(unreviewed_bookings)} unreviewed completed bookings")
+        logger.debug(f"[CRUD] Returning {len(unreviewed_bookings)} unreviewed completed bookings")
         return unreviewed_bookings
 
     except Exception as e:
-        print(f"[CRUD] Error getting unreviewed completed bookings: {e}")
+        logger.error(f"[CRUD] Error getting unreviewed completed bookings: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         return []
 
 def get_cities(db: Session):
@@ -1404,7 +1405,7 @@ def create_push_token(db: Session, token_data: schemas.PushTokenCreate, user_id:
             ).first()
             if existing:
                 return existing
-        print(f"[CRUD] Error creating/updating push token: {e}")
+        logger.error(f"[CRUD] Error creating/updating push token: {e}")
         raise
 
 def get_push_tokens_for_user(db: Session, user_id: str):
@@ -1428,7 +1429,7 @@ def get_push_tokens_for_admin(db: Session, admin_id: str):
             models.PushToken.is_active == True
         ).all()
     except Exception as e:
-        print(f"[CRUD] Error in get_push_tokens_for_admin: {e}")
+        logger.error(f"[CRUD] Error in get_push_tokens_for_admin: {e}")
         return []
 
 def get_active_push_tokens(db: Session, user_ids: list = None):
@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from time import perf_counter
+from utils.logger import get_logger
+from utils.metrics import instrument_engine
+
+logger = get_logger(__name__)
 
 # construct path to .env file explicitly
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,7 +25,7 @@ if SQLALCHEMY_DATABASE_URL:
     if "@" in masked_url:
         part1, part2 = masked_url.split("@")
         masked_url = f"{part1.split(':')[0]}:****@{part2}"
-    print(f"[DB] Loaded DATABASE_URL: {masked_url}")
+    logger.info(f"[DB] Loaded DATABASE_URL: {masked_url}")
 
 # Create engine with connection pooling for PostgreSQL/Supabase
 if "postgresql" in SQLALCHEMY_DATABASE_URL or "supabase" in SQLALCHEMY_DATABASE_URL:
@@ -39,6 +44,9 @@ else:
     # Default engine for other databases
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
+# Query counts and pool statistics for /metrics
+instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -50,14 +58,14 @@ def get_db():
         db = SessionLocal()
         yield db
     except Exception as e:
-        print(f"[DB] Error creating database session: {e}")
+        logger.error(f"[DB] Error creating database session: {e}")
         raise
     finally:
         if db:
             try:
                 db.close()
             except Exception as e:
-                print(f"[DB] Error closing database session: {e}")
+                logger.error(f"[DB] Error closing database session: {e}")
 
 def is_db_available():
     """Check if database is available (for dev mode fallback)"""
@@ -68,3 +76,28 @@ def is_db_available():
         return True
     except:
         return False
+
+def get_pool_status():
+    """Current connection pool usage (QueuePool counters where available)."""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    if hasattr(pool, "_max_overflow"):
+        status["max_overflow"] = pool._max_overflow
+    return status
+
+def get_db_health():
+    """Runs SELECT 1 and reports latency plus pool usage."""
+    report = {"database": "connected", "pool": get_pool_status()}
+    started = perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"[DB] Health check failed: {e}")
+        report["database"] = "unavailable"
+        report["error"] = type(e).__name__
+    report["latency_ms"] = round((perf_counter() - started) * 1000, 2)
+    return report
@@ -0,0 +1,72 @@
+"""
+Database sessions shared by the tests.
+
+The PostgreSQL-only services (venue summaries, rating aggregates, free-slot
+bitmaps, catalog versions, search, nearby) check _enabled(db), the session
+bind's dialect, before their ON CONFLICT upserts and array queries; the
+availability engine tests answer its per-model range queries with fixed rows
+and real (transient) models.Court objects.
+"""
+
+import unittest
+import uuid
+from unittest.mock import MagicMock
+
+
+def fake_session(dialect="postgresql"):
+    """MagicMock session whose bind reports `dialect`."""
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = dialect
+    return db
+
+
+def rows_by_model(results, first=None, dialect="postgresql"):
+    """
+    fake_session() answering db.query(model).filter(...).all() with
+    results[model] (no rows for other models) and .first() with `first`.
+    """
+    db = fake_session(dialect)
+    db.query.side_effect = lambda model: MagicMock(**{
+        "filter.return_value.all.return_value": list(results.get(model, [])),
+        "filter.return_value.first.return_value": first,
+    })
+    return db
+
+
+def make_court(**columns):
+    """
+    Transient models.Court with the columns the availability engine reads:
+    one zone, 1000/hour, no rules, no shared group. Only real columns can be
+    set, so tests cannot lean on attributes the model lacks.
+    """
+    import models
+
+    values = dict(
+        id=uuid.uuid4(), branch_id=uuid.uuid4(), game_type_id=uuid.uuid4(), name="Court 1",
+        logic_type="independent", total_zones=1, capacity_limit=1, price_per_hour=1000,
+        shared_group_id=None, price_conditions=[], unavailability_slots=[], is_active=True,
+    )
+    values.update(columns)
+    return models.Court(**values)
+
+
+def postgres_session():
+    """
+    A real session on DATABASE_URL, for tests that run the upserts against
+    PostgreSQL. Raises unittest.SkipTest when DATABASE_URL is not a reachable
+    PostgreSQL database or the tables are missing.
+    """
+    from sqlalchemy import inspect
+
+    from database import SessionLocal, engine
+
+    if engine.dialect.name != "postgresql":
+        raise unittest.SkipTest("DATABASE_URL is not a PostgreSQL database")
+    try:
+        tables = set(inspect(engine).get_table_names())
+    except Exception as e:
+        raise unittest.SkipTest(f"PostgreSQL not reachable: {e}")
+    missing = {"venue_summary", "rating_aggregates", "court_free_slots", "catalog_versions"} - tables
+    if missing:
+        raise unittest.SkipTest(f"Run the migrations first, missing tables: {sorted(missing)}")
+    return SessionLocal()
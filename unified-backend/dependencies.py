@@ -12,6 +12,10 @@ import os
 from dotenv import load_dotenv
 import models
 from database import get_db
+from services.integrations import write_behind
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 load_dotenv()
 
@@ -43,19 +47,19 @@ def get_current_user(
     
     try:
         # Debug log for token (first 10 chars)
-        print(f"[AUTH] Validating token starting with: {token[:10]}...")
+        logger.debug(f"[AUTH] Validating token starting with: {token[:10]}...")
         
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         sub: str = payload.get("sub")
         
         if sub is None:
-            print("[AUTH] Error: 'sub' missing from token payload")
+            logger.error("[AUTH] Error: 'sub' missing from token payload")
             raise credentials_exception
             
-        print(f"[AUTH] Valid token for sub: {sub}")
+        logger.info(f"[AUTH] Valid token for sub: {sub}")
             
     except JWTError as e:
-        print(f"[AUTH] JWT Decode Error: {str(e)}")
+        logger.error(f"[AUTH] JWT Decode Error: {str(e)}")
         raise credentials_exception
     
     user = None
@@ -65,7 +69,7 @@ def get_current_user(
         user_uuid = uuid.UUID(sub)
         user = db.query(models.User).filter(models.User.id == user_uuid).first()
         if user:
-            print(f"[AUTH] Found user by ID: {sub}")
+            logger.info(f"[AUTH] Found user by ID: {sub}")
     except (ValueError, TypeError, Exception):
         pass # Not a UUID, try email
     
@@ -73,14 +77,14 @@ def get_current_user(
     if user is None and "@" in sub:
         user = db.query(models.User).filter(models.User.email == sub).first()
         if user:
-            print(f"[AUTH] Found user by email: {sub}")
+            logger.info(f"[AUTH] Found user by email: {sub}")
             
     if user is None:
-        print(f"[AUTH] User not found in DB for sub: {sub}")
+        logger.warning(f"[AUTH] User not found in DB for sub: {sub}")
         raise credentials_exception
     
     if not user.is_active:
-        print(f"[AUTH] User inactive: {sub}")
+        logger.info(f"[AUTH] User inactive: {sub}")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
@@ -273,7 +277,7 @@ def hash_token(token: str) -> str:
     """Hash token for secure storage and comparison"""
     return hashlib.sha256(token.encode()).hexdigest()
 
-async def verify_playo_token(
+def verify_playo_token(
     authorization: str = Header(...),
     db: Session = Depends(get_db)
 ) -> models.PlayoAPIKey:
@@ -305,10 +309,8 @@ async def verify_playo_token(
             detail="Invalid or inactive API token"
         )
 
-    # Update last used timestamp
-    from datetime import datetime
-    api_key.last_used_at = datetime.utcnow()
-    db.commit()
+    # Update last used timestamp (written in bulk by the write-behind buffer)
+    write_behind.touch_api_key(api_key.id)
 
     return api_key
 
@@ -316,7 +318,7 @@ async def verify_playo_token(
 # PLAYO API AUTHENTICATION (X-API-Key Header) - For Playo Certification
 # ============================================================================
 
-async def verify_playo_api_key(
+def verify_playo_api_key(
     x_api_key: str = Header(None, alias="X-API-Key"),
     db: Session = Depends(get_db)
 ) -> models.PlayoAPIKey:
@@ -346,10 +348,8 @@ async def verify_playo_api_key(
             detail="Invalid or inactive API token"
         )
 
-    # Update last used timestamp
-    from datetime import datetime
-    api_key.last_used_at = datetime.utcnow()
-    db.commit()
+    # Update last used timestamp (written in bulk by the write-behind buffer)
+    write_behind.touch_api_key(api_key.id)
 
     return api_key
 
@@ -9,7 +9,7 @@ User routes: /api/user/*
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 from pathlib import Path
 from sqlalchemy.exc import OperationalError
@@ -26,13 +26,14 @@ try:
 except (AttributeError, Exception):
     pass
 
-# Import our error handling middleware and utilities
-from middleware.error_handler import ErrorHandlerMiddleware
+# Import our response/error handling middleware and utilities
 from middleware.response_handler import ResponseHandlerMiddleware
+from middleware.metrics import MetricsMiddleware
+from utils.metrics import REGISTRY as metrics_registry
 from utils.logger import logger
 from utils.error_alert_service import configure_error_alerts as configure_alerts
 
-from database import engine, Base, SQLALCHEMY_DATABASE_URL
+from database import engine, Base, SQLALCHEMY_DATABASE_URL, get_db_health
 
 # Lifespan event to create tables on startup
 @asynccontextmanager
@@ -46,12 +47,12 @@ async def lifespan(app: FastAPI):
         else:
             db_type = "MySQL"
             
-        print(f"[DB] Connecting to database: {db_type}")
-        print(f"[STARTUP] MyRush Unified Backend starting...")
+        logger.info(f"[DB] Connecting to database: {db_type}")
+        logger.info(f"[STARTUP] MyRush Unified Backend starting...")
         
         # Optionally create tables (comment out if using migrations)
         Base.metadata.create_all(bind=engine)
-        print("[DB] Database tables created/verified successfully")
+        logger.info("[DB] Database tables created/verified successfully")
 
         # --- FIREBASE ADMIN SDK INITIALIZATION (Phase 3) ---
         try:
@@ -60,31 +61,36 @@ async def lifespan(app: FastAPI):
             if not firebase_admin._apps:
                 cred = credentials.Certificate('myrush-eba39-firebase-adminsdk-fbsvc-bde7fc0b34.json')
                 firebase_admin.initialize_app(cred)
-                print("[FIREBASE] Admin SDK initialized successfully")
+                logger.info("[FIREBASE] Admin SDK initialized successfully")
         except Exception as fe:
-            print(f"[FIREBASE ERROR] Failed to initialize Admin SDK: {fe}")
+            logger.error(f"[FIREBASE ERROR] Failed to initialize Admin SDK: {fe}")
         
         # --- START SCHEDULER (Phase 4) ---
         try:
             from services.scheduler import start_scheduler
             import asyncio
             asyncio.create_task(start_scheduler())
-            print("[SCHEDULER] Background services started successfully")
+            logger.info("[SCHEDULER] Background services started successfully")
         except Exception as se:
-            print(f"[SCHEDULER ERROR] Failed to start background services: {se}")
+            logger.error(f"[SCHEDULER ERROR] Failed to start background services: {se}")
 
-        print("[STARTUP] Server ready!")
-        print("[STARTUP] Admin API: http://localhost:8000/api/admin")
-        print("[STARTUP] User API: http://localhost:8000/api/user")
+        logger.info("[STARTUP] Server ready!")
+        logger.info("[STARTUP] Admin API: http://localhost:8000/api/admin")
+        logger.info("[STARTUP] User API: http://localhost:8000/api/user")
         
     except Exception as e:
-        print(f"[DB WARN] Database connection failed: {e}")
-        print("[DB WARN] Server starting but database connection failed. Check your .env configuration.")
+        logger.warning(f"[DB WARN] Database connection failed: {e}")
+        logger.warning("[DB WARN] Server starting but database connection failed. Check your .env configuration.")
     
     yield
     
     # Shutdown
-    print("[SHUTDOWN] Server shutting down...")
+    logger.info("[SHUTDOWN] Server shutting down...")
+    from services.integrations import write_behind
+    write_behind.flush()
+    from utils import http_client
+    await http_client.aclose_all()
+    http_client.close_all()
 
 # Create FastAPI app
 app = FastAPI(
@@ -95,19 +101,14 @@ app = FastAPI(
     debug=True
 )
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    print(f"[DEBUG] Incoming request: {request.method} {request.url.path}")
-    response = await call_next(request)
-    print(f"[DEBUG] Response status: {response.status_code} for {request.url.path}")
-    return response
-
-# Add error handling middleware FIRST so it runs AFTER CORS
-app.add_middleware(ErrorHandlerMiddleware)
-
-# Add response standardization middleware
+# Response standardization, request logging and unhandled-error reporting
+# (a single pure ASGI layer; added FIRST so it runs AFTER CORS)
 app.add_middleware(ResponseHandlerMiddleware)
 
+# Request latency / in-flight / query-count metrics (outside the envelope so it
+# also times the envelope and error handling)
+app.add_middleware(MetricsMiddleware)
+
 # CORS Configuration (added LAST so it runs FIRST for preflight OPTIONS)
 app.add_middleware(
     CORSMiddleware,
@@ -139,8 +140,7 @@ configure_alerts()
 # Global exception handlers
 @app.exception_handler(OperationalError)
 async def db_connection_exception_handler(request: Request, exc: OperationalError):
-    print(f"[DB ERROR] Connection failed: {type(exc).__name__}: {str(exc)}")
-    logger.error(f"Database connection error for {request.url.path}: {str(exc)}")
+    logger.error(f"[DB ERROR] Connection failed for {request.url.path}: {type(exc).__name__}: {str(exc)}")
     return JSONResponse(
         status_code=503,
         content={
@@ -151,8 +151,7 @@ async def db_connection_exception_handler(request: Request, exc: OperationalErro
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"[ERROR] Global exception handler: {type(exc).__name__}: {str(exc)}", flush=True)
-    traceback.print_exc()
+    logger.error(f"[ERROR] Global exception handler: {type(exc).__name__}: {str(exc)}", exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"detail": f"Internal server error: {str(exc)}", "type": type(exc).__name__}
@@ -183,7 +182,21 @@ def read_root():
 # Health check endpoint
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "database": "connected"}
+    report = get_db_health()
+    if report["database"] != "connected":
+        return JSONResponse(status_code=503, content={"status": "unhealthy", **report})
+    return {"status": "healthy", **report}
+
+# Prometheus metrics (per worker process)
+from services.integrations.outbox_worker import collect_outbox_metrics
+metrics_registry.add_collector(collect_outbox_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    token = os.getenv("METRICS_TOKEN")
+    if token and request.headers.get("authorization") != f"Bearer {token}":
+        return PlainTextResponse("Unauthorized", status_code=401)
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # ============================================================================
 # IMPORT AND INCLUDE ADMIN ROUTERS
@@ -211,7 +224,8 @@ from routers.admin import (
     integrations as admin_integrations,
     blocks as admin_blocks,
     facilities,
-    notifications as admin_notifications
+    notifications as admin_notifications,
+    log_levels as admin_log_levels
 )
 
 # Import media proxy router (serves private S3 files via server-side AWS credentials)
@@ -244,6 +258,7 @@ app.include_router(admin_integrations.router, prefix="/api/admin", tags=["Admin
 app.include_router(admin_blocks.router, prefix="/api/admin", tags=["Admin Court Blocks"])
 app.include_router(facilities.router, prefix="/api/admin", tags=["Admin Facilities"])
 app.include_router(admin_notifications.router, prefix="/api/admin", tags=["Admin Notifications"])
+app.include_router(admin_log_levels.router, prefix="/api/admin", tags=["Admin Log Levels"])
 
 # ============================================================================
 # IMPORT AND INCLUDE USER ROUTERS
@@ -266,7 +281,8 @@ from routers.user import (
     contact,
     cms as user_cms,
     site_settings as user_site_settings,
-    invoices as user_invoices
+    invoices as user_invoices,
+    catalog as user_catalog
 )
 
 # Import chatbot router
@@ -291,6 +307,7 @@ app.include_router(contact.router, prefix="/api/user/contact", tags=["User Conta
 app.include_router(user_cms.router, prefix="/api/user", tags=["User CMS"])
 app.include_router(user_site_settings.router, prefix="/api/user", tags=["User Site Settings"])
 app.include_router(user_invoices.router, prefix="/api/user", tags=["Invoices"])
+app.include_router(user_catalog.router, prefix="/api/user", tags=["User Catalog"])
 
 # Include chatbot knowledge API
 app.include_router(chatbot.router, tags=["Chatbot Knowledge"])
@@ -333,12 +350,6 @@ from routers import example_errors
 app.include_router(example_errors.router, prefix="", tags=["Example Errors"])
 example_errors.register_error_handlers(app)
 
-print("\n" + "="*60)
-print("MYRUSH UNIFIED BACKEND")
-print("="*60)
-print("Admin API: http://localhost:8000/api/admin")
-print("User API: http://localhost:8000/api/user")
-print("API Docs: http://localhost:8000/docs")
-print("="*60 + "\n")
+logger.info("MYRUSH UNIFIED BACKEND loaded - Admin API: /api/admin, User API: /api/user, API Docs: /docs")
 # Trigger reload (Force V3)
 
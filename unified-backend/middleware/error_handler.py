@@ -1,17 +1,15 @@
 """
-Global Error Handling Middleware
+Error Handling Helpers
 
-This middleware provides centralized error handling for the FastAPI application.
-It captures all unhandled exceptions and logs them with full context, triggering
-email alerts for critical errors in production.
+Standard error responses and custom exception classes for the FastAPI
+application. Unhandled exceptions are caught by the response envelope
+middleware (middleware/response_handler.py), which logs them with full
+request context and triggers email alerts.
 
 Features:
-- Captures all unhandled exceptions
-- Logs errors with full request context
+- Consistent error responses for database, auth and business logic errors
+- Logs errors with request context
 - Masks sensitive data
-- Rate-limits email alerts
-- Returns consistent error responses
-- Only sends email alerts in production for 5xx errors
 """
 
 import logging
@@ -22,7 +20,6 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR, HTTP_400_BAD_REQUEST
 import os
 
@@ -30,150 +27,6 @@ from utils.logger import log_error, log_warning, log_info, mask_sensitive_data
 
 logger = logging.getLogger("myrush_backend")
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Global error handling middleware for FastAPI"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Handle requests and catch any unhandled exceptions.
-        
-        Args:
-            request: The incoming HTTP request
-            call_next: The next middleware or endpoint handler
-            
-        Returns:
-            HTTP response
-        """
-        try:
-            # Skip for non-HTTP requests (like WebSockets)
-            if request.scope.get("type") != "http":
-                return await call_next(request)
-
-            # Process the request
-            response = await call_next(request)
-            return response
-            
-        except RequestValidationError as e:
-            # Handle validation errors
-            error_details = {
-                'type': 'validation_error',
-                'message': 'Request validation failed',
-                'errors': e.errors(),
-                'body': await self._get_request_body(request)
-            }
-            
-            log_warning(
-                f"Validation error: {e}",
-                context={
-                    'request_method': request.method,
-                    'request_url': str(request.url),
-                    'validation_errors': e.errors()
-                }
-            )
-            
-            return JSONResponse(
-                status_code=HTTP_400_BAD_REQUEST,
-                content={
-                    'error': 'validation_error',
-                    'message': 'Request validation failed',
-                    'details': e.errors(),
-                    'request_id': getattr(request.state, 'request_id', None)
-                }
-            )
-            
-        except StarletteHTTPException as e:
-            # Handle HTTP exceptions (404, 401, etc.)
-            error_details = {
-                'type': 'http_error',
-                'status_code': e.status_code,
-                'message': e.detail
-            }
-            
-            # Log 5xx errors as errors, others as warnings
-            if e.status_code >= 500:
-                log_error(
-                    e,
-                    request=request,
-                    context={
-                        'status_code': e.status_code,
-                        'error_type': 'http_error'
-                    }
-                )
-            else:
-                log_warning(
-                    f"HTTP {e.status_code}: {e.detail}",
-                    context={
-                        'status_code': e.status_code,
-                        'error_type': 'http_error'
-                    }
-                )
-            
-            return JSONResponse(
-                status_code=e.status_code,
-                content={
-                    'error': 'http_error',
-                    'status_code': e.status_code,
-                    'message': e.detail,
-                    'request_id': getattr(request.state, 'request_id', None)
-                }
-            )
-            
-        except Exception as e:
-            # Handle all other unhandled exceptions
-            error_details = {
-                'type': 'internal_error',
-                'error_class': e.__class__.__name__,
-                'error_message': str(e),
-                'traceback': traceback.format_exc()
-            }
-            
-            # Log the error with full context
-            log_error(
-                e,
-                request=request,
-                context={
-                    'error_type': 'internal_error',
-                    'error_class': e.__class__.__name__,
-                    'request_body': await self._get_request_body(request)
-                }
-            )
-            
-            # Return a generic 500 error response
-            return JSONResponse(
-                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    'error': 'internal_error',
-                    'message': 'An internal server error occurred',
-                    'request_id': getattr(request.state, 'request_id', None),
-                    # In development, include more details
-                    **({'details': str(e)} if os.getenv('ENVIRONMENT', 'development').lower() == 'development' else {})
-                }
-            )
-    
-    async def _get_request_body(self, request: Request) -> Any:
-        """
-        Safely extract request body for logging.
-        
-        Args:
-            request: The HTTP request
-            
-        Returns:
-            Request body data or None if extraction fails
-        """
-        try:
-            # Only extract body for certain methods
-            if request.method in ['POST', 'PUT', 'PATCH']:
-                # Note: This will consume the request body
-                # In production, you might want to read it in a different middleware
-                # and store it in request.state for reuse
-                body = await request.json()
-                return mask_sensitive_data(body)
-        except Exception:
-            # If we can't read the body, that's okay
-            pass
-        
-        return None
-
 def create_error_response(
     error: Exception,
     request: Request,
@@ -0,0 +1,63 @@
+"""
+Request Metrics Middleware
+
+Pure ASGI middleware that records per-route latency, in-flight requests and
+the number of SQL statements each request executed (see utils/metrics.py).
+Routes are labelled by their path template, so /api/user/venues/{venue_id}
+is one series regardless of the id.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUEST_SECONDS,
+    start_query_count,
+    stop_query_count,
+)
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Path template of the matched route. Newer FastAPI resolves included
+    routers lazily and keeps the prefixed template in its route context;
+    otherwise the router stores the (already prefixed) route on the scope.
+    Unmatched paths share one label to keep cardinality bounded.
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        queries, token = start_query_count()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            stop_query_count(token)
+            HTTP_IN_FLIGHT.dec()
+
+            route = route_label(scope)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route, status=status["code"])
+            HTTP_REQUEST_QUERIES.observe(queries[0], route=route)
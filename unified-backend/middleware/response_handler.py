@@ -1,94 +1,201 @@
-import json
-import time
+"""
+Response Envelope Middleware
+
+Wraps every JSON response in the standard envelope:
+
+    {"code": 200, "status": "success", "timestamp": "...Z", "data": <original body>}
+
+Error responses (non-2xx) have their JSON object merged into the envelope
+instead of being nested under "data".
+
+This is a pure ASGI middleware. Success bodies are never decoded: the envelope
+prefix and the closing brace are streamed around the original body bytes, so
+large payloads (admin bookings, venue slots) are serialized exactly once.
+Error bodies are small and are merged with orjson.
+
+It also replaces the former request-logging and ErrorHandlerMiddleware layers,
+so each request passes through one middleware instead of three
+BaseHTTPMiddleware tasks.
+"""
+
+import os
 from datetime import datetime
-from typing import Callable
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import ContentStream, StreamingResponse
+from typing import Optional
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.logger import get_logger, log_error, mask_sensitive_data
+
+request_logger = get_logger("main.requests")
+
+# Paths whose JSON must stay untouched (OpenAPI tooling expects the raw schema)
+SKIP_PATHS = {"/docs", "/redoc", "/openapi.json"}
+# Request bodies larger than this are not kept for error reports
+MAX_CAPTURED_BODY_BYTES = 64 * 1024
+# Status codes that must not carry a body
+NO_BODY_STATUS = {204, 304}
+
+
+def _timestamp() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def envelope_prefix(status_code: int) -> bytes:
+    """Bytes that open a success envelope; the original body and b"}" follow."""
+    head = orjson.dumps({"code": status_code, "status": "success", "timestamp": _timestamp()})
+    return head[:-1] + b',"data":'
+
+
+def envelope_error(status_code: int, body: bytes) -> Optional[bytes]:
+    """Merged error envelope, or None if the body is not valid JSON."""
+    try:
+        original = orjson.loads(body) if body else None
+    except orjson.JSONDecodeError:
+        return None
+
+    content = {"code": status_code, "status": "error", "timestamp": _timestamp()}
+    if isinstance(original, dict):
+        content.update(original)
+    else:
+        content["error_details"] = original
+    return orjson.dumps(content)
+
+
+def internal_error_body(scope: Scope, error: Exception) -> bytes:
+    content = {
+        "error": "internal_error",
+        "message": "An internal server error occurred",
+        "request_id": scope.get("state", {}).get("request_id"),
+    }
+    # In development, include more details
+    if os.getenv("ENVIRONMENT", "development").lower() == "development":
+        content["details"] = str(error)
+    return orjson.dumps(content)
 
-class ResponseHandlerMiddleware(BaseHTTPMiddleware):
+
+class ResponseHandlerMiddleware:
     """
-    Middleware to standardize all API responses.
-    Adds 'code', 'status', and 'timestamp' to every JSON response.
+    Standardizes API responses, logs requests and turns unhandled exceptions
+    into a 500 envelope (with an error alert).
     """
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Record start time if needed for performance tracking
-        start_time = time.time()
-        
-        # Process the request
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip for non-HTTP requests (like WebSockets)
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-
-        response = await call_next(request)
-        
-        # Only process JSON responses
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            return response
-
-        # Skip for certain paths if necessary (e.g., docs, redoc)
-        if request.url.path in ["/docs", "/redoc", "/openapi.json"]:
-            return response
-
-        # Read the original response body
-        # For BaseHTTPMiddleware, we need to iterate over the response iterator
-        response_body = [section async for section in response.body_iterator]
-        response.body_iterator = iterate_in_threadpool(iter(response_body)) # Not needed if we return a new response
-        
-        try:
-            full_body = b"".join(response_body).decode("utf-8")
-            if not full_body:
-                original_data = None
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        request_logger.debug("[REQUEST] Incoming request: %s %s", method, path)
+
+        wrap = path not in SKIP_PATHS and method != "HEAD"
+        state = {"started": False, "mode": None, "status": 0, "buffer": [], "opened": False, "seen_body": False}
+
+        captured = []
+        capture_body = method in ("POST", "PUT", "PATCH")
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if capture_body and message["type"] == "http.request":
+                if sum(len(c) for c in captured) < MAX_CAPTURED_BODY_BYTES:
+                    captured.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["started"] = True
+                status_code = message["status"]
+                state["status"] = status_code
+                request_logger.debug("[REQUEST] Response status: %s for %s", status_code, path)
+
+                headers = MutableHeaders(scope=message)
+                if not wrap or status_code in NO_BODY_STATUS or "application/json" not in headers.get("content-type", ""):
+                    state["mode"] = "passthrough"
+                    await send(message)
+                    return
+
+                if 200 <= status_code < 300:
+                    state["mode"] = "stream"
+                    state["prefix"] = envelope_prefix(status_code)
+                    if "content-length" in headers:
+                        length = int(headers["content-length"]) or len(b"null")
+                        headers["content-length"] = str(length + len(state["prefix"]) + 1)
+                    await send(message)
+                else:
+                    # Hold the start message until the merged body length is known
+                    state["mode"] = "error"
+                    state["start"] = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            mode = state["mode"]
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if mode == "passthrough":
+                await send(message)
+            elif mode == "stream":
+                chunk = body
+                if not state["opened"]:
+                    state["opened"] = True
+                    chunk = state["prefix"] + chunk
+                if body:
+                    state["seen_body"] = True
+                if not more_body:
+                    chunk += b"}" if state["seen_body"] else b"null}"
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
             else:
-                original_data = json.loads(full_body)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # If we can't parse it as JSON, just return the original response
-            # Reconstruct the body iterator for the original response
-            headers = dict(response.headers)
-            headers.pop("content-length", None)
-            return Response(
-                content=b"".join(response_body),
-                status_code=response.status_code,
-                headers=headers,
-                media_type=response.media_type
+                state["buffer"].append(body)
+                if more_body:
+                    return
+                original = b"".join(state["buffer"])
+                merged = envelope_error(state["status"], original)
+                start = state["start"]
+                payload = original if merged is None else merged
+                MutableHeaders(scope=start)["content-length"] = str(len(payload))
+                await send(start)
+                await send({"type": "http.response.body", "body": payload})
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception as e:
+            if state["started"]:
+                raise
+
+            request_body = None
+            if captured:
+                try:
+                    request_body = mask_sensitive_data(orjson.loads(b"".join(captured)))
+                except orjson.JSONDecodeError:
+                    pass
+            log_error(
+                e,
+                request=Request(scope),
+                context={
+                    'error_type': 'internal_error',
+                    'error_class': e.__class__.__name__,
+                    'request_body': request_body
+                }
             )
 
-        # Determine status string
-        status = "success" if 200 <= response.status_code < 300 else "error"
-        
-        # Create standardized structure
-        standardized_content = {
-            "code": response.status_code,
-            "status": status,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-        
-        # Wrap the original data
-        # If the original data is already a dict and has 'message' or 'error', 
-        # we can decide whether to merge or put it in 'data'.
-        # To be strictly standard, we'll put everything in 'data' unless it's an error message.
-        if status == "error":
-            if isinstance(original_data, dict):
-                standardized_content.update(original_data)
-            else:
-                standardized_content["error_details"] = original_data
-        else:
-            standardized_content["data"] = original_data
-
-        # Return the new standardized JSON response
-        headers = dict(response.headers)
-        # Remove content-length as the new body will have a different size
-        headers.pop("content-length", None)
-        # Remove content-type as JSONResponse will set it correctly
-        headers.pop("content-type", None)
-        
-        return JSONResponse(
-            status_code=response.status_code,
-            content=standardized_content,
-            headers=headers
-        )
-
-# Helper to reconstruct iterator if needed (though we're returning a new JSONResponse)
-from starlette.concurrency import iterate_in_threadpool
+            payload = internal_error_body(scope, e)
+            merged = envelope_error(500, payload) if wrap else payload
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(merged)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": merged})
@@ -0,0 +1,21 @@
+import models, database
+from sqlalchemy import text
+db = database.SessionLocal()
+try:
+    print("Running migration for catalog snapshot versions...")
+
+    # One counter per catalog section; missing rows read as version 0
+    db.execute(text("""
+        CREATE TABLE IF NOT EXISTS catalog_versions (
+            section VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT now()
+        )
+    """))
+    db.commit()
+    print("Migration successful: Created 'catalog_versions'.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
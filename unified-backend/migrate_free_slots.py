@@ -0,0 +1,35 @@
+import models, database
+from sqlalchemy import text
+from services.free_slots import rebuild_free_slots
+db = database.SessionLocal()
+try:
+    print("Running migration for free-slot bitmaps...")
+
+    # 1. One 48-bit mask per court and date
+    db.execute(text("""
+        CREATE TABLE IF NOT EXISTS court_free_slots (
+            court_id UUID NOT NULL REFERENCES admin_courts(id) ON DELETE CASCADE,
+            slot_date DATE NOT NULL,
+            branch_id UUID NOT NULL,
+            game_type_id UUID NOT NULL,
+            free_mask BIGINT NOT NULL DEFAULT 0,
+            stale BOOLEAN NOT NULL DEFAULT false,
+            change_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT now(),
+            PRIMARY KEY (court_id, slot_date)
+        )
+    """))
+
+    # 2. Candidate lookup by date and sport, and the stale rows of a date
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_court_free_slots_date_game_type ON court_free_slots (slot_date, game_type_id)"))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_court_free_slots_stale ON court_free_slots (slot_date) WHERE stale"))
+    db.commit()
+
+    # 3. Build the window
+    rows = rebuild_free_slots()
+    print(f"Migration successful: Created 'court_free_slots' and computed {rows} bitmaps.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
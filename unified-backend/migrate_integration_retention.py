@@ -0,0 +1,34 @@
+import models, database
+from sqlalchemy import text
+db = database.SessionLocal()
+try:
+    print("Running migration for integration history retention...")
+
+    # 1. Partial index for the outbox poll: only rows the worker can still claim
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_outbox_actionable "
+        "ON integration_outbox_events (next_attempt_at) "
+        "WHERE status IN ('pending', 'failed', 'processing')"
+    ))
+
+    # 2. Monthly range-partitioned archives (partitions are created by the retention job)
+    for live, archive in (
+        ("integration_logs", "integration_logs_archive"),
+        ("integration_outbox_events", "integration_outbox_events_archive"),
+    ):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {archive} (LIKE {live} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        ))
+        # Rows without created_at have no month to go to
+        db.execute(text(f"CREATE TABLE IF NOT EXISTS {archive}_default PARTITION OF {archive} DEFAULT"))
+        db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{archive}_partner_created ON {archive} (partner_id, created_at)"))
+
+    db.commit()
+    print("Migration successful: Added 'ix_outbox_actionable' and the partitioned "
+          "'integration_logs_archive' / 'integration_outbox_events_archive' tables.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -0,0 +1,22 @@
+import models, database
+from sqlalchemy import text
+db = database.SessionLocal()
+try:
+    print("Running migration for outbox event coalescing...")
+
+    # 1. Merge key for pending availability events (court_id:date:action)
+    db.execute(text("ALTER TABLE integration_outbox_events ADD COLUMN IF NOT EXISTS coalesce_key VARCHAR(255)"))
+
+    # 2. Lookup index used when a new slot change is merged into a pending event
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_integration_outbox_events_coalesce_key "
+        "ON integration_outbox_events (coalesce_key)"
+    ))
+
+    db.commit()
+    print("Migration successful: Added 'coalesce_key' column and index to 'integration_outbox_events'.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
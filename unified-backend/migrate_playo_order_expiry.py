@@ -0,0 +1,32 @@
+import models, database
+from sqlalchemy import text
+db = database.SessionLocal()
+try:
+    print("Running migration for Playo order expiry...")
+
+    # 1. Live holds per court/date (availability lookups skip expired and finished orders)
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_playo_orders_live_holds "
+        "ON playo_orders (court_id, booking_date) WHERE status = 'pending'"
+    ))
+
+    # 2. Overdue holds for the reaper
+    db.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_playo_orders_pending_expiry "
+        "ON playo_orders (expires_at) WHERE status = 'pending'"
+    ))
+
+    # 3. Expire the holds that were left 'pending' before the reaper existed
+    result = db.execute(text(
+        "UPDATE playo_orders SET status = 'expired' "
+        "WHERE status = 'pending' AND expires_at <= (now() AT TIME ZONE 'utc')"
+    ))
+
+    db.commit()
+    print(f"Migration successful: Added 'ix_playo_orders_live_holds' / 'ix_playo_orders_pending_expiry' "
+          f"and expired {result.rowcount} stale holds.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -0,0 +1,37 @@
+import models, database
+from sqlalchemy import text
+from services.rating_aggregates import reconcile_rating_aggregates
+db = database.SessionLocal()
+try:
+    print("Running migration for incremental rating aggregates...")
+
+    # 1. Running totals per court and per branch
+    db.execute(text("""
+        CREATE TABLE IF NOT EXISTS rating_aggregates (
+            scope VARCHAR(10) NOT NULL,
+            subject_id UUID NOT NULL,
+            rating_count INTEGER NOT NULL DEFAULT 0,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            stars_1 INTEGER NOT NULL DEFAULT 0,
+            stars_2 INTEGER NOT NULL DEFAULT 0,
+            stars_3 INTEGER NOT NULL DEFAULT 0,
+            stars_4 INTEGER NOT NULL DEFAULT 0,
+            stars_5 INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT now(),
+            PRIMARY KEY (scope, subject_id)
+        )
+    """))
+
+    # 2. Ratings no longer live in the venue summary
+    db.execute(text("ALTER TABLE venue_summary DROP COLUMN IF EXISTS average_rating"))
+    db.execute(text("ALTER TABLE venue_summary DROP COLUMN IF EXISTS total_reviews"))
+    db.commit()
+
+    # 3. Backfill from active reviews
+    rows = reconcile_rating_aggregates(db)
+    print(f"Migration successful: Created 'rating_aggregates' and backfilled {rows} rows.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -0,0 +1,32 @@
+import models, database
+from sqlalchemy import text
+from services.search import PROFILE_DOCUMENT, USER_DOCUMENT
+from services.venue_summary import summary_upsert
+db = database.SessionLocal()
+try:
+    print("Running migration for trigram search indexes...")
+
+    # 1. Trigram operators and GIN operator classes
+    db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    # 2. Venue search documents, built with the summary row
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS sport_terms TEXT"))
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS place_terms TEXT"))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_venue_summary_sport_terms_trgm ON venue_summary USING gin (sport_terms gin_trgm_ops)"))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_venue_summary_place_terms_trgm ON venue_summary USING gin (place_terms gin_trgm_ops)"))
+
+    # 3. Admin user search; the expressions must match the query's exactly
+    db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin (({USER_DOCUMENT}) gin_trgm_ops)"))
+    db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_profiles_search_trgm ON profiles USING gin (({PROFILE_DOCUMENT}) gin_trgm_ops)"))
+
+    # 4. Fill the new documents
+    statement, params = summary_upsert()
+    result = db.execute(statement, params)
+
+    db.commit()
+    print(f"Migration successful: Created trigram indexes and indexed {result.rowcount} branches.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -0,0 +1,25 @@
+import models, database
+from sqlalchemy import text
+from services.venue_summary import summary_upsert
+db = database.SessionLocal()
+try:
+    print("Running migration for nearest-venue search...")
+
+    # 1. Coordinates and grid cell (services/nearby.py) on the summary row
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS latitude DECIMAL(10, 8)"))
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS longitude DECIMAL(11, 8)"))
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS grid_row INTEGER"))
+    db.execute(text("ALTER TABLE venue_summary ADD COLUMN IF NOT EXISTS grid_col INTEGER"))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_venue_summary_grid ON venue_summary (grid_row, grid_col)"))
+
+    # 2. Fill them for every branch
+    statement, params = summary_upsert()
+    result = db.execute(statement, params)
+
+    db.commit()
+    print(f"Migration successful: Indexed the locations of {result.rowcount} branches.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -0,0 +1,39 @@
+import models, database
+from sqlalchemy import text
+from services.venue_summary import summary_upsert
+db = database.SessionLocal()
+try:
+    print("Running migration for the venue summary read model...")
+
+    # 1. One row per branch, removed with the branch
+    db.execute(text("""
+        CREATE TABLE IF NOT EXISTS venue_summary (
+            branch_id UUID PRIMARY KEY REFERENCES admin_branches(id) ON DELETE CASCADE,
+            game_types JSONB DEFAULT '[]'::jsonb,
+            active_game_types JSONB DEFAULT '[]'::jsonb,
+            amenities JSONB DEFAULT '[]'::jsonb,
+            min_price DECIMAL(10, 2),
+            min_court_price DECIMAL(10, 2),
+            max_court_price DECIMAL(10, 2),
+            sport_terms TEXT,
+            place_terms TEXT,
+            latitude DECIMAL(10, 8),
+            longitude DECIMAL(11, 8),
+            grid_row INTEGER,
+            grid_col INTEGER,
+            updated_at TIMESTAMP DEFAULT now()
+        )
+    """))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_venue_summary_grid ON venue_summary (grid_row, grid_col)"))
+
+    # 2. Backfill every branch
+    statement, params = summary_upsert()
+    result = db.execute(statement, params)
+
+    db.commit()
+    print(f"Migration successful: Created 'venue_summary' and summarized {result.rowcount} branches.")
+except Exception as e:
+    db.rollback()
+    print(f"Migration failed: {e}")
+finally:
+    db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DECIMAL, Date, Time, Integer, TIMESTAMP, UniqueConstraint
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, DECIMAL, Date, Time, Integer, BigInteger, TIMESTAMP, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -181,6 +181,32 @@ class BranchAmenity(Base):
     amenity_id = Column(UUID(as_uuid=True), ForeignKey("admin_amenities.id", ondelete="CASCADE"), primary_key=True)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
 
+class VenueSummary(Base):
+    """
+    Listing read model, one row per branch: aggregates of its game types,
+    amenities and court/slice prices, and its search documents. Maintained by
+    services/venue_summary.py; never written by hand.
+    """
+    __tablename__ = "venue_summary"
+    branch_id = Column(UUID(as_uuid=True), ForeignKey("admin_branches.id", ondelete="CASCADE"), primary_key=True)
+    game_types = Column(JSONB, default=list)         # every linked game type name, sorted
+    active_game_types = Column(JSONB, default=list)  # the linked game types that are active
+    amenities = Column(JSONB, default=list)
+    min_price = Column(DECIMAL(10, 2))        # cheapest active court or slice of an active court
+    min_court_price = Column(DECIMAL(10, 2))  # active courts only
+    max_court_price = Column(DECIMAL(10, 2))
+    sport_terms = Column(Text)  # active game types + synonyms, lowercased (services/search.py)
+    place_terms = Column(Text)  # branch name, address, area, city, lowercased
+    latitude = Column(DECIMAL(10, 8))
+    longitude = Column(DECIMAL(11, 8))
+    grid_row = Column(Integer)  # floor(latitude / GEO_GRID_DEGREES), services/nearby.py
+    grid_col = Column(Integer)  # floor(longitude / GEO_GRID_DEGREES)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_venue_summary_grid', 'grid_row', 'grid_col'),
+    )
+
 class Court(Base):
     __tablename__ = "admin_courts"
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
@@ -538,6 +564,23 @@ class Review(Base):
         UniqueConstraint('booking_id', name='unique_booking_review'),
     )
 
+class RatingAggregate(Base):
+    """
+    Running totals of active reviews per court and per branch, kept in step
+    with review writes by services/rating_aggregates.py.
+    """
+    __tablename__ = "rating_aggregates"
+    scope = Column(String(10), primary_key=True)  # 'court' | 'branch'
+    subject_id = Column(UUID(as_uuid=True), primary_key=True)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow)
+
 class Tournament(Base):
     __tablename__ = "tournaments"
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid, server_default=func.uuid_generate_v4())
@@ -660,6 +703,14 @@ class PlayoOrder(Base):
     court = relationship("Court", foreign_keys=[court_id])
     booking = relationship("Booking", foreign_keys=[booking_id])
 
+    # Only live holds are indexed: availability lookups and the expiry reaper
+    __table_args__ = (
+        Index('ix_playo_orders_live_holds', 'court_id', 'booking_date',
+              postgresql_where=text("status = 'pending'")),
+        Index('ix_playo_orders_pending_expiry', 'expires_at',
+              postgresql_where=text("status = 'pending'")),
+    )
+
 class UserFavoriteCourt(Base):
     __tablename__ = "user_favorite_courts"
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
@@ -762,6 +813,7 @@ class OutboxEvent(Base):
     event_type = Column(String(100), nullable=False)  # e.g., 'INVENTORY_UPDATE'
     category = Column(String(50), nullable=True)  # e.g., 'availability', 'pricing'
     payload = Column(JSONB, nullable=False)  # The exact JSON string to send to the webhook
+    coalesce_key = Column(String(255), nullable=True, index=True)  # 'court_id:date:action' for mergeable availability events
     status = Column(String(20), default='pending', index=True)  # 'pending', 'processing', 'completed', 'failed', 'dead'
     attempts = Column(Integer, default=0)
     max_attempts = Column(Integer, default=5)
@@ -772,6 +824,12 @@ class OutboxEvent(Base):
 
     partner = relationship("Partner")
 
+    # The worker polls only actionable rows; finished history stays out of this index
+    __table_args__ = (
+        Index('ix_outbox_actionable', 'next_attempt_at',
+              postgresql_where=text("status IN ('pending', 'failed', 'processing')")),
+    )
+
 class CourtBlock(Base):
     """Manual blocks created by admins that apply to all platforms"""
     __tablename__ = "admin_court_blocks"
@@ -793,3 +851,35 @@ class CourtBlock(Base):
     __table_args__ = (
         UniqueConstraint('court_id', 'block_date', 'start_time', 'end_time', 'slice_mask', name='unique_court_block_slot'),
     )
+
+class CourtFreeSlots(Base):
+    """
+    Free-slot bitmap of one court on one date: bit i of free_mask is set when
+    the 30-min slot i is offered and nothing in the court's shared group takes
+    it. Maintained by services/free_slots.py for cross-venue availability
+    search; never written by hand.
+    """
+    __tablename__ = "court_free_slots"
+    court_id = Column(UUID(as_uuid=True), ForeignKey("admin_courts.id", ondelete="CASCADE"), primary_key=True)
+    slot_date = Column(Date, primary_key=True)
+    branch_id = Column(UUID(as_uuid=True), nullable=False)
+    game_type_id = Column(UUID(as_uuid=True), nullable=False)
+    free_mask = Column(BigInteger, nullable=False, default=0)
+    stale = Column(Boolean, nullable=False, default=False)  # a booking/block changed since free_mask was computed
+    change_seq = Column(Integer, nullable=False, default=0)  # bumped with every stale mark
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_court_free_slots_date_game_type', 'slot_date', 'game_type_id'),
+        Index('ix_court_free_slots_stale', 'slot_date', postgresql_where=text("stale")),
+    )
+
+class CatalogVersion(Base):
+    """
+    Version counter of one section of the catalog snapshot (services/catalog.py),
+    moved by the admin writes to the section's tables.
+    """
+    __tablename__ = "catalog_versions"
+    section = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow)
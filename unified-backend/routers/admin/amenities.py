@@ -13,6 +13,11 @@ router = APIRouter(
     tags=["amenities"]
 )
 from dependencies import PermissionChecker
+from utils.logger import get_logger
+from services.venue_summary import refresh_venue_summary
+from services.catalog import bump_catalog
+
+logger = get_logger(__name__)
 
 @router.get("", response_model=List[schemas.Amenity], dependencies=[Depends(PermissionChecker("Manage Amenities", "view"))])
 @router.get("/", response_model=List[schemas.Amenity], dependencies=[Depends(PermissionChecker("Manage Amenities", "view"))])
@@ -46,11 +51,11 @@ async def create_amenity(
     icon_url = None
     if icon:
         try:
-             print(f"DEBUG: Uploading icon for amenity: {name}")
+             logger.debug(f"DEBUG: Uploading icon for amenity: {name}")
              icon_url = await s3_utils.upload_file_to_s3(icon, folder="amenities")
-             print(f"DEBUG: Icon uploaded successfully: {icon_url}")
+             logger.debug(f"DEBUG: Icon uploaded successfully: {icon_url}")
         except Exception as e:
-            print(f"Error uploading icon: {e}")
+            logger.error(f"Error uploading icon: {e}")
             pass
 
     db_amenity = models.Amenity(
@@ -60,6 +65,7 @@ async def create_amenity(
         is_active=is_active
     )
     db.add(db_amenity)
+    bump_catalog(db, "amenities")
     db.commit()
     db.refresh(db_amenity)
     return db_amenity
@@ -85,17 +91,20 @@ async def update_amenity(
         try:
             db_amenity.icon_url = await s3_utils.upload_file_to_s3(icon, folder="amenities")
         except Exception as e:
-             print(f"Error uploading icon: {e}")
+             logger.error(f"Error uploading icon: {e}")
              pass
     elif is_icon_removed:
-        print(f"Removing icon for amenity {amenity_id}")
+        logger.info(f"Removing icon for amenity {amenity_id}")
         db_amenity.icon_url = None
 
     db_amenity.name = name
     db_amenity.description = description
     db_amenity.is_active = is_active
 
+    bump_catalog(db, "amenities")
     db.commit()
+    # Amenity names are listed on every branch that has them
+    refresh_venue_summary(db)
     db.refresh(db_amenity)
     return db_amenity
 
@@ -107,7 +116,9 @@ def toggle_amenity_status(amenity_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Amenity not found")
     
     db_amenity.is_active = not db_amenity.is_active
+    bump_catalog(db, "amenities")
     db.commit()
+    refresh_venue_summary(db)
     db.refresh(db_amenity)
     return db_amenity
 
@@ -119,5 +130,7 @@ def delete_amenity(amenity_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Amenity not found")
     
     db.delete(db_amenity)
+    bump_catalog(db, "amenities")
     db.commit()
+    refresh_venue_summary(db)
     return {"message": "Amenity deleted successfully"}
@@ -6,6 +6,8 @@ from typing import List
 import models, schemas
 from database import get_db
 import uuid
+from services.venue_summary import refresh_venue_summary
+from services.catalog import bump_catalog
 
 router = APIRouter(
     prefix="/areas",
@@ -35,6 +37,7 @@ def create_area(area: schemas.AreaCreate, db: Session = Depends(get_db)):
     """Create a new area"""
     db_area = models.Area(**area.model_dump())
     db.add(db_area)
+    bump_catalog(db, "cities")
     db.commit()
     db.refresh(db_area)
     return db_area
@@ -49,7 +52,10 @@ def update_area(area_id: str, area: schemas.AreaCreate, db: Session = Depends(ge
     for key, value in area.model_dump().items():
         setattr(db_area, key, value)
 
+    bump_catalog(db, "cities")
     db.commit()
+    # The name is part of every branch's search document (venue_summary.place_terms)
+    refresh_venue_summary(db)
     db.refresh(db_area)
     return db_area
 
@@ -61,6 +67,7 @@ def toggle_area_status(area_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Area not found")
     
     db_area.is_active = not db_area.is_active
+    bump_catalog(db, "cities")
     db.commit()
     db.refresh(db_area)
     return db_area
@@ -74,6 +81,7 @@ def delete_area(area_id: str, db: Session = Depends(get_db)):
     
     try:
         db.delete(db_area)
+        bump_catalog(db, "cities", "branches", "knowledge")
         db.commit()
         return {"message": "Area deleted successfully"}
     except IntegrityError:
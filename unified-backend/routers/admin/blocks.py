@@ -8,6 +8,9 @@ from dependencies import PermissionChecker, get_current_admin
 from datetime import date
 from uuid import UUID
 from services.integrations.orchestrator import IntegrationOrchestrator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/blocks",
@@ -172,7 +175,7 @@ def create_block(
         try:
             IntegrationOrchestrator.notify_manual_block_change(db, b, 'block')
         except Exception as e:
-            print(f"[BLOCK SYNC] Warning: Failed to notify partners for {b.block_date}: {e}")
+            logger.warning(f"[BLOCK SYNC] Warning: Failed to notify partners for {b.block_date}: {e}")
         
     return created_blocks
 
@@ -191,7 +194,7 @@ def delete_block(
     try:
         IntegrationOrchestrator.notify_manual_block_change(db, db_block, 'available')
     except Exception as e:
-        print(f"[BLOCK SYNC] Warning: Failed to notify partners of block release: {e}")
+        logger.warning(f"[BLOCK SYNC] Warning: Failed to notify partners of block release: {e}")
 
     db.delete(db_block)
     db.commit()
@@ -9,6 +9,9 @@ from datetime import datetime, date
 from uuid import UUID
 from decimal import Decimal
 from utils.notification_helpers import notify_booking_event
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/bookings",
@@ -198,20 +201,16 @@ def create_booking(
         try:
             if db_booking.status in ['confirmed', 'pending']:
                 from services.integrations.orchestrator import IntegrationOrchestrator
-                from utils.booking_utils import safe_parse_time_float
-                for slot in (db_booking.time_slots or []):
-                    slot_start_str = slot.get('start_time') or slot.get('time') or slot.get('start')
-                    if slot_start_str:
-                        slot_start_f = safe_parse_time_float(slot_start_str)
-                        IntegrationOrchestrator.notify_inventory_change(
-                            db=db,
-                            court_id=str(db_booking.court_id),
-                            date=str(db_booking.booking_date),
-                            slot_start=slot_start_f,
-                            action='block'
-                        )
+                from utils.booking_utils import get_booked_slots
+                IntegrationOrchestrator.notify_inventory_range(
+                    db=db,
+                    court_id=str(db_booking.court_id),
+                    date=str(db_booking.booking_date),
+                    slot_starts=sorted(get_booked_slots([db_booking])),
+                    action='block'
+                )
         except Exception as ite:
-            print(f"[ADMIN BOOKING CREATE] Warning: Integration trigger failed: {ite}")
+            logger.warning(f"[ADMIN BOOKING CREATE] Warning: Integration trigger failed: {ite}")
 
         # Trigger Notification
         background_tasks.add_task(
@@ -224,9 +223,7 @@ def create_booking(
         return response
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
-        print(f"[ERROR] Booking creation failed (Version V3): {str(e)}")
+        logger.error(f"[ERROR] Booking creation failed (Version V3): {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create booking (Ref V3): {str(e)}")
 
 from dependencies import get_admin_branch_filter
@@ -423,8 +420,7 @@ def get_all_bookings(
         from fastapi.responses import JSONResponse
         return JSONResponse(content=result)
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[ADMIN BOOKINGS] Failed to list bookings: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 @router.get("/{booking_id}", response_model=schemas.AdminBooking, dependencies=[Depends(PermissionChecker("Manage Bookings", "view"))])
@@ -649,20 +645,16 @@ def update_booking(
         try:
             if db_booking.status in ['confirmed', 'pending']:
                 from services.integrations.orchestrator import IntegrationOrchestrator
-                from utils.booking_utils import safe_parse_time_float
-                for slot in (db_booking.time_slots or []):
-                    slot_start_str = slot.get('start_time') or slot.get('time') or slot.get('start')
-                    if slot_start_str:
-                        slot_start_f = safe_parse_time_float(slot_start_str)
-                        IntegrationOrchestrator.notify_inventory_change(
-                            db=db,
-                            court_id=str(db_booking.court_id),
-                            date=str(db_booking.booking_date),
-                            slot_start=slot_start_f,
-                            action='block'
-                        )
+                from utils.booking_utils import get_booked_slots
+                IntegrationOrchestrator.notify_inventory_range(
+                    db=db,
+                    court_id=str(db_booking.court_id),
+                    date=str(db_booking.booking_date),
+                    slot_starts=sorted(get_booked_slots([db_booking])),
+                    action='block'
+                )
         except Exception as ite:
-            print(f"[ADMIN BOOKING UPDATE] Warning: Integration trigger failed: {ite}")
+            logger.warning(f"[ADMIN BOOKING UPDATE] Warning: Integration trigger failed: {ite}")
 
         return response
     except Exception as e:
@@ -719,20 +711,16 @@ def update_booking_status(booking_id: str, request: dict, background_tasks: Back
             if was_blocked != is_blocked:
                 action = 'block' if is_blocked else 'available'
                 # Import here to avoid circular dependencies if any
-                from utils.booking_utils import safe_parse_time_float
-                for slot in (db_booking.time_slots or []):
-                    slot_start_str = slot.get('start_time') or slot.get('time') or slot.get('start')
-                    if slot_start_str:
-                        slot_start_f = safe_parse_time_float(slot_start_str)
-                        IntegrationOrchestrator.notify_inventory_change(
-                            db=db,
-                            court_id=str(db_booking.court_id),
-                            date=str(db_booking.booking_date),
-                            slot_start=slot_start_f,
-                            action=action
-                        )
+                from utils.booking_utils import get_booked_slots
+                IntegrationOrchestrator.notify_inventory_range(
+                    db=db,
+                    court_id=str(db_booking.court_id),
+                    date=str(db_booking.booking_date),
+                    slot_starts=sorted(get_booked_slots([db_booking])),
+                    action=action
+                )
     except Exception as ite:
-        print(f"[ADMIN STATUS UPDATE] Warning: Integration trigger failed: {ite}")
+        logger.warning(f"[ADMIN STATUS UPDATE] Warning: Integration trigger failed: {ite}")
 
     return {"message": f"Booking status updated to {new_status}"}
 
@@ -768,20 +756,16 @@ def delete_booking(
 
     try:
         from services.integrations.orchestrator import IntegrationOrchestrator
-        from utils.booking_utils import safe_parse_time_float
-        for slot in (db_booking.time_slots or []):
-            slot_start_str = slot.get('start_time') or slot.get('time') or slot.get('start')
-            if slot_start_str:
-                slot_start_f = safe_parse_time_float(slot_start_str)
-                IntegrationOrchestrator.notify_inventory_change(
-                    db=db,
-                    court_id=str(db_booking.court_id),
-                    date=str(db_booking.booking_date),
-                    slot_start=slot_start_f,
-                    action='available'
-                )
+        from utils.booking_utils import get_booked_slots
+        IntegrationOrchestrator.notify_inventory_range(
+            db=db,
+            court_id=str(db_booking.court_id),
+            date=str(db_booking.booking_date),
+            slot_starts=sorted(get_booked_slots([db_booking])),
+            action='available'
+        )
     except Exception as ite:
-        print(f"[ADMIN BOOKING] Warning: Integration trigger failed: {ite}")
+        logger.warning(f"[ADMIN BOOKING] Warning: Integration trigger failed: {ite}")
 
     db.delete(db_booking)
     db.commit()
@@ -17,6 +17,12 @@ router = APIRouter(
 )
 
 from dependencies import get_admin_branch_filter, require_super_admin, PermissionChecker, get_current_admin
+from utils.logger import get_logger
+from services.integrations.partner_catalog import invalidate_partner_catalog
+from services.venue_summary import refresh_venue_summary
+from services.catalog import bump_catalog
+
+logger = get_logger(__name__)
 
 @router.get("", response_model=schemas.BranchListResponse)
 @router.get("/", response_model=schemas.BranchListResponse)
@@ -124,7 +130,7 @@ async def create_branch(
                     url = await s3_utils.upload_file_to_s3(image, folder="branches")
                     image_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading image: {e}")
+                    logger.error(f"Error uploading image: {e}")
                     pass
 
     # Parse opening hours if provided
@@ -186,7 +192,9 @@ async def create_branch(
         )
         db.add(db_access)
 
+    bump_catalog(db, "branches", "knowledge")
     db.commit()
+    refresh_venue_summary(db, [db_branch.id])
     db.refresh(db_branch)
     return db_branch
 
@@ -239,7 +247,7 @@ async def update_branch(
                     url = await s3_utils.upload_file_to_s3(image, folder="branches")
                     image_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading image: {e}")
+                    logger.error(f"Error uploading image: {e}")
                     pass
 
     # Parse opening hours if provided
@@ -293,7 +301,10 @@ async def update_branch(
             )
             db.add(db_branch_amenity)
 
+    bump_catalog(db, "branches", "knowledge")
     db.commit()
+    invalidate_partner_catalog()
+    refresh_venue_summary(db, [branch_id])
     db.refresh(db_branch)
     return db_branch
 
@@ -306,6 +317,7 @@ def toggle_branch_status(branch_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Branch not found")
     
     db_branch.is_active = not db_branch.is_active
+    bump_catalog(db, "branches", "knowledge")
     db.commit()
     db.refresh(db_branch)
     return db_branch
@@ -319,7 +331,9 @@ def delete_branch(branch_id: str, db: Session = Depends(get_db)):
     
     try:
         db.delete(db_branch)
+        bump_catalog(db, "branches", "knowledge")
         db.commit()
+        invalidate_partner_catalog()
         return {"message": "Branch deleted successfully"}
     except IntegrityError:
         db.rollback()
@@ -6,6 +6,8 @@ from typing import List
 import models, schemas
 from database import get_db
 import uuid
+from services.venue_summary import refresh_venue_summary
+from services.catalog import bump_catalog
 
 router = APIRouter(
     prefix="/cities",
@@ -38,6 +40,7 @@ def create_city(city: schemas.CityCreate, db: Session = Depends(get_db)):
 
     db_city = models.City(**city.model_dump())
     db.add(db_city)
+    bump_catalog(db, "cities", "knowledge")
     db.commit()
     db.refresh(db_city)
     return db_city
@@ -52,7 +55,10 @@ def update_city(city_id: str, city: schemas.CityCreate, db: Session = Depends(ge
     for key, value in city.model_dump().items():
         setattr(db_city, key, value)
 
+    bump_catalog(db, "cities", "knowledge")
     db.commit()
+    # The name is part of every branch's search document (venue_summary.place_terms)
+    refresh_venue_summary(db)
     db.refresh(db_city)
     return db_city
 
@@ -64,6 +70,7 @@ def toggle_city_status(city_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="City not found")
     
     db_city.is_active = not db_city.is_active
+    bump_catalog(db, "cities", "knowledge")
     db.commit()
     db.refresh(db_city)
     return db_city
@@ -77,6 +84,7 @@ def delete_city(city_id: str, db: Session = Depends(get_db)):
     
     try:
         db.delete(db_city)
+        bump_catalog(db, "cities", "branches", "knowledge")
         db.commit()
         return {"message": "City deleted successfully"}
     except IntegrityError:
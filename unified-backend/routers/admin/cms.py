@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import models, schemas
 from database import get_db
+from services.catalog import bump_catalog
 from dependencies import require_super_admin, PermissionChecker
 
 router = APIRouter(
@@ -51,6 +52,7 @@ def create_cms_page(page: schemas.CMSPageCreate, db: Session = Depends(get_db)):
         is_active=page.is_active
     )
     db.add(db_page)
+    bump_catalog(db, "cms_pages")
     db.commit()
     db.refresh(db_page)
     return db_page
@@ -74,6 +76,7 @@ def update_cms_page(page_id: str, page_update: schemas.CMSPageUpdate, db: Sessio
     if page_update.is_active is not None:
         db_page.is_active = page_update.is_active
         
+    bump_catalog(db, "cms_pages")
     db.commit()
     db.refresh(db_page)
     return db_page
@@ -85,5 +88,6 @@ def delete_cms_page(page_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Page not found")
     
     db.delete(db_page)
+    bump_catalog(db, "cms_pages")
     db.commit()
     return {"detail": "Page deleted"}
@@ -31,6 +31,11 @@ router = APIRouter(
 )
 
 from dependencies import get_admin_branch_filter
+from utils.logger import get_logger
+from services.integrations.partner_catalog import invalidate_partner_catalog
+from services.venue_summary import refresh_venue_summary
+
+logger = get_logger(__name__)
 
 @router.get("", response_model=schemas.CourtListResponse)
 @router.get("/", response_model=schemas.CourtListResponse)
@@ -152,7 +157,7 @@ async def create_court(
                     url = await s3_utils.upload_file_to_s3(image, folder="courts/images")
                     image_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading image: {e}")
+                    logger.error(f"Error uploading image: {e}")
                     pass
 
     # Handle video uploads
@@ -164,7 +169,7 @@ async def create_court(
                     url = await s3_utils.upload_file_to_s3(video, folder="courts/videos")
                     video_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading video: {e}")
+                    logger.error(f"Error uploading video: {e}")
                     pass
 
     # Parse price conditions if provided
@@ -283,9 +288,11 @@ async def create_court(
                     price_per_hour=Decimal(slice_price)
                 ))
         except Exception as e:
-            print(f"Error parsing sport slices: {e}")
+            logger.error(f"Error parsing sport slices: {e}")
 
     db.commit()
+    invalidate_partner_catalog()
+    refresh_venue_summary(db, [db_court.branch_id])
     db.refresh(db_court)
     
     # Associate Rental Items
@@ -300,7 +307,7 @@ async def create_court(
     try:
         IntegrationOrchestrator.notify_court_schedule_change(db, str(db_court.id), "update")
     except Exception as e:
-        print(f"Bulk schedule notification failed: {e}")
+        logger.warning(f"Bulk schedule notification failed: {e}")
 
     return db_court
 
@@ -336,6 +343,7 @@ async def update_court(
     db_court = db.query(models.Court).filter(models.Court.id == court_id).first()
     if not db_court:
         raise HTTPException(status_code=404, detail="Court not found")
+    previous_branch_id = db_court.branch_id
 
     # Security Check: Existing Court Access
     if branch_filter is not None:
@@ -361,7 +369,7 @@ async def update_court(
                     url = await s3_utils.upload_file_to_s3(image, folder="courts/images")
                     image_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading image: {e}")
+                    logger.error(f"Error uploading image: {e}")
                     pass
 
     # Handle video uploads
@@ -375,7 +383,7 @@ async def update_court(
                     url = await s3_utils.upload_file_to_s3(video, folder="courts/videos")
                     video_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading video: {e}")
+                    logger.error(f"Error uploading video: {e}")
                     pass
 
     # Parse price conditions if provided
@@ -456,7 +464,7 @@ async def update_court(
                     price_per_hour=Decimal(slice_price)
                 ))
         except Exception as e:
-            print(f"Error parsing sport slices: {e}")
+            logger.error(f"Error parsing sport slices: {e}")
             
     if total_zones is not None:
         # Clear existing zones and recreate
@@ -478,13 +486,15 @@ async def update_court(
         except: pass
 
     db.commit()
+    invalidate_partner_catalog()
+    refresh_venue_summary(db, [previous_branch_id, db_court.branch_id])
     db.refresh(db_court)
     
     # Notify partners about recurring schedule changes (Bulk)
     try:
         IntegrationOrchestrator.notify_court_schedule_change(db, str(db_court.id), "update")
     except Exception as e:
-        print(f"Bulk schedule notification failed: {e}")
+        logger.warning(f"Bulk schedule notification failed: {e}")
 
     return db_court
 
@@ -506,6 +516,8 @@ def toggle_court_status(
     
     db_court.is_active = not db_court.is_active
     db.commit()
+    invalidate_partner_catalog()
+    refresh_venue_summary(db, [db_court.branch_id])
     db.refresh(db_court)
     
     # Notify partners about recurring schedule (available/block toggle) - Bulk
@@ -513,7 +525,7 @@ def toggle_court_status(
         status_action = "available" if db_court.is_active else "block"
         IntegrationOrchestrator.notify_court_schedule_change(db, str(db_court.id), status_action)
     except Exception as e:
-        print(f"Toggle notification failed: {e}")
+        logger.warning(f"Toggle notification failed: {e}")
 
     return db_court
 
@@ -557,9 +569,12 @@ def delete_court(
         )
 
     try:
+        court_name, branch_id = db_court.name, db_court.branch_id
         db.delete(db_court)
         db.commit()
-        return {"message": f"Court '{db_court.name}' deleted successfully"}
+        invalidate_partner_catalog()
+        refresh_venue_summary(db, [branch_id])
+        return {"message": f"Court '{court_name}' deleted successfully"}
     except IntegrityError as e:
         db.rollback()
         # Fallback for other constraints not caught above
@@ -637,8 +652,8 @@ async def bulk_update_slots(
                     price_conditions = []
 
             for date_key in date_list:
-                print(f"[DEBUG] Bulk Update: date={date_key}, target_from={from_to_match[0]}, target_to={from_to_match[1]}")
-                print(f"[DEBUG] Original price_conditions count: {len(price_conditions)}")
+                logger.debug(f"[DEBUG] Bulk Update: date={date_key}, target_from={from_to_match[0]}, target_to={from_to_match[1]}")
+                logger.debug(f"[DEBUG] Original price_conditions count: {len(price_conditions)}")
                 
                 target_from_f = safe_parse_time_float(from_to_match[0])
                 target_to_f = safe_parse_time_float(from_to_match[1])
@@ -653,7 +668,7 @@ async def bulk_update_slots(
                         safe_parse_time_float(pc.get('slotTo') or pc.get('slot_to')) == target_to_f
                     )
                 ]
-                print(f"[DEBUG] After filter, count: {len(new_price_conditions)}")
+                logger.debug(f"[DEBUG] After filter, count: {len(new_price_conditions)}")
                 price_conditions = new_price_conditions
 
                 # Create new date-specific slot
@@ -685,7 +700,7 @@ async def bulk_update_slots(
         raise
     except Exception as e:
         db.rollback()
-        print(f"Error in bulk_update_slots: {e}")
+        logger.error(f"Error in bulk_update_slots: {e}")
         raise HTTPException(status_code=400, detail=f"Error updating slots: {str(e)}")
 
 @router.post("/bulk-delete-slots")
@@ -736,7 +751,7 @@ async def bulk_delete_slots(
                 try: price_conditions = json.loads(price_conditions)
                 except: price_conditions = []
 
-            print(f"[DEBUG] Bulk Delete: slot_from={slot_from}, slot_to={slot_to}, dates={date_list}")
+            logger.debug(f"[DEBUG] Bulk Delete: slot_from={slot_from}, slot_to={slot_to}, dates={date_list}")
             
             target_from_f = safe_parse_time_float(slot_from)
             target_to_f = safe_parse_time_float(slot_to)
@@ -744,7 +759,7 @@ async def bulk_delete_slots(
             original_len = len(price_conditions)
             
             for date_key in date_list:
-                print(f"[DEBUG] Checking date: {date_key}")
+                logger.debug(f"[DEBUG] Checking date: {date_key}")
                 # Filter OUT matching slots
                 price_conditions = [
                     pc for pc in price_conditions 
@@ -756,7 +771,7 @@ async def bulk_delete_slots(
                     )
                 ]
             
-            print(f"[DEBUG] price_conditions: original={original_len}, final={len(price_conditions)}")
+            logger.debug(f"[DEBUG] price_conditions: original={original_len}, final={len(price_conditions)}")
 
             if len(price_conditions) != original_len:
                 court.price_conditions = price_conditions
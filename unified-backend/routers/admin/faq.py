@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import models, schemas
 from database import get_db
+from services.catalog import bump_catalog
 from dependencies import require_super_admin, PermissionChecker
 
 router = APIRouter(
@@ -36,6 +37,7 @@ def get_faq(faq_id: str, db: Session = Depends(get_db)):
 def create_faq(faq: schemas.FAQCreate, db: Session = Depends(get_db)):
     db_faq = models.FAQ(question=faq.question, answer=faq.answer, is_active=faq.is_active)
     db.add(db_faq)
+    bump_catalog(db, "faqs")
     db.commit()
     db.refresh(db_faq)
     return db_faq
@@ -51,6 +53,7 @@ def update_faq(faq_id: str, faq: schemas.FAQUpdate, db: Session = Depends(get_db
         db_faq.answer = faq.answer
     if faq.is_active is not None:
         db_faq.is_active = faq.is_active
+    bump_catalog(db, "faqs")
     db.commit()
     db.refresh(db_faq)
     return db_faq
@@ -61,5 +64,6 @@ def delete_faq(faq_id: str, db: Session = Depends(get_db)):
     if not db_faq:
         raise HTTPException(status_code=404, detail="FAQ not found")
     db.delete(db_faq)
+    bump_catalog(db, "faqs")
     db.commit()
     return {"detail": "FAQ deleted"}
@@ -14,6 +14,12 @@ router = APIRouter(
     tags=["game-types"]
 )
 from dependencies import PermissionChecker
+from utils.logger import get_logger
+from services.integrations.partner_catalog import invalidate_partner_catalog
+from services.venue_summary import refresh_venue_summary
+from services.catalog import bump_catalog
+
+logger = get_logger(__name__)
 
 @router.get("", response_model=List[schemas.GameType], dependencies=[Depends(PermissionChecker("Manage Sports", "view"))])
 @router.get("/", response_model=List[schemas.GameType], dependencies=[Depends(PermissionChecker("Manage Sports", "view"))])
@@ -48,11 +54,11 @@ async def create_game_type(
     icon_url = None
     if icon:
         try:
-            print(f"DEBUG: Attempting to upload icon for game type: {name}")
+            logger.debug(f"DEBUG: Attempting to upload icon for game type: {name}")
             icon_url = await s3_utils.upload_file_to_s3(icon, folder="game_types")
-            print(f"DEBUG: Icon upload success. URL: {icon_url}")
+            logger.debug(f"DEBUG: Icon upload success. URL: {icon_url}")
         except Exception as e:
-            print(f"Error uploading icon: {e}")
+            logger.error(f"Error uploading icon: {e}")
             # Do not fallback to None silently if possible, but keep existing behavior for now
             pass
             
@@ -64,6 +70,7 @@ async def create_game_type(
         is_active=is_active
     )
     db.add(db_game_type)
+    bump_catalog(db, "game_types")
     db.commit()
     db.refresh(db_game_type)
     return db_game_type
@@ -89,10 +96,10 @@ async def update_game_type(
         try:
             db_game_type.icon_url = await s3_utils.upload_file_to_s3(icon, folder="game_types")
         except Exception as e:
-            print(f"Error uploading icon: {e}")
+            logger.error(f"Error uploading icon: {e}")
             pass
     elif is_icon_removed:
-        print(f"Removing icon for game type {game_type_id}")
+        logger.info(f"Removing icon for game type {game_type_id}")
         db_game_type.icon_url = None
 
 
@@ -102,7 +109,11 @@ async def update_game_type(
     db_game_type.description = description
     db_game_type.is_active = is_active
 
+    bump_catalog(db, "game_types")
     db.commit()
+    invalidate_partner_catalog()
+    # Game type names are listed on every branch that offers them
+    refresh_venue_summary(db)
     db.refresh(db_game_type)
     return db_game_type
 
@@ -114,7 +125,9 @@ def toggle_game_type_status(game_type_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game type not found")
     
     db_game_type.is_active = not db_game_type.is_active
+    bump_catalog(db, "game_types")
     db.commit()
+    refresh_venue_summary(db)
     db.refresh(db_game_type)
     return db_game_type
 
@@ -127,7 +140,9 @@ def delete_game_type(game_type_id: str, db: Session = Depends(get_db)):
     
     try:
         db.delete(db_game_type)
+        bump_catalog(db, "game_types")
         db.commit()
+        invalidate_partner_catalog()
         return {"message": "Game type deleted successfully"}
     except IntegrityError:
         db.rollback()
@@ -7,6 +7,9 @@ import models, schemas
 from database import get_db
 from dependencies import PermissionChecker
 import json
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/global-price-conditions",
@@ -48,7 +51,7 @@ async def create_global_condition(
     dates_list = []
     
     # Debug: Print received values
-    print(f"DEBUG - Received: condition_type={condition_type}, days={days} (type: {type(days)}), dates={dates} (type: {type(dates)}), slot_from={slot_from}, slot_to={slot_to}, price={price}")
+    logger.debug(f"DEBUG - Received: condition_type={condition_type}, days={days} (type: {type(days)}), dates={dates} (type: {type(dates)}), slot_from={slot_from}, slot_to={slot_to}, price={price}")
     
     try:
         if condition_type == 'date':
@@ -125,9 +128,8 @@ async def create_global_condition(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR creating global condition: {str(e)}")
+        logger.error(f"ERROR creating global condition: {str(e)}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error creating global condition: {str(e)}")
 
 @router.put("/{condition_id}", response_model=dict)
@@ -235,7 +237,7 @@ def apply_global_condition_to_all_courts(condition, db: Session):
     courts = db.query(models.Court).filter(models.Court.is_active == True).all()
     updated_count = 0
     
-    print(f"DEBUG: Applying global condition {condition.id} to all courts (Count: {len(courts)})...")
+    logger.debug(f"DEBUG: Applying global condition {condition.id} to all courts (Count: {len(courts)})...")
     for court in courts:
         # Get existing price conditions
         price_conditions = court.price_conditions or []
@@ -279,7 +281,7 @@ def apply_global_condition_to_all_courts(condition, db: Session):
                         pc['id'] = target_id
                         pc['price'] = str(condition.price)
                         condition_exists = True
-                        print(f"DEBUG: Linked matched condition {target_id} in court {court.name}")
+                        logger.debug(f"DEBUG: Linked matched condition {target_id} in court {court.name}")
                         break
                 else:
                     # Recurring: match by days and time
@@ -290,12 +292,12 @@ def apply_global_condition_to_all_courts(condition, db: Session):
                         pc['id'] = target_id
                         pc['price'] = str(condition.price)
                         condition_exists = True
-                        print(f"DEBUG: Linked matched condition {target_id} in court {court.name}")
+                        logger.debug(f"DEBUG: Linked matched condition {target_id} in court {court.name}")
                         break
         
         # Add if doesn't exist
         if not condition_exists:
-            print(f"DEBUG: Adding new condition {target_id} to court {court.name}")
+            logger.debug(f"DEBUG: Adding new condition {target_id} to court {court.name}")
             if condition.condition_type == 'date':
                 new_condition = {
                     'id': target_id,
@@ -323,9 +325,9 @@ def apply_global_condition_to_all_courts(condition, db: Session):
     
     try:
         db.commit()
-        print(f"DEBUG: Successfully committed updates to {updated_count} courts")
+        logger.debug(f"DEBUG: Successfully committed updates to {updated_count} courts")
     except Exception as e:
-        print(f"ERROR: Failed to commit updates to courts: {str(e)}")
+        logger.error(f"ERROR: Failed to commit updates to courts: {str(e)}")
         db.rollback()
         
     return updated_count
@@ -335,7 +337,7 @@ def remove_global_condition_from_all_courts(condition_id: str, db: Session):
     courts = db.query(models.Court).all()
     target_id = f"global-{condition_id}"
     updated_count = 0
-    print(f"DEBUG: Removing global condition {target_id} from all courts...")
+    logger.debug(f"DEBUG: Removing global condition {target_id} from all courts...")
     
     for court in courts:
         price_conditions = court.price_conditions or []
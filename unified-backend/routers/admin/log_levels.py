@@ -0,0 +1,28 @@
+"""
+Admin API for inspecting and changing logger levels at runtime.
+Changes apply to the worker process that serves the request and are not persisted;
+use LOG_LEVELS in the environment for permanent overrides.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+import schemas
+from dependencies import require_super_admin
+from utils.logger import get_log_levels, set_log_level, logger
+
+router = APIRouter(
+    prefix="/log-levels",
+    tags=["Admin Log Levels"],
+)
+
+@router.get("", dependencies=[Depends(require_super_admin)])
+def list_log_levels():
+    return get_log_levels()
+
+@router.put("", dependencies=[Depends(require_super_admin)])
+def update_log_level(payload: schemas.LogLevelUpdate):
+    try:
+        set_log_level(payload.logger, payload.level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"[LOG LEVELS] {payload.logger or 'root'} set to {payload.level.upper()}")
+    return get_log_levels()
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import models, schemas
 from database import get_db
+from services.catalog import bump_catalog
 import uuid
 
 router = APIRouter(
@@ -38,6 +39,7 @@ def create_policy(policy: schemas.AdminPolicyCreate, db: Session = Depends(get_d
         is_active=policy.is_active
     )
     db.add(new_policy)
+    bump_catalog(db, "policies")
     db.commit()
     db.refresh(new_policy)
     return new_policy
@@ -58,6 +60,7 @@ def update_policy(policy_id: str, policy_update: schemas.AdminPolicyUpdate, db:
     if policy_update.is_active is not None:
         db_policy.is_active = policy_update.is_active
         
+    bump_catalog(db, "policies")
     db.commit()
     db.refresh(db_policy)
     return db_policy
@@ -70,6 +73,7 @@ def delete_policy(policy_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Policy not found")
     
     db.delete(db_policy)
+    bump_catalog(db, "policies")
     db.commit()
     return None
 
@@ -105,4 +109,5 @@ def ensure_default_policies(db: Session):
             new_policy = models.AdminPolicy(**p)
             db.add(new_policy)
         
+        bump_catalog(db, "policies")
         db.commit()
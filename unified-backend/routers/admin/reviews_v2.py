@@ -6,6 +6,10 @@ import schemas
 from database import get_db
 import uuid
 from datetime import datetime
+from utils.logger import get_logger
+from services.rating_aggregates import apply_review
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/reviews",
@@ -35,16 +39,21 @@ def get_all_reviews(db: Session = Depends(get_db)):
                 if r.court_id in court_map:
                    r.court = court_map[r.court_id]
                    
-    print(f"DEBUG_V2: Fetched {len(reviews)} reviews")
+    logger.debug(f"DEBUG_V2: Fetched {len(reviews)} reviews")
     return reviews
 
 
 @router.put("/{review_id}/status")
 def update_review_status(review_id: str, is_active: bool, db: Session = Depends(get_db)):
-    review = db.query(models.Review).filter(models.Review.id == review_id).first()
+    # Locked before the comparison: two concurrent toggles must not both apply the same delta.
+    # Review row first, aggregate rows second: the same lock order as create_review
+    review = db.query(models.Review).filter(models.Review.id == review_id).with_for_update().first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    review.is_active = is_active
+    if review.is_active != is_active:
+        review.is_active = is_active
+        db.flush()
+        apply_review(db, review.court_id, review.rating, +1 if is_active else -1)
     db.commit()
     return {"message": "Review status updated"}
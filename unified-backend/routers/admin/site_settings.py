@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from typing import Optional
 import models, schemas
 from database import get_db
+from services.catalog import bump_catalog
 from dependencies import require_super_admin, PermissionChecker
 from datetime import datetime
 from utils import s3_utils
+from utils.invoice_utils import invalidate_site_settings_snapshot
 
 router = APIRouter(
     prefix="/settings",
@@ -27,6 +29,7 @@ def get_site_settings(db: Session = Depends(get_db)):
             linkedin_url=""
         )
         db.add(settings)
+        bump_catalog(db, "site_settings")
         db.commit()
         db.refresh(settings)
     return settings
@@ -80,6 +83,8 @@ async def update_site_settings(
         except Exception as e:
              raise HTTPException(status_code=500, detail=f"Failed to upload logo: {str(e)}")
 
+    bump_catalog(db, "site_settings")
     db.commit()
     db.refresh(settings)
+    invalidate_site_settings_snapshot()
     return settings
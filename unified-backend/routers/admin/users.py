@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy import text
 from typing import List, Optional
 from datetime import datetime
 import models, schemas
 from database import get_db
 from dependencies import PermissionChecker
+from services.search import PROFILE_DOCUMENT, USER_DOCUMENT, match_clause, rank_expression
 
 router = APIRouter(
     prefix="/users",
@@ -24,18 +25,16 @@ def get_all_users(
     query = db.query(models.User).options(joinedload(models.User.profile))
     
     if search:
-        search_filter = f"%{search}%"
+        # Trigram-indexed documents over the user and profile columns (services/search.py)
+        user_clause, params = match_clause(db, USER_DOCUMENT, "search", search)
+        profile_clause, profile_params = match_clause(db, PROFILE_DOCUMENT, "search", search)
+        params.update(profile_params)
+        rank = f"{rank_expression(db, USER_DOCUMENT, 'search')} + {rank_expression(db, PROFILE_DOCUMENT, 'search')}"
+        # One indexed lookup per table; an OR across the join could use neither index
+        matching_ids = f"SELECT id FROM users WHERE {user_clause} UNION SELECT id FROM profiles WHERE {profile_clause}"
         query = query.join(models.Profile, isouter=True).filter(
-            or_(
-                models.User.first_name.ilike(search_filter),
-                models.User.last_name.ilike(search_filter),
-                models.User.email.ilike(search_filter),
-                models.User.phone_number.ilike(search_filter),
-                models.User.full_name.ilike(search_filter),
-                models.Profile.full_name.ilike(search_filter),
-                models.Profile.phone_number.ilike(search_filter)
-            )
-        )
+            text(f"users.id IN ({matching_ids})")
+        ).order_by(text(f"{rank} DESC")).params(**params)
     
     total = query.count()
     users = query.offset(skip).limit(limit).all()
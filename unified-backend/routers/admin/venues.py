@@ -10,6 +10,9 @@ import shutil
 from pathlib import Path
 from utils import s3_utils
 from dependencies import PermissionChecker
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/venues",
@@ -86,7 +89,7 @@ async def create_venue(
                     url = await s3_utils.upload_file_to_s3(photo, folder="venues/photos")
                     photo_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading photo: {e}")
+                    logger.error(f"Error uploading photo: {e}")
                     pass
 
     # Handle video uploads
@@ -98,7 +101,7 @@ async def create_venue(
                     url = await s3_utils.upload_file_to_s3(video, folder="venues/videos")
                     video_urls.append(url)
                 except Exception as e:
-                    print(f"Error uploading video: {e}")
+                    logger.error(f"Error uploading video: {e}")
                     pass
 
     db_venue = models.AdminVenue(
@@ -150,7 +153,7 @@ async def update_venue(
                     url = await s3_utils.upload_file_to_s3(photo, folder="venues/photos")
                     current_photos.append(url)
                 except Exception as e:
-                    print(f"Error uploading photo: {e}")
+                    logger.error(f"Error uploading photo: {e}")
                     pass
 
     current_videos = db_venue.videos or []
@@ -161,7 +164,7 @@ async def update_venue(
                     url = await s3_utils.upload_file_to_s3(video, folder="venues/videos")
                     current_videos.append(url)
                 except Exception as e:
-                    print(f"Error uploading video: {e}")
+                    logger.error(f"Error uploading video: {e}")
                     pass
 
     db_venue.game_type = game_type
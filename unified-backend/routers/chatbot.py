@@ -5,6 +5,11 @@ from database import get_db
 from typing import Optional, List, Dict, Any
 from functools import lru_cache
 import json
+from services.catalog import CHATBOT_FAQS
+from services.search import match_clause, rank_expression
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/chatbot", tags=["Chatbot Knowledge"])
 
@@ -74,7 +79,7 @@ def get_cached_knowledge_base(db: Session):
             'city_count': len(cities)
         }
     except Exception as e:
-        print(f"[CHATBOT] Error caching knowledge base: {e}")
+        logger.error(f"[CHATBOT] Error caching knowledge base: {e}")
         return {
             'cities': [],
             'game_types': [],
@@ -88,7 +93,7 @@ def get_cached_knowledge_base(db: Session):
 # ============================================================================
 
 @router.get("/knowledge/base")
-async def get_knowledge_base(db: Session = Depends(get_db)):
+def get_knowledge_base(db: Session = Depends(get_db)):
     """
     Get complete knowledge base for chatbot initialization.
     Includes cities, sports, amenities, and platform stats.
@@ -108,7 +113,7 @@ async def get_knowledge_base(db: Session = Depends(get_db)):
                 if p_val:
                     policies.append({p_type: p_val})
         except Exception as poly_err:
-            print(f"[CHATBOT API] Warning: Could not fetch policies: {poly_err}")
+            logger.warning(f"[CHATBOT API] Warning: Could not fetch policies: {poly_err}")
             
         # Add a hardcoded GST entry fallback
         policies.append({"gst": "18.0"})
@@ -119,12 +124,12 @@ async def get_knowledge_base(db: Session = Depends(get_db)):
             "data": knowledge
         }
     except Exception as e:
-        print(f"[CHATBOT API] Error in knowledge base: {e}")
+        logger.error(f"[CHATBOT API] Error in knowledge base: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/knowledge/cities")
-async def get_cities(db: Session = Depends(get_db)):
+def get_cities(db: Session = Depends(get_db)):
     """Get all active cities with areas"""
     try:
         query = text("""
@@ -158,12 +163,12 @@ async def get_cities(db: Session = Depends(get_db)):
         
         return {"success": True, "data": cities}
     except Exception as e:
-        print(f"[CHATBOT API] Error getting cities: {e}")
+        logger.error(f"[CHATBOT API] Error getting cities: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/knowledge/game-types")
-async def get_game_types(db: Session = Depends(get_db)):
+def get_game_types(db: Session = Depends(get_db)):
     """Get all active game types/sports"""
     try:
         query = text("""
@@ -185,12 +190,12 @@ async def get_game_types(db: Session = Depends(get_db)):
         
         return {"success": True, "data": game_types}
     except Exception as e:
-        print(f"[CHATBOT API] Error getting game types: {e}")
+        logger.error(f"[CHATBOT API] Error getting game types: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/knowledge/amenities")
-async def get_amenities(db: Session = Depends(get_db)):
+def get_amenities(db: Session = Depends(get_db)):
     """Get all active amenities"""
     try:
         query = text("""
@@ -211,12 +216,12 @@ async def get_amenities(db: Session = Depends(get_db)):
         
         return {"success": True, "data": amenities}
     except Exception as e:
-        print(f"[CHATBOT API] Error getting amenities: {e}")
+        logger.error(f"[CHATBOT API] Error getting amenities: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/knowledge/venues")
-async def get_all_venues_summary(db: Session = Depends(get_db)):
+def get_all_venues_summary(db: Session = Depends(get_db)):
     """
     Get summary of all active venues for chatbot context.
     Returns lightweight venue data for quick reference.
@@ -283,12 +288,12 @@ async def get_all_venues_summary(db: Session = Depends(get_db)):
         
         return {"success": True, "data": venues, "count": len(venues)}
     except Exception as e:
-        print(f"[CHATBOT API] Error getting venues summary: {e}")
+        logger.error(f"[CHATBOT API] Error getting venues summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/context/venue/{venue_id}")
-async def get_venue_detailed_context(venue_id: str, db: Session = Depends(get_db)):
+def get_venue_detailed_context(venue_id: str, db: Session = Depends(get_db)):
     """
     Get comprehensive venue details for chatbot context.
     Includes full descriptions, pricing info, rules, terms, and reviews.
@@ -444,12 +449,12 @@ async def get_venue_detailed_context(venue_id: str, db: Session = Depends(get_db
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[CHATBOT API] Error getting venue context: {e}")
+        logger.error(f"[CHATBOT API] Error getting venue context: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/booking/calculate")
-async def calculate_chatbot_price(
+def calculate_chatbot_price(
     data: Dict[str, Any],
     db: Session = Depends(get_db)
 ):
@@ -514,43 +519,12 @@ async def calculate_chatbot_price(
             }
         }
     except Exception as e:
-        print(f"[CHATBOT API] Error calculating price: {e}")
+        logger.error(f"[CHATBOT API] Error calculating price: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Normalized sport name mapping for chatbot search
-SPORT_SYNONYMS = {
-    # Swimming
-    "pool": "Swimming", "swimming pool": "Swimming", "aqua": "Swimming", "swimmer": "Swimming",
-    # Football
-    "football": "FootBall", "football turf": "FootBall", "soccer": "FootBall", "footy": "FootBall", "futsal": "FootBall",
-    # Cricket
-    "cricket turf": "Cricket", "cricket ground": "Cricket", "batting": "Cricket",
-    "nets": "Nets", "cricket nets": "Nets", "practice nets": "Nets",
-    # Badminton
-    "badminton court": "Badminton", "shuttle": "Badminton", "baddie": "Badminton", "racket": "Badminton",
-    # Tennis
-    "table tennis": "Table tennis", "tt": "Table tennis", "ping pong": "Table tennis",
-    "tennis": "Tennis", "lawn tennis": "Tennis",
-    # Others
-    "padel": "Padel", "padel tennis": "Padel",
-    "skating": "Skating", "roller skating": "Skating", "skate park": "Skating",
-    "squash": "Squash", "wooden squash": "Squash",
-    "basketball": "Basketball", "hoops": "Basketball", "b-ball": "Basketball",
-    "volleyball": "Volleyball", "voley": "Volleyball",
-    "throwball": "Throwball",
-    "frisbee": "Frisbee", "ultimate frisbee": "Frisbee",
-    "pickleball": "Pickleball", "pickle": "Pickleball"
-}
-
-def normalize_sport_name(sport: str) -> str:
-    """Map common user terms to official game_type names"""
-    if not sport: return sport
-    s = sport.lower().strip()
-    return SPORT_SYNONYMS.get(s, sport)
-
 @router.get("/search/venues")
-async def search_venues_smart(
+def search_venues_smart(
     city: Optional[str] = None,
     sport: Optional[str] = None,
     area: Optional[str] = None,
@@ -560,14 +534,18 @@ async def search_venues_smart(
 ):
     """
     Smart venue search with multiple filters.
-    Uses fuzzy matching (LIKE) for broad results.
+    Uses trigram matching (services/search.py) for typo-tolerant, ranked results.
     """
     try:
-        # Normalize inputs
-        sport = normalize_sport_name(sport)
-        
         conditions = ["b.is_active = true"]
         params = {}
+        ranks = []
+
+        def match(document, param, term):
+            clause, match_params = match_clause(db, document, param, term, whole_words=True)
+            conditions.append(clause)
+            params.update(match_params)
+            ranks.append(rank_expression(db, document, param))
         
         if city and not isinstance(city, str):
             city = None
@@ -576,27 +554,18 @@ async def search_venues_smart(
             # Clean common particles that Gemini might accidentally pass
             city_str = str(city)
             city_clean = city_str.lower().replace("the ", "").replace("in ", "").replace("city", "").strip()
-            # FALLBACK: Check official City name AND Branch name (in case city_id is None)
-            conditions.append("(c.name ILIKE :city OR b.name ILIKE :city)")
-            params['city'] = f"%{city_clean}%"
+            # place_terms covers the city, area, branch name and address
+            match("vs.place_terms", "city", city_clean)
         
         if area:
-            conditions.append("a.name ILIKE :area")
-            params['area'] = f"%{area}%"
+            match("vs.place_terms", "area", area)
         
         if sport and not isinstance(sport, str):
             sport = None
             
         if sport:
-            sport = normalize_sport_name(sport)
-            conditions.append("""
-                EXISTS (
-                    SELECT 1 FROM admin_branch_game_types bgt_f
-                    JOIN admin_game_types gt_f ON gt_f.id = bgt_f.game_type_id
-                    WHERE bgt_f.branch_id = b.id AND gt_f.name ILIKE :sport AND gt_f.is_active = true
-                )
-            """)
-            params['sport'] = f"%{sport}%"
+            # Synonyms ("soccer", "shuttle") are part of sport_terms already
+            match("vs.sport_terms", "sport", sport)
             
         if amenity:
             conditions.append("""
@@ -608,6 +577,10 @@ async def search_venues_smart(
             """)
             params['amenity'] = f"%{amenity}%"
 
+        if price_max:
+            conditions.append("(vs.min_court_price IS NULL OR vs.min_court_price <= :price_max)")
+            params['price_max'] = price_max
+
         query_str = f"""
             SELECT 
                 b.id,
@@ -619,19 +592,20 @@ async def search_venues_smart(
                 b.max_players,
                 COALESCE(c.name, 'Unknown City') as city_name,
                 COALESCE(a.name, 'Unknown Area') as area_name,
-                (SELECT json_agg(gt.name) FROM admin_branch_game_types bgt JOIN admin_game_types gt ON gt.id = bgt.game_type_id WHERE bgt.branch_id = b.id) as game_types,
-                (SELECT json_agg(am.name) FROM admin_branch_amenities ba JOIN admin_amenities am ON am.id = ba.amenity_id WHERE ba.branch_id = b.id) as amenities,
-                (SELECT MIN(price_per_hour) FROM admin_courts WHERE branch_id = b.id AND is_active = true) as min_price,
-                (SELECT MAX(price_per_hour) FROM admin_courts WHERE branch_id = b.id AND is_active = true) as max_price
+                vs.game_types,
+                vs.amenities,
+                vs.min_court_price as min_price,
+                vs.max_court_price as max_price
             FROM admin_branches b
             LEFT JOIN admin_cities c ON c.id = b.city_id
             LEFT JOIN admin_areas a ON a.id = b.area_id
+            LEFT JOIN venue_summary vs ON vs.branch_id = b.id
             WHERE {' AND '.join(conditions)}
-            ORDER BY b.name
+            ORDER BY {' + '.join(ranks) or '0'} DESC, b.name
         """
         
-        print(f"[CHATBOT SQL] Query: {query_str}")
-        print(f"[CHATBOT SQL] Params: {params}")
+        logger.debug("[CHATBOT SQL] Query: %s", query_str)
+        logger.debug("[CHATBOT SQL] Params: %s", params)
         
         result = db.execute(text(query_str), params).fetchall()
         venues = []
@@ -647,10 +621,6 @@ async def search_venues_smart(
             min_price = float(row.min_price) if row.min_price is not None else None
             max_price = float(row.max_price) if row.max_price is not None else None
             
-            # Apply price filter if specified
-            if price_max and min_price is not None and min_price > price_max:
-                continue
-            
             # Safe JSON parsing for fields
             try:
                 game_types = row.game_types if isinstance(row.game_types, list) else json.loads(row.game_types) if row.game_types else []
@@ -688,11 +658,11 @@ async def search_venues_smart(
             "data": venues
         }
     except Exception as e:
-        print(f"[CHATBOT API] Error searching venues: {e}")
+        logger.error(f"[CHATBOT API] Error searching venues: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/booking/{display_id}")
-async def get_booking_details(display_id: str, db: Session = Depends(get_db)):
+def get_booking_details(display_id: str, db: Session = Depends(get_db)):
     """
     Look up booking details and venue location by booking display ID.
     Used by chatbot to help users find their court location.
@@ -749,47 +719,10 @@ async def get_booking_details(display_id: str, db: Session = Depends(get_db)):
             "data": booking_info
         }
     except Exception as e:
-        print(f"[CHATBOT API] Error looking up booking: {e}")
+        logger.error(f"[CHATBOT API] Error looking up booking: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/knowledge/faqs")
 async def get_faqs():
     """Get common FAQs for chatbot context"""
-    faqs = [
-        {
-            "category": "Booking",
-            "question": "How do I book a court?",
-            "answer": "You can book a court by selecting your city, sport, and venue, then choosing a date and time slot. Payment is required to confirm the booking."
-        },
-        {
-            "category": "Cancellation",
-            "question": "What is the cancellation policy?",
-            "answer": "Free cancellation if done 24+ hours before the slot. 50% refund for cancellations between 12-24 hours. No refund for cancellations within 12 hours."
-        },
-        {
-            "category": "Payment",
-            "question": "What payment methods are accepted?",
-            "answer": "We accept UPI, Credit/Debit Cards, Net Banking, and Wallets."
-        },
-        {
-            "category": "Amenities",
-            "question": "Do you provide equipment?",
-            "answer": "Most venues offer equipment rental (rackets, balls, bibs) for a small fee. Check individual venue details."
-        },
-        {
-            "category": "Membership",
-            "question": "Are there membership plans?",
-            "answer": "Currently, we operate on a pay-per-play basis. Membership plans are coming soon!"
-        },
-        {
-            "category": "Support",
-            "question": "How do I contact support?",
-            "answer": "You can email us at support@myrush.in or call +91 9876543210 (9 AM - 9 PM)."
-        },
-        {
-            "category": "Rain Policy",
-            "question": "What if it rains during my outdoor booking?",
-            "answer": "For outdoor sports, if rain disrupts play, we offer a credit refund or rescheduling options. Please contact the venue manager immediately."
-        }
-    ]
-    return {"success": True, "data": faqs}
+    return {"success": True, "data": CHATBOT_FAQS}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Form, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 from datetime import datetime, date
@@ -12,6 +13,10 @@ import models
 import database
 import schemas_district
 from services.integrations.district_adapter import DistrictAdapter
+from services.integrations import write_behind
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/api",
@@ -61,7 +66,7 @@ def verify_district_auth(id: str, apiKey: str, db: Session) -> models.Partner:
 # ============================================================================
 
 @router.get("/checkAvailability/")
-async def check_availability(
+def check_availability(
     request: Request,
     id: str = Query(...),
     apiKey: str = Query(...),
@@ -73,46 +78,51 @@ async def check_availability(
     """
     Slot Availability API for District.
     """
+    partner = None
+    request_payload = {
+        "facilityName": facilityName,
+        "sportName": sportName,
+        "date": date
+    }
     try:
         partner = verify_district_auth(id, apiKey, db)
         adapter = DistrictAdapter(db, partner_id=str(partner.id))
         
-        # Log inbound request
-        log_entry = models.IntegrationLog(
-            partner_id=partner.id,
-            direction="INBOUND",
-            endpoint="/api/checkAvailability/",
-            method="GET",
-            request_payload={
-                "facilityName": facilityName,
-                "sportName": sportName,
-                "date": date
-            }
-        )
-        db.add(log_entry)
-        db.commit()
-        
         response_data = adapter.check_availability(
             facility_name=facilityName,
             sport_name=sportName,
             booking_date_str=date
         )
         
-        log_entry.response_status = 200
-        log_entry.response_payload = response_data
-        db.commit()
+        # Inbound log is buffered and written in bulk (see write_behind.py)
+        write_behind.record_integration_log(
+            partner.id, "INBOUND", "/api/checkAvailability/", "GET",
+            request_payload=request_payload, response_status=200, response_payload=response_data
+        )
         
         return response_data
         
     except ValueError as ve:
+        if partner is not None:
+            write_behind.record_integration_log(
+                partner.id, "INBOUND", "/api/checkAvailability/", "GET",
+                request_payload=request_payload, response_status=400, error_message=str(ve)
+            )
         raise HTTPException(status_code=400, detail=str(ve))
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"District Availability Error: {e}", exc_info=True)
+        if partner is not None:
+            write_behind.record_integration_log(
+                partner.id, "INBOUND", "/api/checkAvailability/", "GET",
+                request_payload=request_payload, response_status=500, error_message=str(e)
+            )
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.post("/makeBatchBooking")
-async def make_batch_booking(
+def make_batch_booking(
     payload: schemas_district.DistrictBatchBookingRequest,
     db: Session = Depends(database.get_db)
 ):
@@ -176,14 +186,13 @@ async def make_batch_booking(
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
-        print(f"\n[CRITICAL ERROR] District Batch Booking Failure: {type(e).__name__}: {str(e)}")
+        logger.error(f"[CRITICAL ERROR] District Batch Booking Failure: {type(e).__name__}: {str(e)}", exc_info=True)
         import traceback
-        traceback.print_exc()
         logging.error(f"District Batch Booking Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/cancelBooking/")
-async def cancel_booking(
+def cancel_booking(
     id: str = Form(...),
     apiKey: str = Form(...),
     facilityName: str = Form(...),
@@ -228,7 +237,7 @@ async def cancel_booking(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/booking/{bookingId}")
-async def get_booking_status(
+def get_booking_status(
     bookingId: str,
     id: str = Query(...),
     apiKey: str = Query(...),
@@ -249,7 +258,7 @@ async def get_booking_status(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/bookings")
-async def get_booking_history(
+def get_booking_history(
     facilityName: str = Query(...),
     date: str = Query(..., description="DD-MM-YYYY"),
     id: str = Query(...),
@@ -271,7 +280,7 @@ async def get_booking_history(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/facilities")
-async def discovery_api(
+def discovery_api(
     id: str = Query(...),
     apiKey: str = Query(...),
     db: Session = Depends(database.get_db)
@@ -293,6 +302,73 @@ async def discovery_api(
 # INBOUND CALLBACK (Sync from District to MyRush)
 # ============================================================================
 
+def _partner_for_callback_key(db: Session, x_api_key: str) -> Optional[models.Partner]:
+    import hashlib
+    incoming_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
+    
+    return db.query(models.Partner).filter(
+        models.Partner.api_key_hash.in_([x_api_key, incoming_hash]),
+        models.Partner.is_active == True
+    ).first()
+
+
+def _apply_inventory_callback(db: Session, data: dict) -> dict:
+    """Applies one District inventory update (runs in the threadpool)."""
+    court_id = data.get("court_id")
+    block_date = data.get("date")
+    slot_start = data.get("slot_start")
+    is_available = data.get("available", True)
+
+    if not all([court_id, block_date, slot_start is not None]):
+        raise HTTPException(status_code=422, detail="Missing required fields")
+
+    hh = int(slot_start)
+    mm = int((slot_start % 1) * 60)
+    start_t = time(hh, mm)
+    
+    end_dt = datetime.combine(date.today(), start_t) + timedelta(minutes=30)
+    end_t = end_dt.time()
+
+    if is_available:
+        # Release Block: Delete local manual block that matches this exact slot
+        db.query(models.CourtBlock).filter(
+            models.CourtBlock.court_id == court_id,
+            models.CourtBlock.block_date == block_date,
+            models.CourtBlock.start_time == start_t,
+            models.CourtBlock.reason == "District Partner Sync"
+        ).delete()
+        logging.info(f"Released District-side block for court {court_id} at {start_t}")
+    else:
+        # Add Block: Create new local manual block IF no conflict exists
+        from utils.conflicts import check_court_availability_conflict
+        conflict = check_court_availability_conflict(
+            db=db,
+            court_id=UUID(str(court_id)),
+            block_date=datetime.strptime(block_date, "%Y-%m-%d").date() if isinstance(block_date, str) else block_date,
+            start_time=start_t,
+            end_time=end_t,
+            slice_mask=0 # District blocks usually apply to the whole allocated unit
+        )
+        
+        if conflict:
+            logging.warning(f"[DISTRICT CALLBACK] Conflict detected, skipping block: {conflict}")
+            return {"status": "ignored", "message": f"Conflict: {conflict}"}
+
+        new_block = models.CourtBlock(
+            court_id=court_id,
+            block_date=block_date,
+            start_time=start_t,
+            end_time=end_t,
+            reason="District Partner Sync",
+            synced_partners=["district"]
+        )
+        db.add(new_block)
+        logging.info(f"Added District-side block for court {court_id} at {start_t}")
+
+    db.commit()
+    return {"status": "success", "message": "Inventory synchronized"}
+
+
 @router.post("/district/callback")
 async def district_inventory_callback(
     request: Request,
@@ -308,18 +384,13 @@ async def district_inventory_callback(
       "slot_start": 10.5,
       "available": false
     }
+    Async only to read the raw body; database work runs in the threadpool.
     """
     x_api_key = request.headers.get("X-API-Key")
     if not x_api_key:
         raise HTTPException(status_code=401, detail="Missing API Key")
     
-    import hashlib
-    incoming_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
-    
-    partner = db.query(models.Partner).filter(
-        models.Partner.api_key_hash.in_([x_api_key, incoming_hash]),
-        models.Partner.is_active == True
-    ).first()
+    partner = await run_in_threadpool(_partner_for_callback_key, db, x_api_key)
     
     if not partner:
         raise HTTPException(status_code=403, detail="Invalid API Key")
@@ -327,64 +398,10 @@ async def district_inventory_callback(
     try:
         data = await request.json()
         logging.info(f"[DISTRICT CALLBACK] Received: {data}")
-        
-        court_id = data.get("court_id")
-        block_date = data.get("date")
-        slot_start = data.get("slot_start")
-        is_available = data.get("available", True)
-
-        if not all([court_id, block_date, slot_start is not None]):
-            raise HTTPException(status_code=422, detail="Missing required fields")
-
-        hh = int(slot_start)
-        mm = int((slot_start % 1) * 60)
-        start_t = time(hh, mm)
-        
-        end_dt = datetime.combine(date.today(), start_t) + timedelta(minutes=30)
-        end_t = end_dt.time()
-
-        if is_available:
-            # Release Block: Delete local manual block that matches this exact slot
-            db.query(models.CourtBlock).filter(
-                models.CourtBlock.court_id == court_id,
-                models.CourtBlock.block_date == block_date,
-                models.CourtBlock.start_time == start_t,
-                models.CourtBlock.reason == "District Partner Sync"
-            ).delete()
-            logging.info(f"Released District-side block for court {court_id} at {start_t}")
-        else:
-            # Add Block: Create new local manual block IF no conflict exists
-            from utils.conflicts import check_court_availability_conflict
-            conflict = check_court_availability_conflict(
-                db=db,
-                court_id=UUID(str(court_id)),
-                block_date=datetime.strptime(block_date, "%Y-%m-%d").date() if isinstance(block_date, str) else block_date,
-                start_time=start_t,
-                end_time=end_t,
-                slice_mask=0 # District blocks usually apply to the whole allocated unit
-            )
-            
-            if conflict:
-                logging.warning(f"[DISTRICT CALLBACK] Conflict detected, skipping block: {conflict}")
-                return {"status": "ignored", "message": f"Conflict: {conflict}"}
-
-            new_block = models.CourtBlock(
-                court_id=court_id,
-                block_date=block_date,
-                start_time=start_t,
-                end_time=end_t,
-                reason="District Partner Sync",
-                synced_partners=["district"]
-            )
-            db.add(new_block)
-            logging.info(f"Added District-side block for court {court_id} at {start_t}")
-
-        db.commit()
-        return {"status": "success", "message": "Inventory synchronized"}
+        return await run_in_threadpool(_apply_inventory_callback, db, data)
 
     except Exception as e:
-        print(f"\n[CRITICAL ERROR] District Callback Failure: {type(e).__name__}: {str(e)}")
+        logger.error(f"[CRITICAL ERROR] District Callback Failure: {type(e).__name__}: {str(e)}", exc_info=True)
         import traceback
-        traceback.print_exc()
         logging.error(f"Error processing District callback: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,6 +4,9 @@ import boto3
 from botocore.exceptions import ClientError
 from utils.s3_utils import get_s3_client, S3_BUCKET_NAME
 import mimetypes
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     tags=["Media Proxy"]
@@ -48,8 +51,8 @@ async def get_media(file_path: str):
         if error_code == "NoSuchKey":
             raise HTTPException(status_code=404, detail="File not found")
         else:
-            print(f"S3 Error: {e}")
+            logger.error(f"S3 Error: {e}")
             raise HTTPException(status_code=500, detail="Error fetching file from S3")
     except Exception as e:
-        print(f"Error proxying media: {e}")
+        logger.error(f"Error proxying media: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -11,6 +11,9 @@ router = APIRouter(
 )
 
 from firebase_admin import messaging
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def send_fcm_notification(device_token: str, title: str, body: str, data: dict = None):
     """Send FCM notification to a single device using V1 API"""
@@ -33,10 +36,10 @@ def send_fcm_notification(device_token: str, title: str, body: str, data: dict =
         # Send a message to the device corresponding to the provided registration token.
         response = messaging.send(message)
         # Response is a message ID string.
-        print(f'[FIREBASE] Successfully sent message: {response}')
+        logger.info(f'[FIREBASE] Successfully sent message: {response}')
         return {"success": 1, "message_id": response}
     except Exception as e:
-        print(f"[FIREBASE ERROR] Failed to send notification: {e}")
+        logger.error(f"[FIREBASE ERROR] Failed to send notification: {e}")
         return {"success": 0, "error": str(e)}
 
 # ============================================================================
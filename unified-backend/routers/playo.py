@@ -5,7 +5,7 @@ Provides endpoints for Playo platform to integrate with MyRush venues
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, time as dt_time, date
 from uuid import UUID, uuid4
 from decimal import Decimal
@@ -13,6 +13,10 @@ import schemas, models, database, dependencies, crud
 from date_utils import parse_date_safe, parse_time_safe
 import logging
 
+from services.free_slots import mark_stale_with_groups
+from services.integrations.playo_availability import PlayoAvailability
+from utils.availability_engine import load_global_price_rules
+
 router = APIRouter(
     prefix="/playo",
     tags=["Playo Integration"],
@@ -28,84 +32,97 @@ def get_court_availability_slots(
     booking_date: date
 ) -> List[dict]:
     """Get available time slots (30-min granularity) for a court on a specific date"""
-    from utils.booking_utils import get_booked_slots, generate_allowed_slots_map
-    
-    # Get court details
     court = db.query(models.Court).filter(models.Court.id == court_id).first()
     if not court:
         return []
-    
-    # Get existing bookings for this court on this date
-    bookings = db.query(models.Booking).filter(
-        models.Booking.court_id == court_id,
-        models.Booking.booking_date == booking_date,
-        models.Booking.status.in_(['confirmed', 'pending'])
-    ).all()
-    
-    booked_slots = get_booked_slots(bookings)
-    
-    # Get pending Playo orders (excluding expired)
-    pending_orders = db.query(models.PlayoOrder).filter(
-        models.PlayoOrder.court_id == court_id,
-        models.PlayoOrder.booking_date == booking_date,
-        models.PlayoOrder.status == 'pending',
-        models.PlayoOrder.expires_at > datetime.utcnow()
-    ).all()
-    
-    for order in pending_orders:
-        s_f = order.start_time.hour + (order.start_time.minute / 60.0)
-        e_f = order.end_time.hour + (order.end_time.minute / 60.0)
-        if e_f == 0: e_f = 24.0
-        curr = s_f
-        while curr < e_f:
-            booked_slots.add(curr % 24)
-            curr += 0.5
-
-    # New: Fetch manual admin blocks
-    manual_blocks = db.query(models.CourtBlock).filter(
-        models.CourtBlock.court_id == court_id,
-        models.CourtBlock.block_date == booking_date
-    ).all()
-    
-    for mb in manual_blocks:
-        s_f = mb.start_time.hour + (mb.start_time.minute / 60.0)
-        e_f = mb.end_time.hour + (mb.end_time.minute / 60.0)
-        if e_f == 0: e_f = 24.0
-        curr = s_f
-        while curr < e_f:
-            booked_slots.add(curr)
-            curr += 0.5
-            
-    # Get allowed slots from configuration
-    allowed_map = generate_allowed_slots_map(db, court.id, booking_date)
-    
-    slots = []
-    # Generate 30-min slots (6 AM to 11 PM)
-    import numpy as np
-    for slot_f in np.arange(6.0, 23.0, 0.5):
-        h = int(slot_f); m = int((slot_f % 1)*60)
-        start = dt_time(h, m)
-        
-        eh = int(slot_f + 0.5); em = int(((slot_f + 0.5) % 1)*60)
-        end = dt_time(eh % 24, em)
-        
-        time_key = f"{h:02d}:{m:02d}"
-        is_available = False
-        price = None
-        
-        if time_key in allowed_map and slot_f not in booked_slots:
-            is_available = True
-            price = float(allowed_map[time_key]['price'])
-            
-        slots.append({
-            'startTime': start.strftime('%H:%M:%S'),
-            'endTime': end.strftime('%H:%M:%S'),
-            'available': is_available,
-            'price': price,
-            'ticketsAvailable': 1 if is_available else 0
-        })
-    
-    return slots
+    branch = db.query(models.Branch).filter(models.Branch.id == court.branch_id).first()
+    return PlayoAvailability(db, branch, [court], booking_date).slots(court)
+
+
+def mark_free_slots_stale(db: Session, court_dates: List[tuple]) -> None:
+    """Flags the free-slot bitmaps of the written (court_id, date) pairs, in the caller's transaction"""
+    try:
+        mark_stale_with_groups(db, court_dates)
+    except Exception as e:
+        logging.error(f"Failed to mark free slots stale for {court_dates}: {e}")
+
+
+def validate_playo_items(db: Session, venue_id: UUID, items: list, noun: str) -> Tuple[list, List[str]]:
+    """
+    Validates every order/booking item of one request against a single
+    availability snapshot per date. Accepted items hold their slots, so items
+    of the same request cannot overlap each other.
+
+    Returns ([(item, court_id, booking_date, start_time, end_time)], errors).
+    """
+    parsed = []
+    errors = []
+    for item in items:
+        try:
+            court_id = UUID(item.courtId)
+        except Exception as e:
+            errors.append(f"Validation error for {noun} {item.playoOrderId}: {str(e)}")
+            continue
+
+        # Validate date format (YYYY-MM-DD)
+        try:
+            booking_date = datetime.strptime(item.date, '%Y-%m-%d').date()
+        except ValueError:
+            errors.append(f"Invalid date format for {noun} {item.playoOrderId}")
+            continue
+
+        # Validate time formats (HH:MM:SS)
+        try:
+            start_time = datetime.strptime(item.startTime, '%H:%M:%S').time()
+            end_time = datetime.strptime(item.endTime, '%H:%M:%S').time()
+        except ValueError:
+            errors.append(f"Invalid time format for {noun} {item.playoOrderId}")
+            continue
+
+        # Validate price and paidAtPlayo are positive numbers
+        if item.price <= 0 or item.paidAtPlayo < 0:
+            errors.append(f"Invalid price values for {noun} {item.playoOrderId}")
+            continue
+
+        parsed.append((item, court_id, booking_date, start_time, end_time))
+
+    if not parsed:
+        return [], errors
+
+    # Venue and courts are loaded once for the whole request
+    venue = db.query(models.Branch).filter(models.Branch.id == venue_id).first()
+    if not venue:
+        return [], errors + [f"Venue {venue_id} not found"]
+    courts = {
+        c.id: c for c in db.query(models.Court).filter(
+            models.Court.id.in_({court_id for _, court_id, _, _, _ in parsed}),
+            models.Court.branch_id == venue_id
+        ).all()
+    }
+
+    global_rules = load_global_price_rules(db)
+    snapshots = {}
+    for booking_date in {booking_date for _, _, booking_date, _, _ in parsed}:
+        date_courts = {courts[cid] for _, cid, d, _, _ in parsed if d == booking_date and cid in courts}
+        snapshots[booking_date] = PlayoAvailability(db, venue, date_courts, booking_date, global_rules)
+
+    validated = []
+    for item, court_id, booking_date, start_time, end_time in parsed:
+        court = courts.get(court_id)
+        if not court:
+            errors.append(f"Court {item.courtId} not found or doesn't belong to venue")
+            continue
+
+        # Every 30-min interval in the requested block must be free
+        availability = snapshots[booking_date]
+        if not availability.is_free(court, start_time, end_time):
+            errors.append(f"Slot {item.startTime}-{item.endTime} is not available for court {item.courtId}")
+            continue
+        availability.hold(court, start_time, end_time)
+        validated.append((item, court_id, booking_date, start_time, end_time))
+
+    return validated, errors
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -156,7 +173,7 @@ def get_or_create_playo_user(
 # ============================================================================
 
 @router.get("/availability", response_model=schemas.PlayoAvailabilityResponse)
-async def fetch_availability(
+def fetch_availability(
     venue_id: str = Query(..., alias="venueId"),
     sport_id: str = Query(..., alias="sportId"),
     date: str = Query(...),  # YYYY-MM-DD
@@ -185,22 +202,23 @@ async def fetch_availability(
             models.GameType.id == UUID(sport_id),
             models.Court.is_active == True
         ).all()
-        
+
+        # One snapshot and one pass for every court of the venue and sport
         court_availability = []
-        for court in courts:
-            slots = get_court_availability_slots(
-                db=db,
-                court_id=court.id,
-                booking_date=booking_date
-            )
+        if courts:
+            branch = db.query(models.Branch).filter(models.Branch.id == UUID(venue_id)).first()
+            availability = PlayoAvailability(db, branch, courts, booking_date)
 
             # Include all courts with all their slots (both available and unavailable)
-            court_availability.append(schemas.PlayoCourt(
-                courtId=str(court.id),
-                courtName=court.name,
-                slots=[schemas.PlayoSlot(**slot) for slot in slots]
-            ))
-        
+            court_availability = [
+                schemas.PlayoCourt(
+                    courtId=str(court.id),
+                    courtName=court.name,
+                    slots=[schemas.PlayoSlot(**slot) for slot in availability.slots(court)]
+                )
+                for court in courts
+            ]
+
         # Return response with proper structure
         return schemas.PlayoAvailabilityResponse(
             courts=court_availability,
@@ -213,7 +231,7 @@ async def fetch_availability(
 
 
 @router.post("/orders", response_model=schemas.PlayoOrderCreateResponse)
-async def create_order(
+def create_order(
     request: schemas.PlayoOrderCreateRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_api_key)
@@ -247,89 +265,19 @@ async def create_order(
             )
 
         # Validate all orders first (transactional approach)
-        validated_orders = []
-        validation_errors = []
-
-        for item in request.orders:
-            try:
-                # Validate courtId is a valid UUID
-                court_id = UUID(item.courtId)
-
-                # Validate date format (YYYY-MM-DD)
-                try:
-                    booking_date = datetime.strptime(item.date, '%Y-%m-%d').date()
-                except ValueError:
-                    validation_errors.append(f"Invalid date format for order {item.playoOrderId}")
-                    continue
-
-                # Validate time formats (HH:MM:SS)
-                try:
-                    start_time = datetime.strptime(item.startTime, '%H:%M:%S').time()
-                    end_time = datetime.strptime(item.endTime, '%H:%M:%S').time()
-                except ValueError:
-                    validation_errors.append(f"Invalid time format for order {item.playoOrderId}")
-                    continue
-
-                # Validate price and paidAtPlayo are positive numbers
-                if item.price <= 0 or item.paidAtPlayo < 0:
-                    validation_errors.append(f"Invalid price values for order {item.playoOrderId}")
-                    continue
-
-                # Verify venue exists
-                venue = db.query(models.Branch).filter(models.Branch.id == venue_id).first()
-                if not venue:
-                    validation_errors.append(f"Venue {request.venueId} not found")
-                    continue
-
-                # Verify court exists and belongs to venue
-                court = db.query(models.Court).filter(
-                    models.Court.id == court_id,
-                    models.Court.branch_id == venue_id
-                ).first()
-                if not court:
-                    validation_errors.append(f"Court {item.courtId} not found or doesn't belong to venue")
-                    continue
-
-                # Verify slot is still available (block can span multiple 30-min slots)
-                slots = get_court_availability_slots(db, court_id, booking_date)
-                
-                req_start_f = start_time.hour + (start_time.minute / 60.0)
-                req_end_f = end_time.hour + (end_time.minute / 60.0)
-                if req_end_f == 0: req_end_f = 24.0
-                
-                # Check every 30-min interval in the requested block
-                available_slots_map = {
-                    datetime.strptime(s['startTime'], '%H:%M:%S').time().hour + 
-                    datetime.strptime(s['startTime'], '%H:%M:%S').time().minute / 60.0: s['available']
-                    for s in slots
-                }
-                
-                slot_available = True
-                curr = req_start_f
-                while curr < req_end_f:
-                    if curr not in available_slots_map or not available_slots_map[curr]:
-                        slot_available = False
-                        break
-                    curr += 0.5
-
-                if not slot_available:
-                    validation_errors.append(f"Slot {item.startTime}-{item.endTime} is not available for court {item.courtId}")
-                    continue
-
-                # If all validations pass, add to validated orders
-                validated_orders.append({
-                    'court_id': court_id,
-                    'booking_date': booking_date,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'price': item.price,
-                    'paidAtPlayo': item.paidAtPlayo,
-                    'playoOrderId': item.playoOrderId
-                })
-
-            except Exception as e:
-                validation_errors.append(f"Validation error for order {item.playoOrderId}: {str(e)}")
-                continue
+        validated, validation_errors = validate_playo_items(db, venue_id, request.orders, "order")
+        validated_orders = [
+            {
+                'court_id': court_id,
+                'booking_date': booking_date,
+                'start_time': start_time,
+                'end_time': end_time,
+                'price': item.price,
+                'paidAtPlayo': item.paidAtPlayo,
+                'playoOrderId': item.playoOrderId
+            }
+            for item, court_id, booking_date, start_time, end_time in validated
+        ]
 
         # If any validation errors, return failure (Playo rule: all or nothing)
         if validation_errors:
@@ -389,6 +337,7 @@ async def create_order(
                 'playoOrderId': order_data['playoOrderId']
             })
 
+        mark_free_slots_stale(db, [(o['court_id'], o['booking_date']) for o in validated_orders])
         db.commit()
         logging.info(f"Playo orders created successfully: {created_orders}")
         return schemas.PlayoOrderCreateResponse(
@@ -420,7 +369,7 @@ async def create_order(
 
 
 @router.post("/orders/confirm", response_model=schemas.PlayoOrderConfirmResponse)
-async def confirm_order(
+def confirm_order(
     request: schemas.PlayoOrderConfirmRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_token)
@@ -437,6 +386,7 @@ async def confirm_order(
     
     try:
         confirmed_bookings = []
+        written = []
         
         for order_id in request.orderIds:
             order = db.query(models.PlayoOrder).filter(
@@ -497,7 +447,9 @@ async def confirm_order(
                 'externalBookingId': str(booking.id),
                 'playoOrderId': order.playo_order_id
             })
+            written.append((order.court_id, order.booking_date))
         
+        mark_free_slots_stale(db, written)
         db.commit()
         
         return schemas.PlayoOrderConfirmResponse(
@@ -516,7 +468,7 @@ async def confirm_order(
 
 
 @router.post("/orders/cancel", response_model=schemas.PlayoOrderCancelResponse)
-async def cancel_order(
+def cancel_order(
     request: schemas.PlayoOrderCancelRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_token)
@@ -532,6 +484,7 @@ async def cancel_order(
     """
     
     try:
+        released = []
         for order_id in request.orderIds:
             order = db.query(models.PlayoOrder).filter(
                 models.PlayoOrder.id == UUID(order_id)
@@ -539,7 +492,9 @@ async def cancel_order(
             
             if order:
                 order.status = 'cancelled'
+                released.append((order.court_id, order.booking_date))
         
+        mark_free_slots_stale(db, released)
         db.commit()
         
         return schemas.PlayoOrderCancelResponse(
@@ -556,7 +511,7 @@ async def cancel_order(
 
 
 @router.post("/bookings/cancel", response_model=schemas.PlayoBookingCancelResponse)
-async def cancel_booking(
+def cancel_booking(
     request: schemas.PlayoBookingCancelRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_token)
@@ -572,6 +527,7 @@ async def cancel_booking(
     """
     
     try:
+        released = []
         for item in request.bookingIds:
             booking = db.query(models.Booking).filter(
                 models.Booking.id == UUID(item.externalBookingId)
@@ -579,8 +535,10 @@ async def cancel_booking(
             
             if booking:
                 booking.status = 'cancelled'
+                released.append((booking.court_id, booking.booking_date))
                 logging.info(f"Booking {item.externalBookingId} cancelled via Playo. Refund amount: {item.refundAtPlayo}")
         
+        mark_free_slots_stale(db, released)
         db.commit()
         
         return schemas.PlayoBookingCancelResponse(
@@ -597,7 +555,7 @@ async def cancel_booking(
 
 
 @router.post("/bookings/map", response_model=schemas.PlayoBookingMapResponse)
-async def map_bookings(
+def map_bookings(
     request: schemas.PlayoBookingMapRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_token)
@@ -637,7 +595,7 @@ async def map_bookings(
 
 
 @router.post("/booking/create", response_model=schemas.PlayoBookingCreateResponse)
-async def create_booking(
+def create_booking(
     request: schemas.PlayoBookingCreateRequest,
     db: Session = Depends(database.get_db),
     api_key: models.PlayoAPIKey = Depends(dependencies.verify_playo_api_key)
@@ -670,90 +628,20 @@ async def create_booking(
             )
 
         # Validate all bookings first (transactional approach)
-        validated_bookings = []
-        validation_errors = []
-
-        for item in request.bookings:
-            try:
-                # Validate courtId is a valid UUID
-                court_id = UUID(item.courtId)
-
-                # Validate date format (YYYY-MM-DD)
-                try:
-                    booking_date = datetime.strptime(item.date, '%Y-%m-%d').date()
-                except ValueError:
-                    validation_errors.append(f"Invalid date format for booking {item.playoOrderId}")
-                    continue
-
-                # Validate time formats (HH:MM:SS)
-                try:
-                    start_time = datetime.strptime(item.startTime, '%H:%M:%S').time()
-                    end_time = datetime.strptime(item.endTime, '%H:%M:%S').time()
-                except ValueError:
-                    validation_errors.append(f"Invalid time format for booking {item.playoOrderId}")
-                    continue
-
-                # Validate price and paidAtPlayo are positive numbers
-                if item.price <= 0 or item.paidAtPlayo < 0:
-                    validation_errors.append(f"Invalid price values for booking {item.playoOrderId}")
-                    continue
-
-                # Verify venue exists
-                venue = db.query(models.Branch).filter(models.Branch.id == venue_id).first()
-                if not venue:
-                    validation_errors.append(f"Venue {request.venueId} not found")
-                    continue
-
-                # Verify court exists and belongs to venue
-                court = db.query(models.Court).filter(
-                    models.Court.id == court_id,
-                    models.Court.branch_id == venue_id
-                ).first()
-                if not court:
-                    validation_errors.append(f"Court {item.courtId} not found or doesn't belong to venue")
-                    continue
-
-                # Verify slot is still available (block can span multiple 30-min slots)
-                slots = get_court_availability_slots(db, court_id, booking_date)
-                
-                req_start_f = start_time.hour + (start_time.minute / 60.0)
-                req_end_f = end_time.hour + (end_time.minute / 60.0)
-                if req_end_f == 0: req_end_f = 24.0
-                
-                # Check every 30-min interval in the requested block
-                available_slots_map = {
-                    datetime.strptime(s['startTime'], '%H:%M:%S').time().hour + 
-                    datetime.strptime(s['startTime'], '%H:%M:%S').time().minute / 60.0: s['available']
-                    for s in slots
-                }
-                
-                slot_available = True
-                curr = req_start_f
-                while curr < req_end_f:
-                    if curr not in available_slots_map or not available_slots_map[curr]:
-                        slot_available = False
-                        break
-                    curr += 0.5
-
-                if not slot_available:
-                    validation_errors.append(f"Slot {item.startTime}-{item.endTime} is not available for court {item.courtId}")
-                    continue
-
-                # If all validations pass, add to validated bookings
-                validated_bookings.append({
-                    'court_id': court_id,
-                    'booking_date': booking_date,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'price': item.price,
-                    'paidAtPlayo': item.paidAtPlayo,
-                    'playoOrderId': item.playoOrderId,
-                    'numTickets': item.numTickets
-                })
-
-            except Exception as e:
-                validation_errors.append(f"Validation error for booking {item.playoOrderId}: {str(e)}")
-                continue
+        validated, validation_errors = validate_playo_items(db, venue_id, request.bookings, "booking")
+        validated_bookings = [
+            {
+                'court_id': court_id,
+                'booking_date': booking_date,
+                'start_time': start_time,
+                'end_time': end_time,
+                'price': item.price,
+                'paidAtPlayo': item.paidAtPlayo,
+                'playoOrderId': item.playoOrderId,
+                'numTickets': item.numTickets
+            }
+            for item, court_id, booking_date, start_time, end_time in validated
+        ]
 
         # If any validation errors, return failure (Playo rule: all or nothing)
         if validation_errors:
@@ -839,6 +727,7 @@ async def create_booking(
                 'playoOrderId': booking_data['playoOrderId']
             })
 
+        mark_free_slots_stale(db, [(b['court_id'], b['booking_date']) for b in validated_bookings])
         db.commit()
         logging.info(f"Playo bookings created successfully: {created_bookings}")
         return schemas.PlayoBookingCreateResponse(
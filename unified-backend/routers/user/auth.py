@@ -9,6 +9,9 @@ import os
 from datetime import timedelta, datetime
 import uuid
 import random
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/auth",
@@ -36,7 +39,7 @@ from dependencies import get_current_user
 
 @router.post("/send-otp", response_model=schemas.SendOTPResponse)
 def send_otp(payload: schemas.SendOTPRequest):
-    print(f"[SEND-OTP] Request for {payload.phone_number}", flush=True)
+    logger.info(f"[SEND-OTP] Request for {payload.phone_number}")
     
     # Use dummy OTP for development
     otp_code = "12345"
@@ -45,16 +48,16 @@ def send_otp(payload: schemas.SendOTPRequest):
     # Try to store in database, but don't fail if DB is down
     try:
         db = database.SessionLocal()
-        print(f"[SEND-OTP] Creating OTP record in database...", flush=True)
+        logger.info(f"[SEND-OTP] Creating OTP record in database...")
         otp = crud.create_otp_record(db, payload.phone_number, otp_code, expires_at)
         db.close()
-        print(f"[DEV] OTP for {payload.phone_number}: {otp_code} (id={otp.id})", flush=True)
+        logger.info(f"[DEV] OTP for {payload.phone_number}: {otp_code} (id={otp.id})")
         return {"message": "OTP sent successfully", "success": True, "verification_id": str(otp.id), "otp_code": otp_code}
     except Exception as db_err:
         # Database error - provide response anyway with dev OTP
-        print(f"[SEND-OTP] DB Error: {type(db_err).__name__}: {str(db_err)}", flush=True)
-        print(f"[SEND-OTP] Continuing in dev mode without database...", flush=True)
-        print(f"[DEV] OTP for {payload.phone_number}: {otp_code} (dev mode, no db)", flush=True)
+        logger.error(f"[SEND-OTP] DB Error: {type(db_err).__name__}: {str(db_err)}")
+        logger.info(f"[SEND-OTP] Continuing in dev mode without database...")
+        logger.info(f"[DEV] OTP for {payload.phone_number}: {otp_code} (dev mode, no db)")
         # Return success response even without DB - this allows development to continue
         return {"message": "OTP sent successfully (dev mode - DB unavailable)", "success": True, "verification_id": "dev-mode", "otp_code": otp_code}
 
@@ -67,7 +70,7 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
     fixed OTP "12345" is always accepted, even if the database is down.
     """
     try:
-        print(f"[VERIFY-OTP] Request: phone={payload.phone_number}, otp={payload.otp_code}")
+        logger.info(f"[VERIFY-OTP] Request: phone={payload.phone_number}, otp={payload.otp_code}")
         db = database.SessionLocal()
 
         try:
@@ -93,43 +96,43 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
                 else:
                     otp = crud.verify_otp_record(db, payload.phone_number, payload.otp_code)
             except Exception as db_err:
-                print(f"[VERIFY-OTP] Database error when verifying OTP: {db_err}")
+                logger.error(f"[VERIFY-OTP] Database error when verifying OTP: {db_err}")
                 # In dev mode, still accept the fixed OTP even if DB is down
                 if payload.otp_code == "12345":
-                    print("[VERIFY-OTP] Accepting dev OTP despite DB error")
+                    logger.error("[VERIFY-OTP] Accepting dev OTP despite DB error")
                     otp = True
                 else:
                     raise
 
             if not otp:
-                print("[VERIFY-OTP] Invalid OTP")
+                logger.warning("[VERIFY-OTP] Invalid OTP")
                 raise HTTPException(status_code=400, detail="Invalid or expired OTP")
 
-            print("[VERIFY-OTP] OTP verified, checking for existing user...")
+            logger.debug("[VERIFY-OTP] OTP verified, checking for existing user...")
 
             try:
                 user = crud.get_user_by_phone(db, payload.phone_number)
                 is_new_user = False
             except Exception as db_err:
-                print(f"[VERIFY-OTP] Database error checking user: {db_err}")
+                logger.error(f"[VERIFY-OTP] Database error checking user: {db_err}")
                 user = None
                 is_new_user = True
 
             if user is None:
                 is_new_user = True
 
-            print(f"[VERIFY-OTP] User found: {user is not None}, is_new_user: {is_new_user}")
+            logger.info(f"[VERIFY-OTP] User found: {user is not None}, is_new_user: {is_new_user}")
 
             # If new user and no profile data, create the user record first,
             # generate a token, then ask the frontend to show the profile form.
             has_profile_data = payload.full_name is not None
             if is_new_user and not has_profile_data:
-                print("[VERIFY-OTP] New user needs to complete profile — creating user record first")
+                logger.info("[VERIFY-OTP] New user needs to complete profile — creating user record first")
                 try:
                     user = crud.create_user_with_phone(db, payload.phone_number, None)
-                    print(f"[VERIFY-OTP] New user created: {user.id}")
+                    logger.info(f"[VERIFY-OTP] New user created: {user.id}")
                 except Exception as db_err:
-                    print(f"[VERIFY-OTP] Error creating new user: {db_err}")
+                    logger.error(f"[VERIFY-OTP] Error creating new user: {db_err}")
                     db.close()
                     raise HTTPException(status_code=500, detail=f"Could not create user: {str(db_err)}")
 
@@ -160,20 +163,20 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
                 "playing_style": payload.playing_style,
             }
             profile_payload = {k: v for k, v in profile_payload.items() if v is not None}
-            print(f"[VERIFY-OTP] Profile payload: {profile_payload}")
+            logger.debug(f"[VERIFY-OTP] Profile payload: {profile_payload}")
 
             # Create or update user + profile
             try:
                 if not user:
-                    print("[VERIFY-OTP] Creating new user...")
+                    logger.info("[VERIFY-OTP] Creating new user...")
                     user = crud.create_user_with_phone(
                         db,
                         payload.phone_number,
                         profile_payload if profile_payload else None,
                     )
-                    print(f"[VERIFY-OTP] User created: {user.id}")
+                    logger.info(f"[VERIFY-OTP] User created: {user.id}")
                 else:
-                    print(f"[VERIFY-OTP] Updating existing user: {user.id}")
+                    logger.info(f"[VERIFY-OTP] Updating existing user: {user.id}")
                     if profile_payload:
                         allowed_fields = [
                             "phone_number",
@@ -194,9 +197,8 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
                             db, schemas.ProfileCreate(**profile_create_data), user.id
                         )
             except Exception as db_err:
-                print(f"[VERIFY-OTP] CRITICAL Database error creating/updating user: {db_err}")
+                logger.error(f"[VERIFY-OTP] CRITICAL Database error creating/updating user: {db_err}", exc_info=True)
                 import traceback
-                traceback.print_exc()
                 # Do NOT swallow error. Fail loudly so client knows registration failed.
                 raise HTTPException(
                     status_code=500,
@@ -212,12 +214,10 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
                     detail="Cannot generate auth token: user has no email or id",
                 )
             sub_value = str(raw_sub)
-            print(
-                "[VERIFY-OTP] Generating token. "
+            logger.info("[VERIFY-OTP] Generating token. "
                 f"email={getattr(user, 'email', None)}, "
                 f"id={getattr(user, 'id', None)}, "
-                f"sub={sub_value} (type={type(raw_sub)})",
-            )
+                f"sub={sub_value} (type={type(raw_sub)})")
 
             access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
@@ -225,7 +225,7 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
             )
 
             db.close()
-            print("[VERIFY-OTP] Success! Token generated")
+            logger.info("[VERIFY-OTP] Success! Token generated")
             return {
                 "access_token": access_token,
                 "token_type": "bearer",
@@ -236,18 +236,16 @@ def verify_otp(payload: schemas.VerifyOTPRequest):
             raise
         except Exception as e:
             db.close()
-            print(f"[VERIFY-OTP] ERROR: {e}")
+            logger.error(f"[VERIFY-OTP] ERROR: {e}", exc_info=True)
             import traceback
-            traceback.print_exc()
             raise HTTPException(
                 status_code=500, detail=f"Internal server error: {e}"
             )
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[VERIFY-OTP] OUTER ERROR: {e}")
+        logger.error(f"[VERIFY-OTP] OUTER ERROR: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(
             status_code=500, detail=f"Internal server error: {e}"
         )
@@ -8,6 +8,9 @@ from datetime import datetime
 
 import os
 import razorpay
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/bookings",
@@ -25,20 +28,19 @@ def create_booking(
     db: Session = Depends(database.get_db)
 ):
     try:
-        print("===========================================")
-        print(f"[BOOKINGS API] RECEIVED CREATE BOOKING REQUEST")
-        print(f"[BOOKINGS API] User: {current_user.id}")
+        logger.info(f"[BOOKINGS API] RECEIVED CREATE BOOKING REQUEST")
+        logger.info(f"[BOOKINGS API] User: {current_user.id}")
         
         # Verify Payment if Razorpay details are present
         if booking.razorpay_payment_id:
             try:
-                print(f"[BOOKINGS API] Verifying Razorpay Payment: {booking.razorpay_payment_id}")
+                logger.info(f"[BOOKINGS API] Verifying Razorpay Payment: {booking.razorpay_payment_id}")
                 client.utility.verify_payment_signature({
                     'razorpay_order_id': booking.razorpay_order_id,
                     'razorpay_payment_id': booking.razorpay_payment_id,
                     'razorpay_signature': booking.razorpay_signature
                 })
-                print("[BOOKINGS API] Payment Signature Verified")
+                logger.info("[BOOKINGS API] Payment Signature Verified")
                 
                 # --- FRAUD CHECK: AMOUNT MATCH ---
                 fetch_order = client.order.fetch(booking.razorpay_order_id)
@@ -54,14 +56,14 @@ def create_booking(
                 # If it's a multi-court order, the total Razorpay amount will be the sum of all courts.
                 # Only strictly validate amount exactly if it's a single court order.
                 if num_courts == 1 and fetch_order['amount'] != expected_paise:
-                     print(f"[FRAUD ALERT] Amount mismatch! Razorpay Order was for {fetch_order['amount']} but single booking payload claims {expected_paise}")
+                     logger.warning(f"[FRAUD ALERT] Amount mismatch! Razorpay Order was for {fetch_order['amount']} but single booking payload claims {expected_paise}")
                      raise HTTPException(status_code=400, detail="Amount mismatch. Payment verification failed due to security policies.")
                 # ---------------------------------
                 
                 booking.payment_status = "paid" # Mark as paid
                 
             except razorpay.errors.SignatureVerificationError:
-                print("[BOOKINGS API] Payment Signature Verification Failed")
+                logger.warning("[BOOKINGS API] Payment Signature Verification Failed")
                 background_tasks.add_task(
                     notify_booking_event, 
                     event_type="payment_failed", 
@@ -73,7 +75,7 @@ def create_booking(
             except HTTPException as hexp:
                 raise hexp
             except Exception as e:
-                print(f"[BOOKINGS API] Payment Verification Error: {e}")
+                logger.error(f"[BOOKINGS API] Payment Verification Error: {e}")
                 background_tasks.add_task(
                     notify_booking_event, 
                     event_type="payment_error", 
@@ -83,7 +85,7 @@ def create_booking(
                 
                 raise HTTPException(status_code=400, detail=f"Payment verification error: {str(e)}")
         else:
-             print("[BOOKINGS API] No payment ID provided - assuming legacy/pay-at-venue flow")
+             logger.info("[BOOKINGS API] No payment ID provided - assuming legacy/pay-at-venue flow")
              # Use default pending status
              
         # --- NEW: CHECK FOR EXISTING PENDING BOOKING ---
@@ -96,7 +98,7 @@ def create_booking(
             ).first()
             
         if existing_booking:
-            print(f"[BOOKINGS API] Found existing PENDING booking {existing_booking.id}. Updating to PAID.")
+            logger.info(f"[BOOKINGS API] Found existing PENDING booking {existing_booking.id}. Updating to PAID.")
             # Update the existing record
             existing_booking.payment_status = booking.payment_status or "paid"
             existing_booking.payment_id = booking.razorpay_payment_id
@@ -136,18 +138,15 @@ def create_booking(
             )
         # -----------------------------------------------
         
-        print("[BOOKINGS API] BOOKING PROCESSED SUCCESSFULLY")
+        logger.info("[BOOKINGS API] BOOKING PROCESSED SUCCESSFULLY")
         return result
 
     except HTTPException as he:
         # Re-raise HTTPExceptions as-is to preserve status code and detail
         raise he
     except Exception as e:
-        print("===========================================")
-        print("[BOOKINGS API] CRITICAL ERROR CREATING BOOKING")
+        logger.error("[BOOKINGS API] CRITICAL ERROR CREATING BOOKING", exc_info=True)
         import traceback
-        traceback.print_exc()
-        print("===========================================")
 
         raise HTTPException(
             status_code=400,
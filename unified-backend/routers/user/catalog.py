@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+import orjson
+from database import get_db
+from services.catalog import CATALOG_SECTIONS, build_catalog, catalog_etag, etag_matches
+
+router = APIRouter(
+    prefix="/catalog",
+    tags=["User Catalog"]
+)
+
+@router.get("")
+@router.get("/")
+def get_catalog(
+    request: Request,
+    sections: Optional[str] = None,
+    have: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Startup catalog in one call: cities (with areas), game types, amenities,
+    branches, FAQs, policies, CMS pages, site settings and chatbot knowledge.
+
+    - sections: comma-separated subset of the sections (default all)
+    - have: comma-separated section:token pairs from an earlier response;
+      those sections are left out of "sections" while their token is current
+    - If-None-Match with the ETag of an earlier response answers 304
+    """
+    wanted = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(CATALOG_SECTIONS)
+    unknown = [s for s in wanted if s not in CATALOG_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown catalog sections: {', '.join(unknown)}")
+
+    known = {}
+    for pair in (have or "").split(","):
+        name, _, token = pair.strip().partition(":")
+        if name and token:
+            known[name] = token
+
+    bundle = build_catalog(db, wanted, known)
+    etag = catalog_etag(bundle)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=orjson.dumps(bundle), media_type="application/json", headers=headers)
@@ -8,6 +8,9 @@ from pydantic import BaseModel
 import models
 from dependencies import get_current_user
 from utils.coupon_utils import validate_coupon_strictly
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AvailableCouponResponse(BaseModel):
     code: str
@@ -47,7 +50,7 @@ def validate_coupon(
             message=result["message"]
         )
     except Exception as e:
-        print(f"[COUPONS API] Error validating: {e}")
+        logger.error(f"[COUPONS API] Error validating: {e}")
         raise HTTPException(status_code=500, detail=f"Error validating coupon: {str(e)}")
 
 @router.get("/available", response_model=List[AvailableCouponResponse])
@@ -72,7 +75,7 @@ def get_available_coupons(db: Session = Depends(get_db)):
         results = db.execute(query).fetchall()
         
         # Log for debugging why some might not be show up
-        print(f"[COUPONS] Fetched {len(results)} active coupons from DB")
+        logger.info(f"[COUPONS] Fetched {len(results)} active coupons from DB")
 
         return [
             AvailableCouponResponse(
@@ -5,6 +5,9 @@ from typing import Optional
 import models, database, json, uuid
 from date_utils import parse_date_safe
 from schemas import resolve_path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/courts",
@@ -25,7 +28,7 @@ def get_courts(
     """
     try:
         # Query from admin_courts with joins to get city, game type, and amenities info
-        # Added subqueries for rating and reviews
+        # Ratings come from rating_aggregates (one row per court)
         query_sql = """
             SELECT
                 ac.id,
@@ -47,12 +50,13 @@ def get_courts(
                 acity.name as city_name,
                 agt.name as game_type,
                 (SELECT COUNT(*) FROM booking b WHERE b.court_id = ac.id AND b.status = 'confirmed') as games_played,
-                (SELECT ROUND(AVG(rating)::numeric, 1) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as average_rating,
-                (SELECT COUNT(*) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as total_reviews
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating,
+                COALESCE(ra.rating_count, 0) as total_reviews
             FROM admin_courts ac
             JOIN admin_branches ab ON ac.branch_id = ab.id
             JOIN admin_cities acity ON ab.city_id = acity.id
             JOIN admin_game_types agt ON ac.game_type_id = agt.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'court' AND ra.subject_id = ac.id
         """
 
         params = {}
@@ -145,9 +149,8 @@ def get_courts(
         
         return result
     except Exception as e:
-        print(f"[COURTS API] Error: {e}")
+        logger.error(f"[COURTS API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{court_id}")
@@ -174,12 +177,13 @@ def get_court(court_id: str, db: Session = Depends(database.get_db)):
                 ab.google_map_url,
                 acity.name as city_name,
                 agt.name as game_type,
-                (SELECT ROUND(AVG(rating)::numeric, 1) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as average_rating,
-                (SELECT COUNT(*) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as total_reviews
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating,
+                COALESCE(ra.rating_count, 0) as total_reviews
             FROM admin_courts ac
             JOIN admin_branches ab ON ac.branch_id = ab.id
             JOIN admin_cities acity ON ab.city_id = acity.id
             JOIN admin_game_types agt ON ac.game_type_id = agt.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'court' AND ra.subject_id = ac.id
             WHERE ac.id = :court_id
         """
         
@@ -238,9 +242,8 @@ def get_court(court_id: str, db: Session = Depends(database.get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[COURTS API] Error getting court: {e}")
+        logger.error(f"[COURTS API] Error getting court: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{court_id}/available-slots")
@@ -258,7 +261,7 @@ def get_available_slots(
         from date_utils import parse_date_safe
         from utils.booking_utils import generate_allowed_slots_map, get_booked_slots, get_now_ist, safe_parse_time_float
         
-        print(f"[COURTS API] Fetching slots for court={court_id}, date={date}")
+        logger.info(f"[COURTS API] Fetching slots for court={court_id}, date={date}")
         
         # 1. Parse Date
         try:
@@ -338,16 +341,14 @@ def get_available_slots(
 
     except HTTPException as he: raise he
     except Exception as e:
-        print(f"[COURTS API] Error: {e}")
+        logger.error(f"[COURTS API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
     except HTTPException as he: raise he
     except Exception as e:
-        print(f"[COURTS API] Error: {e}")
+        logger.error(f"[COURTS API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4,6 +4,10 @@ from sqlalchemy import text
 from typing import Optional
 import database
 import uuid
+from services.rating_aggregates import rating_summary
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/courts",
@@ -74,13 +78,13 @@ def get_courts(
         if len(where_conditions) > 1:
             query_sql = query_sql.replace(" WHERE ac.is_active = true", " WHERE " + " AND ".join(where_conditions))
         
-        print(f"[COURTS API] Query: {query_sql}")
-        print(f"[COURTS API] Params: {params}")
+        logger.debug("[COURTS API] Query: %s", query_sql)
+        logger.debug("[COURTS API] Params: %s", params)
         
         result_proxy = db.execute(text(query_sql), params)
         courts = result_proxy.fetchall()
         
-        print(f"[COURTS API] Found {len(courts)} courts")
+        logger.info(f"[COURTS API] Found {len(courts)} courts")
         
         # Convert to dict format
         result = []
@@ -104,9 +108,8 @@ def get_courts(
         
         return result
     except Exception as e:
-        print(f"[COURTS API] Error: {e}")
+        logger.error(f"[COURTS API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{court_id}/ratings")
@@ -126,73 +129,13 @@ def get_court_ratings(court_id: str, db: Session = Depends(database.get_db)):
         # Determine if it's a court or a branch
         is_branch = db.execute(text("SELECT 1 FROM admin_branches WHERE id = :id"), {"id": court_id}).first() is not None
         
-        if is_branch:
-             query_sql = """
-                SELECT
-                    COUNT(*) as total_reviews,
-                    ROUND(AVG(r.rating)::numeric, 1) as average_rating,
-                    COUNT(CASE WHEN r.rating = 5 THEN 1 END) as five_stars,
-                    COUNT(CASE WHEN r.rating = 4 THEN 1 END) as four_stars,
-                    COUNT(CASE WHEN r.rating = 3 THEN 1 END) as three_stars,
-                    COUNT(CASE WHEN r.rating = 2 THEN 1 END) as two_stars,
-                    COUNT(CASE WHEN r.rating = 1 THEN 1 END) as one_star
-                FROM reviews r
-                JOIN admin_courts ac ON r.court_id = ac.id
-                WHERE ac.branch_id = :court_id AND r.is_active = true
-            """
-        else:
-            query_sql = """
-                SELECT
-                    court_id,
-                    COUNT(*) as total_reviews,
-                    ROUND(AVG(rating)::numeric, 1) as average_rating,
-                    COUNT(CASE WHEN rating = 5 THEN 1 END) as five_stars,
-                    COUNT(CASE WHEN rating = 4 THEN 1 END) as four_stars,
-                    COUNT(CASE WHEN rating = 3 THEN 1 END) as three_stars,
-                    COUNT(CASE WHEN rating = 2 THEN 1 END) as two_stars,
-                    COUNT(CASE WHEN rating = 1 THEN 1 END) as one_star
-                FROM reviews
-                WHERE court_id = :court_id AND is_active = true
-                GROUP BY court_id
-            """
-        
-        result = db.execute(text(query_sql), {"court_id": court_id})
-        row = result.fetchone()
-        
-        if not row:
-            # No reviews yet for this court
-            return {
-                "court_id": court_id,
-                "average_rating": 0,
-                "total_reviews": 0,
-                "rating_distribution": {
-                    "5": 0,
-                    "4": 0,
-                    "3": 0,
-                    "2": 0,
-                    "1": 0
-                }
-            }
-        
-        row_dict = dict(row._mapping)
-        
-        return {
-            "court_id": str(row_dict.get('court_id', court_id)),
-            "average_rating": float(row_dict['average_rating']) if row_dict['average_rating'] else 0,
-            "total_reviews": int(row_dict['total_reviews']),
-            "rating_distribution": {
-                "5": int(row_dict['five_stars']),
-                "4": int(row_dict['four_stars']),
-                "3": int(row_dict['three_stars']),
-                "2": int(row_dict['two_stars']),
-                "1": int(row_dict['one_star'])
-            }
-        }
+        # One primary-key read of the precomputed court/branch aggregate
+        summary = rating_summary(db, "branch" if is_branch else "court", court_id)
+        return {"court_id": court_id, **summary}
         
     except Exception as e:
-        print(f"[COURTS API] Error getting court ratings: {e}")
+        logger.error(f"[COURTS API] Error getting court ratings: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{court_id}/reviews")
@@ -268,9 +211,8 @@ def get_court_reviews(
         }
         
     except Exception as e:
-        print(f"[COURTS API] Error getting court reviews: {e}")
+        logger.error(f"[COURTS API] Error getting court reviews: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 # Rest of the file continues with get_court and get_available_slots endpoints...
@@ -86,12 +86,13 @@ def get_favorites(
                 ab.address_line1 as location,
                 acity.name as city_name,
                 agt.name as game_type,
-                (SELECT ROUND(AVG(rating)::numeric, 1) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as average_rating
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating
             FROM user_favorite_courts ufc
             JOIN admin_courts ac ON ufc.court_id = ac.id
             JOIN admin_branches ab ON ac.branch_id = ab.id
             JOIN admin_cities acity ON ab.city_id = acity.id
             JOIN admin_game_types agt ON ac.game_type_id = agt.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'court' AND ra.subject_id = ac.id
             WHERE ufc.user_id = :user_id
         """
         
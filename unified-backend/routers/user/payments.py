@@ -16,10 +16,13 @@ import schemas
 import crud
 from utils.coupon_utils import validate_coupon_strictly
 from utils.email_sender import send_booking_invoice_email, send_refund_confirmation_email
-from utils.logger import logger
+from utils.logger import get_logger, get_sampled_logger
 
 from utils.booking_utils import get_booked_slots, safe_parse_time_float, calculate_multi_slice_price, generate_allowed_slots_map
 
+logger = get_logger(__name__)
+slot_logger = get_sampled_logger(__name__)
+
 router = APIRouter(
     prefix="/payments",
     tags=["payments"],
@@ -100,7 +103,7 @@ def calculate_authoritative_price(db: Session, court_id: str, booking_date: date
     is_capacity = court.logic_type == "capacity" if court else False
     
     total_slot_price = 0.0
-    print(f"[PRICE_DEBUG] Starting calculation for {len(requested_slots)} slots, players={number_of_players}, is_capacity={is_capacity}")
+    logger.debug("[PRICE_DEBUG] Starting calculation for %d slots, players=%s, is_capacity=%s", len(requested_slots), number_of_players, is_capacity)
     
     for slot in requested_slots:
         # Use price from map if available, else default (though validation should have caught it)
@@ -125,14 +128,14 @@ def calculate_authoritative_price(db: Session, court_id: str, booking_date: date
             slot_price = calculate_multi_slice_price(server_slot, slice_mask or 0, default_map_price)
             
             total_slot_price += slot_price
-            print(f"[PRICE_DEBUG] Slot {norm_start}: Price {slot_price} (Mask={slice_mask})")
+            slot_logger.debug("[PRICE_DEBUG] Slot %s: Price %s (Mask=%s)", norm_start, slot_price, slice_mask)
         else:
-            print(f"[PRICE_DEBUG] Slot {norm_start} not found in map. Falling back.")
+            logger.warning(f"[PRICE_DEBUG] Slot {norm_start} not found in map. Falling back.")
             # Fallback to court base price if absolutely necessary
             if court:
                 slot_price = (float(court.price_per_hour) / 2.0)
                 total_slot_price += slot_price
-                print(f"[PRICE_DEBUG] Fallback Slot {norm_start}: Price {slot_price}")
+                slot_logger.debug("[PRICE_DEBUG] Fallback Slot %s: Price %s", norm_start, slot_price)
         
         # ENRICH SLOT with authoritative price (for capacity, frontend and crud.create_booking expect per-slot price already multiplied.) 
         slot['price'] = (slot_price * number_of_players) if is_capacity else slot_price
@@ -141,9 +144,9 @@ def calculate_authoritative_price(db: Session, court_id: str, booking_date: date
     final_base_price = float(total_slot_price)
     if is_capacity:
         final_base_price = float(total_slot_price * number_of_players)
-        print(f"[PRICE_DEBUG] FINAL TOTAL BASE: {final_base_price} (Multiplied {total_slot_price} by {number_of_players} players)")
+        logger.debug("[PRICE_DEBUG] FINAL TOTAL BASE: %s (Multiplied %s by %s players)", final_base_price, total_slot_price, number_of_players)
     else:
-        print(f"[PRICE_DEBUG] FINAL TOTAL BASE: {final_base_price} (No player multiplier applied)")
+        logger.debug("[PRICE_DEBUG] FINAL TOTAL BASE: %s (No player multiplier applied)", final_base_price)
         
     return final_base_price
 
@@ -176,15 +179,15 @@ def create_payment_order(
          raise HTTPException(status_code=500, detail="Payment gateway not configured")
 
     # 1. Availability Check
-    print(f"[PAYMENTS DEBUG] Creating order for user {current_user.id}, court {booking_details.court_id}, date {booking_details.booking_date}")
-    print(f"[PAYMENTS DEBUG] Provided slots: {booking_details.time_slots}")
+    logger.debug("[PAYMENTS DEBUG] Creating order for user %s, court %s, date %s", current_user.id, booking_details.court_id, booking_details.booking_date)
+    logger.debug("[PAYMENTS DEBUG] Provided slots: %s", booking_details.time_slots)
     try:
         verify_slot_availability(db, booking_details.court_id, booking_details.booking_date, booking_details.time_slots, booking_details.slice_mask, user_id=str(current_user.id))
     except HTTPException as e:
-        print(f"[PAYMENTS DEBUG] Availability check failed: {e.detail}")
+        logger.warning(f"[PAYMENTS DEBUG] Availability check failed: {e.detail}")
         raise e
     except Exception as e:
-        print(f"[PAYMENTS DEBUG] Unexpected availability error: {str(e)}")
+        logger.error(f"[PAYMENTS DEBUG] Unexpected availability error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Availability error: {str(e)}")
     
     # 2. Price Calculation
@@ -198,9 +201,9 @@ def create_payment_order(
             booking_details.slice_mask,
             user_id=str(current_user.id)
         )
-        print(f"[PAYMENTS DEBUG] Calculated Base Price: {server_base_price}")
+        logger.debug(f"[PAYMENTS DEBUG] Calculated Base Price: {server_base_price}")
     except Exception as e:
-        print(f"[PAYMENTS DEBUG] Price calculation failed: {str(e)}")
+        logger.warning(f"[PAYMENTS DEBUG] Price calculation failed: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Price calculation failed: {str(e)}")
     
     # Platform Fee (Hardcoded for now matching frontend)
@@ -209,7 +212,7 @@ def create_payment_order(
     # 3. Coupon Validation
     discount_amount = 0.0
     if booking_details.coupon_code:
-        print(f"[PAYMENTS DEBUG] Validating coupon: {booking_details.coupon_code}")
+        logger.debug(f"[PAYMENTS DEBUG] Validating coupon: {booking_details.coupon_code}")
         try:
             discount_amount = validate_authoritative_coupon(
                 db, 
@@ -218,10 +221,10 @@ def create_payment_order(
                 str(current_user.id)
             )
         except HTTPException as e:
-            print(f"[PAYMENTS DEBUG] Coupon validation failed: {e.detail}")
+            logger.warning(f"[PAYMENTS DEBUG] Coupon validation failed: {e.detail}")
             raise e
         except Exception as e:
-            print(f"[PAYMENTS DEBUG] Unexpected coupon error: {e}")
+            logger.error(f"[PAYMENTS DEBUG] Unexpected coupon error: {e}")
             raise HTTPException(status_code=400, detail=f"Coupon error: {str(e)}")
         
     # 4. Final Total
@@ -242,9 +245,9 @@ def create_payment_order(
             gst_percent = float(active_gst_policy.value)
             gst_amount = (subtotal_amount * gst_percent) / 100
             final_amount = subtotal_amount + gst_amount
-            print(f"[PAYMENTS] GST Applied: {gst_percent}% ({gst_amount}). Subtotal: {subtotal_amount}, Final: {final_amount}")
+            logger.info(f"[PAYMENTS] GST Applied: {gst_percent}% ({gst_amount}). Subtotal: {subtotal_amount}, Final: {final_amount}")
     except Exception as ge:
-        print(f"[PAYMENTS] Warning: Failed to apply GST policy: {ge}")
+        logger.warning(f"[PAYMENTS] Warning: Failed to apply GST policy: {ge}")
     
     # 5. Create Razorpay Order
     # Round to 2 decimal places to avoid float issues before converting to paise
@@ -268,7 +271,7 @@ def create_payment_order(
         # This is the gatekeeper. If two users try to book the same slot at the same time,
         # only the first one will succeed here. The second will get a 409 Conflict BEFORE
         # a Razorpay order is ever created for them — preventing a confusing double payment.
-        print(f"[PAYMENTS] Atomically reserving slot for order {order['id']}")
+        logger.info(f"[PAYMENTS] Atomically reserving slot for order {order['id']}")
         
         # ENRICH BOOKING with authoritative price data before sending to CRUD
         booking_details.status = "payment_pending"
@@ -280,11 +283,11 @@ def create_payment_order(
         
         try:
             db_booking = crud.create_booking(db=db, booking=booking_details, user_id=current_user.id)
-            print(f"[PAYMENTS] Slot reserved. Pending booking ID: {db_booking.id}")
+            logger.info(f"[PAYMENTS] Slot reserved. Pending booking ID: {db_booking.id}")
 
         except HTTPException as slot_err:
             # Known conflict (slot taken, bitmask overlap, etc.) — cancel the Razorpay order and reject
-            print(f"[PAYMENTS] Slot reservation FAILED: {slot_err.detail}. Cancelling Razorpay order {order['id']}.")
+            logger.warning(f"[PAYMENTS] Slot reservation FAILED: {slot_err.detail}. Cancelling Razorpay order {order['id']}.")
             try:
                 client.order.update(order['id'], {"notes": {"status": "cancelled_slot_conflict"}})
             except Exception:
@@ -292,7 +295,7 @@ def create_payment_order(
             raise HTTPException(status_code=409, detail="Slot no longer available — another booking was confirmed first")
         except ValueError as slot_err:
             # DB-level conflict (bitmask update returned 0 rows)
-            print(f"[PAYMENTS] Slot reservation FAILED (ValueError): {slot_err}. Cancelling Razorpay order {order['id']}.")
+            logger.error(f"[PAYMENTS] Slot reservation FAILED (ValueError): {slot_err}. Cancelling Razorpay order {order['id']}.")
             try:
                 client.order.update(order['id'], {"notes": {"status": "cancelled_slot_conflict"}})
             except Exception:
@@ -320,7 +323,7 @@ def create_payment_order(
     except HTTPException as http_err:
         raise http_err
     except Exception as e:
-        print(f"Razorpay Error: {e}")
+        logger.error(f"Razorpay Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to create payment order")
 
 
@@ -360,9 +363,9 @@ def create_multi_court_payment_order(
         verify_slot_availability(db, court_id, booking_date, time_slots, slice_mask, user_id=str(current_user.id))
         price = calculate_authoritative_price(db, court_id, booking_date, time_slots, number_of_players, slice_mask, user_id=str(current_user.id))
         total_price += price
-        print(f"[MULTI-ORDER] Court {court_id}: price={price}")
+        logger.info(f"[MULTI-ORDER] Court {court_id}: price={price}")
 
-    print(f"[MULTI-ORDER] Combined total price: {total_price}")
+    logger.info(f"[MULTI-ORDER] Combined total price: {total_price}")
 
     PLATFORM_FEE = 0.0
     discount_amount = 0.0
@@ -387,9 +390,9 @@ def create_multi_court_payment_order(
             gst_percent = float(active_gst_policy.value)
             gst_amount = (subtotal_amount * gst_percent) / 100
             final_total = subtotal_amount + gst_amount
-            print(f"[MULTI-ORDER] GST Applied: {gst_percent}% ({gst_amount})")
+            logger.info(f"[MULTI-ORDER] GST Applied: {gst_percent}% ({gst_amount})")
     except Exception as ge:
-        print(f"[MULTI-ORDER] Warning: Failed GST fetch: {ge}")
+        logger.warning(f"[MULTI-ORDER] Warning: Failed GST fetch: {ge}")
 
     final_total = round(final_total, 2)
     final_total_paise = int(final_total * 100)
@@ -473,7 +476,7 @@ def create_multi_court_payment_order(
 
             try:
                 db_booking = crud.create_booking(db=db, booking=booking_create, user_id=current_user.id)
-                print(f"[PAYMENTS] Slot reserved. Pending Multi-booking: {db_booking.id} for court {c_id}")
+                logger.info(f"[PAYMENTS] Slot reserved. Pending Multi-booking: {db_booking.id} for court {c_id}")
                 breakdown_list.append({
                     "courtId": c_id,
                     "sliceMask": s_mask,
@@ -482,7 +485,7 @@ def create_multi_court_payment_order(
                 })
             except (HTTPException, ValueError) as slot_err:
                 detail = slot_err.detail if isinstance(slot_err, HTTPException) else str(slot_err)
-                print(f"[PAYMENTS] Multi-order slot reservation FAILED for court {c_id}: {detail}")
+                logger.warning(f"[PAYMENTS] Multi-order slot reservation FAILED for court {c_id}: {detail}")
                 # Cancel already-reserved courts in this order by rolling back
                 db.rollback()
                 try:
@@ -504,7 +507,7 @@ def create_multi_court_payment_order(
     except HTTPException as http_err:
         raise http_err
     except Exception as e:
-        print(f"Razorpay Error: {e}")
+        logger.error(f"Razorpay Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to create payment order")
 
 
@@ -585,7 +588,7 @@ async def razorpay_webhook(
     Razorpay Webhook endpoint for secure server-to-server payment verification.
     """
     if not RAZORPAY_WEBHOOK_SECRET:
-         print("[WEBHOOK] WARNING: RAZORPAY_WEBHOOK_SECRET not configured in .env!")
+         logger.warning("[WEBHOOK] WARNING: RAZORPAY_WEBHOOK_SECRET not configured in .env!")
          raise HTTPException(status_code=500, detail="Webhook secret not configured")
 
     body_bytes = await request.body()
@@ -593,19 +596,19 @@ async def razorpay_webhook(
     signature = request.headers.get("x-razorpay-signature")
 
     if not signature:
-         print("[WEBHOOK] Error: Missing x-razorpay-signature header")
+         logger.error("[WEBHOOK] Error: Missing x-razorpay-signature header")
          raise HTTPException(status_code=400, detail="Missing signature")
 
-    print(f"[WEBHOOK] Received event, validating signature {signature[:10]}...")
+    logger.info(f"[WEBHOOK] Received event, validating signature {signature[:10]}...")
 
     try:
         # Verify the webhook signature against our secret
         client.utility.verify_webhook_signature(body_str, signature, RAZORPAY_WEBHOOK_SECRET)
     except razorpay.errors.SignatureVerificationError:
-        print("[WEBHOOK] Signature verification failed!")
+        logger.warning("[WEBHOOK] Signature verification failed!")
         raise HTTPException(status_code=400, detail="Invalid signature")
     except Exception as e:
-        print(f"[WEBHOOK] Verification error: {e}")
+        logger.error(f"[WEBHOOK] Verification error: {e}")
         raise HTTPException(status_code=400, detail="Signature verification error")
 
     # If we got here, the request genuinely came from Razorpay
@@ -614,7 +617,7 @@ async def razorpay_webhook(
         event = data.get("event")
         payload = data.get("payload", {})
         
-        print(f"[WEBHOOK] Verified event: {event}")
+        logger.info(f"[WEBHOOK] Verified event: {event}")
         
         if event == "payment.captured":
             payment_entity = payload.get("payment", {}).get("entity", {})
@@ -624,8 +627,8 @@ async def razorpay_webhook(
             # The 'notes' contains internal_order_id, item_cost, item_type (e.g. "PHONE")
             notes = payment_entity.get("notes", {})
             
-            print(f"[WEBHOOK] Captured Payment: {payment_id} for Order: {order_id}, Amount: {amount}")
-            print(f"[WEBHOOK] Payment Notes: {notes}")
+            logger.info(f"[WEBHOOK] Captured Payment: {payment_id} for Order: {order_id}, Amount: {amount}")
+            logger.info(f"[WEBHOOK] Payment Notes: {notes}")
             
             # --- 1. FIND BOOKING & PRE-VALIDATE (FRAUD CHECKS) ---
             booking = None
@@ -633,18 +636,18 @@ async def razorpay_webhook(
             try:
                 booking = db.query(models.Booking).filter(models.Booking.razorpay_order_id == order_id).first()
                 if booking:
-                    print(f"[WEBHOOK] Found booking {booking.id} for order {order_id}")
+                    logger.info(f"[WEBHOOK] Found booking {booking.id} for order {order_id}")
                     expected_amount_paise = int(float(booking.total_amount) * 100)
                     if amount != expected_amount_paise:
-                        print(f"[WEBHOOK FRAUD ALERT] Amount mismatch for booking {booking.id}!")
+                        logger.warning(f"[WEBHOOK FRAUD ALERT] Amount mismatch for booking {booking.id}!")
                         is_fraud_mismatch = True
             except Exception as e:
-                print(f"[WEBHOOK ERROR] Pre-validation failed: {e}")
+                logger.error(f"[WEBHOOK ERROR] Pre-validation failed: {e}")
 
             # --- 2. VRIKSHA API INVOCATION (STRICT CONTRACT) ---
             vriksha_success = True # Assume success to ensure booking flow continues even if external logging fails
             try:
-                import requests
+                from utils import http_client
                 vriksha_url = VRIKSHA_WEBHOOK_URL
                 
                 vriksha_payload = json.loads(json.dumps(data)) # Deep copy
@@ -672,7 +675,7 @@ async def razorpay_webhook(
                         n.setdefault("item_cost", p.get("amount", 0))
                     p["notes"] = n
                 
-                print(f"[WEBHOOK-VRIKSHA] Forwarding STRICT contract payload for Booking: {booking.booking_display_id if booking else 'N/A'}")
+                logger.info(f"[WEBHOOK-VRIKSHA] Forwarding STRICT contract payload for Booking: {booking.booking_display_id if booking else 'N/A'}")
                 
                 vriksha_headers = {
                     "Content-Type": "application/json",
@@ -681,21 +684,21 @@ async def razorpay_webhook(
                     "X-Razorpay-Signature": request.headers.get("X-Razorpay-Signature", "")
                 }
                 
-                vriksha_response = requests.post(
+                vriksha_response = await http_client.apost(
                     vriksha_url, 
                     json=vriksha_payload, 
                     headers={k: v for k, v in vriksha_headers.items() if v},
                     timeout=15,
                     verify=False # Bypass expired SSL on tester-webhook.vriksha.ai
                 )
-                print(f"[WEBHOOK-VRIKSHA] Vriksha Response Status: {vriksha_response.status_code}")
+                logger.info(f"[WEBHOOK-VRIKSHA] Vriksha Response Status: {vriksha_response.status_code}")
                 
                 if vriksha_response.status_code == 200:
                     vriksha_success = True
                 else:
-                    print(f"[WEBHOOK-VRIKSHA] REJECTED by Vriksha. Status={vriksha_response.status_code}")
+                    logger.warning(f"[WEBHOOK-VRIKSHA] REJECTED by Vriksha. Status={vriksha_response.status_code}")
             except Exception as e:
-                print(f"[WEBHOOK-VRIKSHA] ERROR calling Vriksha API: {str(e)}")
+                logger.error(f"[WEBHOOK-VRIKSHA] ERROR calling Vriksha API: {str(e)}")
 
             # --- 3. FINAL DATABASE COMMIT (IF VRIKSHA SUCCEEDED) ---
             if vriksha_success and booking:
@@ -705,7 +708,7 @@ async def razorpay_webhook(
                     else:
                         booking.payment_status = "paid"
                         booking.status = "confirmed" # Finalize status
-                        print(f"[WEBHOOK] Marking booking {booking.id} as Paid and Confirmed (Vriksha confirmed).")
+                        logger.info(f"[WEBHOOK] Marking booking {booking.id} as Paid and Confirmed (Vriksha confirmed).")
                     
                     booking.payment_id = payment_id
                     booking.payment_mode = payment_entity.get("method")  # upi, card, netbanking, etc.
@@ -724,22 +727,22 @@ async def razorpay_webhook(
                         logger.error(f"[WEBHOOK ERROR] Email queuing failed: {email_err}")
 
                 except Exception as db_err:
-                    print(f"[WEBHOOK ERROR] Final DB commit failed: {db_err}")
+                    logger.error(f"[WEBHOOK ERROR] Final DB commit failed: {db_err}")
                     db.rollback()
             elif not vriksha_success:
-                print(f"[WEBHOOK WARNING] Booking {booking.id if booking else 'N/A'} NOT marked as Paid because Vriksha processing failed.")
+                logger.warning(f"[WEBHOOK WARNING] Booking {booking.id if booking else 'N/A'} NOT marked as Paid because Vriksha processing failed.")
             # --------------------------------------------------
             # --------------------------------------------------
             
         elif event == "payment.failed":
-            print("[WEBHOOK] Payment failed event received.")
+            logger.warning("[WEBHOOK] Payment failed event received.")
             
         elif event in ["refund.processed", "refund.failed"]:
             refund_entity = payload.get("refund", {}).get("entity", {})
             refund_id = refund_entity.get("id")
             payment_id = refund_entity.get("payment_id")
             
-            print(f"[WEBHOOK] {event}: Refund ID {refund_id} for Payment {payment_id}")
+            logger.info(f"[WEBHOOK] {event}: Refund ID {refund_id} for Payment {payment_id}")
             
             # Find the booking associated with this refund
             booking = db.query(models.Booking).filter(models.Booking.refund_id == refund_id).first()
@@ -751,24 +754,24 @@ async def razorpay_webhook(
                 if event == "refund.processed":
                     booking.refund_status = "processed"
                     booking.payment_status = "refunded"
-                    print(f"[WEBHOOK] Refund processed for booking {booking.id}. Status updated.")
+                    logger.info(f"[WEBHOOK] Refund processed for booking {booking.id}. Status updated.")
                     
                     # --- QUEUE REFUND CONFIRMATION EMAIL ---
                     try:
                         if booking.user and booking.user.email:
-                            print(f"[WEBHOOK] Queuing refund confirmation email for {booking.user.email}")
+                            logger.info(f"[WEBHOOK] Queuing refund confirmation email for {booking.user.email}")
                             background_tasks.add_task(send_refund_confirmation_email, str(booking.id), booking.user.email)
                     except Exception as e:
-                        print(f"[WEBHOOK] Failed to queue refund email: {e}")
+                        logger.warning(f"[WEBHOOK] Failed to queue refund email: {e}")
                         
                 elif event == "refund.failed":
                     booking.refund_status = "failed"
-                    print(f"[WEBHOOK] Refund FAILED for booking {booking.id}. Status updated.")
+                    logger.warning(f"[WEBHOOK] Refund FAILED for booking {booking.id}. Status updated.")
                 
                 booking.updated_at = datetime.utcnow()
                 db.commit()
             else:
-                print(f"[WEBHOOK] Warning: Received refund event for unknown refund_id {refund_id}")
+                logger.warning(f"[WEBHOOK] Warning: Received refund event for unknown refund_id {refund_id}")
 
         # Razorpay expects a simple 200 OK on successful webhook receipt
         return {"status": "success", "message": f"Webhook {event} processed successfully"}
@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import Annotated, List
 import schemas, crud, models, database
 from dependencies import get_current_user
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/profile",
@@ -54,24 +57,24 @@ async def upload_avatar(
     current_user: Annotated[models.User, Depends(get_current_user)],
     db: Session = Depends(database.get_db)
 ):
-    print(f"[PROFILE] upload-avatar entry. User: {current_user.id}, File: {file.filename}")
+    logger.info(f"[PROFILE] upload-avatar entry. User: {current_user.id}, File: {file.filename}")
     from utils.s3_utils import upload_file_to_s3
     
     try:
         # Upload to S3
-        print(f"[PROFILE] Uploading {file.filename} to S3...")
+        logger.info(f"[PROFILE] Uploading {file.filename} to S3...")
         avatar_url = await upload_file_to_s3(file, folder="avatars")
-        print(f"[PROFILE] S3 upload success. URL: {avatar_url}")
+        logger.info(f"[PROFILE] S3 upload success. URL: {avatar_url}")
         
         # Update User model
         current_user.avatar_url = avatar_url
         db.commit()
         db.refresh(current_user)
         
-        print(f"[PROFILE] Database update success for user {current_user.id}")
+        logger.info(f"[PROFILE] Database update success for user {current_user.id}")
         return {"avatar_url": avatar_url, "message": "Avatar updated successfully"}
     except Exception as e:
-        print(f"[PROFILE] upload-avatar error: {str(e)}")
+        logger.error(f"[PROFILE] upload-avatar error: {str(e)}")
         raise
 
 @router.get("/top-players", response_model=List[schemas.TopPlayerResponse])
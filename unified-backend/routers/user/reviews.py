@@ -2,6 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import schemas, crud, models, database
 from dependencies import get_current_user
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/reviews",
@@ -15,29 +18,22 @@ def create_review(
     db: Session = Depends(database.get_db)
 ):
     try:
-        print("===========================================")
-        print(f"[REVIEWS API] 🔥 RECEIVED CREATE REVIEW REQUEST")
-        print(f"[REVIEWS API] User: {current_user.id}")
-        print(f"[REVIEWS API] Review data: booking_id={review.booking_id}, court_id={review.court_id}, rating={review.rating}")
-        print("===========================================")
+        logger.info(f"[REVIEWS API] 🔥 RECEIVED CREATE REVIEW REQUEST")
+        logger.info(f"[REVIEWS API] User: {current_user.id}")
+        logger.debug(f"[REVIEWS API] Review data: booking_id={review.booking_id}, court_id={review.court_id}, rating={review.rating}")
 
         result = crud.create_review(db=db, review=review, user_id=current_user.id)
 
-        print(f"[REVIEWS API] ✅ REVIEW CREATED SUCCESSFULLY: ID={result.id}")
+        logger.info(f"[REVIEWS API] ✅ REVIEW CREATED SUCCESSFULLY: ID={result.id}")
         return result
 
     except ValueError as e:
-        print("===========================================")
-        print(f"[REVIEWS API] ❌ VALIDATION ERROR: {e}")
-        print("===========================================")
+        logger.error(f"[REVIEWS API] ❌ VALIDATION ERROR: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print("===========================================")
-        print(f"[REVIEWS API] ❌ CRITICAL ERROR CREATING REVIEW")
-        print(f"[REVIEWS API] Error: {e}")
+        logger.error(f"[REVIEWS API] ❌ CRITICAL ERROR CREATING REVIEW")
+        logger.error(f"[REVIEWS API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
-        print("===========================================")
         raise HTTPException(status_code=500, detail="Failed to create review")
 
 @router.get("/user")
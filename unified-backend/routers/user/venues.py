@@ -3,9 +3,16 @@ from sqlalchemy.orm import Session
 from typing import List, Optional, Any, Dict
 import models, schemas, database
 from dependencies import get_current_user_optional
-from utils.booking_utils import generate_allowed_slots_map, get_booked_slots, safe_parse_time_float, get_venue_hours, safe_parse_hour
+from utils.booking_utils import generate_allowed_slots_map, get_booked_slots, safe_parse_time_float, get_venue_hours, safe_parse_hour, get_now_ist
 from schemas import resolve_path
 import uuid
+from services.availability_calendar import CALENDAR_MAX_DAYS, CALENDAR_MIN_DAYS, calendar_days
+from services.free_slots import FREE_SLOTS_DAYS, search_free_courts
+from services.nearby import NEARBY_SORTS, find_nearby_venues
+from services.search import match_clause
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/venues",
@@ -21,7 +28,7 @@ def get_game_types(db: Session = Depends(database.get_db)):
         game_types = [row[0] for row in result]
         return game_types
     except Exception as e:
-        print(f"Error fetching game types: {e}")
+        logger.error(f"Error fetching game types: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/cities")
@@ -35,7 +42,7 @@ def get_cities(db: Session = Depends(database.get_db)):
         cities = [row[0] for row in result]
         return cities
     except Exception as e:
-        print(f"Error fetching cities: {e}")
+        logger.error(f"Error fetching cities: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/branches")
@@ -65,10 +72,101 @@ def get_branches(city: Optional[str] = None, db: Session = Depends(database.get_
             })
         return branches
     except Exception as e:
-        print(f"Error fetching branches: {e}")
+        logger.error(f"Error fetching branches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_images(images_value):
+    if not images_value: return []
+    imgs = []
+    if isinstance(images_value, list):
+        imgs = [str(img).strip() for img in images_value if img]
+    elif isinstance(images_value, str):
+        images_value = images_value.strip()
+        if not images_value: return []
+        if images_value.startswith('[') and images_value.endswith(']'):
+            try:
+                import json
+                parsed = json.loads(images_value)
+                imgs = [str(img).strip() for img in parsed if img] if isinstance(parsed, list) else []
+            except: pass
+        elif images_value.startswith('{') and images_value.endswith('}'):
+            imgs = [img.strip() for img in images_value[1:-1].split(',') if img.strip()]
+        elif ',' in images_value:
+            imgs = [img.strip() for img in images_value.split(',') if img.strip()]
+        else:
+            imgs = [images_value]
+
+    # Resolve all paths to absolute URLs
+    return [resolve_path(img) for img in imgs]
+
+
+def _venue_card(b: Dict[str, Any]) -> Dict[str, Any]:
+    """A branch row (get_venues' columns) in the format of the frontend "Venue" interface."""
+    # Frontend expects: court_name, location, game_type, prices, photos
+    return {
+        "id": str(b['id']),
+        "court_name": b['branch_name'], # Mapping Branch Name to 'court_name' for frontend compatibility
+        "location": f"{(b.get('location') or '')}, {(b.get('city_name') or '')}".strip(', '),
+        "game_type": ', '.join(b.get('game_types') or []) or 'Multi-Sport',
+        "prices": str(b.get('min_price') or 'On Request'),
+        "description": b.get('ground_overview') or b.get('search_location') or '',
+        "photos": _parse_images(b.get('images')),
+        "videos": [], # Branch videos if any
+        "rating": float(b.get('average_rating') or 0),
+        "reviews": int(b.get('total_reviews') or 0),
+        "branch_name": b['branch_name'],
+        "city_name": b['city_name'],
+        "branch_id": str(b['id']), # Explicitly return branch_id for easier frontend matching
+        "created_at": b['created_at'].isoformat() if b.get('created_at') else None,
+        "updated_at": b['updated_at'].isoformat() if b.get('updated_at') else None,
+    }
+
+
+SLOT_PAYLOAD_VERSIONS = (1, 2)
+
+
+def _compact_court_slots(court: Dict[str, Any], allowed_slots_map: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One court of the v2 slot payload: court and slice definitions once, then
+    the offered (not blocked) 30-min slots as parallel arrays. Slot i starts at
+    i * 30 minutes; price_index points into prices. Availability is derived
+    client-side: the slot is free when occupied_mask leaves a zone open, a
+    slice when occupied_mask & slice mask == 0.
+    """
+    slots = sorted(
+        (safe_parse_time_float(t), d) for t, d in allowed_slots_map.items() if not d['is_blocked']
+    )
+    prices: List[float] = []
+    price_index: Dict[float, int] = {}
+    arrays: Dict[str, List[int]] = {"slot": [], "price_index": [], "occupied_mask": [], "booked_capacity": []}
+    for h_float, details in slots:
+        price = details['price']
+        if price not in price_index:
+            price_index[price] = len(prices)
+            prices.append(price)
+        arrays["slot"].append(int(h_float * 2))
+        arrays["price_index"].append(price_index[price])
+        arrays["occupied_mask"].append(details.get('occupied_mask', 0))
+        arrays["booked_capacity"].append(details.get('booked_capacity', 0))
+
+    first = slots[0][1] if slots else {}
+    return {
+        "court_id": str(court['id']),
+        "court_name": court['name'],
+        "game_type": court.get('game_type', ''),
+        "logic_type": court.get('logic_type') or 'independent',
+        "total_zones": first.get('total_zones', court.get('total_zones') or 1),
+        "capacity_limit": first.get('capacity_limit', 1),
+        # Slice definitions without the per-slot is_available flag
+        "slices": [
+            {k: v for k, v in sl.items() if k != 'is_available'} for sl in first.get('slices', [])
+        ],
+        "prices": prices,
+        **arrays,
+    }
+
+
 @router.get("/")
 def get_venues(
     city: Optional[str] = None,
@@ -80,13 +178,9 @@ def get_venues(
     try:
         from sqlalchemy import text
         
-        # Query to fetch branches with aggregated details
-        # We need:
-        # - Branch details (id, name, location, images)
-        # - City name
-        # - Min price from courts
-        # - Aggregated game types
-        
+        # Branch details plus the per-branch aggregates precomputed in
+        # venue_summary (game types, min price over courts/slices) and
+        # rating_aggregates
         query_sql = """
             SELECT 
                 ab.id,
@@ -96,50 +190,17 @@ def get_venues(
                 ab.images,
                 ab.ground_overview,
                 ab.search_location,
-                
-                -- Aggregated Game Types
-                (
-                    SELECT string_agg(DISTINCT agt.name, ', ')
-                    FROM admin_branch_game_types abgt
-                    JOIN admin_game_types agt ON abgt.game_type_id = agt.id
-                    WHERE abgt.branch_id = ab.id
-                ) as game_types,
-                
-                -- Min Price from Courts/Slices
-                (
-                    SELECT MIN(val)
-                    FROM (
-                        SELECT ac.price_per_hour AS val
-                        FROM admin_courts ac
-                        WHERE ac.branch_id = ab.id AND ac.is_active = true
-                        UNION ALL
-                        SELECT ss.price_per_hour AS val
-                        FROM admin_sport_slices ss
-                        JOIN admin_courts ac ON ss.court_id = ac.id
-                        WHERE ac.branch_id = ab.id AND ac.is_active = true AND ss.price_per_hour IS NOT NULL
-                    ) AS prices
-                ) as min_price,
-
-                -- Aggregated Ratings for Branch (from all courts in branch)
-                (
-                    SELECT ROUND(AVG(r.rating)::numeric, 1)
-                    FROM reviews r
-                    JOIN admin_courts ac ON r.court_id = ac.id
-                    WHERE ac.branch_id = ab.id AND r.is_active = true
-                ) as average_rating,
-                
-                (
-                    SELECT COUNT(*)
-                    FROM reviews r
-                    JOIN admin_courts ac ON r.court_id = ac.id
-                    WHERE ac.branch_id = ab.id AND r.is_active = true
-                ) as total_reviews,
-
+                vs.game_types,
+                vs.min_price,
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating,
+                COALESCE(ra.rating_count, 0) as total_reviews,
                 ab.created_at,
                 ab.updated_at
 
             FROM admin_branches ab
             JOIN admin_cities acity ON ab.city_id = acity.id
+            LEFT JOIN venue_summary vs ON vs.branch_id = ab.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'branch' AND ra.subject_id = ab.id
             WHERE ab.is_active = true
         """
         
@@ -164,83 +225,110 @@ def get_venues(
                  # logic for list if needed, usually simplified to "contains any"
                  pass 
             else:
-                 # Check if branch has this game type
-                 query_sql += """
-                    AND EXISTS (
-                        SELECT 1 FROM admin_branch_game_types abgt
-                        JOIN admin_game_types agt ON abgt.game_type_id = agt.id
-                        WHERE abgt.branch_id = ab.id AND agt.name ILIKE :game_type
-                    )
-                 """
-                 params['game_type'] = f"%{game_type}%"
+                 # Check if branch offers this game type (trigram-indexed, synonyms included)
+                 clause, match_params = match_clause(db, "vs.sport_terms", "game_type", game_type, whole_words=True)
+                 query_sql += f" AND {clause}"
+                 params.update(match_params)
 
-        print(f"[VENUES API] Query: {query_sql}")
-        print(f"[VENUES API] Params: {params}")
+        logger.debug("[VENUES API] Query: %s", query_sql)
+        logger.debug("[VENUES API] Params: %s", params)
         
         result_proxy = db.execute(text(query_sql), params)
         branches = result_proxy.fetchall()
         
-        print(f"[VENUES API] Found {len(branches)} branches")
-        
-        # Helper function to parse images
-        def parse_images(images_value):
-            if not images_value: return []
-            imgs = []
-            if isinstance(images_value, list):
-                imgs = [str(img).strip() for img in images_value if img]
-            elif isinstance(images_value, str):
-                images_value = images_value.strip()
-                if not images_value: return []
-                if images_value.startswith('[') and images_value.endswith(']'):
-                    try:
-                        import json
-                        parsed = json.loads(images_value)
-                        imgs = [str(img).strip() for img in parsed if img] if isinstance(parsed, list) else []
-                    except: pass
-                elif images_value.startswith('{') and images_value.endswith('}'):
-                    imgs = [img.strip() for img in images_value[1:-1].split(',') if img.strip()]
-                elif ',' in images_value:
-                    imgs = [img.strip() for img in images_value.split(',') if img.strip()]
-                else:
-                    imgs = [images_value]
-            
-            # Resolve all paths to absolute URLs
-            return [resolve_path(img) for img in imgs]
-
-        result = []
-        for branch in branches:
-            b = dict(branch._mapping)
-            
-            parsed_images = parse_images(b.get('images'))
-            # If branch has no images, maybe fallback to court images? (Skipping for now to keep it fast)
-            
-            # Map to the format expected by Frontend "Venue" interface (mostly)
-            # Frontend expects: court_name, location, game_type, prices, photos
-            
-            result.append({
-                "id": str(b['id']),
-                "court_name": b['branch_name'], # Mapping Branch Name to 'court_name' for frontend compatibility
-                "location": f"{(b.get('location') or '')}, {(b.get('city_name') or '')}".strip(', '),
-                "game_type": b.get('game_types', '') or 'Multi-Sport',
-                "prices": str(b.get('min_price') or 'On Request'),
-                "description": b.get('ground_overview') or b.get('search_location') or '',
-                "photos": parsed_images,
-                "videos": [], # Branch videos if any
-                "rating": float(b.get('average_rating') or 0),
-                "reviews": int(b.get('total_reviews') or 0),
-                "branch_name": b['branch_name'],
-                "city_name": b['city_name'],
-                "branch_id": str(b['id']), # Explicitly return branch_id for easier frontend matching
-                "created_at": b['created_at'].isoformat() if b.get('created_at') else None,
-                "updated_at": b['updated_at'].isoformat() if b.get('updated_at') else None,
-            })
+        logger.info(f"[VENUES API] Found {len(branches)} branches")
         
-        return result
+        return [_venue_card(dict(branch._mapping)) for branch in branches]
 
     except Exception as e:
-        print(f"Error in get_venues: {e}")
+        logger.error(f"Error in get_venues: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/nearby")
+def get_nearby_venues(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    limit: int = Query(20, ge=1, le=100),
+    game_type: Optional[str] = None,
+    price_max: Optional[float] = None,
+    sort_by: str = "distance",
+    db: Session = Depends(database.get_db)
+):
+    """
+    Venues near a point: every venue within radius_km, or the `limit`
+    nearest when no radius is given. Optional sport and max-price filters;
+    sort_by is distance (default), price or rating.
+    """
+    if sort_by not in NEARBY_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(NEARBY_SORTS)}")
+    try:
+        venues = find_nearby_venues(
+            db, lat, lng, radius_km=radius_km, limit=limit,
+            game_type=game_type if game_type != "undefined" else None,
+            price_max=price_max, sort_by=sort_by
+        )
+        return [{**_venue_card(v), "distance_km": v["distance_km"]} for v in venues]
+    except Exception as e:
+        logger.error(f"Error in get_nearby_venues: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/available")
+def get_available_courts(
+    date: str,
+    start_time: str,
+    duration_minutes: int = Query(60, ge=30, le=720),
+    game_type: Optional[str] = None,
+    city: Optional[str] = None,
+    area: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(database.get_db)
+):
+    """
+    Courts of any venue free from start_time for duration_minutes on date,
+    grouped by venue. Answered from the free-slot bitmaps (services/free_slots.py).
+    """
+    from datetime import datetime as dt, timedelta
+    from date_utils import parse_date_safe
+
+    slot_date = parse_date_safe(date, "%Y-%m-%d", "date")
+    start = safe_parse_time_float(start_time)
+    if start * 2 != int(start * 2) or duration_minutes % 30:
+        raise HTTPException(status_code=400, detail="start_time and duration_minutes must be on the 30-minute grid")
+    first_slot, slot_count = int(start * 2), duration_minutes // 30
+    if first_slot + slot_count > 48:
+        raise HTTPException(status_code=400, detail="The requested window runs past midnight")
+
+    now_ist = get_now_ist()
+    if dt.combine(slot_date, dt.min.time()) + timedelta(hours=start) < now_ist:
+        raise HTTPException(status_code=400, detail="The requested time is in the past")
+    if slot_date >= now_ist.date() + timedelta(days=FREE_SLOTS_DAYS):
+        raise HTTPException(status_code=400, detail=f"Search is limited to the next {FREE_SLOTS_DAYS} days")
+
+    try:
+        rows = search_free_courts(
+            db, slot_date, first_slot, slot_count,
+            game_type=game_type if game_type != "undefined" else None, city=city, area=area, limit=limit
+        )
+        venues: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            venue = venues.setdefault(str(row['venue_id']), {
+                "venue_id": str(row['venue_id']),
+                "venue_name": row['venue_name'],
+                "city_name": row['city_name'],
+                "area_name": row['area_name'],
+                "courts": [],
+            })
+            venue["courts"].append({
+                "court_id": str(row['court_id']),
+                "court_name": row['court_name'],
+                "game_type": row['game_type'],
+                "price_per_hour": float(row['price_per_hour'] or 0),
+            })
+        return {"date": date, "start_time": start_time, "duration_minutes": duration_minutes, "venues": list(venues.values())}
+    except Exception as e:
+        logger.error(f"Error in get_available_courts: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{venue_id}")
@@ -293,23 +381,13 @@ def get_venue(venue_id: str, db: Session = Depends(database.get_db)):
                     ) AS prices
                 ) as min_price,
 
-                -- Aggregated Ratings for Branch
-                (
-                    SELECT ROUND(AVG(r.rating)::numeric, 1)
-                    FROM reviews r
-                    JOIN admin_courts ac ON r.court_id = ac.id
-                    WHERE ac.branch_id = ab.id AND r.is_active = true
-                ) as average_rating,
-                
-                (
-                    SELECT COUNT(*)
-                    FROM reviews r
-                    JOIN admin_courts ac ON r.court_id = ac.id
-                    WHERE ac.branch_id = ab.id AND r.is_active = true
-                ) as total_reviews
+                -- Branch ratings (rating_aggregates)
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating,
+                COALESCE(ra.rating_count, 0) as total_reviews
 
             FROM admin_branches ab
             LEFT JOIN admin_cities acity ON ab.city_id = acity.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'branch' AND ra.subject_id = ab.id
             WHERE ab.id = :venue_id
         """
         
@@ -363,7 +441,7 @@ def get_venue(venue_id: str, db: Session = Depends(database.get_db)):
                         "icon_url": r['icon_url']
                     })
             except Exception as e:
-                print(f"Error fetching branch amenities: {e}")
+                logger.error(f"Error fetching branch amenities: {e}")
 
             # Combine terms and rules
             terms_list = []
@@ -400,9 +478,8 @@ def get_venue(venue_id: str, db: Session = Depends(database.get_db)):
     except HTTPException as he:
         raise he
     except Exception as e:
-        print(f"Error in get_venue: {e}")
+        logger.error(f"Error in get_venue: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{venue_id}/slots")
@@ -410,13 +487,17 @@ def get_venue_slots(
     venue_id: str,
     date: str,
     game_type: Optional[str] = None,
+    version: int = 1,
     current_user: Optional[models.User] = Depends(get_current_user_optional),
     db: Session = Depends(database.get_db)
 ):
     """
     Get aggregated available slots for a venue (branch) on a specific date.
     Considers branch opening hours, court availability, and game type.
+    version=2 returns the compact per-court format (see _compact_court_slots).
     """
+    if version not in SLOT_PAYLOAD_VERSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported slot payload version {version}")
     try:
         from datetime import datetime
         from date_utils import parse_date_safe
@@ -458,10 +539,11 @@ def get_venue_slots(
             SELECT 
                 ac.id, ac.name, ac.price_per_hour, ac.price_conditions, ac.unavailability_slots, agt.name as game_type,
                 ac.shared_group_id, ac.total_zones, ac.logic_type,
-                (SELECT ROUND(AVG(rating)::numeric, 1) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as court_rating,
-                (SELECT COUNT(*) FROM reviews r WHERE r.court_id = ac.id AND r.is_active = true) as court_reviews
+                ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as court_rating,
+                COALESCE(ra.rating_count, 0) as court_reviews
             FROM admin_courts ac
             JOIN admin_game_types agt ON ac.game_type_id = agt.id
+            LEFT JOIN rating_aggregates ra ON ra.scope = 'court' AND ra.subject_id = ac.id
             WHERE ac.branch_id = :branch_id AND ac.is_active = true
         """
         params = {"branch_id": branch_id}
@@ -492,6 +574,7 @@ def get_venue_slots(
 
         # 6. Aggregate
         consolidated_slots = {} # "HH:00" -> SlotInfo
+        compact_courts = [] # v2
         
         for court_row in court_res:
             court = dict(court_row._mapping)
@@ -567,6 +650,10 @@ def get_venue_slots(
             # Fetch dynamic slot map which now includes aggregated occupancy from 'booking' table
             # Pass user_id to correctly exclude current user's own pending bookings from the mask
             allowed_slots_map = generate_allowed_slots_map(db, c_id, booking_date, user_id=str(current_user.id) if current_user else None)
+
+            if version == 2:
+                compact_courts.append(_compact_court_slots(court, allowed_slots_map))
+                continue
             
             # D. Merge to Consolidated
             for slot_time, details in allowed_slots_map.items():
@@ -627,6 +714,15 @@ def get_venue_slots(
                     }
                             
 
+        if version == 2:
+            return {
+                "venue_id": venue_id,
+                "date": date,
+                "version": 2,
+                "slot_minutes": 30,
+                "courts": compact_courts
+            }
+
         # Return all slots to allow frontend to show "Blocked" state
         final_slots = sorted(consolidated_slots.values(), key=lambda x: x['time'])
         
@@ -639,9 +735,48 @@ def get_venue_slots(
     except HTTPException as he: 
         raise he
     except Exception as e:
-        print(f"[VENUES API] Error: {e}")
+        logger.error(f"[VENUES API] Error: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{venue_id}/calendar")
+def get_venue_calendar(
+    venue_id: str,
+    start_date: Optional[str] = None,
+    days: int = Query(CALENDAR_MIN_DAYS, ge=CALENDAR_MIN_DAYS, le=CALENDAR_MAX_DAYS),
+    game_type: Optional[str] = None,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Per-day counts of free, partially free and full slots and the minimum
+    price for a venue (branch) over `days` days from start_date (default
+    today), for the date picker. See services/availability_calendar.py.
+    """
+    from date_utils import parse_date_safe
+
+    try:
+        uuid.UUID(venue_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Venue not found (Invalid ID)")
+
+    today = get_now_ist().date()
+    first = parse_date_safe(start_date, "%Y-%m-%d", "start_date") if start_date else today
+    if first < today:
+        raise HTTPException(status_code=400, detail="start_date is in the past")
+
+    branch = db.query(models.Branch).filter(models.Branch.id == venue_id).first()
+    if not branch:
+        raise HTTPException(status_code=404, detail="Venue or Branch not found")
+
+    try:
+        sport = game_type if game_type != "undefined" else None
+        return {
+            "venue_id": venue_id,
+            "game_type": sport,
+            "days": calendar_days(db, branch, first, days, sport),
+        }
+    except Exception as e:
+        logger.error(f"Error in get_venue_calendar: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{venue_id}/zones")
@@ -697,7 +832,7 @@ def get_venue_zones(
 
         return {"venue_id": venue_id, "zones": result}
     except Exception as e:
-        import traceback; traceback.print_exc()
+        logger.exception(f"[VENUES API] Error getting venue zones: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/seed", response_model=List[schemas.VenueResponse])
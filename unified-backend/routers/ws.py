@@ -5,6 +5,9 @@ import json
 from typing import Optional
 from jose import jwt
 from dependencies import SECRET_KEY, ALGORITHM
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     tags=["websockets"],
@@ -30,9 +33,9 @@ async def websocket_endpoint(
             try:
                 payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
                 identifier = payload.get("sub")
-                print(f"[WS] Authenticated user: {identifier}")
+                logger.info(f"[WS] Authenticated user: {identifier}")
             except Exception as e:
-                print(f"[WS] Auth Error for token {token[:10]}...: {e}")
+                logger.error(f"[WS] Auth Error for token {token[:10]}...: {e}")
                 identifier = token # Fallback
             
     
@@ -46,5 +49,5 @@ async def websocket_endpoint(
     except WebSocketDisconnect:
         manager.disconnect(str(identifier), websocket)
     except Exception as e:
-        print(f"[WS ERROR] {e}")
+        logger.error(f"[WS ERROR] {e}")
         manager.disconnect(str(identifier), websocket)
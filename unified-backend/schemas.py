@@ -1578,5 +1578,9 @@ class NotificationListResponse(BaseModel):
     items: List[NotificationResponse]
     unread_count: int
 
+class LogLevelUpdate(BaseModel):
+    logger: str = "root"
+    level: str
+
 # Resolve forward references
 User.update_forward_refs()
@@ -0,0 +1,122 @@
+"""
+Multi-day availability calendar.
+
+The user app's date picker shaded sold-out days by calling
+GET /venues/{id}/slots once per day, each call running the slot engine for
+every court of the branch. calendar_days() answers a whole 7-30 day range for
+one branch and sport with the partner availability engine
+(utils/availability_engine.py):
+
+- bookings, manual blocks and live Playo holds are read with one range query
+  each over first..last date (OccupancySnapshot.for_dates)
+- each court's day is reduced to a 48-bit mask of offered slots and one of
+  free slots; the branch's day is then a few bitwise folds over the courts
+
+A slot (30 min) of the day is
+
+- free       offered and free on every court that offers it
+- partial    free on some of those courts, taken on others
+- full       offered but taken on all of them
+
+A court slot is taken, as in GET /venues/{id}/slots, only when bookings,
+holds and blocks occupy all of the court's zones; a 2-zone turf with one half
+booked still has a free slot. A slot of a capacity court (pool, rink) is
+taken only once its bookings, holds and partial blocks fill capacity_limit
+places.
+
+min_price is the lowest hourly price among the free court slots of the day.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+import models
+from services.free_slots import free_mask
+from utils.availability_engine import (
+    OccupancySnapshot,
+    SLOTS_PER_DAY,
+    compile_price_vector,
+    load_global_price_rules,
+)
+from utils.booking_utils import get_now_ist
+
+CALENDAR_MIN_DAYS = 7
+CALENDAR_MAX_DAYS = 30
+
+
+def calendar_courts(db: Session, branch_id: Any, game_type: Optional[str] = None) -> List[models.Court]:
+    """
+    Active courts of the branch for the sport: its primary game type matches,
+    or it has sport slices of it (multi-sport courts), as in get_venue_slots.
+    """
+    query = db.query(models.Court).filter(models.Court.branch_id == branch_id, models.Court.is_active == True)
+    if game_type:
+        sport_ids = db.query(models.GameType.id).filter(models.GameType.name.ilike(f"%{game_type}%"))
+        sliced = db.query(models.SportSlice.court_id).filter(models.SportSlice.sport_id.in_(sport_ids))
+        query = query.filter(or_(models.Court.game_type_id.in_(sport_ids), models.Court.id.in_(sliced)))
+    return query.all()
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _all_zones_taken(snapshot: OccupancySnapshot, court: models.Court) -> List[bool]:
+    """Per slot: are all of the court's zones occupied?"""
+    full = (1 << (court.total_zones or 1)) - 1
+    return [(m & full) == full for m in snapshot.occupied_masks(court)]
+
+
+def summarize_day(day: date, court_vectors: List[tuple]) -> Dict[str, Any]:
+    """
+    Counts for one day from (prices, offered_mask, free_mask) per court.
+    free_mask must be a subset of offered_mask.
+    """
+    offered = any_free = 0
+    # Slots where no court offering them is taken
+    all_free = (1 << SLOTS_PER_DAY) - 1
+    min_price = None
+    for prices, offered_mask, court_free in court_vectors:
+        offered |= offered_mask
+        any_free |= court_free
+        all_free &= court_free | ~offered_mask
+        if court_free:
+            cheapest = min(prices[i] for i in range(SLOTS_PER_DAY) if court_free >> i & 1)
+            min_price = cheapest if min_price is None else min(min_price, cheapest)
+    all_free &= offered
+    return {
+        "date": day.isoformat(),
+        "free_slots": _popcount(all_free),
+        "partial_slots": _popcount(any_free & ~all_free),
+        "full_slots": _popcount(offered & ~any_free),
+        # Vector prices are per 30-min slot
+        "min_price": min_price * 2 if min_price is not None else None,
+    }
+
+
+def calendar_days(db: Session, branch: models.Branch, start_date: date, days: int,
+                  game_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Per-day slot counts and minimum price for start_date and the following days - 1 days."""
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    courts = calendar_courts(db, branch.id, game_type)
+    if not courts:
+        return [summarize_day(d, []) for d in dates]
+
+    global_rules = load_global_price_rules(db)
+    snapshots = OccupancySnapshot.for_dates(db, courts, dates, pending_orders_at=datetime.utcnow())
+    now_ist = get_now_ist()
+
+    result = []
+    for d in dates:
+        snapshot = snapshots[d]
+        court_vectors = []
+        for court in courts:
+            prices = compile_price_vector(court, branch, d, global_rules, now_ist)
+            hidden = snapshot.fully_blocked(court)
+            offered = free_mask(prices, [False] * SLOTS_PER_DAY, hidden)
+            court_vectors.append((prices, offered, free_mask(prices, _all_zones_taken(snapshot, court), hidden)))
+        result.append(summarize_day(d, court_vectors))
+    return result
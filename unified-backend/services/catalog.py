@@ -0,0 +1,271 @@
+"""
+Catalog snapshot.
+
+At cold start the apps fetched cities, game types, amenities, branches, FAQs,
+policies, CMS pages, site settings and the chatbot knowledge base from
+separate endpoints, each querying the database on every call. GET
+/api/user/catalog serves all of them as one bundle of CATALOG_SECTIONS, and
+a section is only read from the database again after it changed:
+
+- catalog_versions (models.CatalogVersion) holds a version counter per
+  section. The admin writes to a section's tables call bump_catalog() in
+  their transaction, so the counter moves together with the committed data
+- each process keeps the sections it built, with a content token (hash of
+  the section's JSON). A request reads the counters, one scan of a
+  nine-row table, and rebuilds only the sections whose counter moved or that
+  are older than CATALOG_MAX_AGE_SECONDS (writes made outside the API)
+- the bundle's ETag is derived from the section tokens, so If-None-Match
+  answers 304 without a body; ?have=section:token,... returns only the
+  sections whose token differs (per-section delta). The ETag is weak (W/):
+  the response envelope adds a per-request timestamp around the same bundle
+
+Settings (env):
+- CATALOG_MAX_AGE_SECONDS   rebuild a cached section at least this often (default 3600)
+
+Version counters are PostgreSQL only (ON CONFLICT upsert); on other databases
+sections are rebuilt every CATALOG_MAX_AGE_SECONDS.
+"""
+
+import hashlib
+import os
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+
+CATALOG_MAX_AGE_SECONDS = int(os.getenv("CATALOG_MAX_AGE_SECONDS", "3600"))
+
+CATALOG_SECTIONS = (
+    "cities", "game_types", "amenities", "branches", "faqs",
+    "policies", "cms_pages", "site_settings", "knowledge",
+)
+
+# Served by GET /api/user/settings until an admin saves the settings
+DEFAULT_SITE_SETTINGS = {
+    "id": "00000000-0000-0000-0000-000000000000",
+    "company_name": "Addrush Sports Private Limited",
+    "email": "support@myrush.in",
+    "contact_number": "",
+    "address": "",
+    "copyright_text": "",
+    "instagram_url": "",
+    "youtube_url": "",
+    "linkedin_url": "",
+    "site_logo": None
+}
+
+# Common questions for chatbot context (GET /api/chatbot/knowledge/faqs)
+CHATBOT_FAQS = [
+    {
+        "category": "Booking",
+        "question": "How do I book a court?",
+        "answer": "You can book a court by selecting your city, sport, and venue, then choosing a date and time slot. Payment is required to confirm the booking."
+    },
+    {
+        "category": "Cancellation",
+        "question": "What is the cancellation policy?",
+        "answer": "Free cancellation if done 24+ hours before the slot. 50% refund for cancellations between 12-24 hours. No refund for cancellations within 12 hours."
+    },
+    {
+        "category": "Payment",
+        "question": "What payment methods are accepted?",
+        "answer": "We accept UPI, Credit/Debit Cards, Net Banking, and Wallets."
+    },
+    {
+        "category": "Amenities",
+        "question": "Do you provide equipment?",
+        "answer": "Most venues offer equipment rental (rackets, balls, bibs) for a small fee. Check individual venue details."
+    },
+    {
+        "category": "Membership",
+        "question": "Are there membership plans?",
+        "answer": "Currently, we operate on a pay-per-play basis. Membership plans are coming soon!"
+    },
+    {
+        "category": "Support",
+        "question": "How do I contact support?",
+        "answer": "You can email us at support@myrush.in or call +91 9876543210 (9 AM - 9 PM)."
+    },
+    {
+        "category": "Rain Policy",
+        "question": "What if it rains during my outdoor booking?",
+        "answer": "For outdoor sports, if rain disrupts play, we offer a credit refund or rescheduling options. Please contact the venue manager immediately."
+    }
+]
+
+_BUMP = text("""
+    INSERT INTO catalog_versions (section, version, updated_at)
+    SELECT section, 1, now() AT TIME ZONE 'utc' FROM unnest(CAST(:sections AS text[])) AS section
+    ON CONFLICT (section) DO UPDATE SET
+        version = catalog_versions.version + 1,
+        updated_at = EXCLUDED.updated_at
+""")
+
+_lock = threading.Lock()
+# section -> {"version", "built_at", "token", "data"}, per process
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _enabled(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def bump_catalog(db: Session, *sections: str) -> None:
+    """
+    Moves the version of the given sections. Does not commit: call before the
+    admin write is committed so both land together.
+    """
+    unknown = set(sections) - set(CATALOG_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown catalog sections: {sorted(unknown)}")
+    if _enabled(db) and sections:
+        db.execute(_BUMP, {"sections": sorted(set(sections))})
+
+
+def invalidate_catalog() -> None:
+    """Drops this process's built sections (tests, maintenance scripts)."""
+    with _lock:
+        _cache.clear()
+
+
+def _dump(schema, rows: Iterable) -> List[Dict[str, Any]]:
+    return [schema.model_validate(row).model_dump(mode="json") for row in rows]
+
+
+def _cities(db: Session) -> List[Dict[str, Any]]:
+    """Active cities, each with its active areas."""
+    areas: Dict[Any, List[Dict[str, str]]] = {}
+    for area in db.query(models.Area).filter(models.Area.is_active == True).order_by(models.Area.name).all():
+        areas.setdefault(area.city_id, []).append({"id": str(area.id), "name": area.name})
+    cities = db.query(models.City).filter(models.City.is_active == True).order_by(models.City.name).all()
+    return [
+        {**schemas.City.model_validate(city).model_dump(mode="json"), "areas": areas.get(city.id, [])}
+        for city in cities
+    ]
+
+
+def _game_types(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.GameType, db.query(models.GameType).filter(
+        models.GameType.is_active == True
+    ).order_by(models.GameType.name).all())
+
+
+def _amenities(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.Amenity, db.query(models.Amenity).filter(
+        models.Amenity.is_active == True
+    ).order_by(models.Amenity.name).all())
+
+
+def _branches(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.BranchResponse, db.query(models.Branch).filter(
+        models.Branch.is_active == True
+    ).order_by(models.Branch.name).all())
+
+
+def _faqs(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.FAQResponse, db.query(models.FAQ).filter(
+        models.FAQ.is_active == True
+    ).order_by(models.FAQ.created_at).all())
+
+
+def _policies(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.AdminPolicy, db.query(models.AdminPolicy).filter(
+        models.AdminPolicy.is_active == True
+    ).order_by(models.AdminPolicy.type, models.AdminPolicy.name).all())
+
+
+def _cms_pages(db: Session) -> List[Dict[str, Any]]:
+    return _dump(schemas.CMSPageResponse, db.query(models.CMSPage).filter(
+        models.CMSPage.is_active == True
+    ).order_by(models.CMSPage.created_at.desc()).all())
+
+
+def _site_settings(db: Session) -> Dict[str, Any]:
+    settings = db.query(models.SiteSetting).first()
+    if not settings:
+        return DEFAULT_SITE_SETTINGS
+    return schemas.SiteSettingResponse.model_validate(settings).model_dump(mode="json")
+
+
+def _knowledge(db: Session) -> Dict[str, Any]:
+    """Chatbot platform stats and FAQs; cities, sports and amenities are their own sections."""
+    return {
+        "venue_count": db.query(models.Branch).filter(models.Branch.is_active == True).count(),
+        "city_count": db.query(models.City).filter(models.City.is_active == True).count(),
+        "faqs": CHATBOT_FAQS,
+    }
+
+
+_BUILDERS: Dict[str, Callable[[Session], Any]] = {
+    "cities": _cities,
+    "game_types": _game_types,
+    "amenities": _amenities,
+    "branches": _branches,
+    "faqs": _faqs,
+    "policies": _policies,
+    "cms_pages": _cms_pages,
+    "site_settings": _site_settings,
+    "knowledge": _knowledge,
+}
+
+
+def _token(data: Any) -> str:
+    return hashlib.sha256(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()[:16]
+
+
+def catalog_sections(db: Session, sections: Iterable[str] = CATALOG_SECTIONS) -> Dict[str, Dict[str, Any]]:
+    """The requested sections as {"token", "data"}, rebuilding those that changed."""
+    versions = {row.section: row.version for row in db.query(models.CatalogVersion).all()}
+    now = monotonic()
+    result = {}
+    for name in sections:
+        version = versions.get(name, 0)
+        with _lock:
+            cached = _cache.get(name)
+        if cached is None or cached["version"] != version or now - cached["built_at"] > CATALOG_MAX_AGE_SECONDS:
+            # The counter is read first: a write committed meanwhile rebuilds again next time
+            data = _BUILDERS[name](db)
+            cached = {"version": version, "built_at": now, "token": _token(data), "data": data}
+            with _lock:
+                _cache[name] = cached
+        result[name] = cached
+    return result
+
+
+def build_catalog(db: Session, sections: Iterable[str] = CATALOG_SECTIONS,
+                  have: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    The bundle: every requested section's token, and the data of those whose
+    token differs from the one in `have` (all of them without it).
+    """
+    have = have or {}
+    current = catalog_sections(db, sections)
+    return {
+        "tokens": {name: s["token"] for name, s in current.items()},
+        "sections": {name: s["data"] for name, s in current.items() if have.get(name) != s["token"]},
+    }
+
+
+def catalog_etag(bundle: Dict[str, Any]) -> str:
+    """Weak ETag of a bundle: its tokens and which sections it carries determine its content."""
+    key = ",".join(f"{name}:{token}" for name, token in sorted(bundle["tokens"].items()))
+    key += "|" + ",".join(sorted(bundle["sections"]))
+    return 'W/"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check; the comparison is weak (RFC 7232), so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or _opaque(etag) in (_opaque(c) for c in candidates)
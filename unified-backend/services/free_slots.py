@@ -0,0 +1,302 @@
+"""
+Free-slot bitmaps for cross-venue availability search.
+
+"Any free football court tomorrow at 19:00 in Bangalore" used to mean
+opening venue after venue, each running get_venue_slots and the full slot
+engine. court_free_slots (models.CourtFreeSlots) keeps one 48-bit mask per
+(court, date) for the next FREE_SLOTS_DAYS days, bit i set when the 30-min
+slot i is offered (venue hours, court timings, recurring unavailability) and
+free of bookings, manual blocks and live Playo holds anywhere in the court's
+shared group; a capacity court stays free until capacity_limit places are
+taken. A search is then one indexed query testing
+
+    free_mask & wanted = wanted
+
+over the courts of the date, sport and place.
+
+- Booking and block changes reach IntegrationOrchestrator.notify_inventory_range,
+  which calls mark_stale() for the court and its shared-group siblings in the
+  writer's transaction; the Playo endpoints and the hold reaper, which write
+  orders and bookings directly, call mark_stale_with_groups()
+- search_free_courts() recomputes the stale rows of the searched date before
+  answering, so a search never returns a court booked a moment ago
+- free_slots_job rebuilds the whole window every FREE_SLOTS_REBUILD_SECONDS,
+  which also covers price/timing edits and rolls the window forward
+
+Masks are computed with the partner availability engine
+(utils/availability_engine.py): one OccupancySnapshot and one price vector
+per court for all courts of a date.
+
+Settings (env):
+- FREE_SLOTS_DAYS              dates kept, from today (default 14)
+- FREE_SLOTS_REBUILD_SECONDS   pause between full rebuilds (default 900)
+
+PostgreSQL only (ON CONFLICT upserts, uuid arrays); elsewhere nothing is
+maintained and searches return no courts.
+"""
+
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from utils.availability_engine import (
+    OccupancySnapshot,
+    SLOTS_PER_DAY,
+    compile_price_vector,
+    load_global_price_rules,
+)
+from utils.booking_utils import get_now_ist
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+FREE_SLOTS_DAYS = int(os.getenv("FREE_SLOTS_DAYS", "14"))
+FREE_SLOTS_REBUILD_SECONDS = int(os.getenv("FREE_SLOTS_REBUILD_SECONDS", "900"))
+
+_MARK_STALE = text("""
+    UPDATE court_free_slots SET stale = true, change_seq = change_seq + 1
+    WHERE court_id = ANY(CAST(:court_ids AS uuid[])) AND slot_date = :slot_date
+""")
+
+# A row marked stale after its change_seq was read stays stale
+_UPSERT = text("""
+    INSERT INTO court_free_slots (court_id, slot_date, branch_id, game_type_id, free_mask, stale, change_seq, updated_at)
+    VALUES (:court_id, :slot_date, :branch_id, :game_type_id, :free_mask, false, :change_seq, now() AT TIME ZONE 'utc')
+    ON CONFLICT (court_id, slot_date) DO UPDATE SET
+        branch_id = EXCLUDED.branch_id,
+        game_type_id = EXCLUDED.game_type_id,
+        free_mask = EXCLUDED.free_mask,
+        stale = court_free_slots.change_seq <> EXCLUDED.change_seq,
+        updated_at = EXCLUDED.updated_at
+""")
+
+_SEARCH = """
+    SELECT
+        ab.id as venue_id,
+        ab.name as venue_name,
+        acity.name as city_name,
+        aa.name as area_name,
+        ac.id as court_id,
+        ac.name as court_name,
+        agt.name as game_type,
+        ac.price_per_hour
+    FROM court_free_slots fs
+    JOIN admin_courts ac ON ac.id = fs.court_id
+    JOIN admin_branches ab ON ab.id = fs.branch_id
+    JOIN admin_game_types agt ON agt.id = fs.game_type_id
+    LEFT JOIN admin_cities acity ON acity.id = ab.city_id
+    LEFT JOIN admin_areas aa ON aa.id = ab.area_id
+    WHERE fs.slot_date = :slot_date
+      AND (fs.free_mask & :wanted) = :wanted
+      AND ac.is_active = true AND ab.is_active = true
+"""
+
+
+def _enabled(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def window_mask(first_slot: int, slot_count: int) -> int:
+    """Bits first_slot .. first_slot + slot_count - 1."""
+    return ((1 << slot_count) - 1) << first_slot
+
+
+def free_mask(prices: List[Optional[float]], booked: List[bool], hidden: List[bool]) -> int:
+    """Bitmap of the slots that are priced (offered), not taken and not hidden by a full block."""
+    mask = 0
+    for i in range(SLOTS_PER_DAY):
+        if prices[i] is not None and not booked[i] and not hidden[i]:
+            mask |= 1 << i
+    return mask
+
+
+def mark_stale(db: Session, court_ids: Iterable[Any], slot_date: Any) -> None:
+    """
+    Flags the courts' bitmaps of one date for recomputation. Does not commit:
+    called from the transaction of the booking or block write. The UPDATE runs
+    in a savepoint, so a failure the caller logs and ignores does not abort
+    the writer's transaction.
+    """
+    if not _enabled(db):
+        return
+    court_ids = sorted({str(c) for c in court_ids if c})
+    if court_ids:
+        with db.begin_nested():
+            db.execute(_MARK_STALE, {"court_ids": court_ids, "slot_date": str(slot_date)})
+
+
+def mark_stale_with_groups(db: Session, court_dates: Iterable[tuple]) -> None:
+    """
+    mark_stale() for (court_id, date) pairs written outside the orchestrator
+    (Playo holds and bookings), widened to each court's shared-group siblings.
+    Does not commit; runs in a savepoint like mark_stale().
+    """
+    if not _enabled(db):
+        return
+    by_date: Dict[Any, set] = {}
+    for court_id, slot_date in court_dates:
+        if court_id and slot_date:
+            by_date.setdefault(slot_date, set()).add(str(court_id))
+    if not by_date:
+        return
+
+    with db.begin_nested():
+        court_ids = set().union(*by_date.values())
+        groups = {
+            str(row.id): row.shared_group_id
+            for row in db.query(models.Court.id, models.Court.shared_group_id).filter(
+                models.Court.id.in_(court_ids)
+            ).all()
+        }
+        group_ids = {g for g in groups.values() if g}
+        members: Dict[Any, set] = {}
+        if group_ids:
+            for row in db.query(models.Court.id, models.Court.shared_group_id).filter(
+                models.Court.shared_group_id.in_(group_ids)
+            ).all():
+                members.setdefault(row.shared_group_id, set()).add(str(row.id))
+
+        for slot_date, ids in sorted(by_date.items(), key=lambda item: str(item[0])):
+            targets = set(ids)
+            for court_id in ids:
+                targets |= members.get(groups.get(court_id), set())
+            mark_stale(db, targets, slot_date)
+
+
+def refresh_free_slots(db: Session, slot_date: date, court_ids: Optional[Iterable[Any]] = None,
+                       global_rules: List[tuple] = None) -> int:
+    """
+    Recomputes and upserts the bitmaps of one date for the given courts (all
+    active courts when None). Does not commit. Returns the rows written.
+    Inactive courts keep rows; searches skip them.
+    """
+    if not _enabled(db):
+        return 0
+    query = db.query(models.Court)
+    if court_ids is None:
+        query = query.filter(models.Court.is_active == True)
+    else:
+        court_ids = list(court_ids)
+        if not court_ids:
+            return 0
+        query = query.filter(models.Court.id.in_(court_ids))
+    courts = query.all()
+    if not courts:
+        return 0
+
+    # Read before the snapshot: a change committed after this read keeps its row stale
+    seqs = {
+        str(row.court_id): row.change_seq
+        for row in db.query(models.CourtFreeSlots.court_id, models.CourtFreeSlots.change_seq).filter(
+            models.CourtFreeSlots.slot_date == slot_date,
+            models.CourtFreeSlots.court_id.in_([c.id for c in courts])
+        ).all()
+    }
+    branches = {
+        b.id: b for b in db.query(models.Branch).filter(models.Branch.id.in_({c.branch_id for c in courts})).all()
+    }
+    global_rules = load_global_price_rules(db) if global_rules is None else global_rules
+    snapshot = OccupancySnapshot(db, courts, slot_date, pending_orders_at=datetime.utcnow())
+    now_ist = get_now_ist()
+
+    rows = []
+    for court in courts:
+        prices = compile_price_vector(court, branches.get(court.branch_id), slot_date, global_rules, now_ist)
+        rows.append({
+            "court_id": str(court.id),
+            "slot_date": slot_date,
+            "branch_id": str(court.branch_id),
+            "game_type_id": str(court.game_type_id),
+            "free_mask": free_mask(prices, snapshot.booked(court), snapshot.fully_blocked(court)),
+            "change_seq": seqs.get(str(court.id), 0),
+        })
+    db.execute(_UPSERT, rows)
+    return len(rows)
+
+
+def refresh_stale(db: Session, slot_date: date) -> int:
+    """Recomputes and commits the stale bitmaps of one date. Returns the rows written."""
+    if not _enabled(db):
+        return 0
+    stale_ids = [
+        row.court_id for row in db.query(models.CourtFreeSlots.court_id).filter(
+            models.CourtFreeSlots.slot_date == slot_date,
+            models.CourtFreeSlots.stale == True
+        ).all()
+    ]
+    if not stale_ids:
+        return 0
+    written = refresh_free_slots(db, slot_date, stale_ids)
+    db.commit()
+    return written
+
+
+def search_free_courts(db: Session, slot_date: date, first_slot: int, slot_count: int,
+                       game_type: Optional[str] = None, city: Optional[str] = None,
+                       area: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Active courts free for slots first_slot .. first_slot + slot_count - 1 of
+    slot_date, optionally of one sport (game type name) in one city / area.
+    """
+    if not _enabled(db):
+        return []
+    refresh_stale(db, slot_date)
+
+    query_sql = _SEARCH
+    params: Dict[str, Any] = {"slot_date": slot_date, "wanted": window_mask(first_slot, slot_count)}
+    if game_type:
+        query_sql += " AND LOWER(agt.name) = LOWER(:game_type)"
+        params["game_type"] = game_type.strip()
+    if city:
+        query_sql += " AND LOWER(acity.name) = LOWER(:city)"
+        params["city"] = city.strip()
+    if area:
+        query_sql += " AND LOWER(aa.name) = LOWER(:area)"
+        params["area"] = area.strip()
+    query_sql += " ORDER BY ab.name, ac.name LIMIT :limit"
+    params["limit"] = limit
+
+    return [dict(row._mapping) for row in db.execute(text(query_sql), params).fetchall()]
+
+
+def rebuild_free_slots() -> int:
+    """Recomputes every bitmap of the window (one commit per date) and drops past dates."""
+    db = SessionLocal()
+    try:
+        if not _enabled(db):
+            return 0
+        today = get_now_ist().date()
+        global_rules = load_global_price_rules(db)
+        written = 0
+        for offset in range(FREE_SLOTS_DAYS):
+            written += refresh_free_slots(db, today + timedelta(days=offset), global_rules=global_rules)
+            db.commit()
+        db.query(models.CourtFreeSlots).filter(models.CourtFreeSlots.slot_date < today).delete(synchronize_session=False)
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def free_slots_job():
+    """Scheduler loop: rebuilds the free-slot window every FREE_SLOTS_REBUILD_SECONDS."""
+    while True:
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(rebuild_free_slots)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Free-slot rebuild failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="free_slots")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="free_slots")
+        await asyncio.sleep(FREE_SLOTS_REBUILD_SECONDS)
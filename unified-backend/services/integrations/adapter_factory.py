@@ -4,18 +4,19 @@ from .district_adapter import DistrictAdapter
 
 class AdapterFactory:
     @staticmethod
-    def get_adapter(partner_name: str, partner_id: str, db: Session) -> BaseIntegrationAdapter:
+    def get_adapter(partner_name: str, partner_id: str, db: Session, partner=None) -> BaseIntegrationAdapter:
         """
         Unified factory for retrieving 3rd-party integration adapters.
         This allows the worker and orchestrator to be vendor-agnostic.
+        Pass the already loaded `partner` to spare the adapter its own lookup.
         """
         name_upper = partner_name.upper()
         
         if name_upper == "DISTRICT":
-            return DistrictAdapter(db, partner_id=partner_id)
+            return DistrictAdapter(db, partner_id=partner_id, partner=partner)
         
         # Placeholder for future vendors:
         # if name_upper == "PLAYO":
-        #     return PlayoAdapter(db, partner_id=partner_id)
+        #     return PlayoAdapter(db, partner_id=partner_id, partner=partner)
             
         raise ValueError(f"No integration adapter found for partner: {partner_name}")
@@ -9,9 +9,10 @@ class BaseIntegrationAdapter(ABC):
     Enforces a standard contract for checking availability, booking, and cancelling.
     """
     
-    def __init__(self, db: Session, partner_id: str):
+    def __init__(self, db: Session, partner_id: str, partner=None):
         self.db = db
         self.partner_id = partner_id
+        self.partner = partner
 
     @abstractmethod
     def check_availability(self, facility_name: str, sport_name: str, booking_date: str) -> Dict[str, Any]:
@@ -63,3 +64,21 @@ class BaseIntegrationAdapter(ABC):
         Handles vendor-specific authentication (e.g., HMAC for District, Bearer tokens).
         """
         pass
+
+    def prepare_webhook(self, url: str, payload: Dict[str, Any], custom_headers: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        First half of send_webhook: resolves credentials and headers (may use self.db).
+        Returns a request spec for transmit_webhook.
+        """
+        headers = {"Content-Type": "application/json"}
+        if custom_headers:
+            headers.update(custom_headers)
+        return {"url": url, "json": payload, "headers": headers}
+
+    def transmit_webhook(self, request: Dict[str, Any], timeout: float = 30) -> Any:
+        """
+        Second half of send_webhook: performs the HTTP call for a prepared request.
+        Must not touch self.db, since the outbox worker calls it from delivery threads.
+        """
+        from utils import http_client
+        return http_client.post(request["url"], json=request["json"], headers=request["headers"], timeout=timeout)
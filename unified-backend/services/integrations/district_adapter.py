@@ -4,9 +4,12 @@ from uuid import UUID
 import logging
 from datetime import datetime, date, time as dt_time, timedelta
 from .base_adapter import BaseIntegrationAdapter
+from . import partner_catalog
 import models
 import schemas_district
-from utils.booking_utils import generate_allowed_slots_map, get_booked_slots
+from utils.booking_utils import generate_allowed_slots_map, get_now_ist
+from utils.availability_engine import SLOTS_PER_DAY, OccupancySnapshot, compile_price_vector, load_global_price_rules
+from utils.metrics import SLOT_ENGINE_SECONDS, timed
 import json
 import uuid
 import re
@@ -22,14 +25,16 @@ class DistrictAdapter(BaseIntegrationAdapter):
 
     def _get_branch_by_facility_name(self, facility_name: str) -> models.Branch:
         """Helper to find venue by exact District facility Name string"""
-        branch = self.db.query(models.Branch).filter(models.Branch.name.ilike(facility_name)).first()
+        branch_id = partner_catalog.branch_id_for_name(self.db, facility_name)
+        branch = self._get_branch(branch_id) if branch_id is not None else None
         if not branch:
             raise ValueError(f"Facility Name '{facility_name}' not found in MyRush.")
         return branch
 
     def _get_game_type_by_sport_name(self, sport_name: str) -> models.GameType:
         """Helper to find sport by exact District sport Name string"""
-        st = self.db.query(models.GameType).filter(models.GameType.name.ilike(sport_name)).first()
+        game_type_id = partner_catalog.game_type_id_for_name(self.db, sport_name)
+        st = self.db.query(models.GameType).get(game_type_id) if game_type_id is not None else None
         if not st:
             raise ValueError(f"Sport Name '{sport_name}' not found in MyRush.")
         return st
@@ -62,11 +67,33 @@ class DistrictAdapter(BaseIntegrationAdapter):
             self.db.flush()
         return user
 
-    def __init__(self, db: Session, partner_id: str = None, skip_notifications: bool = False):
+    def __init__(self, db: Session, partner_id: str = None, skip_notifications: bool = False, partner: models.Partner = None):
         self.db = db
         self.partner_id = partner_id
+        self.partner = partner
         self.skip_notifications = skip_notifications
-
+        # Lookups memoised for the adapter's lifetime (one request, or one outbox batch)
+        self._branches = {}
+        self._courts = {}
+        self._inventory_contexts = {}  # (court_id, date) -> see _inventory_context
+
+    def _get_branch(self, branch_id) -> models.Branch:
+        key = str(branch_id)
+        if key not in self._branches:
+            self._branches[key] = self.db.query(models.Branch).get(branch_id)
+        return self._branches[key]
+
+    def _get_court(self, court_id) -> models.Court:
+        key = str(court_id)
+        if key not in self._courts:
+            self._courts[key] = self.db.query(models.Court).get(court_id)
+        return self._courts[key]
+
+    def _court_index(self, court: models.Court) -> int:
+        """District courtNumber: position of the court among its branch's courts of the same sport."""
+        return partner_catalog.court_index(self.db, court)
+
+    @timed(SLOT_ENGINE_SECONDS, stage="partner_availability")
     def check_availability(self, facility_name: str, sport_name: str, booking_date_str: str) -> Dict[str, Any]:
         """
         Implements GET /checkAvailability
@@ -87,121 +114,39 @@ class DistrictAdapter(BaseIntegrationAdapter):
         if not courts:
             return {"date": booking_date_str, "slot_data": []}
 
-        # Optimization 1: Pre-calculate availability maps
-        court_allowed_maps = {}
-        for court in courts:
-            court_allowed_maps[court.id] = generate_allowed_slots_map(self.db, court.id, target_date)
-
-        # Optimization 2: Fetch all bookings for the day for these courts AND their siblings in shared groups
-        court_ids = [c.id for c in courts]
-        
-        # Find siblings in shared groups
-        shared_group_ids = [UUID(str(c.shared_group_id)) for c in courts if c.shared_group_id]
-        if shared_group_ids:
-            all_relevant_courts = self.db.query(models.Court).filter(
-                models.Court.shared_group_id.in_(shared_group_ids)
-            ).all()
-            relevant_court_ids = [c.id for c in all_relevant_courts]
-            # Map for quick lookup: {sibling_id: parent_group_id}
-            sibling_to_group = {c.id: UUID(str(c.shared_group_id)) for c in all_relevant_courts}
-            court_id_to_obj = {c.id: c for c in all_relevant_courts}
-        else:
-            relevant_court_ids = court_ids
-            sibling_to_group = {}
-            court_id_to_obj = {c.id: c for c in courts}
+        # One occupancy snapshot for all courts (and shared-group siblings),
+        # one price vector per court; then a single pass over the 48 slots.
+        snapshot = OccupancySnapshot(self.db, courts, target_date)
+        global_rules = load_global_price_rules(self.db)
+        now_ist = get_now_ist()
 
-        all_bookings = self.db.query(models.Booking).filter(
-            models.Booking.court_id.in_(relevant_court_ids),
-            models.Booking.booking_date == target_date,
-            models.Booking.status.in_(['confirmed', 'pending', 'locked'])
-        ).all()
-
-        # New: Fetch manual admin blocks
-        manual_blocks = self.db.query(models.CourtBlock).filter(
-            models.CourtBlock.court_id.in_(relevant_court_ids),
-            models.CourtBlock.block_date == target_date
-        ).all()
-        
-        # Build lookup for blocks and bookings by court
-        blocks_by_court = {cid: [] for cid in relevant_court_ids}
-        for mb in manual_blocks:
-            blocks_by_court[mb.court_id].append(mb)
-        
-        # Build lookup for booked slots by court: {court_id: {slot_start_f: slice_mask}}
-        bookings_by_court_slots = {cid: {} for cid in relevant_court_ids}
-        for b in all_bookings:
-            for h in get_booked_slots([b]):
-                bookings_by_court_slots[b.court_id][h] = b.slice_mask or 0
+        capacity = branch.max_players if branch.max_players and sport.name.lower() in ['basketball', 'cricket', 'football'] else 1
+        columns = []
+        for idx, court in enumerate(courts):
+            prices = compile_price_vector(court, branch, target_date, global_rules, now_ist)
+            hidden = snapshot.fully_blocked(court)
+            columns.append((idx, court.name, prices, hidden, snapshot.booked(court)))
 
         slot_data_list = []
-        
-        for slot_num in range(0, 48):
-            h = slot_num // 2
-            m = (slot_num % 2) * 30
-            time_key = f"{h:02d}:{m:02d}"
-            slot_start_f = h + (m/60.0)
-            slot_start_time = dt_time(h, m)
-            
-            try:
-                court_entries = []
-                for idx, court in enumerate(courts):
-                    allowed_map = court_allowed_maps.get(court.id, {})
-                    if time_key not in allowed_map:
-                        continue
-                    
-                    # Check manual admin blocks (including siblings in shared group)
-                    is_manual_blocked = False
-                    relevant_block_court_ids = [court.id]
-                    if court.shared_group_id:
-                        c_group_id = UUID(str(court.shared_group_id))
-                        relevant_block_court_ids = [cid for cid, gid in sibling_to_group.items() if gid == c_group_id]
-                    
-                    for bc_id in relevant_block_court_ids:
-                        relevant_blocks = blocks_by_court.get(bc_id, [])
-                        court_mask = court.slice_mask or 1
-                        for block in relevant_blocks:
-                            if block.start_time <= slot_start_time < block.end_time:
-                                # Match by slice mask if present, otherwise assume it blocks the entire court
-                                block_mask = block.slice_mask if block.slice_mask is not None and block.slice_mask > 0 else (1 << (court.total_zones or 1)) - 1
-                                if (block_mask & court_mask) != 0:
-                                    is_manual_blocked = True; break
-                        if is_manual_blocked: break
-
-                    # Check bookings (including siblings)
-                    is_booked = False
-                    court_mask = court.slice_mask or 1
-                    for bc_id in relevant_block_court_ids:
-                        booked_mask = bookings_by_court_slots.get(bc_id, {}).get(slot_start_f)
-                        if booked_mask is not None:
-                            # If booked_mask is 0, it means entire court
-                            if booked_mask == 0:
-                                booked_mask = (1 << (court_id_to_obj.get(bc_id).total_zones or 1)) - 1
-                            
-                            if (booked_mask & court_mask) != 0:
-                                is_booked = True; break
-                        if is_booked: break
-                    
-                    is_booked = is_booked or is_manual_blocked
-                    
-                    capacity = branch.max_players if branch.max_players and sport.name.lower() in ['basketball', 'cricket', 'football'] else 1
-                    
-                    court_entries.append({
-                        "courtNumber": idx,
-                        "court_name": court.name,
-                        "price": float(allowed_map[time_key]['price']),
-                        "booked": is_booked,
-                        "capacity": capacity,
-                        "available": 0 if is_booked else capacity
-                    })
-                
-                if court_entries:
-                    slot_data_list.append({
-                        "slotNumber": slot_num,
-                        "slot_time": self._get_slot_time_string(slot_num),
-                        "courts": court_entries
-                    })
-            except Exception as e:
-                print(f"Error in availability loop for slot {slot_num}: {e}")
+        for slot_num in range(SLOTS_PER_DAY):
+            court_entries = [
+                {
+                    "courtNumber": idx,
+                    "court_name": name,
+                    "price": prices[slot_num],
+                    "booked": booked[slot_num],
+                    "capacity": capacity,
+                    "available": 0 if booked[slot_num] else capacity
+                }
+                for idx, name, prices, hidden, booked in columns
+                if prices[slot_num] is not None and not hidden[slot_num]
+            ]
+            if court_entries:
+                slot_data_list.append({
+                    "slotNumber": slot_num,
+                    "slot_time": self._get_slot_time_string(slot_num),
+                    "courts": court_entries
+                })
 
         return {
             "date": booking_date_str,
@@ -215,93 +160,85 @@ class DistrictAdapter(BaseIntegrationAdapter):
         target_branch = self._get_branch_by_facility_name(payload.facilityName)
         target_sport = self._get_game_type_by_sport_name(payload.sportName)
         
+        # Load and lock the facility's courts for this sport in one statement
         all_courts = self.db.query(models.Court).filter(
             models.Court.branch_id == target_branch.id,
             models.Court.game_type_id == target_sport.id
-        ).order_by(models.Court.created_at).all()
+        ).order_by(models.Court.created_at).with_for_update().all()
         
         if not all_courts:
             raise ValueError("No courts found for this facility/sport.")
 
-        # Lock unique courts involved
-        locked_court_ids = [c.id for c in all_courts]
-        self.db.query(models.Court).filter(models.Court.id.in_(locked_court_ids)).with_for_update().all()
-
-        user = self._get_or_create_partner_user(payload.userName, payload.userPhone, payload.userEmail)
-        
-        booking_ids = []
-        total_slots = 0
-        
         # Enforce 1-hour minimum: For District, this means at least 2 slots in the batch
         # (Though usually it should be 2 slots per specific court/date)
         if len(payload.slots) < 2:
              raise ValueError("Minimum booking duration is 1 hour (2 slots).")
 
+        # 1. Parse the whole batch and group it by date
+        requested = []  # (slot_req, court, target_date)
+        courts_by_date = {}
         for slot_req in payload.slots:
             try:
                 target_date = datetime.strptime(slot_req.date, '%d-%m-%Y').date()
             except ValueError:
                 target_date = datetime.strptime(slot_req.date, '%Y-%m-%d').date()
-            h = slot_req.slotNumber // 2
-            m = (slot_req.slotNumber % 2) * 30
-            time_key = f"{h:02d}:{m:02d}"
-            slot_start_f = h + (m/60.0)
-            
+            if not 0 <= slot_req.slotNumber < SLOTS_PER_DAY:
+                raise ValueError(f"Invalid slot number {slot_req.slotNumber}")
             if slot_req.courtNumber >= len(all_courts):
                 raise ValueError(f"Invalid court index {slot_req.courtNumber}")
-            
             court = all_courts[slot_req.courtNumber]
-            
-            allowed_map = generate_allowed_slots_map(self.db, court.id, target_date)
-            if time_key not in allowed_map:
-                raise ValueError(f"Slot {slot_req.slotNumber} ({time_key}) on {slot_req.date} is not available for {court.name}")
-            
-            # Conflict Check: Check this court AND siblings in same shared group
-            from uuid import UUID
-            conflict_court_ids = [court.id]
-            if court.shared_group_id:
-                group_id = UUID(str(court.shared_group_id))
-                conflict_court_ids = [c[0] for c in self.db.query(models.Court.id).filter(models.Court.shared_group_id == group_id).all()]
-
-            # Check for existing bookings
-            active_bookings = self.db.query(models.Booking).filter(
-                models.Booking.court_id.in_(conflict_court_ids),
-                models.Booking.booking_date == target_date,
-                models.Booking.status.in_(['confirmed', 'pending'])
-            ).all()
-            
-            for b in active_bookings:
-                if slot_start_f in get_booked_slots([b]):
-                    # Simple rule: if any sibling has a 'Full Court' booking (mask 0), it's a conflict.
-                    # If it's the same court, it's a conflict.
-                    if b.court_id == court.id or not b.slice_mask:
-                        raise ValueError(f"Conflict: Slot {slot_req.slotNumber} on {slot_req.date} for {court.name} is blocked by booking on {b.court_id}")
-                    # If we had slice-specific logic for District here, we'd check masks.
-                    # For now, if they share a group, we assume conflict to be safe.
-                    raise ValueError(f"Conflict: Shared Group Slot occupied by {b.court_id}")
-
-            # Check for existing manual blocks
-            active_blocks = self.db.query(models.CourtBlock).filter(
-                models.CourtBlock.court_id.in_(conflict_court_ids),
-                models.CourtBlock.block_date == target_date
-            ).all()
-            for ab in active_blocks:
-                if ab.start_time <= dt_time(h, m) < ab.end_time:
-                    raise ValueError(f"Conflict: Slot {slot_req.slotNumber} on {slot_req.date} is under a Manual Block.")
-
-            price = allowed_map[time_key]['price']
+            requested.append((slot_req, court, target_date))
+            courts_by_date.setdefault(target_date, {})[court.id] = court
+
+        # 2. One occupancy snapshot per date, one price vector per (court, date)
+        global_rules = load_global_price_rules(self.db)
+        now_ist = get_now_ist()
+        snapshots = {d: OccupancySnapshot(self.db, courts.values(), d) for d, courts in courts_by_date.items()}
+        vectors = {}
+        for d, courts in courts_by_date.items():
+            for court in courts.values():
+                vectors[(court.id, d)] = (
+                    compile_price_vector(court, target_branch, d, global_rules, now_ist),
+                    snapshots[d].fully_blocked(court),
+                    snapshots[d].block_covered(court),
+                    snapshots[d].occupied_masks(court),
+                )
+
+        # 3. Validate every slot in memory before writing anything
+        taken = set()  # (shared group, date, slot) claimed earlier in this batch
+        for slot_req, court, target_date in requested:
+            i = slot_req.slotNumber
+            time_key = f"{i // 2:02d}:{(i % 2) * 30:02d}"
+            prices, hidden, block_covered, occupied = vectors[(court.id, target_date)]
+            if prices[i] is None or hidden[i]:
+                raise ValueError(f"Slot {i} ({time_key}) on {slot_req.date} is not available for {court.name}")
+            if block_covered[i]:
+                raise ValueError(f"Conflict: Slot {i} on {slot_req.date} is under a Manual Block.")
+            # Any booking in the shared group holds the slot, whatever its slices
+            claim = (OccupancySnapshot.group_key(court), target_date, i)
+            if occupied[i] or claim in taken:
+                raise ValueError(f"Conflict: Slot {i} on {slot_req.date} for {court.name} is already booked")
+            taken.add(claim)
+
+        # 4. Insert the whole batch with one flush
+        user = self._get_or_create_partner_user(payload.userName, payload.userPhone, payload.userEmail)
+        # Metadata tag for batch tracking
+        source_tag = f"district|{batch_id}"
+        court_indexes = {c.id: idx for idx, c in enumerate(all_courts)}
+        blocked_slots = {}  # (court_id, date) -> slot starts, notified after the insert
+        bookings = []
+        for slot_req, court, target_date in requested:
+            i = slot_req.slotNumber
+            h, m = i // 2, (i % 2) * 30
             ehh = int(h + (m+30)//60)
             emm = (m+30) % 60
-            
-            # Metadata tag for batch tracking
-            source_tag = f"district|{batch_id}"
-            
-            booking = models.Booking(
+            price = vectors[(court.id, target_date)][0][i]
+            bookings.append(models.Booking(
                 user_id=user.id,
                 court_id=court.id,
                 booking_date=target_date,
                 time_slots=[{
-                    "start": time_key,
+                    "start": f"{h:02d}:{m:02d}",
                     "end": f"{ehh:02d}:{emm:02d}",
                     "price": float(price)
                 }],
@@ -315,59 +252,47 @@ class DistrictAdapter(BaseIntegrationAdapter):
                 _old_end_time=dt_time(ehh % 24, emm),
                 _old_duration_minutes=30,
                 _old_price_per_hour=float(price * 2) # Store logical hourly rate
-            )
-            self.db.add(booking)
-            self.db.flush()
-            booking_ids.append(str(booking.id))
-            total_slots += 1
-
-            # INTEGRATION TRIGGER
-            if not self.skip_notifications:
+            ))
+            blocked_slots.setdefault((str(court.id), str(target_date)), []).append(i * 0.5)
+        self.db.add_all(bookings)
+        self.db.flush()
+
+        # INTEGRATION TRIGGER (one coalesced event per court/date)
+        if not self.skip_notifications:
+            from .orchestrator import IntegrationOrchestrator
+            for (court_id, date_str), slot_starts in blocked_slots.items():
                 try:
-                    from .orchestrator import IntegrationOrchestrator
-                    IntegrationOrchestrator.notify_inventory_change(
-                        db=self.db, 
-                        court_id=str(court.id), 
-                        date=str(target_date), 
-                        slot_start=slot_start_f, 
+                    IntegrationOrchestrator.notify_inventory_range(
+                        db=self.db,
+                        court_id=court_id,
+                        date=date_str,
+                        slot_starts=slot_starts,
                         action='block'
                     )
                 except Exception as e:
-                    print(f"[DISTRICT] Trigger failed: {e}")
+                    logger.warning(f"[DISTRICT] Trigger failed: {e}")
 
         self.db.commit()
         
-        # Prepare detailed response for each booking
+        # Detailed response for each booking, from the rows just written
         bookings_detail = []
-        for b_id in booking_ids:
-            b_obj = self.db.query(models.Booking).get(b_id)
-            if b_obj:
-                c_obj = self.db.query(models.Court).get(b_obj.court_id)
-                # Find court index
-                c_idx = 0
-                for i, c in enumerate(all_courts):
-                    if c.id == c_obj.id:
-                        c_idx = i
-                        break
-                
-                s_num = (b_obj._old_start_time.hour * 2) if b_obj._old_start_time else 0
-                
-                bookings_detail.append({
-                    "bookingId": str(b_obj.id),
-                    "facilityName": target_branch.name,
-                    "courtName": c_obj.name,
-                    "courtNumber": c_idx,
-                    "date": b_obj.booking_date.strftime('%d-%m-%Y'),
-                    "slotTime": self._get_slot_time_string(s_num),
-                    "slotNumber": s_num,
-                    "status": b_obj.status
-                })
+        for booking, (slot_req, court, target_date) in zip(bookings, requested):
+            bookings_detail.append({
+                "bookingId": str(booking.id),
+                "facilityName": target_branch.name,
+                "courtName": court.name,
+                "courtNumber": court_indexes[court.id],
+                "date": target_date.strftime('%d-%m-%Y'),
+                "slotTime": self._get_slot_time_string(slot_req.slotNumber),
+                "slotNumber": slot_req.slotNumber,
+                "status": "confirmed"
+            })
 
         return {
             "message": "Batch booking successful!",
-            "bookingIDs": booking_ids,
+            "bookingIDs": [str(b.id) for b in bookings],
             "batchBookingId": batch_id,
-            "totalSlots": total_slots,
+            "totalSlots": len(bookings),
             "bookings": bookings_detail
         }
 
@@ -406,6 +331,7 @@ class DistrictAdapter(BaseIntegrationAdapter):
         cancelled_details = []
         total_cancelled = 0
         total_refund = 0.0
+        released_slots = {}  # (court_id, date) -> slot starts, notified after the loop
 
         for b in bookings:
             b.status = 'cancelled'
@@ -413,19 +339,8 @@ class DistrictAdapter(BaseIntegrationAdapter):
             refund_amount = float(b.total_amount or 0)
             total_refund += refund_amount
             
-            # INTEGRATION TRIGGER
-            if not self.skip_notifications:
-                try:
-                    from .orchestrator import IntegrationOrchestrator
-                    slot_start_f = (b._old_start_time.hour + b._old_start_time.minute/60.0) if b._old_start_time else 0.0
-                    IntegrationOrchestrator.notify_inventory_change(
-                        db=self.db, 
-                        court_id=str(b.court_id), 
-                        date=str(b.booking_date), 
-                        slot_start=slot_start_f, 
-                        action='available'
-                    )
-                except Exception: pass
+            slot_start_f = (b._old_start_time.hour + b._old_start_time.minute/60.0) if b._old_start_time else 0.0
+            released_slots.setdefault((str(b.court_id), str(b.booking_date)), []).append(slot_start_f)
 
             slot_num = (b._old_start_time.hour * 2) if b._old_start_time else 0
             
@@ -448,6 +363,20 @@ class DistrictAdapter(BaseIntegrationAdapter):
                 "cancelled": True
             })
 
+        # INTEGRATION TRIGGER (one coalesced event per court/date)
+        if not self.skip_notifications:
+            from .orchestrator import IntegrationOrchestrator
+            for (court_id, date_str), slot_starts in released_slots.items():
+                try:
+                    IntegrationOrchestrator.notify_inventory_range(
+                        db=self.db,
+                        court_id=court_id,
+                        date=date_str,
+                        slot_starts=slot_starts,
+                        action='available'
+                    )
+                except Exception: pass
+
         self.db.commit()
 
         return {
@@ -478,9 +407,12 @@ class DistrictAdapter(BaseIntegrationAdapter):
         Executes the HTTP POST request to District's callback endpoint.
         Uses simple API-KEY + Basic auth headers (NOT HMAC — that's for inbound gateway).
         """
-        import requests as http_requests
-        
-        partner = self.db.query(models.Partner).get(self.partner_id)
+        return self.transmit_webhook(self.prepare_webhook(url, payload, custom_headers))
+
+    def prepare_webhook(self, url: str, payload: Dict[str, Any], custom_headers: Dict[str, Any] = None) -> Dict[str, Any]:
+        if self.partner is None:
+            self.partner = self.db.query(models.Partner).get(self.partner_id)
+        partner = self.partner
         if not partner:
             raise ValueError(f"Partner {self.partner_id} not found for webhook transmission.")
 
@@ -493,16 +425,27 @@ class DistrictAdapter(BaseIntegrationAdapter):
         }
         if custom_headers:
             headers.update(custom_headers)
-        
+        return {"url": url, "json": payload, "headers": headers}
+
+    def transmit_webhook(self, request: Dict[str, Any], timeout: float = 30) -> Any:
+        from utils import http_client
+
+        url, payload = request["url"], request["json"]
         logger.info(f"[DISTRICT WEBHOOK] POST {url}")
-        logger.info(f"[DISTRICT WEBHOOK] Payload: {json.dumps(payload, indent=2)[:500]}")
-        
-        response = http_requests.post(url, json=payload, headers=headers, timeout=30)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[DISTRICT WEBHOOK] Payload: {json.dumps(payload, indent=2)[:500]}")
+
+        response = http_client.post(url, json=payload, headers=request["headers"], timeout=timeout)
         logger.info(f"[DISTRICT WEBHOOK] Response: {response.status_code} {response.text[:300]}")
         return response
 
     def format_inventory_webhook(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Maps internal change to District Type B specific date webhook"""
+        """
+        Maps internal change to District Type B specific date webhook.
+        One body carries every slot of the event (`slot_starts`; legacy events
+        have a single `slot_start`). Court index, prices and capacity usage are
+        computed once per court/date, not per slot.
+        """
         date_val = event_data['date']
         if isinstance(date_val, str):
             try:
@@ -511,109 +454,128 @@ class DistrictAdapter(BaseIntegrationAdapter):
                 target_date_obj = datetime.strptime(date_val, '%d-%m-%Y')
         else:
             target_date_obj = date_val
+        target_date = target_date_obj.date() if isinstance(target_date_obj, datetime) else target_date_obj
 
-        date_str = target_date_obj.strftime('%d-%m-%Y')
-        
-        branch = self.db.query(models.Branch).get(event_data['branch_id'])
-        court = self.db.query(models.Court).get(event_data['court_id'])
-        
-        if not branch or not court:
+        context = self._inventory_context(event_data['branch_id'], event_data['court_id'], target_date)
+        if context is None:
             logger.warning(f"Skipping webhook: branch={event_data.get('branch_id')} court={event_data.get('court_id')} not found")
             return {}
 
-        all_courts = self.db.query(models.Court).filter(
-            models.Court.branch_id == branch.id,
-            models.Court.game_type_id == court.game_type_id
-        ).order_by(models.Court.created_at).all()
-        
-        court_index = 0
-        for i, c in enumerate(all_courts):
-            if str(c.id) == str(court.id):
-                court_index = i
-                break
-        
-        slot_start = event_data['slot_start']
-        slot_idx = int(slot_start * 2)
-        
-        # Calculate remaining capacity for the slot
-        from utils.booking_utils import safe_parse_time_float
-        from sqlalchemy import or_
-        from datetime import time as dt_time
-        
-        h = int(slot_start)
-        m = int((slot_start % 1) * 60)
-        slot_time = dt_time(h, m)
-        
+        branch, court = context["branch"], context["court"]
+        slot_starts = event_data.get('slot_starts')
+        if slot_starts is None:
+            slot_starts = [event_data['slot_start']]
+
+        # Calculate day of week (0=Monday in Python, but District uses 0=Sunday convention)
+        day_of_week = target_date.weekday()  # 0=Mon, 6=Sun
+        # Convert to District's convention (0=Sun, 1=Mon, ..., 6=Sat)
+        district_day = (day_of_week + 1) % 7
+
+        webhook_data = []
+        for slot_start in sorted(slot_starts):
+            h = int(slot_start)
+            m = int((slot_start % 1) * 60)
+
+            if court.logic_type == 'capacity':
+                # Remaining capacity for the slot
+                final_count = max(0, context["total_cap"] - context["used"](slot_start, dt_time(h, m)))
+            else:
+                # Standard binary availability
+                final_count = 0 if event_data['action'] == 'block' else 1
+
+            price_entry = context["allowed_map"].get(f"{h:02d}:{m:02d}")
+            webhook_data.append({
+                "courtNumber": str(context["court_index"]),
+                "slotNumber": str(int(slot_start * 2)),
+                "count": str(final_count),
+                "sport": court.game_type.name,
+                "facilityName": branch.name,
+                "day": str(district_day),
+                "price": float(price_entry.get('price', 0)) if price_entry else 0
+            })
+
+        return {
+            "sourceType": "inventory",
+            "action": event_data['action'],
+            "data": webhook_data,
+            "timestamp": int(datetime.utcnow().timestamp()),
+            "requestId": f"req-B-{uuid.uuid4().hex[:8]}"
+        }
+
+    def _inventory_context(self, branch_id: str, court_id: str, target_date: date):
+        """
+        Per-court/date lookups for inventory webhooks, memoised on the adapter
+        (the outbox worker uses one adapter per partner per batch).
+        """
+        key = (str(court_id), target_date)
+        if key in self._inventory_contexts:
+            return self._inventory_contexts[key]
+
+        branch = self._get_branch(branch_id)
+        court = self._get_court(court_id)
+        if not branch or not court:
+            self._inventory_contexts[key] = None
+            return None
+
+        context = {
+            "branch": branch,
+            "court": court,
+            "court_index": self._court_index(court),
+            "allowed_map": generate_allowed_slots_map(self.db, court.id, target_date),
+        }
+
         if court.logic_type == 'capacity':
+            from utils.booking_utils import safe_parse_time_float
+            from sqlalchemy import or_
+
             total_cap = court.capacity_limit or 1
-            
-            # Sum Admin Blocks
+
+            # Admin Blocks and User Bookings for the day, loaded once
             blocks = self.db.query(models.CourtBlock).filter(
                 models.CourtBlock.court_id == court.id,
-                models.CourtBlock.block_date == target_date_obj.date(),
-                models.CourtBlock.start_time <= slot_time,
-                models.CourtBlock.end_time > slot_time
+                models.CourtBlock.block_date == target_date
             ).all()
-            blocked_sum = sum((b.blocked_capacity if b.blocked_capacity is not None else total_cap) for b in blocks)
-            
-            # Sum User Bookings
+            block_ranges = [
+                (b.start_time, b.end_time, b.blocked_capacity if b.blocked_capacity is not None else total_cap)
+                for b in blocks
+            ]
+
             bookings = self.db.query(models.Booking).filter(
                 models.Booking.court_id == court.id,
-                models.Booking.booking_date == target_date_obj.date(),
+                models.Booking.booking_date == target_date,
                 or_(models.Booking.status.is_(None), models.Booking.status.notin_(['cancelled', 'failed', 'refunded']))
             ).all()
-            
-            booked_sum = 0
+            booking_ranges = []
             for bk in bookings:
-                t_slots = bk.time_slots or []
-                for s in t_slots:
+                ranges = []
+                for s in (bk.time_slots or []):
                     try:
-                        s_f = safe_parse_time_float(s.get('start_time') or s.get('time') or s.get('start'))
-                        e_f = safe_parse_time_float(s.get('end_time') or s.get('end'))
-                        if s_f <= slot_start < e_f:
-                            booked_sum += getattr(bk, 'num_tickets', 1) or 1
-                            break
+                        ranges.append((
+                            safe_parse_time_float(s.get('start_time') or s.get('time') or s.get('start')),
+                            safe_parse_time_float(s.get('end_time') or s.get('end'))
+                        ))
                     except: continue
-            
-            final_count = max(0, total_cap - (blocked_sum + booked_sum))
-        else:
-            # Standard binary availability
-            final_count = 0 if event_data['action'] == 'block' else 1
+                if ranges:
+                    booking_ranges.append((ranges, getattr(bk, 'num_tickets', 1) or 1))
 
-        # Calculate day of week (0=Monday in Python, but District uses 0=Sunday convention)
-        day_of_week = target_date_obj.weekday()  # 0=Mon, 6=Sun
-        # Convert to District's convention (0=Sun, 1=Mon, ..., 6=Sat)
-        district_day = (day_of_week + 1) % 7
+            def used(slot_start: float, slot_time: dt_time) -> int:
+                blocked_sum = sum(cap for start, end, cap in block_ranges if start <= slot_time < end)
+                # A booking counts once per slot even if its time_slots overlap
+                booked_sum = sum(
+                    tickets for ranges, tickets in booking_ranges
+                    if any(s_f <= slot_start < e_f for s_f, e_f in ranges)
+                )
+                return blocked_sum + booked_sum
 
-        # Get price for this slot
-        from utils.booking_utils import generate_allowed_slots_map
-        allowed_map = generate_allowed_slots_map(self.db, court.id, target_date_obj.date() if hasattr(target_date_obj, 'date') else target_date_obj)
-        slot_price = 0
-        price_key = f"{h}:{m:02d}"
-        if price_key in allowed_map:
-            slot_price = float(allowed_map[price_key].get('price', 0))
-
-        webhook_data = [{
-            "courtNumber": str(court_index),
-            "slotNumber": str(slot_idx),
-            "count": str(final_count),
-            "sport": court.game_type.name,
-            "facilityName": branch.name,
-            "day": str(district_day),
-            "price": slot_price
-        }]
+            context["total_cap"] = total_cap
+            context["used"] = used
 
-        return {
-            "sourceType": "inventory",
-            "action": event_data['action'],
-            "data": webhook_data,
-            "timestamp": int(datetime.utcnow().timestamp()),
-            "requestId": f"req-B-{uuid.uuid4().hex[:8]}"
-        }
+        self._inventory_contexts[key] = context
+        return context
 
     def format_court_schedule_webhook_raw(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Wraps the court object logic for the OutboxWorker which passes raw IDs."""
-        court = self.db.query(models.Court).get(event_data['court_id'])
+        court = self._get_court(event_data['court_id'])
         return self.format_court_schedule_webhook(court, event_data['action'])
 
     def format_court_schedule_webhook(self, court: models.Court, action: str) -> Dict[str, Any]:
@@ -623,19 +585,10 @@ class DistrictAdapter(BaseIntegrationAdapter):
         """
         branch = court.branch
         if not branch:
-            branch = self.db.query(models.Branch).get(court.branch_id)
-            
-        all_courts = self.db.query(models.Court).filter(
-            models.Court.branch_id == branch.id,
-            models.Court.game_type_id == court.game_type_id
-        ).order_by(models.Court.created_at).all()
-        
-        court_index = 0
-        for i, c in enumerate(all_courts):
-            if str(c.id) == str(court.id):
-                court_index = i
-                break
-        
+            branch = self._get_branch(court.branch_id)
+
+        court_index = self._court_index(court)
+
         webhook_data = []
         for day in range(7):
             for hour in range(24):
@@ -664,20 +617,10 @@ class DistrictAdapter(BaseIntegrationAdapter):
 
     def format_recurring_webhook(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Maps internal change to District Type A recurring modification"""
-        branch = self.db.query(models.Branch).get(event_data['branch_id'])
-        court = self.db.query(models.Court).get(event_data['court_id'])
-        
-        all_courts = self.db.query(models.Court).filter(
-            models.Court.branch_id == branch.id,
-            models.Court.game_type_id == court.game_type_id
-        ).order_by(models.Court.created_at).all()
-        
-        court_index = 0
-        for i, c in enumerate(all_courts):
-            if str(c.id) == str(court.id):
-                court_index = i
-                break
-        
+        branch = self._get_branch(event_data['branch_id'])
+        court = self._get_court(event_data['court_id'])
+        court_index = self._court_index(court)
+
         slot_start = event_data['slot_start']
         hour = int(slot_start)
         slot_indices = [hour * 2, hour * 2 + 1]
@@ -712,21 +655,12 @@ class DistrictAdapter(BaseIntegrationAdapter):
         if not booking:
             raise ValueError(f"Booking ID {booking_id} not found.")
         
-        court = self.db.query(models.Court).get(booking.court_id)
-        branch = self.db.query(models.Branch).get(court.branch_id)
-        
+        court = self._get_court(booking.court_id)
+        branch = self._get_branch(court.branch_id)
+
         # Find court count/index
-        all_courts = self.db.query(models.Court).filter(
-            models.Court.branch_id == branch.id,
-            models.Court.game_type_id == court.game_type_id
-        ).order_by(models.Court.created_at).all()
-        
-        court_index = 0
-        for i, c in enumerate(all_courts):
-            if c.id == court.id:
-                court_index = i
-                break
-        
+        court_index = self._court_index(court)
+
         slot_num = (booking._old_start_time.hour * 2) if booking._old_start_time else 0
         
         return {
@@ -762,20 +696,9 @@ class DistrictAdapter(BaseIntegrationAdapter):
         history = []
         for b in bookings:
             # We can reuse the logic from get_booking_status but simplified
-            c_obj = self.db.query(models.Court).get(b.court_id)
-            
-            # Sub-optimal but works for history volume
-            all_courts_of_type = self.db.query(models.Court).filter(
-                models.Court.branch_id == branch.id,
-                models.Court.game_type_id == c_obj.game_type_id
-            ).order_by(models.Court.created_at).all()
-            
-            c_idx = 0
-            for i, c in enumerate(all_courts_of_type):
-                if c.id == c_obj.id:
-                    c_idx = i
-                    break
-            
+            c_obj = self._get_court(b.court_id)
+            c_idx = self._court_index(c_obj)
+
             s_num = (b._old_start_time.hour * 2) if b._old_start_time else 0
             
             history.append({
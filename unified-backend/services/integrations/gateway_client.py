@@ -35,6 +35,8 @@ from urllib.parse import urlparse
 from typing import Optional, Dict, Any
 
 import requests
+
+from utils import http_client
 # Not loading .env here as credentials should be passed explicitly.
 
 logger = logging.getLogger("DistrictGatewayClient")
@@ -173,7 +175,7 @@ class DistrictGatewayClient:
         logger.info(f"[GATEWAY] X-Timestamp: {headers['X-Timestamp']}")
         logger.info(f"[GATEWAY] X-Signature: {headers['X-Signature'][:16]}...")
 
-        response = requests.get(
+        response = http_client.get(
             url,
             params=params,
             headers=headers,
@@ -223,7 +225,7 @@ class DistrictGatewayClient:
 
         if json_data is not None:
             headers["Content-Type"] = "application/json"
-            response = requests.post(
+            response = http_client.post(
                 url,
                 json=json_data,
                 headers=headers,
@@ -231,14 +233,14 @@ class DistrictGatewayClient:
             )
         elif form_data is not None:
             headers["Content-Type"] = "application/x-www-form-urlencoded"
-            response = requests.post(
+            response = http_client.post(
                 url,
                 data=form_data,
                 headers=headers,
                 timeout=self.timeout,
             )
         else:
-            response = requests.post(
+            response = http_client.post(
                 url,
                 headers=headers,
                 timeout=self.timeout,
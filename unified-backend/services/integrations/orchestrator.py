@@ -4,6 +4,7 @@ import logging
 import models
 from .district_adapter import DistrictAdapter
 from .outbox_service import OutboxService
+from services.free_slots import mark_stale
 
 logger = logging.getLogger("IntegrationOrchestrator")
 
@@ -16,6 +17,19 @@ class IntegrationOrchestrator:
         Date: YYYY-MM-DD
         slot_start: 0.0, 0.5, ..., 23.5
         """
+        IntegrationOrchestrator.notify_inventory_range(db, court_id, date, [slot_start], action, blocked_capacity)
+
+    @staticmethod
+    def notify_inventory_range(db: Session, court_id: str, date: str, slot_starts: List[float], action: str, blocked_capacity: int = None):
+        """
+        Same as notify_inventory_change for several 30-min slots of one court/date
+        (a booking, a cancellation, a manual block range).
+        Queues one event per partner per affected court, merged with any
+        undelivered event for the same court/date (see OutboxService.queue_inventory_slots).
+        """
+        if not slot_starts:
+            return
+
         # Use db.get for direct lookup (standard in 2.x, works in 1.4+)
         try:
             court = db.get(models.Court, court_id) if hasattr(db, 'get') else db.query(models.Court).get(court_id)
@@ -38,8 +52,15 @@ class IntegrationOrchestrator:
             ).all()
             target_court_ids = [str(court.id)] + [str(s.id) for s in siblings]
 
+        # Cross-venue availability bitmaps of the group are recomputed on next read
+        try:
+            mark_stale(db, target_court_ids, date)
+        except Exception as e:
+            logger.error(f"Failed to mark free slots stale for court {court_id} on {date}: {e}")
+
         partners = db.query(models.Partner).filter(models.Partner.is_active == True).all()
-        
+        slot_starts = sorted({float(s) for s in slot_starts})
+
         for partner in partners:
             try:
                 # 1. Validation Logic
@@ -59,15 +80,15 @@ class IntegrationOrchestrator:
                         "branch_id": str(court.branch_id),
                         "court_id": t_court_id,
                         "date": date,
-                        "slot_start": slot_start,
+                        "slot_starts": slot_starts,
                         "action": action,
                         "blocked_capacity": blocked_capacity
                     }
-                    
-                    # 3. Queue the RAW event
-                    OutboxService.queue_inventory_update(db, str(partner.id), event_data, category="availability")
-                    logger.info(f"Queued RAW {action} event for {partner.name} - Court: {t_court_id}, Slot: {slot_start}")
-                
+
+                    # 3. Queue (or merge) the RAW event
+                    OutboxService.queue_inventory_slots(db, str(partner.id), event_data)
+                    logger.info(f"Queued RAW {action} event for {partner.name} - Court: {t_court_id}, Slots: {slot_starts}")
+
             except Exception as e:
                 logger.error(f"Failed to queue inventory update for partner {partner.name}: {e}")
 
@@ -115,19 +136,22 @@ class IntegrationOrchestrator:
             if e_f <= s_f: # Handle midnight crossover or errors
                 e_f = 24.0
             
-            # Iterate through 30-min slots
+            # All 30-min slots of the block go out as one event per partner/court
+            slot_starts = []
             curr = s_f
             while curr < e_f:
-                IntegrationOrchestrator.notify_inventory_change(
-                    db=db,
-                    court_id=str(block.court_id),
-                    date=str(block.block_date),
-                    slot_start=curr,
-                    action=action,
-                    blocked_capacity=block.blocked_capacity
-                )
+                slot_starts.append(curr)
                 curr += 0.5
-                
+
+            IntegrationOrchestrator.notify_inventory_range(
+                db=db,
+                court_id=str(block.court_id),
+                date=str(block.block_date),
+                slot_starts=slot_starts,
+                action=action,
+                blocked_capacity=block.blocked_capacity
+            )
+
             logger.info(f"Synchronized manual {action} for Court {block.court_id} on {block.block_date}")
             
         except Exception as e:
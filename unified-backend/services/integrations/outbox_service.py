@@ -6,7 +6,7 @@ from typing import Any, Dict
 
 class OutboxService:
     @staticmethod
-    def queue_inventory_update(db: Session, partner_id: str, payload: Dict[str, Any], category: str = "availability"):
+    def queue_inventory_update(db: Session, partner_id: str, payload: Dict[str, Any], category: str = "availability", coalesce_key: str = None):
         """
         Queues an inventory update event for a specific partner.
         Called by core booking/court logic whenever availability changes.
@@ -16,6 +16,7 @@ class OutboxService:
             event_type="INVENTORY_UPDATE",
             category=category,
             payload=payload,
+            coalesce_key=coalesce_key,
             status="pending",
             next_attempt_at=datetime.utcnow(),
             attempts=0,
@@ -25,6 +26,57 @@ class OutboxService:
         db.flush()
         return event
 
+    @staticmethod
+    def inventory_coalesce_key(court_id: str, date: str, action: str) -> str:
+        return f"{court_id}:{date}:{action}"
+
+    @staticmethod
+    def queue_inventory_slots(db: Session, partner_id: str, event_data: Dict[str, Any]):
+        """
+        Queues an availability change covering several slots of one court/date.
+
+        Slots are merged into an undelivered event with the same
+        (partner, court, date, action) instead of creating one row per slot, and
+        removed from a pending event with the opposite action so only the latest
+        state of each slot is sent. Rows a worker has already claimed or locked
+        are left alone; a new event is created instead.
+        """
+        slot_starts = sorted({float(s) for s in event_data["slot_starts"]})
+        action = event_data["action"]
+        key = OutboxService.inventory_coalesce_key(event_data["court_id"], event_data["date"], action)
+        opposite = "available" if action == "block" else "block"
+        opposite_key = OutboxService.inventory_coalesce_key(event_data["court_id"], event_data["date"], opposite)
+
+        pending = db.query(models.OutboxEvent).filter(
+            models.OutboxEvent.partner_id == partner_id,
+            models.OutboxEvent.category == "availability",
+            models.OutboxEvent.status == "pending",
+            models.OutboxEvent.attempts == 0,
+            models.OutboxEvent.coalesce_key.in_([key, opposite_key])
+        ).order_by(models.OutboxEvent.created_at).with_for_update(skip_locked=True).all()
+
+        event = None
+        for existing in pending:
+            if existing.coalesce_key == opposite_key:
+                remaining = [s for s in existing.payload.get("slot_starts", []) if s not in slot_starts]
+                if not remaining:
+                    db.delete(existing)
+                else:
+                    existing.payload = {**existing.payload, "slot_starts": remaining}
+            elif event is None:
+                event = existing
+
+        if event is not None:
+            merged = sorted(set(event.payload.get("slot_starts", [])) | set(slot_starts))
+            # Reassign (not mutate) so the JSONB column is flagged dirty
+            event.payload = {**event.payload, **event_data, "slot_starts": merged}
+            db.flush()
+            return event
+
+        return OutboxService.queue_inventory_update(
+            db, partner_id, {**event_data, "slot_starts": slot_starts}, category="availability", coalesce_key=key
+        )
+
     @staticmethod
     def queue_event_for_all_partners(db: Session, event_type: str, payload_factory: Any):
         """
@@ -1,145 +1,351 @@
+"""
+Outbox worker: delivers queued partner webhooks (integration_outbox_events).
+
+Each poll:
+1. claims a batch with SELECT ... FOR UPDATE SKIP LOCKED and marks it
+   'processing' in the same transaction, so any number of worker processes can
+   run side by side without delivering an event twice;
+2. folds availability events for the same partner/court/date/action into one;
+3. formats payloads and resolves headers on the worker's DB session;
+4. transmits through a bounded thread pool, capped per partner;
+5. writes every status change and integration log in one commit.
+
+Events left in 'processing' by a crashed worker are reclaimed after
+OUTBOX_LEASE_SECONDS. Polling is adaptive: a full batch is followed by the next
+claim straight away, while empty polls back off up to OUTBOX_MAX_POLL_SECONDS.
+
+Run with: python services/integrations/outbox_worker.py
+"""
+
+import os
+import random
+import signal
+import threading
 import time
-import requests
-import json
-import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 from database import SessionLocal
 import models
-from services.integrations.gateway_client import DistrictGatewayClient
+from services.integrations.outbox_service import OutboxService
+from utils.metrics import OUTBOX_PENDING, OUTBOX_LAG_SECONDS, OUTBOX_DELIVERY_SECONDS
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("OutboxWorker")
+from utils.logger import get_logger
 
+logger = get_logger("OutboxWorker")
 
-def process_outbox():
-    """
-    Main loop for processing integration outbox events.
-    Usually run as a standalone process or a cron job.
-    """
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "16"))
+OUTBOX_PARTNER_CONCURRENCY = int(os.getenv("OUTBOX_PARTNER_CONCURRENCY", "4"))
+OUTBOX_HTTP_TIMEOUT_SECONDS = float(os.getenv("OUTBOX_HTTP_TIMEOUT_SECONDS", "30"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_MIN_POLL_SECONDS = float(os.getenv("OUTBOX_MIN_POLL_SECONDS", "0.5"))
+OUTBOX_MAX_POLL_SECONDS = float(os.getenv("OUTBOX_MAX_POLL_SECONDS", "30"))
+
+_executor = None
+_executor_lock = threading.Lock()
+_partner_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def collect_outbox_metrics():
+    """Refreshes outbox depth/lag gauges; registered as a /metrics collector."""
     db = SessionLocal()
     try:
-        # 1. Get pending or failed events ready for retry
-        now = datetime.utcnow()
-        events = db.query(models.OutboxEvent).filter(
+        depth, oldest = db.query(
+            func.count(models.OutboxEvent.id), func.min(models.OutboxEvent.created_at)
+        ).filter(
             models.OutboxEvent.status.in_(['pending', 'failed']),
-            models.OutboxEvent.next_attempt_at <= now,
             models.OutboxEvent.attempts < models.OutboxEvent.max_attempts
-        ).limit(50).all()
+        ).one()
+    finally:
+        db.close()
+    OUTBOX_PENDING.set(depth or 0)
+    OUTBOX_LAG_SECONDS.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0)
 
-        if not events:
-            return
 
-        logger.info(f"Processing {len(events)} outbox events...")
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OUTBOX_CONCURRENCY, thread_name_prefix="outbox")
+        return _executor
 
-        for event in events:
-            partner = event.partner
-            if not partner:
-                logger.warning(f"Event {event.id} skipped: Partner not found")
-                event.status = 'failed'
-                db.commit()
-                continue
 
-            # Resolve the target webhook URL: Configure -> Fallback -> Error
-            target_url = None
-            if event.category:
-                config = db.query(models.PartnerWebhookConfig).filter(
-                    models.PartnerWebhookConfig.partner_id == partner.id,
-                    models.PartnerWebhookConfig.event_name == event.category,
-                    models.PartnerWebhookConfig.is_active == True
-                ).first()
-                if config:
-                    target_url = config.webhook_url
-            
-            if not target_url:
-                target_url = partner.webhook_url
-
-            if not target_url:
-                logger.warning(f"Event {event.id} skipped: No destination URL found (Category: {event.category})")
-                event.status = 'failed'
-                db.commit()
-                continue
+def _partner_semaphore(partner_id) -> threading.BoundedSemaphore:
+    key = str(partner_id)
+    with _executor_lock:
+        if key not in _partner_semaphores:
+            _partner_semaphores[key] = threading.BoundedSemaphore(OUTBOX_PARTNER_CONCURRENCY)
+        return _partner_semaphores[key]
+
+
+class _Delivery:
+    __slots__ = ("event", "partner", "adapter", "request")
+
+    def __init__(self, event, partner, adapter, request):
+        self.event = event
+        self.partner = partner
+        self.adapter = adapter
+        self.request = request
+
+
+class PartnerContext:
+    """
+    Everything resolved once per partner for a batch: the partner row, its
+    adapter (which memoises branch/court/court-index lookups across the
+    batch's events) and the webhook target per event category.
+    """
+    __slots__ = ("partner", "adapter", "targets")
+
+    def __init__(self, partner, adapter, targets):
+        self.partner = partner
+        self.adapter = adapter
+        self.targets = targets
+
+    def target(self, category):
+        """(url, extra_headers) for an event category: Configure -> Fallback -> None."""
+        url, headers = self.targets.get(category, (None, None))
+        return url or self.partner.webhook_url, headers or {}
+
+
+def load_partner_contexts(db: Session, partner_ids) -> Dict[Any, PartnerContext]:
+    """Two queries for the whole batch, regardless of how many events it holds."""
+    from services.integrations.adapter_factory import AdapterFactory
+
+    partners = db.query(models.Partner).filter(models.Partner.id.in_(set(partner_ids))).all()
+    targets: Dict[Any, Dict[str, Any]] = {p.id: {} for p in partners}
+    for config in db.query(models.PartnerWebhookConfig).filter(
+        models.PartnerWebhookConfig.partner_id.in_(list(targets)),
+        models.PartnerWebhookConfig.is_active == True
+    ).all():
+        targets[config.partner_id][config.event_name] = (config.webhook_url, config.headers)
+
+    contexts = {}
+    for partner in partners:
+        try:
+            adapter = AdapterFactory.get_adapter(partner.name, str(partner.id), db, partner=partner)
+        except ValueError:
+            adapter = None
+        contexts[partner.id] = PartnerContext(partner, adapter, targets[partner.id])
+    return contexts
+
 
-            # 2. Update status to processing
-            event.status = 'processing'
-            event.last_attempt_at = datetime.utcnow()
-            event.attempts += 1
-            db.commit()
-
-            try:
-                # 3. Resolve Adapter and Send Webhook
-                logger.info(f"Sending {event.event_type} ({event.category}) for {partner.name} to {target_url}")
-                
-                # GET ADAPTER via Factory
-                from services.integrations.adapter_factory import AdapterFactory
-                try:
-                    adapter = AdapterFactory.get_adapter(partner.name, str(partner.id), db)
-                except ValueError as e:
-                    logger.error(f"No adapter for {partner.name}: {e}")
-                    event.status = 'failed'
-                    event.error_message = str(e)
-                    db.commit()
-                    continue
-
-                # FETCH CUSTOM HEADERS (if any)
-                # Re-fetch config to get headers (safest)
-                extra_headers = {}
-                if event.category:
-                    config = db.query(models.PartnerWebhookConfig).filter(
-                        models.PartnerWebhookConfig.partner_id == partner.id,
-                        models.PartnerWebhookConfig.event_name == event.category,
-                        models.PartnerWebhookConfig.is_active == True
-                    ).first()
-                    if config and config.headers:
-                        extra_headers = config.headers
-
-                # TRANSLATE PAYLOAD (Raw MyRush -> Vendor JSON)
-                formatted_payload = adapter.format_webhook_payload(event.category, event.payload)
-
-                # TRANSMIT (Delegated to Adapter for protocol details like HMAC)
-                response = adapter.send_webhook(
-                    url=target_url,
-                    payload=formatted_payload,
-                    custom_headers=extra_headers
-                )
-
-                # 4. Handle Response & Logging
-                try:
-                    res_body = response.json()
-                except:
-                    res_body = {"raw": response.text[:2000]}
-
-                # Log for observability (Target URL is fully resolved)
-                log = models.IntegrationLog(
-                    partner_id=partner.id,
-                    direction='OUTBOUND',
-                    endpoint=target_url, 
-                    method='POST',
-                    request_payload=formatted_payload,
-                    response_status=response.status_code,
-                    response_payload=res_body
-                )
-                db.add(log)
-
-                if 200 <= response.status_code < 300:
-                    logger.info(f"Event {event.id} delivered successfully.")
-                    event.status = 'completed'
-                    event.error_message = None
-                else:
-                    logger.error(f"Event {event.id} failed with status {response.status_code}")
-                    event.error_message = f"HTTP {response.status_code}: {response.text[:500]}"
-                    _handle_failure(event)
-
-            except Exception as e:
-                logger.error(f"Error processing event {event.id}: {e}", exc_info=True)
-                event.error_message = str(e)
+def claim_batch(db: Session, limit: int = OUTBOX_BATCH_SIZE) -> List[models.OutboxEvent]:
+    """
+    Atomically claims up to `limit` due events for this worker. Rows locked by
+    another worker are skipped rather than waited on.
+    """
+    now = datetime.utcnow()
+    lease_expired = now - timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    events = db.query(models.OutboxEvent).filter(
+        or_(
+            and_(
+                models.OutboxEvent.status.in_(['pending', 'failed']),
+                models.OutboxEvent.next_attempt_at <= now,
+                models.OutboxEvent.attempts < models.OutboxEvent.max_attempts
+            ),
+            and_(
+                models.OutboxEvent.status == 'processing',
+                models.OutboxEvent.last_attempt_at < lease_expired
+            )
+        )
+    ).order_by(models.OutboxEvent.next_attempt_at).limit(limit).with_for_update(skip_locked=True).all()
+
+    claimed = []
+    for event in events:
+        if event.status == 'processing':
+            logger.warning(f"Event {event.id} reclaimed after its delivery lease expired")
+            if (event.attempts or 0) >= (event.max_attempts or 0):
+                event.error_message = event.error_message or "Delivery lease expired"
                 _handle_failure(event)
-            
-            db.commit()
+                continue
+        event.status = 'processing'
+        event.last_attempt_at = now
+        event.attempts = (event.attempts or 0) + 1
+        claimed.append(event)
+
+    db.commit()
+    return claimed
+
+
+def _coalesce_events(events: List[models.OutboxEvent]) -> List[models.OutboxEvent]:
+    """
+    Folds claimed availability events with the same partner, court, date and
+    action into the oldest of them, so the partner gets one multi-slot webhook.
+    Such duplicates exist when a change was queued while an earlier event was
+    locked by a worker, or were queued one slot per row before coalescing.
+    The absorbed events are completed; their slots ride on the kept event.
+    """
+    kept: Dict[Any, models.OutboxEvent] = {}
+    result = []
+    for event in events:
+        payload = event.payload or {}
+        key = None
+        if event.category == "availability" and payload.get("court_id"):
+            key = (event.partner_id, event.coalesce_key or OutboxService.inventory_coalesce_key(
+                payload["court_id"], payload.get("date"), payload.get("action")))
+        if key is None:
+            result.append(event)
+            continue
 
+        slots = payload.get("slot_starts")
+        if slots is None:
+            slots = [payload["slot_start"]] if payload.get("slot_start") is not None else []
+
+        primary = kept.get(key)
+        if primary is None:
+            kept[key] = event
+            if "slot_starts" not in payload:
+                event.payload = {**payload, "slot_starts": slots}
+            result.append(event)
+            continue
+
+        merged = sorted(set(primary.payload["slot_starts"]) | set(slots))
+        primary.payload = {**primary.payload, "slot_starts": merged}
+        event.status = 'completed'
+        event.error_message = f"Merged into event {primary.id}"
+    return result
+
+
+def _prepare_deliveries(db: Session, events: List[models.OutboxEvent]) -> List[_Delivery]:
+    """Resolves URL, adapter, payload and headers for each event (DB work, worker thread)."""
+    contexts = load_partner_contexts(db, {event.partner_id for event in events})
+
+    deliveries = []
+    for event in events:
+        context = contexts.get(event.partner_id)
+        if not context:
+            logger.warning(f"Event {event.id} skipped: Partner not found")
+            event.error_message = "Partner not found"
+            _handle_failure(event)
+            continue
+        partner = context.partner
+
+        target_url, extra_headers = context.target(event.category)
+        if not target_url:
+            logger.warning(f"Event {event.id} skipped: No destination URL found (Category: {event.category})")
+            event.error_message = f"No destination URL for category {event.category}"
+            _handle_failure(event)
+            continue
+
+        try:
+            if context.adapter is None:
+                raise ValueError(f"No integration adapter found for partner: {partner.name}")
+
+            # TRANSLATE PAYLOAD (Raw MyRush -> Vendor JSON) and resolve headers/auth
+            formatted_payload = context.adapter.format_webhook_payload(event.category, event.payload)
+            request = context.adapter.prepare_webhook(target_url, formatted_payload, extra_headers)
+        except Exception as e:
+            logger.error(f"Error preparing event {event.id} for {partner.name}: {e}", exc_info=True)
+            event.error_message = str(e)
+            _handle_failure(event)
+            continue
+
+        deliveries.append(_Delivery(event, partner, context.adapter, request))
+    return deliveries
+
+
+def _transmit(delivery: _Delivery):
+    """Runs in the delivery pool. Returns (response, error, elapsed_seconds)."""
+    with _partner_semaphore(delivery.partner.id):
+        started = time.perf_counter()
+        try:
+            response = delivery.adapter.transmit_webhook(delivery.request, timeout=OUTBOX_HTTP_TIMEOUT_SECONDS)
+            return response, None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+
+def _apply_result(delivery: _Delivery, response, error, elapsed: float):
+    """Updates the event from its delivery outcome; returns an IntegrationLog or None."""
+    event, partner = delivery.event, delivery.partner
+
+    if error is not None:
+        OUTBOX_DELIVERY_SECONDS.observe(elapsed, partner=partner.name, outcome="exception")
+        logger.error(f"Error processing event {event.id}: {error}", exc_info=error)
+        event.error_message = str(error)
+        _handle_failure(event)
+        return None
+
+    try:
+        res_body = response.json()
+    except Exception:
+        res_body = {"raw": response.text[:2000]}
+
+    if 200 <= response.status_code < 300:
+        OUTBOX_DELIVERY_SECONDS.observe(elapsed, partner=partner.name, outcome="success")
+        logger.info(f"Event {event.id} delivered successfully.")
+        event.status = 'completed'
+        event.error_message = None
+    else:
+        OUTBOX_DELIVERY_SECONDS.observe(elapsed, partner=partner.name, outcome="http_error")
+        logger.error(f"Event {event.id} failed with status {response.status_code}")
+        event.error_message = f"HTTP {response.status_code}: {response.text[:500]}"
+        _handle_failure(event)
+
+    # Log for observability (Target URL is fully resolved)
+    return models.IntegrationLog(
+        partner_id=partner.id,
+        direction='OUTBOUND',
+        endpoint=delivery.request["url"],
+        method='POST',
+        request_payload=delivery.request["json"],
+        response_status=response.status_code,
+        response_payload=res_body
+    )
+
+
+def process_outbox(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Claims and delivers one batch of due outbox events.
+    Returns the number of events claimed (0 when nothing was due).
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        events = claim_batch(db, batch_size)
+        if not events:
+            return 0
+
+        logger.info(f"Processing {len(events)} outbox events...")
+        deliveries = _prepare_deliveries(db, _coalesce_events(events))
+        results = list(_get_executor().map(_transmit, deliveries))
+
+        logs = []
+        for delivery, (response, error, elapsed) in zip(deliveries, results):
+            log = _apply_result(delivery, response, error, elapsed)
+            if log is not None:
+                logs.append(log)
+        db.add_all(logs)
+        db.commit()
+        return len(events)
     finally:
         db.close()
 
+
+def run_worker(stop_event: threading.Event = None):
+    """Polls until stop_event is set, backing off while the outbox is empty."""
+    stop_event = stop_event or threading.Event()
+    delay = OUTBOX_MIN_POLL_SECONDS
+    while not stop_event.is_set():
+        try:
+            processed = process_outbox()
+        except Exception as e:
+            logger.error(f"Worker loop error: {e}", exc_info=True)
+            processed = 0
+
+        if processed >= OUTBOX_BATCH_SIZE:
+            # More work is likely waiting
+            continue
+        if processed:
+            delay = OUTBOX_MIN_POLL_SECONDS
+        else:
+            delay = min(delay * 2, OUTBOX_MAX_POLL_SECONDS)
+        # Jitter keeps several workers from polling in lockstep
+        stop_event.wait(delay * random.uniform(0.8, 1.2))
+
+
 def _handle_failure(event: models.OutboxEvent):
     """Calculates exponential backoff for retries and marks as dead if threshold reached"""
     # User Defined Backoff: Attempt 1 = 5m wait, Attempt 2 = 15m, Attempt 3 = 1h, Attempt 4 = 4h
@@ -167,9 +373,8 @@ def _handle_failure(event: models.OutboxEvent):
 
 if __name__ == "__main__":
     logger.info("Outbox worker started...")
-    while True:
-        try:
-            process_outbox()
-        except Exception as e:
-            logger.error(f"Worker loop error: {e}")
-        time.sleep(30) # Wait 30 seconds between polls
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run_worker(stop)
+    logger.info("Outbox worker stopped.")
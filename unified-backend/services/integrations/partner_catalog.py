@@ -0,0 +1,103 @@
+"""
+Partner catalog cache.
+
+Partner APIs address venues and sports by name ("facilityName", "sportName")
+and courts by position ("courtNumber" = index among the branch's courts of
+that sport, oldest first). Resolving those used to cost an ilike scan per
+name and a court listing per call, on every partner request. The mapping only
+changes when an admin edits branches, courts or sports, so it is kept here
+per process:
+
+- facility name -> branch id
+- sport name -> game type id
+- (branch id, game type id) -> court ids ordered by created_at
+
+Only ids are cached (ORM objects belong to a session); callers load rows by
+primary key. Admin writes call invalidate_partner_catalog(); the TTL covers
+other worker processes, which do not see that call.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import models
+
+PARTNER_CATALOG_TTL_SECONDS = int(os.getenv("PARTNER_CATALOG_TTL_SECONDS", "300"))
+
+_lock = threading.Lock()
+# key -> (value, expires_at)
+_entries: Dict[tuple, Tuple[Any, float]] = {}
+
+
+def _get(key: tuple):
+    with _lock:
+        entry = _entries.get(key)
+        if entry and time.monotonic() < entry[1]:
+            return entry[0]
+        _entries.pop(key, None)
+    return None
+
+
+def _put(key: tuple, value) -> None:
+    with _lock:
+        _entries[key] = (value, time.monotonic() + PARTNER_CATALOG_TTL_SECONDS)
+
+
+def invalidate_partner_catalog() -> None:
+    """Call after branches, courts or game types are created, renamed, toggled or deleted."""
+    with _lock:
+        _entries.clear()
+
+
+def branch_id_for_name(db: Session, facility_name: str):
+    """Id of the branch whose name matches case-insensitively, or None (misses are not cached)."""
+    key = ("branch", facility_name.lower())
+    branch_id = _get(key)
+    if branch_id is None:
+        row = db.query(models.Branch.id).filter(models.Branch.name.ilike(facility_name)).first()
+        if row is None:
+            return None
+        branch_id = row.id
+        _put(key, branch_id)
+    return branch_id
+
+
+def game_type_id_for_name(db: Session, sport_name: str):
+    """Id of the game type whose name matches case-insensitively, or None (misses are not cached)."""
+    key = ("sport", sport_name.lower())
+    game_type_id = _get(key)
+    if game_type_id is None:
+        row = db.query(models.GameType.id).filter(models.GameType.name.ilike(sport_name)).first()
+        if row is None:
+            return None
+        game_type_id = row.id
+        _put(key, game_type_id)
+    return game_type_id
+
+
+def court_order(db: Session, branch_id, game_type_id) -> List[str]:
+    """Ids of every court of the branch and sport, active or not, oldest first."""
+    key = ("courts", str(branch_id), str(game_type_id))
+    order = _get(key)
+    if order is None:
+        rows = db.query(models.Court.id).filter(
+            models.Court.branch_id == branch_id,
+            models.Court.game_type_id == game_type_id
+        ).order_by(models.Court.created_at).all()
+        order = [str(row.id) for row in rows]
+        _put(key, order)
+    return order
+
+
+def court_index(db: Session, court: models.Court) -> int:
+    """District courtNumber: position of the court among its branch's courts of the same sport."""
+    court_id = str(court.id)
+    for i, cid in enumerate(court_order(db, court.branch_id, court.game_type_id)):
+        if cid == court_id:
+            return i
+    return 0
+
@@ -0,0 +1,94 @@
+"""
+Playo availability on the shared occupancy engine.
+
+Playo polls /playo/availability for a venue, sport and date far more often
+than any other partner endpoint, and every order or booking item re-checks
+its slots. Each court used to run its own booking, Playo order and block
+queries plus a full generate_allowed_slots_map; now one PlayoAvailability
+answers for all courts of a date:
+
+- one OccupancySnapshot (bookings, manual blocks, shared-group siblings and
+  unexpired pending Playo orders) for every court involved
+- one price vector per court from compile_price_vector()
+- hold() marks an accepted order item as taken, so the next items of the
+  same request are validated against it without going back to the database
+
+Playo only sees 06:00-23:00 (PLAYO_FIRST_SLOT to PLAYO_END_SLOT).
+"""
+
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+import models
+from utils.availability_engine import (
+    OccupancySnapshot,
+    SLOTS_PER_DAY,
+    compile_price_vector,
+    load_global_price_rules,
+    slot_span,
+)
+from utils.booking_utils import get_now_ist
+
+# 06:00 and 23:00 as 30-min slot indices (end exclusive)
+PLAYO_FIRST_SLOT = 12
+PLAYO_END_SLOT = 46
+
+
+def _slot_time(index: int) -> str:
+    return time((index // 2) % 24, (index % 2) * 30).strftime('%H:%M:%S')
+
+
+class PlayoAvailability:
+    """Offered, free and priced slots of one date for a set of courts of a venue."""
+
+    def __init__(self, db: Session, branch: Optional[models.Branch], courts: Iterable[models.Court],
+                 booking_date: date, global_rules: List[tuple] = None, now: datetime = None):
+        self.courts = list(courts)
+        self.booking_date = booking_date
+        self.snapshot = OccupancySnapshot(
+            db, self.courts, booking_date, pending_orders_at=now or datetime.utcnow()
+        )
+        global_rules = load_global_price_rules(db) if global_rules is None else global_rules
+        now_ist = get_now_ist()
+        self._prices: Dict[object, List[Optional[float]]] = {}
+        for court in self.courts:
+            prices = compile_price_vector(court, branch, booking_date, global_rules, now_ist)
+            hidden = self.snapshot.fully_blocked(court)
+            self._prices[court.id] = [None if hidden[i] else prices[i] for i in range(SLOTS_PER_DAY)]
+
+    def free(self, court: models.Court) -> List[bool]:
+        """Per slot: offered to Playo, priced and not taken."""
+        prices, booked = self._prices[court.id], self.snapshot.booked(court)
+        return [
+            PLAYO_FIRST_SLOT <= i < PLAYO_END_SLOT and prices[i] is not None and not booked[i]
+            for i in range(SLOTS_PER_DAY)
+        ]
+
+    def slots(self, court: models.Court) -> List[dict]:
+        """The court's 06:00-23:00 slots in the PlayoSlot shape."""
+        prices, free = self._prices[court.id], self.free(court)
+        return [
+            {
+                'startTime': _slot_time(i),
+                'endTime': _slot_time(i + 1),
+                'available': free[i],
+                'price': prices[i] if free[i] else None,
+                'ticketsAvailable': 1 if free[i] else 0,
+            }
+            for i in range(PLAYO_FIRST_SLOT, PLAYO_END_SLOT)
+        ]
+
+    def is_free(self, court: models.Court, start: time, end: time) -> bool:
+        """Is every 30-min slot of [start, end) free? Off-grid windows never are."""
+        span = slot_span(start, end)
+        if span is None:
+            return False
+        free = self.free(court)
+        return all(free[i] for i in span)
+
+    def hold(self, court: models.Court, start: time, end: time) -> None:
+        """Takes [start, end) for the rest of this snapshot's checks."""
+        self.snapshot.hold(court, slot_span(start, end) or [])
+
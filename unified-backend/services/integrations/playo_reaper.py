@@ -0,0 +1,91 @@
+"""
+Reaper for expired Playo holds.
+
+POST /playo/orders holds slots with a pending PlayoOrder that expires after
+15 minutes unless Playo confirms it. Expiry used to be implicit: readers
+filtered on expires_at > now and the row stayed 'pending' forever, so every
+hold lookup walked all historical orders. The reaper marks expired holds
+'expired' in batches; live holds are then found through the partial index
+ix_playo_orders_live_holds (court_id, booking_date WHERE status = 'pending').
+
+Holds are never published to partners as blocked, so their expiry sends no
+inventory events: a release could only re-open a slot booked meanwhile. The
+free-slot bitmaps (services/free_slots.py) did count them, so their rows are
+marked stale in the expiring transaction.
+
+Settings (env):
+- PLAYO_REAPER_INTERVAL_SECONDS   pause between runs (default 60)
+- PLAYO_REAPER_BATCH_ROWS         orders expired per transaction (default 500)
+
+Batches are claimed with SKIP LOCKED, so the reapers of several API workers
+never expire the same order twice.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from services.free_slots import mark_stale_with_groups
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+PLAYO_REAPER_INTERVAL_SECONDS = int(os.getenv("PLAYO_REAPER_INTERVAL_SECONDS", "60"))
+PLAYO_REAPER_BATCH_ROWS = int(os.getenv("PLAYO_REAPER_BATCH_ROWS", "500"))
+
+
+def expire_batch(db: Session, now: datetime) -> int:
+    """Expires up to PLAYO_REAPER_BATCH_ROWS overdue holds in one transaction. Returns orders expired."""
+    orders = db.query(models.PlayoOrder).filter(
+        models.PlayoOrder.status == 'pending',
+        models.PlayoOrder.expires_at <= now
+    ).order_by(models.PlayoOrder.expires_at).limit(PLAYO_REAPER_BATCH_ROWS).with_for_update(skip_locked=True).all()
+    if not orders:
+        return 0
+
+    for order in orders:
+        order.status = 'expired'
+
+    mark_stale_with_groups(db, [(o.court_id, o.booking_date) for o in orders])
+    db.commit()
+    return len(orders)
+
+
+def reap_expired_orders(now: datetime = None) -> int:
+    """Expires every overdue hold, batch by batch. Returns orders expired."""
+    now = now or datetime.utcnow()
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            expired = expire_batch(db, now)
+            total += expired
+            if expired < PLAYO_REAPER_BATCH_ROWS:
+                break
+        if total:
+            logger.info(f"[PLAYO REAPER] Expired {total} Playo holds")
+        return total
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def playo_reaper_job():
+    """Scheduler loop: expires overdue Playo holds every PLAYO_REAPER_INTERVAL_SECONDS."""
+    while True:
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(reap_expired_orders)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Playo reaper failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="playo_reaper")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="playo_reaper")
+        await asyncio.sleep(PLAYO_REAPER_INTERVAL_SECONDS)
@@ -0,0 +1,188 @@
+"""
+Retention for integration history.
+
+integration_logs (full request/response bodies for every partner call) and
+integration_outbox_events (completed and dead deliveries) used to grow
+forever, and the outbox poll paid for it. Old rows are now moved into
+monthly range-partitioned archive tables, and whole archive months are
+dropped once they age out:
+
+    integration_logs            -> integration_logs_archive            (by created_at)
+    integration_outbox_events   -> integration_outbox_events_archive   (completed/dead only)
+
+Partitions are named <archive>_yYYYYmMM and created on demand; the tables
+themselves come from migrate_integration_retention.py. Actionable outbox rows
+never move; the worker polls them through the partial index
+ix_outbox_actionable.
+
+Settings (env):
+- INTEGRATION_LOG_HOT_DAYS      days of logs kept in the live table (default 30)
+- OUTBOX_HOT_DAYS               days of finished events kept live (default 7)
+- INTEGRATION_ARCHIVE_MONTHS    archive months kept before dropping (default 12)
+- RETENTION_BATCH_ROWS          rows moved per statement (default 5000)
+- RETENTION_INTERVAL_SECONDS    pause between runs (default 86400)
+
+PostgreSQL only; on other databases the job does nothing. Every API worker
+runs the scheduler, so a run is guarded by an advisory lock.
+"""
+
+import asyncio
+import os
+import re
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal, engine
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+INTEGRATION_LOG_HOT_DAYS = int(os.getenv("INTEGRATION_LOG_HOT_DAYS", "30"))
+OUTBOX_HOT_DAYS = int(os.getenv("OUTBOX_HOT_DAYS", "7"))
+INTEGRATION_ARCHIVE_MONTHS = int(os.getenv("INTEGRATION_ARCHIVE_MONTHS", "12"))
+RETENTION_BATCH_ROWS = int(os.getenv("RETENTION_BATCH_ROWS", "5000"))
+RETENTION_INTERVAL_SECONDS = int(os.getenv("RETENTION_INTERVAL_SECONDS", "86400"))
+
+# Arbitrary constant shared by all workers (pg_try_advisory_lock key)
+RETENTION_LOCK_KEY = 7310402
+
+# live table -> (model, archive table, extra filter for rows allowed to move)
+ARCHIVED_TABLES = {
+    models.IntegrationLog.__tablename__: (models.IntegrationLog, "integration_logs_archive", ""),
+    models.OutboxEvent.__tablename__: (
+        models.OutboxEvent, "integration_outbox_events_archive", "AND status IN ('completed', 'dead')"
+    ),
+}
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(d) -> date:
+    return date(d.year, d.month, 1)
+
+
+def next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def partition_name(archive: str, month: date) -> str:
+    return f"{archive}_y{month.year:04d}m{month.month:02d}"
+
+
+def months_between(first: date, last: date) -> List[date]:
+    """Month starts from first's month through last's month, inclusive."""
+    months, current = [], month_start(first)
+    while current <= month_start(last):
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+def expired_partitions(names: List[str], today: date, keep_months: int = None) -> List[str]:
+    """Partitions whose whole month is older than the last keep_months months."""
+    keep_months = INTEGRATION_ARCHIVE_MONTHS if keep_months is None else keep_months
+    oldest_kept = month_start(today)
+    for _ in range(keep_months):
+        oldest_kept = month_start(oldest_kept - timedelta(days=1))
+    expired = []
+    for name in names:
+        match = _PARTITION_SUFFIX.search(name)
+        if match and date(int(match.group(1)), int(match.group(2)), 1) < oldest_kept:
+            expired.append(name)
+    return expired
+
+
+def _ensure_partitions(db: Session, archive: str, first: datetime, last: datetime) -> None:
+    for month in months_between(first, last):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(archive, month)} PARTITION OF {archive} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        ))
+
+
+def archive_table(db: Session, table: str, now: datetime = None) -> int:
+    """Moves rows older than the table's hot window into its archive. Returns rows moved."""
+    model, archive, extra_filter = ARCHIVED_TABLES[table]
+    hot_days = OUTBOX_HOT_DAYS if model is models.OutboxEvent else INTEGRATION_LOG_HOT_DAYS
+    cutoff = (now or datetime.utcnow()) - timedelta(days=hot_days)
+    oldest = db.execute(
+        text(f"SELECT min(created_at) FROM {table} WHERE created_at < :cutoff {extra_filter}"), {"cutoff": cutoff}
+    ).scalar()
+    if oldest is None:
+        return 0
+    _ensure_partitions(db, archive, oldest, cutoff)
+    db.commit()
+
+    columns = ", ".join(c.name for c in model.__table__.columns)
+    move = text(
+        f"WITH moved AS ("
+        f" DELETE FROM {table} WHERE id IN ("
+        f"  SELECT id FROM {table} WHERE created_at < :cutoff {extra_filter}"
+        f"  ORDER BY created_at LIMIT :batch)"
+        f" RETURNING {columns})"
+        f" INSERT INTO {archive} ({columns}) SELECT {columns} FROM moved"
+    )
+    total = 0
+    while True:
+        moved = db.execute(move, {"cutoff": cutoff, "batch": RETENTION_BATCH_ROWS}).rowcount
+        db.commit()
+        total += moved
+        if moved < RETENTION_BATCH_ROWS:
+            return total
+
+
+def drop_expired_partitions(db: Session, archive: str, today: date = None) -> List[str]:
+    names = [row[0] for row in db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": archive})]
+    expired = expired_partitions(names, today or date.today())
+    for name in expired:
+        db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    db.commit()
+    return expired
+
+
+def run_retention() -> Dict[str, int]:
+    """One retention pass over every archived table. Returns rows moved per table."""
+    if engine.dialect.name != "postgresql":
+        return {}
+    # The advisory lock belongs to a connection, so the whole pass uses one
+    with engine.connect() as connection:
+        db = SessionLocal(bind=connection)
+        try:
+            if not db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": RETENTION_LOCK_KEY}).scalar():
+                logger.info("[RETENTION] Another worker is running retention, skipping")
+                return {}
+            try:
+                moved = {}
+                for table, (_, archive, _) in ARCHIVED_TABLES.items():
+                    moved[table] = archive_table(db, table)
+                    dropped = drop_expired_partitions(db, archive)
+                    logger.info(f"[RETENTION] {table}: archived {moved[table]} rows, dropped partitions {dropped}")
+                return moved
+            finally:
+                db.rollback()
+                db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": RETENTION_LOCK_KEY})
+                db.commit()
+        finally:
+            db.close()
+
+
+async def retention_job():
+    """Scheduler loop: archives integration history once per RETENTION_INTERVAL_SECONDS."""
+    while True:
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(run_retention)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Retention job failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="retention")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="retention")
+        await asyncio.sleep(RETENTION_INTERVAL_SECONDS)
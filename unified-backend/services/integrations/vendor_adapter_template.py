@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 import requests
 import logging
 
+from utils import http_client
+
 from .base_adapter import BaseIntegrationAdapter
 import models
 
@@ -25,7 +27,9 @@ class NewVendorAdapter(BaseIntegrationAdapter):
         Args:
             category: 'availability', 'pricing', or 'maintenance'
             data: The raw dictionary queued by the Orchestrator
-                 - availability: {branch_id, court_id, date, slot_start, action}
+                 - availability: {branch_id, court_id, date, slot_starts, action, blocked_capacity}
+                   (slot_starts lists every changed 30-min slot of that court/date;
+                   events queued before coalescing carry a single slot_start)
                  - pricing: {branch_id, court_id, day, slot_start, action, price}
                  - maintenance: {court_id, action}
         """
@@ -35,10 +39,11 @@ class NewVendorAdapter(BaseIntegrationAdapter):
             # Map MyRush 'block' action to Vendor's nomenclature
             vendor_status = "unavailable" if data["action"] == "block" else "available"
             
+            slot_starts = data.get("slot_starts") or [data["slot_start"]]
             return {
                 "vendor_court_id": data["court_id"],
                 "event_date": data["date"],
-                "start_time": data["slot_start"],
+                "start_times": slot_starts,
                 "status": vendor_status
             }
 
@@ -79,7 +84,8 @@ class NewVendorAdapter(BaseIntegrationAdapter):
 
         # 4. Transmit
         # Note: You can use any protocol here (REST, SOAP, gRPC, etc.)
-        response = requests.post(
+        # utils.http_client reuses pooled keep-alive connections per host
+        response = http_client.post(
             url,
             json=payload,
             headers=headers,
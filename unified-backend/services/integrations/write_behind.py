@@ -0,0 +1,163 @@
+"""
+Write-behind buffer for partner bookkeeping rows.
+
+Every Playo request used to commit api_key.last_used_at, and every District
+checkAvailability committed an IntegrationLog row twice (request, then
+response). Neither is read on the request path, so both are buffered in
+memory and written in bulk:
+
+- touch_api_key(): keeps only the latest last_used_at per key
+- record_integration_log(): queues one complete row (request + response)
+- flush(): one bulk UPDATE and one bulk INSERT, run every
+  WRITE_BEHIND_FLUSH_SECONDS by write_behind_job() and on shutdown
+
+Settings (env):
+- WRITE_BEHIND_FLUSH_SECONDS       flush interval (default 5)
+- WRITE_BEHIND_MAX_ROWS            buffered log rows before a caller flushes
+                                   inline (default 500)
+- INTEGRATION_LOG_PAYLOADS         full | truncated | sampled | none
+                                   (default truncated)
+- INTEGRATION_LOG_PAYLOAD_MAX_BYTES  size kept in truncated mode (default 4096)
+- INTEGRATION_LOG_SAMPLE_RATE      share of rows keeping full payloads in
+                                   sampled mode (default 0.1)
+
+Every mode writes one row per request: sampled mode keeps all rows (status,
+endpoint, error message) and drops the payloads of the unsampled ones. Error
+rows (status >= 400) always keep their full payloads. Rows buffered in a
+worker that dies before the next flush are lost; booking and cancellation
+logs are still written synchronously for that reason.
+"""
+
+import asyncio
+import os
+import random
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import insert, update
+
+import models
+from database import SessionLocal
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("WRITE_BEHIND_FLUSH_SECONDS", "5"))
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", "500"))
+INTEGRATION_LOG_PAYLOADS = os.getenv("INTEGRATION_LOG_PAYLOADS", "truncated").lower()
+INTEGRATION_LOG_PAYLOAD_MAX_BYTES = int(os.getenv("INTEGRATION_LOG_PAYLOAD_MAX_BYTES", "4096"))
+INTEGRATION_LOG_SAMPLE_RATE = float(os.getenv("INTEGRATION_LOG_SAMPLE_RATE", "0.1"))
+
+_lock = threading.Lock()
+_api_key_touches: Dict[Any, datetime] = {}
+_log_rows: List[dict] = []
+
+
+def capture_payload(payload: Any, mode: str = None, keep_full: bool = False) -> Any:
+    """Applies the payload capture mode to one request or response body."""
+    mode = mode or INTEGRATION_LOG_PAYLOADS
+    if payload is None or keep_full or mode == "full":
+        return payload
+    if mode == "none":
+        return None
+    if mode == "truncated":
+        raw = orjson.dumps(payload, default=str)
+        if len(raw) <= INTEGRATION_LOG_PAYLOAD_MAX_BYTES:
+            return payload
+        return {
+            "truncated": True,
+            "size": len(raw),
+            "preview": raw[:INTEGRATION_LOG_PAYLOAD_MAX_BYTES].decode("utf-8", "ignore"),
+        }
+    # sampled: record_integration_log already cleared the payloads of unsampled rows
+    return payload
+
+
+def touch_api_key(api_key_id, used_at: datetime = None) -> None:
+    """Records a use of a Playo API key; last_used_at is written on the next flush."""
+    used_at = used_at or datetime.utcnow()
+    with _lock:
+        previous = _api_key_touches.get(api_key_id)
+        if previous is None or used_at > previous:
+            _api_key_touches[api_key_id] = used_at
+
+
+def record_integration_log(partner_id, direction: str, endpoint: str, method: str,
+                           request_payload: Any = None, response_status: Optional[int] = None,
+                           response_payload: Any = None, error_message: Optional[str] = None) -> None:
+    """Queues one IntegrationLog row; flushes inline if the buffer is full."""
+    keep_full = response_status is not None and response_status >= 400
+    if INTEGRATION_LOG_PAYLOADS == "sampled" and not keep_full and random.random() >= INTEGRATION_LOG_SAMPLE_RATE:
+        request_payload = response_payload = None
+    row = {
+        "partner_id": partner_id,
+        "direction": direction,
+        "endpoint": endpoint,
+        "method": method,
+        "request_payload": capture_payload(request_payload, keep_full=keep_full),
+        "response_status": response_status,
+        "response_payload": capture_payload(response_payload, keep_full=keep_full),
+        "error_message": error_message,
+        "created_at": datetime.utcnow(),
+    }
+    with _lock:
+        _log_rows.append(row)
+        full = len(_log_rows) >= WRITE_BEHIND_MAX_ROWS
+    if full:
+        flush()
+
+
+def pending() -> Dict[str, int]:
+    with _lock:
+        return {"api_key_touches": len(_api_key_touches), "integration_logs": len(_log_rows)}
+
+
+def flush() -> int:
+    """Writes everything buffered so far. Returns the number of rows written."""
+    with _lock:
+        touches = dict(_api_key_touches)
+        rows = list(_log_rows)
+        _api_key_touches.clear()
+        _log_rows.clear()
+    if not touches and not rows:
+        return 0
+
+    db = SessionLocal()
+    try:
+        if touches:
+            db.execute(update(models.PlayoAPIKey), [
+                {"id": key_id, "last_used_at": used_at} for key_id, used_at in touches.items()
+            ])
+        if rows:
+            db.execute(insert(models.IntegrationLog), rows)
+        db.commit()
+        return len(touches) + len(rows)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[WRITE-BEHIND] Flush of {len(touches)} key touches and {len(rows)} logs failed: {e}")
+        # Requeue for the next flush, keeping the buffer bounded
+        for key_id, used_at in touches.items():
+            touch_api_key(key_id, used_at)
+        with _lock:
+            room = max(WRITE_BEHIND_MAX_ROWS * 2 - len(_log_rows), 0)
+            _log_rows[:0] = rows[-room:] if room else []
+        return 0
+    finally:
+        db.close()
+
+
+async def write_behind_job():
+    """Scheduler loop: flushes the buffer every WRITE_BEHIND_FLUSH_SECONDS."""
+    while True:
+        await asyncio.sleep(WRITE_BEHIND_FLUSH_SECONDS)
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(flush)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Write-behind flush failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="write_behind")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="write_behind")
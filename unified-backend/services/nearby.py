@@ -0,0 +1,148 @@
+"""
+Nearest-venue search.
+
+Branch coordinates (admin_branches.latitude / longitude) are copied into
+venue_summary along with the branch's grid cell: grid_row / grid_col, its
+position on a GEO_GRID_DEGREES lattice (0.05 degrees, about 5.5 km), under
+the B-tree index ix_venue_summary_grid. A radius query reads only the cells
+of the circle's bounding box and measures exact (haversine) distances for
+the branches found there; a k-nearest query widens the radius until k
+venues lie inside it.
+
+Coordinates are refreshed with the rest of the summary row, so coordinates
+set directly in the database are picked up by venue_summary_job.
+
+Settings (env):
+- NEARBY_START_RADIUS_KM   first radius of a k-nearest search (default 5)
+- NEARBY_MAX_RADIUS_KM     largest radius searched (default 100)
+"""
+
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from services.search import match_clause
+
+NEARBY_START_RADIUS_KM = float(os.getenv("NEARBY_START_RADIUS_KM", "5"))
+NEARBY_MAX_RADIUS_KM = float(os.getenv("NEARBY_MAX_RADIUS_KM", "100"))
+
+# Changing the lattice needs a full venue_summary rebuild
+GEO_GRID_DEGREES = 0.05
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+NEARBY_SORTS = ("distance", "price", "rating")
+
+# Same columns as the venue listing, plus the coordinates
+_NEARBY_SELECT = """
+    SELECT
+        ab.id,
+        ab.name as branch_name,
+        ab.address_line1 as location,
+        acity.name as city_name,
+        ab.images,
+        ab.ground_overview,
+        ab.search_location,
+        vs.game_types,
+        vs.min_price,
+        vs.latitude,
+        vs.longitude,
+        ROUND(ra.rating_sum::numeric / NULLIF(ra.rating_count, 0), 1) as average_rating,
+        COALESCE(ra.rating_count, 0) as total_reviews,
+        ab.created_at,
+        ab.updated_at
+    FROM venue_summary vs
+    JOIN admin_branches ab ON ab.id = vs.branch_id
+    JOIN admin_cities acity ON ab.city_id = acity.id
+    LEFT JOIN rating_aggregates ra ON ra.scope = 'branch' AND ra.subject_id = ab.id
+    WHERE ab.is_active = true
+      AND vs.grid_row BETWEEN :row_lo AND :row_hi
+      AND vs.grid_col BETWEEN :col_lo AND :col_hi
+"""
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def grid_window(lat: float, lng: float, radius_km: float) -> Dict[str, int]:
+    """Grid rows/cols of the bounding box of the circle, as query params."""
+    d_lat = radius_km / KM_PER_DEGREE
+    d_lng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return {
+        "row_lo": math.floor((lat - d_lat) / GEO_GRID_DEGREES),
+        "row_hi": math.floor((lat + d_lat) / GEO_GRID_DEGREES),
+        "col_lo": math.floor((lng - d_lng) / GEO_GRID_DEGREES),
+        "col_hi": math.floor((lng + d_lng) / GEO_GRID_DEGREES),
+    }
+
+
+def _within(db: Session, lat: float, lng: float, radius_km: float, game_type: Optional[str],
+            price_max: Optional[float]) -> List[Dict[str, Any]]:
+    """Venues within radius_km, each with its distance_km."""
+    query_sql = _NEARBY_SELECT
+    params: Dict[str, Any] = grid_window(lat, lng, radius_km)
+    if game_type:
+        clause, match_params = match_clause(db, "vs.sport_terms", "game_type", game_type, whole_words=True)
+        query_sql += f" AND {clause}"
+        params.update(match_params)
+    if price_max is not None:
+        query_sql += " AND vs.min_price <= :price_max"
+        params["price_max"] = price_max
+
+    venues = []
+    for row in db.execute(text(query_sql), params).fetchall():
+        venue = dict(row._mapping)
+        distance = haversine_km(lat, lng, float(venue["latitude"]), float(venue["longitude"]))
+        if distance <= radius_km:
+            venue["distance_km"] = round(distance, 2)
+            venues.append(venue)
+    return venues
+
+
+def _sort_key(sort_by: str):
+    if sort_by == "price":
+        return lambda v: (v["min_price"] is None, float(v["min_price"] or 0), v["distance_km"])
+    if sort_by == "rating":
+        return lambda v: (-float(v["average_rating"] or 0), v["distance_km"])
+    return lambda v: v["distance_km"]
+
+
+def find_nearby_venues(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius_km: Optional[float] = None,
+    limit: int = 20,
+    game_type: Optional[str] = None,
+    price_max: Optional[float] = None,
+    sort_by: str = "distance",
+) -> List[Dict[str, Any]]:
+    """
+    Venues around (lat, lng). With radius_km, every venue inside it (up to
+    limit); without, the `limit` nearest within NEARBY_MAX_RADIUS_KM. The
+    result is ordered by sort_by (see NEARBY_SORTS), nearest first on ties.
+    """
+    if radius_km is not None:
+        venues = _within(db, lat, lng, min(radius_km, NEARBY_MAX_RADIUS_KM), game_type, price_max)
+    else:
+        # The k nearest are exactly the k nearest inside any circle holding k venues
+        radius = NEARBY_START_RADIUS_KM
+        while True:
+            venues = _within(db, lat, lng, radius, game_type, price_max)
+            if len(venues) >= limit or radius >= NEARBY_MAX_RADIUS_KM:
+                break
+            radius = min(radius * 2, NEARBY_MAX_RADIUS_KM)
+        venues.sort(key=lambda v: v["distance_km"])
+        venues = venues[:limit]
+    venues.sort(key=_sort_key(sort_by))
+    return venues[:limit]
@@ -0,0 +1,184 @@
+"""
+Incremental rating aggregates.
+
+Venue listings, venue detail, the slot page and the ratings endpoints used
+to run AVG/COUNT (and a per-star COUNT for the distribution) over reviews on
+every request. rating_aggregates (models.RatingAggregate) keeps, per court
+and per branch, the count, sum and per-star histogram of active reviews, so
+a rating read is one primary-key lookup:
+
+    average = rating_sum / rating_count (rounded to 1 decimal)
+
+- apply_review() adds or removes one review from its court's and branch's
+  rows, inside the caller's transaction: crud.create_review (+1) and admin
+  review moderation in routers/admin/reviews_v2.py (+1 / -1)
+- reconcile_rating_aggregates() recomputes every row from reviews and fixes
+  drift (writes made outside those paths, courts moved between branches);
+  rating_reconcile_job runs it every RATING_RECONCILE_SECONDS (default 3600)
+
+PostgreSQL only (ON CONFLICT upserts); on other databases nothing is written.
+"""
+
+import asyncio
+import os
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+RATING_RECONCILE_SECONDS = int(os.getenv("RATING_RECONCILE_SECONDS", "3600"))
+
+STARS = (1, 2, 3, 4, 5)
+
+_COUNTERS = ["rating_count", "rating_sum"] + [f"stars_{s}" for s in STARS]
+
+_APPLY = """
+    INSERT INTO rating_aggregates (scope, subject_id, {columns}, updated_at)
+    VALUES (:scope, :subject_id, {values}, now() AT TIME ZONE 'utc')
+    ON CONFLICT (scope, subject_id) DO UPDATE SET
+        {increments},
+        updated_at = EXCLUDED.updated_at
+"""
+
+# Exact totals per court and per branch, from active reviews
+_TOTALS = """
+    WITH totals AS (
+        SELECT 'court' AS scope, r.court_id AS subject_id, COUNT(*) AS rating_count, SUM(r.rating) AS rating_sum,
+               {stars}
+        FROM reviews r
+        WHERE r.is_active = true
+        GROUP BY r.court_id
+        UNION ALL
+        SELECT 'branch', ac.branch_id, COUNT(*), SUM(r.rating),
+               {stars}
+        FROM reviews r
+        JOIN admin_courts ac ON ac.id = r.court_id
+        WHERE r.is_active = true
+        GROUP BY ac.branch_id
+    )
+""".format(stars=", ".join(f"COUNT(*) FILTER (WHERE r.rating = {s}) AS stars_{s}" for s in STARS))
+
+_RECONCILE_UPSERT = _TOTALS + """
+    INSERT INTO rating_aggregates (scope, subject_id, {columns}, updated_at)
+    SELECT scope, subject_id, {columns}, now() AT TIME ZONE 'utc' FROM totals
+    ON CONFLICT (scope, subject_id) DO UPDATE SET
+        {assignments},
+        updated_at = EXCLUDED.updated_at
+    WHERE ({current}) IS DISTINCT FROM ({excluded})
+""".format(
+    columns=", ".join(_COUNTERS),
+    assignments=", ".join(f"{c} = EXCLUDED.{c}" for c in _COUNTERS),
+    current=", ".join(f"rating_aggregates.{c}" for c in _COUNTERS),
+    excluded=", ".join(f"EXCLUDED.{c}" for c in _COUNTERS),
+)
+
+_RECONCILE_DELETE = _TOTALS + """
+    DELETE FROM rating_aggregates ra
+    WHERE NOT EXISTS (SELECT 1 FROM totals t WHERE t.scope = ra.scope AND t.subject_id = ra.subject_id)
+"""
+
+
+def _enabled(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def average(rating_sum, rating_count) -> float:
+    return round(float(rating_sum) / rating_count, 1) if rating_count else 0
+
+
+def apply_statement(rating: int):
+    """Upsert adding :delta reviews of the given star rating to one (scope, subject_id) row."""
+    star_column = f"stars_{rating}" if rating in STARS else None
+    values = {c: "0" for c in _COUNTERS}
+    values.update(rating_count=":delta", rating_sum=":delta * :rating")
+    if star_column:
+        values[star_column] = ":delta"
+    return text(_APPLY.format(
+        columns=", ".join(_COUNTERS),
+        values=", ".join(values[c] for c in _COUNTERS),
+        increments=",\n        ".join(
+            f"{c} = rating_aggregates.{c} + EXCLUDED.{c}" for c in _COUNTERS if values[c] != "0"
+        ),
+    ))
+
+
+def apply_review(db: Session, court_id: Any, rating: int, delta: int = 1, branch_id: Any = None) -> None:
+    """
+    Adds (delta=1) or removes (delta=-1) one active review from its court's
+    and branch's aggregates. Does not commit: call before the review write is
+    committed so both land together, and after it is flushed, so every writer
+    locks the review row before the aggregate rows.
+    """
+    if not _enabled(db) or not delta:
+        return
+    if branch_id is None:
+        branch_id = db.query(models.Court.branch_id).filter(models.Court.id == court_id).scalar()
+    statement = apply_statement(rating)
+    for scope, subject_id in (("court", court_id), ("branch", branch_id)):
+        if subject_id is not None:
+            db.execute(statement, {"scope": scope, "subject_id": str(subject_id), "delta": delta, "rating": rating})
+
+
+def rating_summary(db: Session, scope: str, subject_id: Any) -> Dict[str, Any]:
+    """Average, total and per-star distribution for one court or branch."""
+    row: Optional[models.RatingAggregate] = db.query(models.RatingAggregate).filter(
+        models.RatingAggregate.scope == scope,
+        models.RatingAggregate.subject_id == subject_id
+    ).first()
+    if not row or not row.rating_count:
+        return {"average_rating": 0, "total_reviews": 0, "rating_distribution": {str(s): 0 for s in reversed(STARS)}}
+    return {
+        "average_rating": average(row.rating_sum, row.rating_count),
+        "total_reviews": row.rating_count,
+        "rating_distribution": {str(s): getattr(row, f"stars_{s}") for s in reversed(STARS)},
+    }
+
+
+def reconcile_rating_aggregates(db: Session) -> int:
+    """
+    Recomputes every aggregate from reviews and commits. Review writes are
+    held off for the duration (SHARE lock), so increments cannot be lost in
+    between. Returns the number of rows that had drifted.
+    """
+    if not _enabled(db):
+        return 0
+    try:
+        db.execute(text("LOCK TABLE reviews IN SHARE MODE"))
+        fixed = db.execute(text(_RECONCILE_UPSERT)).rowcount
+        fixed += db.execute(text(_RECONCILE_DELETE)).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if fixed:
+        logger.warning(f"[RATINGS] Reconciliation corrected {fixed} rating aggregate rows")
+    return fixed
+
+
+def _reconcile() -> int:
+    db = SessionLocal()
+    try:
+        return reconcile_rating_aggregates(db)
+    finally:
+        db.close()
+
+
+async def rating_reconcile_job():
+    """Scheduler loop: reconciles rating aggregates every RATING_RECONCILE_SECONDS."""
+    while True:
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(_reconcile)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Rating reconciliation failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="rating_reconcile")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="rating_reconcile")
+        await asyncio.sleep(RATING_RECONCILE_SECONDS)
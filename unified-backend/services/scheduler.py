@@ -1,14 +1,22 @@
 import asyncio
-import logging
 from datetime import datetime, time, timedelta
+from time import perf_counter
 import crud
 import models
 from database import SessionLocal
 from utils.notifier import Notifier
 from utils.booking_utils import get_now_ist
+from utils.metrics import SCHEDULER_JOB_SECONDS, SCHEDULER_JOB_FAILURES
+from services.integrations.write_behind import write_behind_job
+from services.integrations.retention import retention_job
+from services.integrations.playo_reaper import playo_reaper_job
+from services.venue_summary import venue_summary_job
+from services.rating_aggregates import rating_reconcile_job
+from services.free_slots import free_slots_job
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("scheduler")
+from utils.logger import get_logger
+
+logger = get_logger("scheduler")
 
 async def reminder_job():
     """
@@ -16,6 +24,7 @@ async def reminder_job():
     Runs every 15 minutes.
     """
     while True:
+        started = perf_counter()
         try:
             logger.info("[SCHEDULER] Running reminder job...")
             db = SessionLocal()
@@ -46,8 +55,10 @@ async def reminder_job():
                 db.close()
         except Exception as e:
             logger.error(f"[SCHEDULER ERROR] Reminder job failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="reminder")
             
         # Wait 15 minutes
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="reminder")
         await asyncio.sleep(900)
 
 async def review_prompt_job():
@@ -56,6 +67,7 @@ async def review_prompt_job():
     Runs every 15 minutes.
     """
     while True:
+        started = perf_counter()
         try:
             logger.info("[SCHEDULER] Running review prompt job...")
             db = SessionLocal()
@@ -85,6 +97,8 @@ async def review_prompt_job():
                 db.close()
         except Exception as e:
             logger.error(f"[SCHEDULER ERROR] Review prompt job failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="review_prompt")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="review_prompt")
         await asyncio.sleep(900)
 
 async def expiry_alert_job():
@@ -93,6 +107,7 @@ async def expiry_alert_job():
     Runs every 3 minutes.
     """
     while True:
+        started = perf_counter()
         try:
             db = SessionLocal()
             try:
@@ -114,6 +129,8 @@ async def expiry_alert_job():
                 db.close()
         except Exception as e:
             logger.error(f"[SCHEDULER ERROR] Expiry alert job failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="expiry_alert")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="expiry_alert")
         await asyncio.sleep(180)
 
 async def summary_job():
@@ -124,6 +141,7 @@ async def summary_job():
     last_summary_date = None
     
     while True:
+        started = perf_counter()
         try:
             now = get_now_ist()
             
@@ -185,7 +203,9 @@ async def summary_job():
                     db.close()
         except Exception as e:
             logger.error(f"[SCHEDULER ERROR] Summary job failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="summary")
             
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="summary")
         await asyncio.sleep(1800)
 
 async def start_scheduler():
@@ -196,5 +216,11 @@ async def start_scheduler():
         reminder_job(),
         summary_job(),
         review_prompt_job(),
-        expiry_alert_job()
+        expiry_alert_job(),
+        write_behind_job(),
+        retention_job(),
+        playo_reaper_job(),
+        venue_summary_job(),
+        rating_reconcile_job(),
+        free_slots_job()
     )
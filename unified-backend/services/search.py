@@ -0,0 +1,105 @@
+"""
+Trigram search.
+
+Venue lookup (chatbot venue search, GET /venues/?game_type=) and the admin
+user search used to run ILIKE '%term%' over raw columns: a sequential scan
+per query, and a typo ("badmintn") found nothing. Searches now run against
+documents that carry pg_trgm GIN indexes (migrate_search_index.py):
+
+- venue_summary.sport_terms   the branch's active game types plus their
+                              SPORT_SYNONYMS, lowercased. Synonyms are
+                              expanded when the summary row is built, so
+                              "shuttle" or "soccer" match directly instead
+                              of being normalized on every query
+- venue_summary.place_terms   branch name, address, area and city
+- USER_DOCUMENT / PROFILE_DOCUMENT
+                              expressions over the users / profiles columns
+                              the admin search covers, indexed as written
+                              here (the query must repeat them verbatim for
+                              the planner to use the index)
+
+A term matches a document when it occurs in it (ILIKE, or a word-prefix
+regex for whole_words) or is within pg_trgm's word similarity threshold of
+part of it (<%); both are served by the GIN index. Results are ranked by
+word_similarity.
+
+On other databases (SQLite in tests) matching falls back to LIKE, without
+typo tolerance or ranking.
+"""
+
+import re
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+# Common user terms for the official game type names
+SPORT_SYNONYMS = {
+    # Swimming
+    "pool": "Swimming", "swimming pool": "Swimming", "aqua": "Swimming", "swimmer": "Swimming",
+    # Football
+    "football": "FootBall", "football turf": "FootBall", "soccer": "FootBall", "footy": "FootBall", "futsal": "FootBall",
+    # Cricket
+    "cricket turf": "Cricket", "cricket ground": "Cricket", "batting": "Cricket",
+    "nets": "Nets", "cricket nets": "Nets", "practice nets": "Nets",
+    # Badminton
+    "badminton court": "Badminton", "shuttle": "Badminton", "baddie": "Badminton", "racket": "Badminton",
+    # Tennis
+    "table tennis": "Table tennis", "tt": "Table tennis", "ping pong": "Table tennis",
+    "tennis": "Tennis", "lawn tennis": "Tennis",
+    # Others
+    "padel": "Padel", "padel tennis": "Padel",
+    "skating": "Skating", "roller skating": "Skating", "skate park": "Skating",
+    "squash": "Squash", "wooden squash": "Squash",
+    "basketball": "Basketball", "hoops": "Basketball", "b-ball": "Basketball",
+    "volleyball": "Volleyball", "voley": "Volleyball",
+    "throwball": "Throwball",
+    "frisbee": "Frisbee", "ultimate frisbee": "Frisbee",
+    "pickleball": "Pickleball", "pickle": "Pickleball"
+}
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+# (game type name, synonym) pairs, lowercased, for joining at index time
+SPORT_SYNONYM_VALUES = "(VALUES {}) AS sport_synonyms(game_type, term)".format(", ".join(
+    f"({_sql_literal(game_type.lower())}, {_sql_literal(term)})" for term, game_type in SPORT_SYNONYMS.items()
+))
+
+USER_DOCUMENT = (
+    "lower(coalesce(users.first_name, '') || ' ' || coalesce(users.last_name, '') || ' ' || "
+    "coalesce(users.full_name, '') || ' ' || coalesce(users.email, '') || ' ' || "
+    "coalesce(users.phone_number, ''))"
+)
+
+PROFILE_DOCUMENT = "lower(coalesce(profiles.full_name, '') || ' ' || coalesce(profiles.phone_number, ''))"
+
+
+def _trigram(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def match_clause(db: Session, document: str, param: str, term: str, whole_words: bool = False) -> Tuple[str, Dict[str, str]]:
+    """
+    SQL condition matching `term` against the `document` expression, and its
+    bind params (named after `param`). whole_words only matches the term at
+    the start of a word, so "tt" does not match "batting".
+    """
+    term = term.strip().lower()
+    if not _trigram(db):
+        if whole_words:
+            return f"(' ' || LOWER({document})) LIKE :{param}_like", {f"{param}_like": f"% {term}%"}
+        return f"LOWER({document}) LIKE :{param}_like", {f"{param}_like": f"%{term}%"}
+    if whole_words:
+        clause = f"({document} ~* :{param}_pattern OR :{param} <% {document})"
+        return clause, {param: term, f"{param}_pattern": r"\m" + re.escape(term)}
+    clause = f"({document} ILIKE :{param}_like OR :{param} <% {document})"
+    return clause, {param: term, f"{param}_like": f"%{term}%"}
+
+
+def rank_expression(db: Session, document: str, param: str) -> str:
+    """Relevance of the term bound to `param` for `document` (higher first); 0 without pg_trgm."""
+    if not _trigram(db):
+        return "0"
+    return f"COALESCE(word_similarity(:{param}, {document}), 0)"
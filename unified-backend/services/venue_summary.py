@@ -0,0 +1,196 @@
+"""
+Venue summary read model.
+
+The venue listing (GET /venues/) and the chatbot venue search used to
+aggregate every branch's game types, amenities and court/slice prices with
+correlated subqueries on each call. Those aggregates now live
+in venue_summary (models.VenueSummary), one row per branch, and both
+endpoints join it by primary key. Ratings are kept separately, incrementally,
+in rating_aggregates (services/rating_aggregates.py). The row also carries
+the trigram-indexed search documents (sport_terms, place_terms) described in
+services/search.py and the coordinates and grid cell used by
+services/nearby.py.
+
+Rows are recomputed per branch, with one upsert, by the writes that change
+them:
+
+- courts and their sport slices (routers/admin/courts.py)
+- branch details, game types and amenities (routers/admin/branches.py)
+- game type / amenity / city / area renames and toggles (every branch is
+  refreshed)
+
+A refresh runs after the caller's commit and never fails the caller; the
+periodic venue_summary_job rebuilds every row, which also covers writes made
+outside the API (maintenance scripts).
+
+Settings (env):
+- VENUE_SUMMARY_REFRESH_SECONDS   pause between full rebuilds (default 900)
+
+PostgreSQL only (jsonb_agg, ON CONFLICT); on other databases refreshes are
+skipped.
+"""
+
+import asyncio
+import os
+from time import perf_counter
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from services.nearby import GEO_GRID_DEGREES
+from services.search import SPORT_SYNONYM_VALUES
+from utils.logger import get_logger
+from utils.metrics import SCHEDULER_JOB_FAILURES, SCHEDULER_JOB_SECONDS
+
+logger = get_logger(__name__)
+
+VENUE_SUMMARY_REFRESH_SECONDS = int(os.getenv("VENUE_SUMMARY_REFRESH_SECONDS", "900"))
+
+_SUMMARY_SELECT = """
+    SELECT
+        b.id,
+        COALESCE((
+            SELECT jsonb_agg(DISTINCT gt.name ORDER BY gt.name)
+            FROM admin_branch_game_types bgt
+            JOIN admin_game_types gt ON gt.id = bgt.game_type_id
+            WHERE bgt.branch_id = b.id
+        ), '[]'::jsonb),
+        COALESCE((
+            SELECT jsonb_agg(DISTINCT gt.name ORDER BY gt.name)
+            FROM admin_branch_game_types bgt
+            JOIN admin_game_types gt ON gt.id = bgt.game_type_id
+            WHERE bgt.branch_id = b.id AND gt.is_active = true
+        ), '[]'::jsonb),
+        COALESCE((
+            SELECT jsonb_agg(DISTINCT am.name ORDER BY am.name)
+            FROM admin_branch_amenities ba
+            JOIN admin_amenities am ON am.id = ba.amenity_id
+            WHERE ba.branch_id = b.id
+        ), '[]'::jsonb),
+        (
+            SELECT MIN(val)
+            FROM (
+                SELECT ac.price_per_hour AS val
+                FROM admin_courts ac
+                WHERE ac.branch_id = b.id AND ac.is_active = true
+                UNION ALL
+                SELECT ss.price_per_hour AS val
+                FROM admin_sport_slices ss
+                JOIN admin_courts ac ON ss.court_id = ac.id
+                WHERE ac.branch_id = b.id AND ac.is_active = true AND ss.price_per_hour IS NOT NULL
+            ) AS prices
+        ),
+        (SELECT MIN(price_per_hour) FROM admin_courts WHERE branch_id = b.id AND is_active = true),
+        (SELECT MAX(price_per_hour) FROM admin_courts WHERE branch_id = b.id AND is_active = true),
+        (
+            SELECT string_agg(DISTINCT terms.term, ' ' ORDER BY terms.term)
+            FROM admin_branch_game_types bgt
+            JOIN admin_game_types gt ON gt.id = bgt.game_type_id
+            CROSS JOIN LATERAL (
+                SELECT lower(gt.name) AS term
+                UNION ALL
+                SELECT sport_synonyms.term FROM {synonyms} WHERE sport_synonyms.game_type = lower(gt.name)
+            ) AS terms
+            WHERE bgt.branch_id = b.id AND gt.is_active = true
+        ),
+        lower(concat_ws(' ',
+            b.name,
+            b.address_line1,
+            (SELECT a.name FROM admin_areas a WHERE a.id = b.area_id),
+            (SELECT c.name FROM admin_cities c WHERE c.id = b.city_id)
+        )),
+        b.latitude,
+        b.longitude,
+        floor(b.latitude / {grid})::int,
+        floor(b.longitude / {grid})::int,
+        now() AT TIME ZONE 'utc'
+    FROM admin_branches b
+""".replace("{synonyms}", SPORT_SYNONYM_VALUES).replace("{grid}", repr(GEO_GRID_DEGREES))
+
+_UPSERT = """
+    INSERT INTO venue_summary (
+        branch_id, game_types, active_game_types, amenities,
+        min_price, min_court_price, max_court_price, sport_terms, place_terms,
+        latitude, longitude, grid_row, grid_col, updated_at
+    )
+    {select}
+    {where}
+    ON CONFLICT (branch_id) DO UPDATE SET
+        game_types = EXCLUDED.game_types,
+        active_game_types = EXCLUDED.active_game_types,
+        amenities = EXCLUDED.amenities,
+        min_price = EXCLUDED.min_price,
+        min_court_price = EXCLUDED.min_court_price,
+        max_court_price = EXCLUDED.max_court_price,
+        sport_terms = EXCLUDED.sport_terms,
+        place_terms = EXCLUDED.place_terms,
+        latitude = EXCLUDED.latitude,
+        longitude = EXCLUDED.longitude,
+        grid_row = EXCLUDED.grid_row,
+        grid_col = EXCLUDED.grid_col,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def _enabled(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def summary_upsert(branch_ids: Optional[Iterable] = None):
+    """The upsert statement for the given branches (every branch when None) and its params."""
+    if branch_ids is None:
+        return text(_UPSERT.format(select=_SUMMARY_SELECT, where="")), {}
+    statement = text(_UPSERT.format(select=_SUMMARY_SELECT, where="WHERE b.id = ANY(CAST(:branch_ids AS uuid[]))"))
+    return statement, {"branch_ids": sorted({str(b) for b in branch_ids})}
+
+
+def refresh_venue_summary(db: Session, branch_ids: Optional[Iterable] = None) -> None:
+    """
+    Recomputes and commits the summary rows of the given branches (all when
+    None). Call after the write itself is committed; failures are logged and
+    left to venue_summary_job.
+    """
+    if not _enabled(db):
+        return
+    if branch_ids is not None:
+        branch_ids = [b for b in branch_ids if b]
+        if not branch_ids:
+            return
+    statement, params = summary_upsert(branch_ids)
+    try:
+        db.execute(statement, params)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[VENUE SUMMARY] Refresh of {branch_ids or 'all branches'} failed: {e}")
+
+
+def rebuild_venue_summaries() -> None:
+    """Recomputes every branch's row in one statement."""
+    db = SessionLocal()
+    try:
+        if not _enabled(db):
+            return
+        statement, params = summary_upsert()
+        db.execute(statement, params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def venue_summary_job():
+    """Scheduler loop: rebuilds every summary row once per VENUE_SUMMARY_REFRESH_SECONDS."""
+    while True:
+        started = perf_counter()
+        try:
+            await asyncio.to_thread(rebuild_venue_summaries)
+        except Exception as e:
+            logger.error(f"[SCHEDULER ERROR] Venue summary rebuild failed: {e}")
+            SCHEDULER_JOB_FAILURES.inc(job="venue_summary")
+        SCHEDULER_JOB_SECONDS.observe(perf_counter() - started, job="venue_summary")
+        await asyncio.sleep(VENUE_SUMMARY_REFRESH_SECONDS)
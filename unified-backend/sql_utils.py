@@ -6,6 +6,9 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Union
 import uuid
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def safe_execute_sql(
     db: Session,
@@ -39,8 +42,8 @@ def safe_execute_sql(
     """
     try:
         if debug:
-            print(f"[SQL_UTILS] Executing query: {query}")
-            print(f"[SQL_UTILS] With params: {params}")
+            logger.debug(f"[SQL_UTILS] Executing query: {query}")
+            logger.debug(f"[SQL_UTILS] With params: {params}")
 
         # Convert UUID strings to UUID objects for proper type handling
         processed_params = {}
@@ -55,7 +58,7 @@ def safe_execute_sql(
                 processed_params[key] = value
 
         if debug and processed_params != params:
-            print(f"[SQL_UTILS] Converted params: {processed_params}")
+            logger.debug(f"[SQL_UTILS] Converted params: {processed_params}")
 
         # Execute the query with proper parameter binding
         result = db.execute(text(query), processed_params)
@@ -80,9 +83,8 @@ def safe_execute_sql(
         return [dict(zip(column_names, row)) for row in rows]
 
     except Exception as e:
-        print(f"[SQL_UTILS] Error executing query: {e}")
+        logger.error(f"[SQL_UTILS] Error executing query: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
         raise
 
 def build_safe_where_clause(
@@ -0,0 +1,86 @@
+import sys
+import os
+import ast
+import unittest
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+# Modules whose handlers must keep synchronous DB work off the event loop.
+# Add a module here once its async handlers follow the convention.
+CHECKED_MODULES = [
+    "dependencies.py",
+    "routers/playo.py",
+    "routers/chatbot.py",
+    "routers/integrations/district.py",
+]
+
+
+def _is_session_param(arg: ast.arg, default) -> bool:
+    if isinstance(arg.annotation, ast.Name) and arg.annotation.id == "Session":
+        return True
+    if isinstance(default, ast.Call) and getattr(default.func, "id", None) == "Depends" and default.args:
+        target = default.args[0]
+        return getattr(target, "id", None) == "get_db" or getattr(target, "attr", None) == "get_db"
+    return False
+
+
+def find_blocking_db_use(source: str, filename: str = "<source>"):
+    """
+    (line, function) for every use of a Session parameter inside an async def
+    that is not an argument of run_in_threadpool(...).
+    """
+    tree = ast.parse(source, filename)
+    parents = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+
+    violations = []
+    for func in ast.walk(tree):
+        if not isinstance(func, ast.AsyncFunctionDef):
+            continue
+        args = func.args.args + func.args.kwonlyargs
+        defaults = [None] * (len(func.args.args) - len(func.args.defaults)) + func.args.defaults + func.args.kw_defaults
+        sessions = {a.arg for a, d in zip(args, defaults) if _is_session_param(a, d)}
+        if not sessions:
+            continue
+        for node in ast.walk(func):
+            if isinstance(node, ast.Name) and node.id in sessions:
+                parent = parents.get(node)
+                offloaded = (
+                    isinstance(parent, ast.Call)
+                    and getattr(parent.func, "id", None) == "run_in_threadpool"
+                    and node in parent.args
+                )
+                if not offloaded:
+                    violations.append((node.lineno, func.name))
+    return violations
+
+
+class TestAsyncDbConvention(unittest.TestCase):
+    def test_checked_modules_do_not_block_the_event_loop(self):
+        for module in CHECKED_MODULES:
+            with open(module, encoding="utf-8") as f:
+                violations = find_blocking_db_use(f.read(), module)
+            self.assertEqual(
+                violations, [],
+                f"{module}: sync DB work in async def; make the handler a plain def or use run_in_threadpool"
+            )
+
+    def test_checker_flags_direct_session_use(self):
+        source = (
+            "async def handler(db: Session = Depends(get_db)):\n"
+            "    return db.query(models.Court).all()\n"
+            "async def helper_call(db=Depends(database.get_db)):\n"
+            "    return load(db)\n"
+            "async def offloaded(db: Session = Depends(get_db)):\n"
+            "    return await run_in_threadpool(load, db)\n"
+            "def sync_handler(db: Session = Depends(get_db)):\n"
+            "    return db.query(models.Court).all()\n"
+        )
+        self.assertEqual(find_blocking_db_use(source), [(2, "handler"), (4, "helper_call")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from db_test_utils import make_court, rows_by_model
+from services import availability_calendar
+from services.availability_calendar import calendar_days, summarize_day
+from utils.availability_engine import SLOTS_PER_DAY, OccupancySnapshot
+
+# A Monday
+DAY = date(2026, 1, 5)
+
+
+def _booking(court, day, slots, players=None, slice_mask=None):
+    return MagicMock(
+        court_id=court.id, booking_date=day, slice_mask=slice_mask, number_of_players=players,
+        time_slots=[{"start_time": s} for s in slots]
+    )
+
+
+def _block(court, day, start, end, blocked_capacity=None):
+    return MagicMock(
+        court_id=court.id, block_date=day, start_time=start, end_time=end, slice_mask=None,
+        blocked_capacity=blocked_capacity
+    )
+
+
+def _db(bookings=(), blocks=(), orders=()):
+    """Session answering the snapshot's range queries by model."""
+    return rows_by_model({models.Booking: bookings, models.CourtBlock: blocks, models.PlayoOrder: orders})
+
+
+def _vector(price, offered_slots, free_slots):
+    prices = [price if i in offered_slots else None for i in range(SLOTS_PER_DAY)]
+    offered = sum(1 << i for i in offered_slots)
+    free = sum(1 << i for i in free_slots)
+    return prices, offered, free
+
+
+class TestForDates(unittest.TestCase):
+    def test_range_is_read_once_and_split_per_date(self):
+        court = make_court()
+        next_day = DAY + timedelta(days=1)
+        db = _db(
+            bookings=[_booking(court, DAY, ["10:00"]), _booking(court, next_day, ["11:00"])],
+            blocks=[_block(court, next_day, dt_time(6, 0), dt_time(7, 0))],
+        )
+
+        snapshots = OccupancySnapshot.for_dates(db, [court], [next_day, DAY])
+
+        # Bookings and blocks, one query each for both dates
+        self.assertEqual(db.query.call_count, 2)
+        self.assertEqual(sorted(snapshots), [DAY, next_day])
+        booked_day = snapshots[DAY].booked(court)
+        booked_next = snapshots[next_day].booked(court)
+        self.assertTrue(booked_day[20])
+        self.assertFalse(booked_day[22])
+        self.assertFalse(booked_next[20])
+        self.assertTrue(booked_next[22])
+        self.assertTrue(booked_next[12])
+        self.assertFalse(booked_day[12])
+
+    def test_no_dates(self):
+        db = _db()
+        self.assertEqual(OccupancySnapshot.for_dates(db, [make_court()], []), {})
+        db.query.assert_not_called()
+
+
+class TestSummarizeDay(unittest.TestCase):
+    def test_free_partial_and_full_counts(self):
+        day = summarize_day(DAY, [
+            # Court A offers 10:00-12:00, taken at 10:00 and 10:30
+            _vector(500.0, {20, 21, 22, 23}, {22, 23}),
+            # Court B offers 10:00-11:00 and 12:00, taken at 10:00
+            _vector(400.0, {20, 21, 24}, {21, 24}),
+        ])
+        self.assertEqual(day["date"], "2026-01-05")
+        # 11:00, 11:30 (only A offers them) and 12:00 (only B)
+        self.assertEqual(day["free_slots"], 3)
+        # 10:30: free on B, taken on A
+        self.assertEqual(day["partial_slots"], 1)
+        # 10:00: taken on both
+        self.assertEqual(day["full_slots"], 1)
+        self.assertEqual(day["min_price"], 800.0)
+
+    def test_sold_out_and_closed_days(self):
+        sold_out = summarize_day(DAY, [_vector(500.0, {20, 21}, set())])
+        self.assertEqual((sold_out["free_slots"], sold_out["partial_slots"], sold_out["full_slots"]), (0, 0, 2))
+        self.assertIsNone(sold_out["min_price"])
+
+        closed = summarize_day(DAY, [])
+        self.assertEqual((closed["free_slots"], closed["partial_slots"], closed["full_slots"]), (0, 0, 0))
+
+
+def _calendar(db, courts):
+    branch = MagicMock(id=uuid.uuid4(), opening_hours={
+        "monday": {"isActive": True, "open": "06:00", "close": "22:00"},
+        "default": {"isActive": False},
+    })
+    with patch.object(availability_calendar, "calendar_courts", return_value=courts), \
+         patch.object(availability_calendar, "load_global_price_rules", return_value=[]), \
+         patch.object(availability_calendar, "get_now_ist", return_value=datetime(2026, 1, 4, 12, 0)):
+        return calendar_days(db, branch, DAY, 7)
+
+
+class TestCalendarDays(unittest.TestCase):
+    def test_days_from_one_snapshot_range(self):
+        court = make_court()
+        db = _db(bookings=[_booking(court, DAY, ["10:00"])])
+
+        days = _calendar(db, [court])
+
+        self.assertEqual([d["date"] for d in days], [(DAY + timedelta(days=i)).isoformat() for i in range(7)])
+        # Monday 06:00-22:00 is 32 slots, one booked
+        self.assertEqual((days[0]["free_slots"], days[0]["full_slots"]), (31, 1))
+        self.assertEqual(days[0]["min_price"], 1000.0)
+        # Closed on the other days
+        self.assertEqual(days[1]["free_slots"], 0)
+        # Bookings, blocks and pending orders: three queries for the week
+        self.assertEqual(db.query.call_count, 3)
+
+    def test_zoned_court_is_full_only_when_every_zone_is_taken(self):
+        turf = make_court(total_zones=2)
+        db = _db(bookings=[
+            # One half at 10:00, both halves (two bookings) at 11:00
+            _booking(turf, DAY, ["10:00"], slice_mask=1),
+            _booking(turf, DAY, ["11:00"], slice_mask=1),
+            _booking(turf, DAY, ["11:00"], slice_mask=2),
+        ])
+
+        days = _calendar(db, [turf])
+
+        self.assertEqual((days[0]["free_slots"], days[0]["full_slots"]), (31, 1))
+
+    def test_capacity_court_is_full_only_at_its_limit(self):
+        pool = make_court(logic_type="capacity", capacity_limit=20)
+        db = _db(
+            bookings=[
+                _booking(pool, DAY, ["10:00"], players=4),
+                _booking(pool, DAY, ["11:00"], players=15),
+            ],
+            # Five places held back by the venue at 11:00
+            blocks=[_block(pool, DAY, dt_time(11, 0), dt_time(11, 30), blocked_capacity=5)],
+        )
+
+        days = _calendar(db, [pool])
+
+        # 10:00 still has 16 places; 11:00 is full (15 booked + 5 blocked)
+        self.assertEqual((days[0]["free_slots"], days[0]["full_slots"]), (31, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
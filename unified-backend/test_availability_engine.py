@@ -0,0 +1,156 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, datetime, time as dt_time
+from unittest.mock import MagicMock
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from db_test_utils import make_court, rows_by_model
+from utils.availability_engine import OccupancySnapshot, compile_price_vector, slot_index
+
+# A Monday
+DAY = date(2026, 1, 5)
+
+
+def _booking(court, slots, slice_mask=None, players=None):
+    return MagicMock(
+        court_id=court.id, slice_mask=slice_mask, number_of_players=players,
+        time_slots=[{"start_time": s} for s in slots]
+    )
+
+
+def _block(court, start, end, slice_mask=None, blocked_capacity=None):
+    return MagicMock(
+        court_id=court.id, start_time=start, end_time=end, slice_mask=slice_mask, blocked_capacity=blocked_capacity
+    )
+
+
+def _db(bookings=(), blocks=(), siblings=()):
+    """Session answering the snapshot's three queries by model."""
+    return rows_by_model({models.Court: siblings, models.Booking: bookings, models.CourtBlock: blocks})
+
+
+class TestSlotIndex(unittest.TestCase):
+    def test_grid_and_off_grid_starts(self):
+        self.assertEqual(slot_index(10.5), 21)
+        self.assertEqual(slot_index(0.0), 0)
+        self.assertIsNone(slot_index(10.25))
+        self.assertIsNone(slot_index(24.0))
+
+
+class TestPriceVector(unittest.TestCase):
+    def setUp(self):
+        self.branch = MagicMock(opening_hours={"monday": {"isActive": True, "open": "06:00", "close": "22:00"}})
+        self.tomorrow = datetime(2026, 1, 4, 12, 0)
+
+    def test_base_price_within_venue_hours(self):
+        prices = compile_price_vector(make_court(), self.branch, DAY, [], self.tomorrow)
+        self.assertIsNone(prices[11])
+        self.assertEqual(prices[12], 500.0)
+        self.assertEqual(prices[43], 500.0)
+        self.assertIsNone(prices[44])
+
+    def test_court_rules_override_global_rules(self):
+        court = make_court(price_conditions=[{"days": ["Monday"], "slotFrom": "18:00", "slotTo": "22:00", "price": 1600}])
+        global_rules = [({"price": 800}, 6.0, 22.0, set(), {"mon"})]
+        prices = compile_price_vector(court, self.branch, DAY, global_rules, self.tomorrow)
+        # The court has its own timings for Mondays, so only 18:00-22:00 is offered
+        self.assertIsNone(prices[12])
+        self.assertEqual(prices[36], 800.0)
+
+    def test_unavailability_and_past_slots_are_closed(self):
+        court = make_court(unavailability_slots=[{"days": ["mon"], "times": ["10:00"]}])
+        prices = compile_price_vector(court, self.branch, DAY, [], datetime(2026, 1, 5, 8, 10))
+        self.assertIsNone(prices[16])   # 08:00 already started
+        self.assertEqual(prices[17], 500.0)
+        self.assertIsNone(prices[20])   # 10:00 unavailable on Mondays
+
+
+class TestOccupancySnapshot(unittest.TestCase):
+    def test_shared_group_sibling_booking_overlaps_by_slice(self):
+        group = uuid.uuid4()
+        turf = make_court(shared_group_id=group, total_zones=2)
+        box = make_court(shared_group_id=group, total_zones=1)
+        # Second zone of the turf: overlaps the two-zone courts of the group only
+        db = _db(bookings=[_booking(turf, ["18:00"], slice_mask=2)], siblings=[turf, box])
+
+        snapshot = OccupancySnapshot(db, [turf, box], DAY)
+
+        self.assertTrue(snapshot.booked(turf)[36])
+        self.assertFalse(snapshot.booked(box)[36])
+        self.assertFalse(snapshot.booked(turf)[37])
+        self.assertEqual(snapshot.occupied_masks(box)[36], 2)
+
+    def test_whole_court_booking_and_unsliced_block(self):
+        court = make_court()
+        db = _db(bookings=[_booking(court, ["09:00", "09:30"])], blocks=[_block(court, dt_time(20, 0), dt_time(21, 0))])
+
+        snapshot = OccupancySnapshot(db, [court], DAY)
+        booked = snapshot.booked(court)
+        hidden = snapshot.fully_blocked(court)
+
+        self.assertEqual([i for i, b in enumerate(booked) if b], [18, 19, 40, 41])
+        self.assertEqual([i for i, h in enumerate(hidden) if h], [40, 41])
+
+    def test_ungrouped_courts_in_mixed_branch_keep_their_bookings(self):
+        group = uuid.uuid4()
+        grouped = make_court(shared_group_id=group)
+        standalone = make_court()
+        db = _db(bookings=[_booking(standalone, ["07:00"])], siblings=[grouped])
+
+        snapshot = OccupancySnapshot(db, [grouped, standalone], DAY)
+
+        self.assertTrue(snapshot.booked(standalone)[14])
+        self.assertFalse(snapshot.booked(grouped)[14])
+
+
+class TestCapacityCourts(unittest.TestCase):
+    def setUp(self):
+        self.pool = make_court(logic_type="capacity", capacity_limit=10)
+
+    def test_slot_is_taken_only_when_players_reach_the_limit(self):
+        db = _db(bookings=[
+            _booking(self.pool, ["07:00", "07:30"], players=4),
+            _booking(self.pool, ["07:00"], players=6),
+            _booking(self.pool, ["08:00"]),  # no player count: one place
+        ])
+
+        snapshot = OccupancySnapshot(db, [self.pool], DAY)
+
+        self.assertEqual([i for i, b in enumerate(snapshot.booked(self.pool)) if b], [14])
+        places = snapshot.booked_places(self.pool)
+        self.assertEqual((places[14], places[15], places[16]), (10, 4, 1))
+
+    def test_partial_block_takes_places_without_hiding_the_court(self):
+        db = _db(
+            bookings=[_booking(self.pool, ["09:00"], players=5)],
+            blocks=[_block(self.pool, dt_time(9, 0), dt_time(10, 0), blocked_capacity=5)],
+        )
+
+        snapshot = OccupancySnapshot(db, [self.pool], DAY)
+
+        self.assertEqual([i for i, b in enumerate(snapshot.booked(self.pool)) if b], [18])
+        self.assertFalse(any(snapshot.fully_blocked(self.pool)))
+        self.assertEqual(snapshot.booked_places(self.pool)[19], 5)
+        self.assertTrue(snapshot.block_covered(self.pool)[19])
+
+    def test_block_without_capacity_closes_the_facility(self):
+        db = _db(blocks=[_block(self.pool, dt_time(9, 0), dt_time(10, 0), blocked_capacity=0)])
+
+        snapshot = OccupancySnapshot(db, [self.pool], DAY)
+
+        self.assertEqual([i for i, h in enumerate(snapshot.fully_blocked(self.pool)) if h], [18, 19])
+        self.assertTrue(snapshot.booked(self.pool)[18])
+
+    def test_hold_with_places(self):
+        snapshot = OccupancySnapshot(_db(bookings=[_booking(self.pool, ["07:00"], players=9)]), [self.pool], DAY)
+        snapshot.hold(self.pool, [14, 15], places=1)
+        self.assertEqual([i for i, b in enumerate(snapshot.booked(self.pool)) if b], [14])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+from database import get_db
+from db_test_utils import fake_session
+from middleware.response_handler import ResponseHandlerMiddleware
+from routers.user import catalog as catalog_router
+from services import catalog
+from services.catalog import build_catalog, bump_catalog, catalog_etag, catalog_sections, etag_matches
+
+
+def _db(versions=None, dialect="postgresql"):
+    """MagicMock session whose catalog_versions rows are `versions`."""
+    db = fake_session(dialect)
+    rows = [MagicMock(section=name, version=v) for name, v in (versions or {}).items()]
+    db.query.side_effect = lambda model: MagicMock(**{"all.return_value": rows})
+    return db
+
+
+class _Builders:
+    """Stand-in section builders counting their calls."""
+
+    def __init__(self):
+        self.data = {name: [name] for name in catalog.CATALOG_SECTIONS}
+        self.calls = {name: 0 for name in catalog.CATALOG_SECTIONS}
+
+    def patch(self):
+        def builder(name):
+            def build(db):
+                self.calls[name] += 1
+                return self.data[name]
+            return build
+        return patch.dict(catalog._BUILDERS, {name: builder(name) for name in catalog.CATALOG_SECTIONS})
+
+
+class TestBumpCatalog(unittest.TestCase):
+    def test_bumps_sections_in_the_callers_transaction(self):
+        db = _db()
+        bump_catalog(db, "faqs", "cities", "faqs")
+        params = db.execute.call_args[0][1]
+        self.assertEqual(params, {"sections": ["cities", "faqs"]})
+        db.commit.assert_not_called()
+
+    def test_unknown_section_is_rejected(self):
+        with self.assertRaises(ValueError):
+            bump_catalog(_db(), "coupons")
+
+    def test_noop_without_postgres(self):
+        db = _db(dialect="sqlite")
+        bump_catalog(db, "faqs")
+        db.execute.assert_not_called()
+
+
+class TestCatalogSections(unittest.TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+        self.builders = _Builders()
+
+    def tearDown(self):
+        catalog.invalidate_catalog()
+
+    def test_sections_are_rebuilt_only_when_their_version_moves(self):
+        with self.builders.patch():
+            catalog_sections(_db({"faqs": 1}))
+            catalog_sections(_db({"faqs": 1}))
+            self.assertEqual(self.builders.calls["faqs"], 1)
+            self.assertEqual(self.builders.calls["cities"], 1)
+
+            catalog_sections(_db({"faqs": 2}))
+            self.assertEqual(self.builders.calls["faqs"], 2)
+            self.assertEqual(self.builders.calls["cities"], 1)
+
+    def test_sections_older_than_max_age_are_rebuilt(self):
+        with self.builders.patch(), patch.object(catalog, "CATALOG_MAX_AGE_SECONDS", -1):
+            catalog_sections(_db(), ["faqs"])
+            catalog_sections(_db(), ["faqs"])
+        self.assertEqual(self.builders.calls["faqs"], 2)
+
+
+class TestBuildCatalog(unittest.TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+        self.builders = _Builders()
+
+    def tearDown(self):
+        catalog.invalidate_catalog()
+
+    def test_delta_leaves_out_sections_the_client_has(self):
+        with self.builders.patch():
+            full = build_catalog(_db())
+            self.assertEqual(set(full["sections"]), set(catalog.CATALOG_SECTIONS))
+
+            self.builders.data["faqs"] = ["changed"]
+            delta = build_catalog(_db({"faqs": 1}), have=full["tokens"])
+
+        self.assertEqual(delta["sections"], {"faqs": ["changed"]})
+        self.assertNotEqual(delta["tokens"]["faqs"], full["tokens"]["faqs"])
+        self.assertEqual(delta["tokens"]["cities"], full["tokens"]["cities"])
+
+    def test_etag_follows_content(self):
+        with self.builders.patch():
+            first = build_catalog(_db())
+            same = build_catalog(_db({"faqs": 1}))  # version moved, content did not
+            self.builders.data["faqs"] = ["changed"]
+            changed = build_catalog(_db({"faqs": 2}))
+            delta = build_catalog(_db({"faqs": 2}), have=changed["tokens"])
+
+        self.assertEqual(catalog_etag(first), catalog_etag(same))
+        self.assertNotEqual(catalog_etag(first), catalog_etag(changed))
+        # Same tokens, fewer sections carried: a different representation
+        self.assertNotEqual(catalog_etag(changed), catalog_etag(delta))
+
+    def test_etag_matching(self):
+        self.assertTrue(etag_matches('W/"abc"', 'W/"abc"'))
+        self.assertTrue(etag_matches('"x", "abc"', 'W/"abc"'))
+        self.assertTrue(etag_matches('"abc"', '"abc"'))
+        self.assertTrue(etag_matches('*', 'W/"abc"'))
+        self.assertFalse(etag_matches('W/"abd"', 'W/"abc"'))
+        self.assertFalse(etag_matches(None, 'W/"abc"'))
+
+
+class TestCatalogEndpoint(unittest.TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+        self.builders = _Builders()
+        app = FastAPI()
+        app.include_router(catalog_router.router, prefix="/api/user")
+        app.dependency_overrides[get_db] = lambda: _db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        catalog.invalidate_catalog()
+
+    def test_etag_and_not_modified(self):
+        with self.builders.patch():
+            response = self.client.get("/api/user/catalog")
+            self.assertEqual(response.status_code, 200)
+            etag = response.headers["etag"]
+            self.assertEqual(response.json()["sections"]["faqs"], ["faqs"])
+
+            cached = self.client.get("/api/user/catalog", headers={"If-None-Match": etag})
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(cached.content, b"")
+
+    def test_enveloped_responses_share_a_weak_etag(self):
+        # The envelope's timestamp makes every body different; the ETag must not claim byte equality
+        self.client.app.add_middleware(ResponseHandlerMiddleware)
+        with self.builders.patch():
+            first = self.client.get("/api/user/catalog")
+            second = self.client.get("/api/user/catalog")
+            cached = self.client.get("/api/user/catalog", headers={"If-None-Match": first.headers["etag"]})
+
+        self.assertTrue(first.headers["etag"].startswith('W/"'))
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertEqual(first.json()["data"]["sections"]["faqs"], ["faqs"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_section_subset_and_delta(self):
+        with self.builders.patch():
+            first = self.client.get("/api/user/catalog?sections=faqs,policies").json()
+            self.assertEqual(set(first["tokens"]), {"faqs", "policies"})
+
+            have = f"faqs:{first['tokens']['faqs']}"
+            delta = self.client.get(f"/api/user/catalog?sections=faqs,policies&have={have}").json()
+        self.assertEqual(set(delta["sections"]), {"policies"})
+
+    def test_unknown_section(self):
+        response = self.client.get("/api/user/catalog?sections=faqs,coupons")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, timedelta, time as dt_time
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+import schemas_district
+from db_test_utils import make_court
+from services.integrations.district_adapter import DistrictAdapter
+
+FUTURE = date.today() + timedelta(days=3)
+
+
+def _court(name, **columns):
+    return make_court(name=name, price_per_hour=1200, **columns)
+
+
+def _payload(*slots):
+    return schemas_district.DistrictBatchBookingRequest(
+        id="req-1", apiKey="key", facilityName="Rush Arena", sportName="Football",
+        userName="Bot", userPhone="9999999999",
+        slots=[schemas_district.DistrictSlotRule(date=FUTURE.strftime('%d-%m-%Y'), slotNumber=n, courtNumber=c) for n, c in slots]
+    )
+
+
+class TestBatchBooking(unittest.TestCase):
+    def setUp(self):
+        self.courts = [_court("Turf A"), _court("Turf B")]
+        self.bookings = []
+        self.blocks = []
+
+        def query(model):
+            q = MagicMock()
+            if model is models.Court:
+                q.filter.return_value.order_by.return_value.with_for_update.return_value.all.return_value = self.courts
+                q.filter.return_value.all.return_value = self.courts
+            elif model is models.Booking:
+                q.filter.return_value.all.return_value = self.bookings
+            elif model is models.CourtBlock:
+                q.filter.return_value.all.return_value = self.blocks
+            return q
+
+        self.db = MagicMock()
+        self.db.query.side_effect = query
+        self.adapter = DistrictAdapter(self.db, skip_notifications=True)
+        branch = MagicMock(opening_hours=None)
+        branch.name = "Rush Arena"
+        self.adapter._get_branch_by_facility_name = MagicMock(return_value=branch)
+        self.adapter._get_game_type_by_sport_name = MagicMock()
+        self.adapter._get_or_create_partner_user = MagicMock(return_value=MagicMock(id=uuid.uuid4()))
+        patcher = patch("services.integrations.district_adapter.load_global_price_rules", return_value=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _inserted(self):
+        return self.db.add_all.call_args[0][0]
+
+    def test_batch_is_validated_and_inserted_in_one_flush(self):
+        result = self.adapter.make_batch_booking(_payload((20, 1), (21, 1)), batch_id="b-1")
+
+        bookings = self._inserted()
+        self.assertEqual(len(bookings), 2)
+        self.assertEqual(self.db.flush.call_count, 1)
+        self.assertEqual(bookings[1].time_slots, [{"start": "10:30", "end": "11:00", "price": 600.0}])
+        self.assertEqual(bookings[0].booking_source, "district|b-1")
+        self.assertEqual([b["slotNumber"] for b in result["bookings"]], [20, 21])
+        self.assertEqual(result["bookings"][0]["courtNumber"], 1)
+        self.assertEqual(result["totalSlots"], 2)
+        self.db.commit.assert_called_once()
+
+    def test_existing_booking_in_shared_group_conflicts(self):
+        group = uuid.uuid4()
+        sibling = _court("Half Turf", shared_group_id=group, total_zones=2)
+        self.courts = [_court("Full Turf", shared_group_id=group, total_zones=2), sibling]
+        self.bookings = [MagicMock(court_id=sibling.id, slice_mask=2, time_slots=[{"start": "10:30"}])]
+
+        with self.assertRaisesRegex(ValueError, "already booked"):
+            self.adapter.make_batch_booking(_payload((20, 0), (21, 0)), batch_id="b-1")
+        self.db.add_all.assert_not_called()
+
+    def test_same_slot_twice_in_one_batch_conflicts(self):
+        with self.assertRaisesRegex(ValueError, "already booked"):
+            self.adapter.make_batch_booking(_payload((20, 0), (20, 0)), batch_id="b-1")
+
+    def test_manual_block_conflicts(self):
+        self.blocks = [MagicMock(court_id=self.courts[0].id, start_time=dt_time(10, 0), end_time=dt_time(11, 0), slice_mask=0)]
+
+        with self.assertRaisesRegex(ValueError, "Manual Block"):
+            self.adapter.make_batch_booking(_payload((18, 0), (20, 0)), batch_id="b-1")
+        self.db.add_all.assert_not_called()
+
+    def test_closed_slot_is_rejected(self):
+        self.courts[0].unavailability_slots = [{"dates": [FUTURE.isoformat()], "times": ["09:00"]}]
+
+        with self.assertRaisesRegex(ValueError, "not available"):
+            self.adapter.make_batch_booking(_payload((17, 0), (18, 0)), batch_id="b-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
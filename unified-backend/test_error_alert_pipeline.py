@@ -0,0 +1,92 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from utils.error_alert_service import ErrorAlertPipeline, SharedAlertRateLimiter, error_fingerprint
+
+
+def _raise(message):
+    try:
+        raise ValueError(message)
+    except ValueError as e:
+        return e
+
+
+class TestErrorAlertPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, "alert_state.json")
+        self.sent = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _pipeline(self, max_alerts=3):
+        limiter = SharedAlertRateLimiter(self.state_file, window_minutes=5, max_alerts=max_alerts)
+        pipeline = ErrorAlertPipeline(rate_limiter=limiter, window_seconds=3600, sender=self._send)
+        # Keep the worker thread out of the way; tests flush explicitly
+        pipeline.start = lambda: None
+        return pipeline
+
+    def _send(self, subject, text, html):
+        self.sent.append((subject, text))
+        return True
+
+    def test_same_fingerprint_is_aggregated_into_one_digest(self):
+        pipeline = self._pipeline()
+        request = {'method': 'GET', 'path': '/api/user/venues', 'url': 'http://x/api/user/venues'}
+        for i in range(5):
+            pipeline.enqueue(_raise(f"db down {i}"), request)
+        pipeline.enqueue(_raise("db down"), {'method': 'GET', 'path': '/api/user/bookings'})
+
+        self.assertTrue(pipeline.flush())
+        self.assertEqual(len(self.sent), 1)
+        subject, text = self.sent[0]
+        self.assertIn("6 errors (2 distinct)", subject)
+        self.assertIn("[5x] ValueError", text)
+        self.assertIn("[1x] ValueError", text)
+
+    def test_single_error_uses_classic_alert(self):
+        pipeline = self._pipeline()
+        pipeline.enqueue(_raise("boom"), {'path': '/x'})
+        pipeline.flush()
+        self.assertEqual(self.sent[0][0], "🚨 MyRush Backend Error Alert - ValueError")
+
+    def test_rate_limit_is_shared_between_pipelines(self):
+        # Two pipelines stand in for two worker processes sharing the state file
+        first, second = self._pipeline(max_alerts=1), self._pipeline(max_alerts=1)
+        error = _raise("boom")
+
+        first.enqueue(error, {'path': '/x'})
+        self.assertTrue(first.flush())
+
+        second.enqueue(error, {'path': '/x'})
+        second.enqueue(error, {'path': '/x'})
+        self.assertFalse(second.flush())
+        self.assertEqual(len(self.sent), 1)
+
+    def test_suppressed_count_is_reported_with_next_alert(self):
+        limiter = SharedAlertRateLimiter(self.state_file, window_minutes=5, max_alerts=1)
+        fingerprint = error_fingerprint(_raise("boom"), {'path': '/x'})
+
+        self.assertEqual(limiter.acquire({fingerprint: 1}), {fingerprint: 1})
+        self.assertEqual(limiter.acquire({fingerprint: 4}), {})
+
+        limiter.window_seconds = 0  # window elapsed
+        self.assertEqual(limiter.acquire({fingerprint: 1}), {fingerprint: 5})
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        limiter = SharedAlertRateLimiter(self.state_file)
+        pipeline = ErrorAlertPipeline(rate_limiter=limiter, max_queue_size=1, sender=self._send)
+        pipeline.start = lambda: None
+        self.assertTrue(pipeline.enqueue(_raise("a")))
+        self.assertFalse(pipeline.enqueue(_raise("b")))
+        self.assertEqual(pipeline.dropped, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
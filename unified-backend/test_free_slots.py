@@ -0,0 +1,142 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from db_test_utils import fake_session
+from services import free_slots
+
+DAY = date(2026, 1, 5)
+
+
+class TestMasks(unittest.TestCase):
+    def test_window_mask(self):
+        self.assertEqual(free_slots.window_mask(38, 2), 0b11 << 38)  # 19:00-20:00
+
+    def test_free_mask_needs_price_and_no_occupancy(self):
+        prices = [None] * 48
+        prices[38] = prices[39] = prices[40] = 500.0
+        booked = [False] * 48
+        booked[39] = True
+        hidden = [False] * 48
+        hidden[40] = True
+        self.assertEqual(free_slots.free_mask(prices, booked, hidden), 1 << 38)
+
+
+class TestMarkStale(unittest.TestCase):
+    def test_marks_group_once(self):
+        db = fake_session()
+        court = uuid.uuid4()
+        free_slots.mark_stale(db, [court, str(court), None], "2026-01-05")
+        self.assertEqual(db.execute.call_args.args[1], {"court_ids": [str(court)], "slot_date": "2026-01-05"})
+        db.commit.assert_not_called()
+
+    def test_update_runs_in_a_savepoint(self):
+        db = fake_session()
+        calls = []
+        db.begin_nested.return_value.__enter__.side_effect = lambda: calls.append("savepoint")
+        db.begin_nested.return_value.__exit__.side_effect = lambda *exc: calls.append("release")
+        db.execute.side_effect = lambda *args: calls.append("update")
+        free_slots.mark_stale(db, [uuid.uuid4()], "2026-01-05")
+        self.assertEqual(calls, ["savepoint", "update", "release"])
+
+    def test_skipped_outside_postgres(self):
+        db = fake_session("sqlite")
+        free_slots.mark_stale(db, [uuid.uuid4()], DAY)
+        self.assertEqual(free_slots.search_free_courts(db, DAY, 38, 2), [])
+        db.execute.assert_not_called()
+
+
+class TestMarkStaleWithGroups(unittest.TestCase):
+    def test_widens_to_shared_group_per_date(self):
+        court, sibling, lone = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        group = uuid.uuid4()
+        db = fake_session()
+        db.query.return_value.filter.return_value.all.side_effect = [
+            [MagicMock(id=court, shared_group_id=group), MagicMock(id=lone, shared_group_id=None)],
+            [MagicMock(id=court, shared_group_id=group), MagicMock(id=sibling, shared_group_id=group)],
+        ]
+        next_day = date(2026, 1, 6)
+
+        free_slots.mark_stale_with_groups(db, [(court, DAY), (lone, next_day), (court, DAY), (None, DAY)])
+
+        calls = [c.args[1] for c in db.execute.call_args_list]
+        self.assertEqual(calls, [
+            {"court_ids": sorted([str(court), str(sibling)]), "slot_date": str(DAY)},
+            {"court_ids": [str(lone)], "slot_date": str(next_day)},
+        ])
+        db.commit.assert_not_called()
+
+    def test_skipped_outside_postgres(self):
+        db = fake_session("sqlite")
+        free_slots.mark_stale_with_groups(db, [(uuid.uuid4(), DAY)])
+        db.query.assert_not_called()
+        db.execute.assert_not_called()
+
+
+class TestPlayoWritesMarkStale(unittest.TestCase):
+    """Playo endpoints write orders and bookings without the orchestrator."""
+
+    def test_cancelled_order_and_booking_mark_their_dates(self):
+        from routers import playo
+        court = uuid.uuid4()
+        row = MagicMock(court_id=court, booking_date=DAY)
+        db = fake_session()
+        db.query.return_value.filter.return_value.first.return_value = row
+
+        with patch.object(playo, "mark_stale_with_groups") as mark:
+            playo.cancel_order(MagicMock(orderIds=[str(uuid.uuid4())]), db=db, api_key=None)
+            playo.cancel_booking(
+                MagicMock(bookingIds=[MagicMock(externalBookingId=str(uuid.uuid4()))]), db=db, api_key=None
+            )
+
+        self.assertEqual([c.args[1] for c in mark.call_args_list], [[(court, DAY)], [(court, DAY)]])
+        self.assertEqual(db.commit.call_count, 2)
+
+
+class TestRefresh(unittest.TestCase):
+    def test_upserts_mask_with_change_seq_read_before_snapshot(self):
+        court = MagicMock(id=uuid.uuid4(), branch_id=uuid.uuid4(), game_type_id=uuid.uuid4())
+        db = fake_session()
+        db.query.return_value.filter.return_value.all.side_effect = [
+            [court],  # courts
+            [MagicMock(court_id=court.id, change_seq=7)],  # change_seq of existing rows
+            [],  # branches
+        ]
+        snapshot = MagicMock()
+        snapshot.booked.return_value = [False] * 48
+        snapshot.fully_blocked.return_value = [False] * 48
+        prices = [None] * 48
+        prices[20] = 400.0
+
+        with patch.object(free_slots, "OccupancySnapshot", return_value=snapshot), \
+             patch.object(free_slots, "compile_price_vector", return_value=prices):
+            self.assertEqual(free_slots.refresh_free_slots(db, DAY, [court.id], global_rules=[]), 1)
+
+        row = db.execute.call_args.args[1][0]
+        self.assertEqual((row["free_mask"], row["change_seq"]), (1 << 20, 7))
+        self.assertIn("stale = court_free_slots.change_seq <> EXCLUDED.change_seq", str(db.execute.call_args.args[0]))
+
+
+class TestSearch(unittest.TestCase):
+    def test_bitwise_window_and_filters(self):
+        db = fake_session()
+        db.query.return_value.filter.return_value.all.return_value = []  # nothing stale
+        db.execute.return_value.fetchall.return_value = []
+
+        free_slots.search_free_courts(db, DAY, 38, 2, game_type="Football", city="Bangalore")
+
+        sql, params = str(db.execute.call_args.args[0]), db.execute.call_args.args[1]
+        self.assertIn("(fs.free_mask & :wanted) = :wanted", sql)
+        self.assertIn("LOWER(agt.name) = LOWER(:game_type)", sql)
+        self.assertEqual(params["wanted"], 0b11 << 38)
+        self.assertEqual(params["city"], "Bangalore")
+
+
+if __name__ == "__main__":
+    unittest.main()
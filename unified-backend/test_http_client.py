@@ -0,0 +1,118 @@
+import sys
+import os
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import requests
+
+from utils import http_client
+from utils.metrics import OUTBOUND_HTTP_SECONDS
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _reply(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        with server.lock:
+            server.hits += 1
+            server.client_ports.add(self.client_address[1])
+            status = server.statuses.pop(0) if server.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        self.server.client_ports = set()
+        self.server.statuses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self.sleep = patch.object(http_client.time, "sleep", lambda s: None)
+        self.sleep.start()
+
+    def tearDown(self):
+        self.sleep.stop()
+        http_client.close_all()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def test_calls_to_one_host_reuse_a_connection(self):
+        for _ in range(5):
+            self.assertEqual(http_client.post(self.url, json={"a": 1}).status_code, 200)
+        self.assertEqual(self.server.hits, 5)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_get_retries_gateway_errors(self):
+        self.server.statuses = [503, 502]
+        response = http_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits, 3)
+
+    def test_post_is_not_retried_after_reaching_the_server(self):
+        self.server.statuses = [503]
+        self.assertEqual(http_client.post(self.url, json={}).status_code, 503)
+        self.assertEqual(self.server.hits, 1)
+
+    def test_connect_failures_are_retried_then_raised(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        attempts = []
+        with patch.object(http_client, "backoff_delay", lambda attempt: attempts.append(attempt) or 0):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                http_client.post(self.url, json={}, retries=2)
+        self.assertEqual(attempts, [0, 1])
+
+    def test_latency_is_recorded_per_host(self):
+        host = http_client.host_key(self.url)
+        before = OUTBOUND_HTTP_SECONDS.count(host=host, method="GET", outcome=200)
+        http_client.get(self.url)
+        self.assertEqual(OUTBOUND_HTTP_SECONDS.count(host=host, method="GET", outcome=200), before + 1)
+
+    def test_async_client_pools_and_retries(self):
+        self.server.statuses = [504]
+
+        async def run():
+            with patch.object(http_client, "backoff_delay", lambda attempt: 0):
+                first = await http_client.aget(self.url)
+                second = await http_client.apost(self.url, json={"a": 1})
+            await http_client.aclose_all()
+            return first.status_code, second.status_code
+
+        self.assertEqual(asyncio.run(run()), (200, 200))
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_backoff_is_jittered(self):
+        delays = {http_client.backoff_delay(1) for _ in range(20)}
+        self.assertGreater(len(delays), 1)
+        base = http_client.HTTP_RETRY_BACKOFF * 2
+        self.assertTrue(all(base * 0.5 <= d <= base * 1.5 for d in delays))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+from datetime import time as dt_time
+from unittest.mock import MagicMock
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from services.integrations.district_adapter import DistrictAdapter
+from services.integrations.outbox_worker import _coalesce_events
+
+
+def _event(event_id, payload, partner_id="p1", coalesce_key=None, category="availability"):
+    return models.OutboxEvent(
+        id=event_id, partner_id=partner_id, category=category, payload=payload,
+        coalesce_key=coalesce_key, status="processing", attempts=1, max_attempts=5
+    )
+
+
+class TestCoalesceClaimedEvents(unittest.TestCase):
+    def test_same_court_date_action_is_folded_into_oldest(self):
+        first = _event("e1", {"court_id": "c1", "date": "2026-01-05", "action": "block", "slot_starts": [10.0]}, coalesce_key="c1:2026-01-05:block")
+        legacy = _event("e2", {"court_id": "c1", "date": "2026-01-05", "action": "block", "slot_start": 10.5})
+        other_partner = _event("e3", {"court_id": "c1", "date": "2026-01-05", "action": "block", "slot_starts": [11.0]}, partner_id="p2")
+
+        kept = _coalesce_events([first, legacy, other_partner])
+
+        self.assertEqual(kept, [first, other_partner])
+        self.assertEqual(first.payload["slot_starts"], [10.0, 10.5])
+        self.assertEqual(legacy.status, "completed")
+        self.assertIn("e1", legacy.error_message)
+
+    def test_opposite_actions_and_other_categories_stay_separate(self):
+        block = _event("e1", {"court_id": "c1", "date": "2026-01-05", "action": "block", "slot_starts": [10.0]})
+        release = _event("e2", {"court_id": "c1", "date": "2026-01-05", "action": "available", "slot_starts": [10.0]})
+        schedule = _event("e3", {"court_id": "c1", "action": "update"}, category="maintenance")
+
+        self.assertEqual(_coalesce_events([block, release, schedule]), [block, release, schedule])
+
+    def test_legacy_event_gets_slot_list(self):
+        legacy = _event("e1", {"court_id": "c1", "date": "2026-01-05", "action": "block", "slot_start": 9.0})
+        _coalesce_events([legacy])
+        self.assertEqual(legacy.payload["slot_starts"], [9.0])
+
+
+class TestMultiSlotInventoryWebhook(unittest.TestCase):
+    def _adapter(self, logic_type="binary"):
+        adapter = DistrictAdapter(MagicMock(), partner_id="p1")
+        court = MagicMock(logic_type=logic_type)
+        court.game_type.name = "Football"
+        context = {
+            "branch": MagicMock(), "court": court, "court_index": 2,
+            "allowed_map": {"09:00": {"price": 400}, "09:30": {"price": 450}},
+        }
+        context["branch"].name = "Rush Arena"
+        if logic_type == "capacity":
+            context["total_cap"] = 10
+            context["used"] = lambda slot_start, slot_time: 3 if slot_time < dt_time(9, 30) else 0
+        adapter._inventory_context = MagicMock(return_value=context)
+        return adapter
+
+    def test_one_body_carries_every_slot(self):
+        adapter = self._adapter()
+        body = adapter.format_inventory_webhook({
+            "branch_id": "b1", "court_id": "c1", "date": "2026-01-05",
+            "slot_starts": [9.5, 9.0], "action": "block"
+        })
+
+        adapter._inventory_context.assert_called_once()
+        self.assertEqual([d["slotNumber"] for d in body["data"]], ["18", "19"])
+        self.assertEqual([d["price"] for d in body["data"]], [400.0, 450.0])
+        self.assertEqual({d["count"] for d in body["data"]}, {"0"})
+        self.assertEqual(body["data"][0]["courtNumber"], "2")
+
+    def test_capacity_courts_report_remaining_per_slot(self):
+        adapter = self._adapter("capacity")
+        body = adapter.format_inventory_webhook({
+            "branch_id": "b1", "court_id": "c1", "date": "2026-01-05",
+            "slot_start": 9.0, "action": "available"
+        })
+        self.assertEqual([d["count"] for d in body["data"]], ["7"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from utils import invoice_utils
+
+
+def _context():
+    booking = models.Booking(id=uuid.uuid4(), status="pending", payment_status="pending", total_amount=1000)
+    user = models.User(id=uuid.uuid4(), full_name="Asha")
+    court = models.Court(id=uuid.uuid4(), name="Court 1")
+    branch = models.Branch(id=uuid.uuid4(), name="Koramangala")
+    return booking, user, court, branch
+
+
+class TestInvoiceCache(unittest.TestCase):
+    def setUp(self):
+        invoice_utils._html_by_digest.clear()
+        self.row = _context()
+        self.site = SimpleNamespace(company_name="Rush", site_logo=None)
+        self.template = MagicMock()
+        self.template.render.side_effect = lambda ctx: f"<html>{ctx['booking'].status}/{ctx['booking'].payment_status}</html>"
+        self.patches = [
+            patch.object(invoice_utils, "load_invoice_context", side_effect=lambda db, booking_id: self.row),
+            patch.object(invoice_utils, "get_site_settings_snapshot", side_effect=lambda db: self.site),
+            patch.object(invoice_utils, "invoice_template", self.template),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        invoice_utils._html_by_digest.clear()
+
+    def _render(self, auto_print=False):
+        return invoice_utils.render_invoice_html(MagicMock(), str(uuid.uuid4()), auto_print)
+
+    def test_unchanged_booking_is_served_from_cache(self):
+        first = self._render()
+        self.assertEqual(self._render(), first)
+        self.assertEqual(self.template.render.call_count, 1)
+
+    def test_booking_change_from_any_write_path_renders_again(self):
+        self._render()
+        # e.g. payment confirmed or cancelled by another worker: nothing is invalidated
+        self.row[0].payment_status = "paid"
+        self.row[0].status = "confirmed"
+        self.assertEqual(self._render(), "<html>confirmed/paid</html>")
+        self.assertEqual(self.template.render.call_count, 2)
+
+    def test_site_settings_and_print_flag_are_part_of_the_key(self):
+        self._render()
+        self._render(auto_print=True)
+        self.site = SimpleNamespace(company_name="Rush Sports", site_logo=None)
+        self._render()
+        self.assertEqual(self.template.render.call_count, 3)
+
+    def test_missing_booking(self):
+        self.row = None
+        self.assertIsNone(self._render())
+        self.template.render.assert_not_called()
+
+    def test_cache_is_bounded(self):
+        with patch.object(invoice_utils, "INVOICE_CACHE_MAX_ENTRIES", 2):
+            for status in ("pending", "confirmed", "cancelled"):
+                self.row[0].status = status
+                self._render()
+        self.assertEqual(len(invoice_utils._html_by_digest), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
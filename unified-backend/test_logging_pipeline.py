@@ -0,0 +1,52 @@
+import sys
+import os
+import logging
+import unittest
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from utils.logger import SampledLogger, set_log_level, get_log_levels, get_logger
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.target = get_logger("test.logging_pipeline")
+        self.target.propagate = False
+        self.capture = _Capture()
+        self.target.addHandler(self.capture)
+
+    def tearDown(self):
+        self.target.removeHandler(self.capture)
+        self.target.setLevel(logging.NOTSET)
+
+    def test_sampled_logger_respects_rate(self):
+        self.target.setLevel(logging.DEBUG)
+        SampledLogger(self.target, rate=0.0).debug("never")
+        for i in range(5):
+            SampledLogger(self.target, rate=1.0).debug("always %s", i)
+        self.assertEqual([r.getMessage() for r in self.capture.records], [f"always {i}" for i in range(5)])
+
+    def test_sampled_logger_skips_disabled_levels(self):
+        self.target.setLevel(logging.INFO)
+        SampledLogger(self.target, rate=1.0).debug("hidden")
+        self.assertEqual(self.capture.records, [])
+
+    def test_set_log_level_at_runtime(self):
+        set_log_level("test.logging_pipeline", "warning")
+        self.assertEqual(get_log_levels()["test.logging_pipeline"], "WARNING")
+        with self.assertRaises(ValueError):
+            set_log_level("test.logging_pipeline", "LOUD")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from middleware.metrics import MetricsMiddleware
+from utils.metrics import (
+    MetricsRegistry, HTTP_REQUEST_SECONDS, HTTP_REQUEST_QUERIES,
+    instrument_engine, DB_QUERIES_TOTAL,
+)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("job_seconds", "Job time", ("job",), buckets=(1, 5))
+        histogram.observe(0.5, job="a")
+        histogram.observe(3, job="a")
+        histogram.observe(9, job="a")
+
+        text_out = registry.render()
+        self.assertIn('job_seconds_bucket{job="a",le="1"} 1', text_out)
+        self.assertIn('job_seconds_bucket{job="a",le="5"} 2', text_out)
+        self.assertIn('job_seconds_bucket{job="a",le="+Inf"} 3', text_out)
+        self.assertIn('job_seconds_count{job="a"} 3', text_out)
+        self.assertIn('job_seconds_sum{job="a"} 12.5', text_out)
+
+    def test_collectors_refresh_gauges_and_errors_are_contained(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("depth", "Queue depth")
+        registry.add_collector(lambda: gauge.set(7))
+        registry.add_collector(lambda: 1 / 0)
+        self.assertIn("depth 7", registry.render())
+
+    def test_label_mismatch_is_rejected(self):
+        counter = MetricsRegistry().counter("hits", "Hits", ("route",))
+        with self.assertRaises(ValueError):
+            counter.inc(path="/x")
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def test_route_template_and_query_count(self):
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+
+        router = APIRouter()
+
+        @router.get("/courts/{court_id}")
+        def court(court_id: str):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            return {"id": court_id}
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/test-metrics")
+        app.add_middleware(MetricsMiddleware)
+
+        before = DB_QUERIES_TOTAL.value()
+        TestClient(app).get("/api/test-metrics/courts/42")
+
+        route = "/api/test-metrics/courts/{court_id}"
+        self.assertEqual(HTTP_REQUEST_SECONDS.count(method="GET", route=route, status=200), 1)
+        self.assertEqual(HTTP_REQUEST_QUERIES.count(route=route), 1)
+        self.assertEqual(HTTP_REQUEST_QUERIES._values[(route,)][1], 2)
+        self.assertEqual(DB_QUERIES_TOTAL.value() - before, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
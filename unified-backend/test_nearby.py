@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+import uuid
+from unittest.mock import MagicMock
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from db_test_utils import fake_session
+from services import nearby
+
+# MG Road, Bangalore
+LAT, LNG = 12.9756, 77.6067
+
+
+def _row(lat, lng, min_price=500, rating=4.0):
+    return MagicMock(_mapping={
+        "id": uuid.uuid4(), "latitude": lat, "longitude": lng, "min_price": min_price, "average_rating": rating,
+    })
+
+
+def _db(*results):
+    db = fake_session()
+    db.execute.return_value.fetchall.side_effect = [list(r) for r in results]
+    return db
+
+
+class TestGeometry(unittest.TestCase):
+    def test_haversine(self):
+        # MG Road to Kempegowda airport, about 27 km
+        self.assertAlmostEqual(nearby.haversine_km(LAT, LNG, 13.1989, 77.7068), 26.9, delta=1.0)
+        self.assertEqual(nearby.haversine_km(LAT, LNG, LAT, LNG), 0)
+
+    def test_grid_window_covers_circle(self):
+        window = nearby.grid_window(LAT, LNG, 5)
+        self.assertEqual((window["row_lo"], window["row_hi"]), (258, 260))
+        self.assertEqual((window["col_lo"], window["col_hi"]), (1551, 1553))
+
+
+class TestFindNearby(unittest.TestCase):
+    def test_radius_drops_bounding_box_corners(self):
+        inside, corner = _row(12.99, 77.61), _row(13.015, 77.645)
+        db = _db([corner, inside])
+
+        venues = nearby.find_nearby_venues(db, LAT, LNG, radius_km=5)
+
+        self.assertEqual([v["id"] for v in venues], [inside._mapping["id"]])
+        self.assertEqual(venues[0]["distance_km"], 1.64)
+
+    def test_knn_widens_until_enough(self):
+        near, mid, far = _row(12.98, 77.61), _row(13.05, 77.60), _row(13.10, 77.62)
+        db = _db([near], [mid, near], [far, mid, near])
+
+        venues = nearby.find_nearby_venues(db, LAT, LNG, limit=2)
+
+        self.assertEqual(db.execute.call_count, 2)  # 5 km, then 10 km
+        self.assertEqual([v["id"] for v in venues], [near._mapping["id"], mid._mapping["id"]])
+
+    def test_filters_and_price_sort(self):
+        cheap_far, dear_near = _row(13.00, 77.60, min_price=300), _row(12.98, 77.61, min_price=900)
+        db = _db([dear_near, cheap_far])
+
+        venues = nearby.find_nearby_venues(
+            db, LAT, LNG, radius_km=10, game_type="Football", price_max=1000, sort_by="price"
+        )
+
+        self.assertEqual([float(v["min_price"]) for v in venues], [300, 900])
+        sql, params = str(db.execute.call_args.args[0]), db.execute.call_args.args[1]
+        self.assertIn("vs.sport_terms ~* :game_type_pattern", sql)
+        self.assertIn("vs.min_price <= :price_max", sql)
+        self.assertEqual(params["price_max"], 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
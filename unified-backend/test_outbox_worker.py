@@ -0,0 +1,121 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from services.integrations import outbox_worker
+from services.integrations.district_adapter import DistrictAdapter
+from services.integrations.outbox_worker import PartnerContext, _Delivery, _apply_result, _transmit, run_worker
+
+
+class _SlowAdapter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def transmit_webhook(self, request, timeout=30):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return MagicMock(status_code=200)
+
+
+def _delivery(adapter, partner_id="p1"):
+    event = models.OutboxEvent(id="e", attempts=1, max_attempts=5, status="processing")
+    partner = models.Partner(id=partner_id, name="DISTRICT")
+    return _Delivery(event, partner, adapter, {"url": "http://partner/hook", "json": {"a": 1}, "headers": {}})
+
+
+class TestOutboxWorker(unittest.TestCase):
+    def test_partner_concurrency_is_capped(self):
+        adapter = _SlowAdapter()
+        deliveries = [_delivery(adapter, partner_id="capped") for _ in range(12)]
+        with patch.object(outbox_worker, "OUTBOX_PARTNER_CONCURRENCY", 2), \
+                patch.object(outbox_worker, "_partner_semaphores", {}):
+            threads = [threading.Thread(target=_transmit, args=(d,)) for d in deliveries]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertLessEqual(adapter.peak, 2)
+
+    def test_success_completes_event_and_builds_log(self):
+        delivery = _delivery(None)
+        response = MagicMock(status_code=200, text="{}")
+        response.json.return_value = {"ok": True}
+
+        log = _apply_result(delivery, response, None, 0.1)
+        self.assertEqual(delivery.event.status, "completed")
+        self.assertEqual(log.response_payload, {"ok": True})
+        self.assertEqual(log.endpoint, "http://partner/hook")
+
+    def test_http_error_schedules_retry(self):
+        delivery = _delivery(None)
+        response = MagicMock(status_code=502, text="bad gateway")
+        response.json.side_effect = ValueError()
+
+        _apply_result(delivery, response, None, 0.1)
+        self.assertEqual(delivery.event.status, "failed")
+        self.assertIn("HTTP 502", delivery.event.error_message)
+        self.assertIsNotNone(delivery.event.next_attempt_at)
+
+    def test_polling_backs_off_when_idle_and_drains_full_batches(self):
+        stop = threading.Event()
+        results = iter([outbox_worker.OUTBOX_BATCH_SIZE, 3, 0, 0, 0])
+        waits = []
+
+        def fake_process():
+            try:
+                return next(results)
+            except StopIteration:
+                stop.set()
+                return 0
+
+        stop.wait = lambda delay: waits.append(delay)
+        with patch.object(outbox_worker, "process_outbox", fake_process), \
+                patch.object(outbox_worker.random, "uniform", return_value=1.0):
+            run_worker(stop)
+
+        # Full batch: no wait; partial batch: minimum poll; then doubling
+        base = outbox_worker.OUTBOX_MIN_POLL_SECONDS
+        self.assertEqual(waits[:4], [base, base * 2, base * 4, base * 8])
+
+
+class TestPartnerContext(unittest.TestCase):
+    def test_category_config_overrides_partner_fallback(self):
+        partner = models.Partner(id="p1", name="DISTRICT", webhook_url="http://fallback")
+        context = PartnerContext(partner, None, {"availability": ("http://avail", {"X-Test": "1"})})
+
+        self.assertEqual(context.target("availability"), ("http://avail", {"X-Test": "1"}))
+        self.assertEqual(context.target("pricing"), ("http://fallback", {}))
+
+    def test_adapter_reuses_loaded_partner_and_court_indexes(self):
+        db = MagicMock()
+        partner = models.Partner(id="p1", name="DISTRICT", api_key_hash="key", unique_id="uid")
+        adapter = DistrictAdapter(db, partner_id="p1", partner=partner)
+
+        request = adapter.prepare_webhook("http://hook", {"a": 1})
+        self.assertEqual(request["headers"]["API-KEY"], "key")
+
+        rows = [MagicMock(id="c1"), MagicMock(id="c2")]
+        db.query.return_value.filter.return_value.order_by.return_value.all.return_value = rows
+        first = MagicMock(id="c1", branch_id="b1", game_type_id="g1")
+        second = MagicMock(id="c2", branch_id="b1", game_type_id="g1")
+
+        self.assertEqual((adapter._court_index(first), adapter._court_index(second)), (0, 1))
+        # One court-list query for both courts, none for the partner
+        self.assertEqual(db.query.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from services.integrations import partner_catalog
+
+
+def _db(rows):
+    db = MagicMock()
+    query = db.query.return_value.filter.return_value
+    query.first.return_value = rows[0] if rows else None
+    query.order_by.return_value.all.return_value = rows
+    return db
+
+
+class TestPartnerCatalog(unittest.TestCase):
+    def setUp(self):
+        partner_catalog.invalidate_partner_catalog()
+
+    def tearDown(self):
+        partner_catalog.invalidate_partner_catalog()
+
+    def test_names_resolve_once_case_insensitively(self):
+        db = _db([MagicMock(id="b1")])
+
+        self.assertEqual(partner_catalog.branch_id_for_name(db, "Rush Arena"), "b1")
+        self.assertEqual(partner_catalog.branch_id_for_name(db, "rush arena"), "b1")
+        self.assertEqual(db.query.call_count, 1)
+
+    def test_misses_are_not_cached(self):
+        db = _db([])
+        self.assertIsNone(partner_catalog.game_type_id_for_name(db, "Padel"))
+        self.assertIsNone(partner_catalog.game_type_id_for_name(db, "Padel"))
+        self.assertEqual(db.query.call_count, 2)
+
+    def test_court_index_counts_inactive_courts(self):
+        db = _db([MagicMock(id="c1"), MagicMock(id="c2"), MagicMock(id="c3")])
+
+        self.assertEqual(partner_catalog.court_index(db, MagicMock(id="c3", branch_id="b1", game_type_id="g1")), 2)
+        self.assertEqual(partner_catalog.court_index(db, MagicMock(id="c1", branch_id="b1", game_type_id="g1")), 0)
+        self.assertEqual(db.query.call_count, 1)
+
+    def test_invalidation_drops_entries(self):
+        db = _db([MagicMock(id="b1")])
+        partner_catalog.branch_id_for_name(db, "Rush Arena")
+        partner_catalog.invalidate_partner_catalog()
+        partner_catalog.branch_id_for_name(db, "Rush Arena")
+        self.assertEqual(db.query.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, timedelta, time as dt_time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from db_test_utils import make_court, rows_by_model
+from routers.playo import fetch_availability, validate_playo_items
+from services.integrations.playo_availability import PlayoAvailability
+from utils.availability_engine import slot_span
+
+FUTURE = date.today() + timedelta(days=3)
+
+
+def _db(courts=(), bookings=(), blocks=(), orders=(), branch=None):
+    """Session answering each model's query with fixed rows."""
+    return rows_by_model(
+        {models.Court: courts, models.Booking: bookings, models.CourtBlock: blocks, models.PlayoOrder: orders},
+        first=branch,
+    )
+
+
+def _item(court, start, end, order_id="po-1"):
+    return SimpleNamespace(
+        courtId=str(court.id), date=FUTURE.isoformat(), startTime=start, endTime=end,
+        price=1000, paidAtPlayo=0, playoOrderId=order_id
+    )
+
+
+class TestSlotSpan(unittest.TestCase):
+    def test_spans(self):
+        self.assertEqual(slot_span(dt_time(10, 0), dt_time(11, 0)), range(20, 22))
+        self.assertEqual(slot_span(dt_time(23, 0), dt_time(0, 0)), range(46, 48))
+        self.assertIsNone(slot_span(dt_time(10, 15), dt_time(11, 0)))
+        self.assertIsNone(slot_span(dt_time(11, 0), dt_time(10, 0)))
+
+
+class TestPlayoAvailability(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("services.integrations.playo_availability.load_global_price_rules", return_value=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_slots_cover_playo_window_with_prices(self):
+        court = make_court()
+        slots = PlayoAvailability(_db(), None, [court], FUTURE).slots(court)
+
+        self.assertEqual(len(slots), 34)
+        self.assertEqual(slots[0], {
+            'startTime': '06:00:00', 'endTime': '06:30:00', 'available': True, 'price': 500.0, 'ticketsAvailable': 1
+        })
+        self.assertEqual(slots[-1]['endTime'], '23:00:00')
+
+    def test_pending_orders_and_sibling_bookings_occupy(self):
+        group = uuid.uuid4()
+        court = make_court(shared_group_id=group)
+        sibling = make_court(shared_group_id=group)
+        booking = MagicMock(court_id=sibling.id, slice_mask=None, time_slots=[{"start_time": "07:00"}])
+        order = MagicMock(court_id=court.id, start_time=dt_time(9, 0), end_time=dt_time(10, 0))
+        db = _db(courts=[court, sibling], bookings=[booking], orders=[order])
+
+        availability = PlayoAvailability(db, None, [court], FUTURE)
+        free = availability.free(court)
+
+        self.assertFalse(free[14])  # sibling's booking at 07:00
+        self.assertFalse(free[18] or free[19])  # pending order 09:00-10:00
+        self.assertTrue(free[20])
+        self.assertFalse(availability.is_free(court, dt_time(9, 30), dt_time(10, 30)))
+        self.assertTrue(availability.is_free(court, dt_time(10, 0), dt_time(11, 0)))
+
+
+class TestValidateItems(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("routers.playo.load_global_price_rules", return_value=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_items_of_one_request_cannot_overlap(self):
+        court = make_court()
+        db = _db(courts=[court], branch=MagicMock(opening_hours=None))
+        items = [
+            _item(court, "10:00:00", "11:00:00", "po-1"),
+            _item(court, "11:00:00", "12:00:00", "po-2"),
+            _item(court, "10:30:00", "11:30:00", "po-3"),
+        ]
+
+        validated, errors = validate_playo_items(db, uuid.uuid4(), items, "order")
+
+        self.assertEqual([v[0].playoOrderId for v in validated], ["po-1", "po-2"])
+        self.assertEqual(errors, [f"Slot 10:30:00-11:30:00 is not available for court {court.id}"])
+        # Venue, courts and one snapshot of bookings, blocks and orders; nothing per item
+        self.assertEqual(db.query.call_count, 5)
+
+    def test_unknown_court_and_bad_time(self):
+        court = make_court()
+        db = _db(courts=[], branch=MagicMock(opening_hours=None))
+        items = [_item(court, "10:00:00", "11:00:00"), _item(court, "10am", "11:00:00", "po-2")]
+
+        validated, errors = validate_playo_items(db, uuid.uuid4(), items, "booking")
+
+        self.assertEqual(validated, [])
+        self.assertEqual(errors, [
+            "Invalid time format for booking po-2",
+            f"Court {court.id} not found or doesn't belong to venue",
+        ])
+
+
+class TestFetchAvailability(unittest.TestCase):
+    """GET /playo/availability end to end on real model rows."""
+
+    def setUp(self):
+        patcher = patch("services.integrations.playo_availability.load_global_price_rules", return_value=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_two_zone_court_with_one_zone_booked(self):
+        branch = models.Branch(id=uuid.uuid4(), name="Rush Arena", opening_hours=None)
+        court = make_court(branch_id=branch.id, total_zones=2, logic_type="divisible")
+        booking = models.Booking(
+            court_id=court.id, booking_date=FUTURE, slice_mask=1, status="confirmed",
+            time_slots=[{"start_time": "07:00", "end_time": "07:30"}]
+        )
+        db = _db(courts=[court], bookings=[booking], branch=branch)
+        db.query.side_effect = lambda model: MagicMock(**{
+            "join.return_value.filter.return_value.all.return_value": [court] if model is models.Court else [],
+            "filter.return_value.all.return_value": [booking] if model is models.Booking else [],
+            "filter.return_value.first.return_value": branch,
+        })
+
+        response = fetch_availability(
+            venue_id=str(branch.id), sport_id=str(court.game_type_id), date=FUTURE.isoformat(), db=db, api_key=None
+        )
+
+        slots = {slot.startTime: slot.available for slot in response.courts[0].slots}
+        self.assertEqual(response.requestStatus, 1)
+        self.assertFalse(slots["07:00:00"])
+        self.assertTrue(slots["07:30:00"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, datetime, time as dt_time
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from services.integrations import playo_reaper
+from services.integrations.orchestrator import IntegrationOrchestrator
+from services.integrations.outbox_service import OutboxService
+
+DAY = date(2026, 1, 5)
+NOW = datetime(2026, 1, 5, 8, 0)
+
+
+def _order(court_id, start, end):
+    return MagicMock(court_id=court_id, booking_date=DAY, start_time=start, end_time=end, status='pending')
+
+
+def _db(*batches):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value \
+        .with_for_update.return_value.all.side_effect = [list(b) for b in batches]
+    return db
+
+
+class TestExpireBatch(unittest.TestCase):
+    def test_expires_without_partner_events(self):
+        court = uuid.uuid4()
+        orders = [_order(court, dt_time(10, 0), dt_time(11, 0)), _order(court, dt_time(11, 0), dt_time(11, 30))]
+        db = _db(orders)
+
+        with patch.object(IntegrationOrchestrator, "notify_inventory_range") as notify, \
+             patch.object(OutboxService, "queue_inventory_slots") as queue:
+            self.assertEqual(playo_reaper.expire_batch(db, NOW), 2)
+
+        self.assertEqual([o.status for o in orders], ['expired', 'expired'])
+        notify.assert_not_called()
+        queue.assert_not_called()
+        db.commit.assert_called_once()
+
+    def test_expired_holds_mark_free_slots_stale(self):
+        court = uuid.uuid4()
+        db = _db([_order(court, dt_time(10, 0), dt_time(11, 0))])
+
+        with patch.object(playo_reaper, "mark_stale_with_groups") as mark:
+            playo_reaper.expire_batch(db, NOW)
+
+        mark.assert_called_once_with(db, [(court, DAY)])
+
+    def test_nothing_overdue(self):
+        db = _db([])
+        self.assertEqual(playo_reaper.expire_batch(db, NOW), 0)
+        db.commit.assert_not_called()
+
+
+class TestReapExpiredOrders(unittest.TestCase):
+    def test_runs_batches_until_short_batch(self):
+        court = uuid.uuid4()
+        db = _db(
+            [_order(court, dt_time(6, 0), dt_time(7, 0))] * 2,
+            [_order(court, dt_time(7, 0), dt_time(8, 0))],
+        )
+        with patch.object(playo_reaper, "PLAYO_REAPER_BATCH_ROWS", 2), \
+             patch.object(playo_reaper, "SessionLocal", return_value=db):
+            self.assertEqual(playo_reaper.reap_expired_orders(NOW), 3)
+
+        self.assertEqual(db.commit.call_count, 2)
+        db.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import os
+import unittest
+import uuid
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+import models
+from db_test_utils import postgres_session
+from services import catalog, free_slots, rating_aggregates
+from services.venue_summary import summary_upsert
+
+
+class TestPostgresUpserts(unittest.TestCase):
+    """
+    Runs the ON CONFLICT upserts against the PostgreSQL database of
+    DATABASE_URL. Nothing is committed: every test rolls back.
+    """
+
+    def setUp(self):
+        self.db = postgres_session()
+        tag = uuid.uuid4().hex[:8]
+        city = models.City(name=f"Test City {tag}", short_code=f"T{tag}")
+        self.db.add(city)
+        self.db.flush()
+        area = models.Area(city_id=city.id, name=f"Test Area {tag}")
+        game_type = models.GameType(name=f"Test Sport {tag}", short_code=f"S{tag}")
+        self.db.add_all([area, game_type])
+        self.db.flush()
+        self.branch = models.Branch(city_id=city.id, area_id=area.id, name=f"Test Venue {tag}", is_active=True)
+        self.db.add(self.branch)
+        self.db.flush()
+        self.court = models.Court(
+            branch_id=self.branch.id, game_type_id=game_type.id, name="Court 1", price_per_hour=800, is_active=True
+        )
+        self.db.add(self.court)
+        self.db.flush()
+
+    def tearDown(self):
+        self.db.rollback()
+        self.db.close()
+
+    def test_venue_summary_upsert_inserts_then_updates(self):
+        statement, params = summary_upsert([self.branch.id])
+        self.db.execute(statement, params)
+        self.court.price_per_hour = 600
+        self.db.flush()
+        self.db.execute(statement, params)
+
+        row = self.db.query(models.VenueSummary).filter(models.VenueSummary.branch_id == self.branch.id).one()
+        self.assertEqual(float(row.min_court_price), 600.0)
+        self.assertIn(self.branch.name.lower(), row.place_terms)
+
+    def test_rating_aggregates_apply_and_remove(self):
+        for rating in (5, 4, 4):
+            rating_aggregates.apply_review(self.db, self.court.id, rating, +1, branch_id=self.branch.id)
+        rating_aggregates.apply_review(self.db, self.court.id, 5, -1, branch_id=self.branch.id)
+
+        for scope, subject_id in (("court", self.court.id), ("branch", self.branch.id)):
+            summary = rating_aggregates.rating_summary(self.db, scope, subject_id)
+            self.assertEqual((summary["total_reviews"], summary["average_rating"]), (2, 4.0))
+            self.assertEqual(summary["rating_distribution"]["5"], 0)
+
+    def test_court_free_slots_refresh_and_stale_marks(self):
+        day = date.today() + timedelta(days=3)
+
+        def row():
+            self.db.expire_all()
+            return self.db.query(models.CourtFreeSlots).filter(
+                models.CourtFreeSlots.court_id == self.court.id,
+                models.CourtFreeSlots.slot_date == day
+            ).one()
+
+        self.assertEqual(free_slots.refresh_free_slots(self.db, day, [self.court.id], global_rules=[]), 1)
+        self.assertEqual((row().stale, row().change_seq), (False, 0))
+
+        free_slots.mark_stale_with_groups(self.db, [(self.court.id, day)])
+        self.assertEqual((row().stale, row().change_seq), (True, 1))
+
+        free_slots.refresh_free_slots(self.db, day, [self.court.id], global_rules=[])
+        self.assertEqual((row().stale, row().change_seq), (False, 1))
+
+    def test_failed_stale_mark_leaves_the_writer_transaction_usable(self):
+        broken = text("UPDATE court_free_slots SET no_such_column = true")
+        with patch.object(free_slots, "_MARK_STALE", broken):
+            with self.assertRaises(Exception):
+                free_slots.mark_stale(self.db, [self.court.id], date.today())
+        self.court.name = "Court 1A"
+        self.db.flush()
+        self.assertEqual(self.db.query(models.Court.name).filter(models.Court.id == self.court.id).scalar(), "Court 1A")
+
+    def test_catalog_versions_bump(self):
+        def version():
+            self.db.expire_all()
+            row = self.db.query(models.CatalogVersion).filter(models.CatalogVersion.section == "faqs").first()
+            return row.version if row else 0
+
+        before = version()
+        catalog.bump_catalog(self.db, "faqs")
+        catalog.bump_catalog(self.db, "faqs", "faqs")
+        self.assertEqual(version(), before + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
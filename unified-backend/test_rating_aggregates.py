@@ -0,0 +1,103 @@
+import sys
+import os
+import unittest
+import uuid
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from db_test_utils import fake_session
+from services import rating_aggregates
+
+
+class TestApplyReview(unittest.TestCase):
+    def test_statement_touches_only_the_rated_star(self):
+        sql = str(rating_aggregates.apply_statement(4))
+        self.assertIn("ON CONFLICT (scope, subject_id) DO UPDATE", sql)
+        self.assertIn("stars_4 = rating_aggregates.stars_4 + EXCLUDED.stars_4", sql)
+        self.assertNotIn("stars_5 = rating_aggregates", sql)
+
+    def test_updates_court_and_branch(self):
+        db = fake_session()
+        court, branch = uuid.uuid4(), uuid.uuid4()
+        db.query.return_value.filter.return_value.scalar.return_value = branch
+
+        rating_aggregates.apply_review(db, court, 5, -1)
+
+        params = [c.args[1] for c in db.execute.call_args_list]
+        self.assertEqual(params, [
+            {"scope": "court", "subject_id": str(court), "delta": -1, "rating": 5},
+            {"scope": "branch", "subject_id": str(branch), "delta": -1, "rating": 5},
+        ])
+        db.commit.assert_not_called()
+
+    def test_skipped_outside_postgres(self):
+        db = fake_session("sqlite")
+        rating_aggregates.apply_review(db, uuid.uuid4(), 3)
+        self.assertEqual(rating_aggregates.reconcile_rating_aggregates(db), 0)
+        db.execute.assert_not_called()
+
+
+class TestRatingSummary(unittest.TestCase):
+    def test_from_aggregate_row(self):
+        db = fake_session()
+        db.query.return_value.filter.return_value.first.return_value = MagicMock(
+            rating_count=3, rating_sum=13, stars_1=0, stars_2=0, stars_3=0, stars_4=2, stars_5=1
+        )
+        self.assertEqual(rating_aggregates.rating_summary(db, "court", uuid.uuid4()), {
+            "average_rating": 4.3,
+            "total_reviews": 3,
+            "rating_distribution": {"5": 1, "4": 2, "3": 0, "2": 0, "1": 0},
+        })
+
+    def test_no_reviews(self):
+        db = fake_session()
+        db.query.return_value.filter.return_value.first.return_value = None
+        summary = rating_aggregates.rating_summary(db, "branch", uuid.uuid4())
+        self.assertEqual((summary["average_rating"], summary["total_reviews"]), (0, 0))
+
+
+class TestReviewModeration(unittest.TestCase):
+    def test_review_row_is_written_before_the_aggregates(self):
+        from routers.admin import reviews_v2
+        db = fake_session()
+        review = MagicMock(is_active=False, court_id=uuid.uuid4(), rating=5)
+        db.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = review
+        calls = []
+        db.flush.side_effect = lambda: calls.append(("flush", review.is_active))
+
+        with patch.object(reviews_v2, "apply_review", side_effect=lambda *a: calls.append(("apply", a[3]))):
+            reviews_v2.update_review_status(str(uuid.uuid4()), True, db=db)
+
+        self.assertEqual(calls, [("flush", True), ("apply", +1)])
+        db.commit.assert_called_once()
+
+    def test_unchanged_status_leaves_aggregates_alone(self):
+        from routers.admin import reviews_v2
+        db = fake_session()
+        db.query.return_value.filter.return_value.with_for_update.return_value.first.return_value = MagicMock(is_active=True)
+
+        with patch.object(reviews_v2, "apply_review") as apply:
+            reviews_v2.update_review_status(str(uuid.uuid4()), True, db=db)
+
+        apply.assert_not_called()
+
+
+class TestReconcile(unittest.TestCase):
+    def test_counts_corrected_rows(self):
+        db = fake_session()
+        db.execute.side_effect = [MagicMock(), MagicMock(rowcount=2), MagicMock(rowcount=1)]
+        self.assertEqual(rating_aggregates.reconcile_rating_aggregates(db), 3)
+        db.commit.assert_called_once()
+
+    def test_failure_rolls_back(self):
+        db = fake_session()
+        db.execute.side_effect = [MagicMock(), Exception("deadlock detected")]
+        with self.assertRaises(Exception):
+            rating_aggregates.reconcile_rating_aggregates(db)
+        db.rollback.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
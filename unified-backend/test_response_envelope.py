@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+import unittest
+from unittest.mock import patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+
+from middleware.response_handler import ResponseHandlerMiddleware
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(ResponseHandlerMiddleware)
+
+    @app.get("/items")
+    def items():
+        return [{"id": i} for i in range(3)]
+
+    @app.get("/none")
+    def none():
+        return None
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("kaboom")
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("plain")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b'[1,', b'2,', b'3]']), media_type="application/json")
+
+    return app
+
+
+class TestResponseEnvelope(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(_app(), raise_server_exceptions=False)
+
+    def test_success_body_is_wrapped_without_reparsing(self):
+        response = self.client.get("/items")
+        body = response.json()
+        self.assertEqual(body["code"], 200)
+        self.assertEqual(body["status"], "success")
+        self.assertTrue(body["timestamp"].endswith("Z"))
+        self.assertEqual(body["data"], [{"id": 0}, {"id": 1}, {"id": 2}])
+        self.assertEqual(int(response.headers["content-length"]), len(response.content))
+
+    def test_null_body(self):
+        self.assertIsNone(self.client.get("/none").json()["data"])
+
+    def test_streamed_json_is_wrapped(self):
+        self.assertEqual(self.client.get("/stream").json()["data"], [1, 2, 3])
+
+    def test_error_body_is_merged(self):
+        response = self.client.get("/missing")
+        body = response.json()
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(body["status"], "error")
+        self.assertEqual(body["code"], 404)
+        self.assertEqual(body["detail"], "Venue not found")
+        self.assertNotIn("data", body)
+
+    def test_unhandled_exception_becomes_500_envelope(self):
+        with patch("middleware.response_handler.log_error") as log_error:
+            response = self.client.get("/boom")
+        self.assertEqual(response.status_code, 500)
+        body = response.json()
+        self.assertEqual(body["status"], "error")
+        self.assertEqual(body["error"], "internal_error")
+        log_error.assert_called_once()
+
+    def test_non_json_and_docs_untouched(self):
+        self.assertEqual(self.client.get("/text").text, "plain")
+        self.assertIn("openapi", json.loads(self.client.get("/openapi.json").content))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import os
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from services.integrations import retention
+
+
+class TestPartitionCalendar(unittest.TestCase):
+    def test_months_between_crosses_year_end(self):
+        self.assertEqual(
+            retention.months_between(datetime(2025, 11, 20), datetime(2026, 1, 3)),
+            [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)]
+        )
+        self.assertEqual(retention.next_month(date(2025, 12, 1)), date(2026, 1, 1))
+
+    def test_expired_partitions_keep_recent_months(self):
+        names = [
+            retention.partition_name("integration_logs_archive", date(2025, 9, 1)),
+            retention.partition_name("integration_logs_archive", date(2025, 10, 1)),
+            "integration_logs_archive_default",
+        ]
+        # Keeping 3 months before January 2026 keeps October onwards
+        self.assertEqual(
+            retention.expired_partitions(names, date(2026, 1, 15), keep_months=3),
+            ["integration_logs_archive_y2025m09"]
+        )
+
+
+class TestArchiveTable(unittest.TestCase):
+    def _db(self, oldest, moved_counts):
+        db = MagicMock()
+        results = [MagicMock(**{"scalar.return_value": oldest})]
+        results += [MagicMock() for _ in range(32)]  # partition DDL
+        db.execute.side_effect = lambda statement, params=None: (
+            MagicMock(rowcount=moved_counts.pop(0)) if "WITH moved" in str(statement) else results.pop(0)
+        )
+        return db
+
+    def test_nothing_old_enough(self):
+        db = self._db(None, [])
+        self.assertEqual(retention.archive_table(db, "integration_logs", now=datetime(2026, 3, 1)), 0)
+        db.commit.assert_not_called()
+
+    def test_moves_in_batches_until_short_batch(self):
+        db = self._db(datetime(2026, 1, 10), [2, 2, 1])
+        with patch.object(retention, "RETENTION_BATCH_ROWS", 2):
+            moved = retention.archive_table(db, "integration_outbox_events", now=datetime(2026, 3, 1))
+
+        self.assertEqual(moved, 5)
+        statements = [str(c.args[0]) for c in db.execute.call_args_list]
+        self.assertTrue(any("integration_outbox_events_archive_y2026m02 PARTITION OF" in s for s in statements))
+        move = next(s for s in statements if "WITH moved" in s)
+        self.assertIn("status IN ('completed', 'dead')", move)
+        self.assertIn("INSERT INTO integration_outbox_events_archive", move)
+
+    def test_non_postgres_is_a_no_op(self):
+        with patch.object(retention, "engine", MagicMock(dialect=MagicMock())) as engine:
+            engine.dialect.name = "sqlite"
+            self.assertEqual(retention.run_retention(), {})
+            engine.connect.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
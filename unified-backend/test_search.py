@@ -0,0 +1,71 @@
+import sys
+import os
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from db_test_utils import fake_session
+from services import search
+from services.venue_summary import summary_upsert
+
+
+class TestTrigramClauses(unittest.TestCase):
+    def test_substring_match_with_typo_tolerance(self):
+        clause, params = search.match_clause(fake_session(), "vs.place_terms", "area", " Koramangala ")
+        self.assertEqual(clause, "(vs.place_terms ILIKE :area_like OR :area <% vs.place_terms)")
+        self.assertEqual(params, {"area": "koramangala", "area_like": "%koramangala%"})
+
+    def test_whole_words_anchor_at_word_start(self):
+        clause, params = search.match_clause(fake_session(), "vs.sport_terms", "sport", "b-ball", whole_words=True)
+        self.assertIn("vs.sport_terms ~* :sport_pattern", clause)
+        self.assertEqual(params["sport_pattern"], r"\mb\-ball")
+
+    def test_rank(self):
+        self.assertEqual(
+            search.rank_expression(fake_session(), "vs.sport_terms", "sport"),
+            "COALESCE(word_similarity(:sport, vs.sport_terms), 0)"
+        )
+
+
+class TestSynonymsAtIndexTime(unittest.TestCase):
+    def test_summary_expands_synonyms(self):
+        statement, _ = summary_upsert()
+        sql = str(statement)
+        self.assertIn("('football', 'soccer')", sql)
+        self.assertIn("sport_terms = EXCLUDED.sport_terms", sql)
+
+
+class TestLikeFallback(unittest.TestCase):
+    """SQLite has no pg_trgm: plain LIKE over the same documents."""
+
+    def setUp(self):
+        self.db = sessionmaker(bind=create_engine("sqlite://"))()
+        self.db.execute(text("CREATE TABLE venue_summary (branch_id TEXT, sport_terms TEXT)"))
+        self.db.execute(text(
+            "INSERT INTO venue_summary VALUES ('cricket', 'batting cricket cricket turf'), "
+            "('tt', 'ping pong table tennis tt'), ('tennis', 'lawn tennis tennis')"
+        ))
+
+    def tearDown(self):
+        self.db.close()
+
+    def _search(self, term, whole_words):
+        clause, params = search.match_clause(self.db, "sport_terms", "sport", term, whole_words=whole_words)
+        self.assertEqual(search.rank_expression(self.db, "sport_terms", "sport"), "0")
+        rows = self.db.execute(text(f"SELECT branch_id FROM venue_summary WHERE {clause} ORDER BY branch_id"), params)
+        return [r[0] for r in rows]
+
+    def test_whole_words(self):
+        self.assertEqual(self._search("TT", True), ["tt"])
+        self.assertEqual(self._search("tennis", True), ["tennis", "tt"])
+
+    def test_substring(self):
+        self.assertEqual(self._search("tt", False), ["cricket", "tt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
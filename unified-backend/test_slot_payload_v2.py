@@ -0,0 +1,56 @@
+import sys
+import os
+import unittest
+import uuid
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from routers.user.venues import _compact_court_slots
+
+SLICES = [
+    {"id": "s1", "name": "Half A", "mask": 1, "sport_id": "g1", "sport_name": "FootBall", "price_per_hour": 800.0},
+    {"id": "s2", "name": "Half B", "mask": 2, "sport_id": "g1", "sport_name": "FootBall", "price_per_hour": 800.0},
+]
+
+
+def _slot(time_key, price, occupied=0, booked=0):
+    return {
+        "time": time_key, "price": price, "is_blocked": False, "occupied_mask": occupied,
+        "booked_capacity": booked, "capacity_limit": 10, "total_zones": 2,
+        "slices": [dict(sl, is_available=(occupied & sl["mask"]) == 0) for sl in SLICES],
+    }
+
+
+class TestCompactCourtSlots(unittest.TestCase):
+    def setUp(self):
+        self.court = {"id": uuid.uuid4(), "name": "Turf 1", "game_type": "FootBall", "logic_type": "divisible", "total_zones": 2}
+
+    def test_parallel_arrays_in_slot_order(self):
+        slots_map = {
+            "18:30": _slot("18:30", 750.0, occupied=1, booked=4),
+            "06:00": _slot("06:00", 500.0),
+            "18:00": _slot("18:00", 750.0),
+        }
+        court = _compact_court_slots(self.court, slots_map)
+
+        self.assertEqual(court["court_id"], str(self.court["id"]))
+        self.assertEqual((court["total_zones"], court["capacity_limit"]), (2, 10))
+        self.assertEqual(court["slot"], [12, 36, 37])
+        self.assertEqual(court["prices"], [500.0, 750.0])
+        self.assertEqual(court["price_index"], [0, 1, 1])
+        self.assertEqual(court["occupied_mask"], [0, 0, 1])
+        self.assertEqual(court["booked_capacity"], [0, 0, 4])
+
+    def test_slices_declared_once_without_slot_state(self):
+        court = _compact_court_slots(self.court, {"06:00": _slot("06:00", 500.0, occupied=2)})
+        self.assertEqual(court["slices"], SLICES)
+
+    def test_court_without_slots(self):
+        court = _compact_court_slots(self.court, {})
+        self.assertEqual((court["slot"], court["prices"], court["slices"]), ([], [], []))
+        self.assertEqual(court["total_zones"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import os
+import unittest
+import uuid
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from db_test_utils import fake_session
+from services import venue_summary
+
+
+class TestSummaryUpsert(unittest.TestCase):
+    def test_selected_branches_are_deduplicated(self):
+        branch = uuid.uuid4()
+        statement, params = venue_summary.summary_upsert([branch, str(branch)])
+        self.assertIn("ANY(CAST(:branch_ids AS uuid[]))", str(statement))
+        self.assertIn("ON CONFLICT (branch_id) DO UPDATE", str(statement))
+        self.assertEqual(params, {"branch_ids": [str(branch)]})
+
+    def test_every_branch(self):
+        statement, params = venue_summary.summary_upsert()
+        self.assertNotIn(":branch_ids", str(statement))
+        self.assertEqual(params, {})
+
+
+class TestRefresh(unittest.TestCase):
+    def test_refresh_commits_one_upsert(self):
+        db = fake_session()
+        venue_summary.refresh_venue_summary(db, [uuid.uuid4(), None])
+        db.execute.assert_called_once()
+        db.commit.assert_called_once()
+
+    def test_nothing_to_refresh(self):
+        db = fake_session()
+        venue_summary.refresh_venue_summary(db, [None])
+        db.execute.assert_not_called()
+
+    def test_failure_is_logged_not_raised(self):
+        db = fake_session()
+        db.execute.side_effect = Exception("relation \"venue_summary\" does not exist")
+        venue_summary.refresh_venue_summary(db, [uuid.uuid4()])
+        db.rollback.assert_called_once()
+
+    def test_skipped_outside_postgres(self):
+        db = fake_session("sqlite")
+        venue_summary.refresh_venue_summary(db)
+        db.execute.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# Add the project root to sys.path
+sys.path.append(os.getcwd())
+
+from services.integrations import write_behind
+
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        write_behind._api_key_touches.clear()
+        write_behind._log_rows.clear()
+
+    def tearDown(self):
+        write_behind._api_key_touches.clear()
+        write_behind._log_rows.clear()
+
+    def test_touches_keep_latest_timestamp_per_key(self):
+        write_behind.touch_api_key("k1", datetime(2026, 1, 5, 10, 0))
+        write_behind.touch_api_key("k1", datetime(2026, 1, 5, 9, 0))
+        write_behind.touch_api_key("k2", datetime(2026, 1, 5, 8, 0))
+
+        self.assertEqual(write_behind._api_key_touches["k1"], datetime(2026, 1, 5, 10, 0))
+        self.assertEqual(write_behind.pending(), {"api_key_touches": 2, "integration_logs": 0})
+
+    def test_truncated_capture(self):
+        small = {"slot_data": []}
+        large = {"slot_data": ["x" * 100] * 100}
+        with patch.object(write_behind, "INTEGRATION_LOG_PAYLOAD_MAX_BYTES", 256):
+            self.assertEqual(write_behind.capture_payload(small, mode="truncated"), small)
+            captured = write_behind.capture_payload(large, mode="truncated")
+            self.assertTrue(captured["truncated"])
+            self.assertEqual(len(captured["preview"]), 256)
+            self.assertEqual(write_behind.capture_payload(large, mode="truncated", keep_full=True), large)
+        self.assertIsNone(write_behind.capture_payload(large, mode="none"))
+
+    def test_sampled_rows_drop_payloads_but_errors_keep_them(self):
+        with patch.object(write_behind, "INTEGRATION_LOG_PAYLOADS", "sampled"), \
+             patch.object(write_behind, "INTEGRATION_LOG_SAMPLE_RATE", 0.0):
+            write_behind.record_integration_log("p1", "INBOUND", "/api/checkAvailability/", "GET", {"a": 1}, 200, {"b": 2})
+            write_behind.record_integration_log("p1", "INBOUND", "/api/checkAvailability/", "GET", {"a": 1}, 400, error_message="bad")
+
+        ok, error = write_behind._log_rows
+        self.assertIsNone(ok["request_payload"])
+        self.assertIsNone(ok["response_payload"])
+        self.assertEqual(error["request_payload"], {"a": 1})
+
+    def test_flush_writes_in_bulk_and_empties_buffer(self):
+        write_behind.touch_api_key("k1")
+        write_behind.record_integration_log("p1", "INBOUND", "/api/checkAvailability/", "GET", response_status=200)
+        db = MagicMock()
+        with patch.object(write_behind, "SessionLocal", return_value=db):
+            written = write_behind.flush()
+
+        self.assertEqual(written, 2)
+        self.assertEqual(db.execute.call_count, 2)
+        db.commit.assert_called_once()
+        self.assertEqual(write_behind.pending(), {"api_key_touches": 0, "integration_logs": 0})
+
+    def test_failed_flush_requeues(self):
+        write_behind.touch_api_key("k1")
+        write_behind.record_integration_log("p1", "INBOUND", "/api/checkAvailability/", "GET", response_status=200)
+        db = MagicMock()
+        db.execute.side_effect = Exception("database unavailable")
+        with patch.object(write_behind, "SessionLocal", return_value=db):
+            self.assertEqual(write_behind.flush(), 0)
+
+        db.rollback.assert_called_once()
+        self.assertEqual(write_behind.pending(), {"api_key_touches": 1, "integration_logs": 1})
+
+    def test_full_buffer_flushes_inline(self):
+        with patch.object(write_behind, "WRITE_BEHIND_MAX_ROWS", 2), \
+             patch.object(write_behind, "flush") as flush:
+            write_behind.record_integration_log("p1", "INBOUND", "/x", "GET")
+            flush.assert_not_called()
+            write_behind.record_integration_log("p1", "INBOUND", "/x", "GET")
+            flush.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
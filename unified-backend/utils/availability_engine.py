@@ -0,0 +1,319 @@
+"""
+Partner availability engine.
+
+Answers "which 30-min slots of these courts are offered, at what price, and
+which are taken" for a whole venue/sport/date in one pass, for partner
+polling and booking endpoints (District checkAvailability, makeBatchBooking,
+Playo availability and orders), the free-slot bitmaps and the availability
+calendar:
+
+- OccupancySnapshot reads bookings and manual blocks once for the requested
+  courts plus every sibling in their shared groups, and folds them into one
+  48-entry occupancy bitmask vector per shared group (or per ungrouped court).
+  Unexpired pending Playo orders can be folded in as one more layer.
+  OccupancySnapshot.for_dates() does the same for a range of dates with one
+  query per table.
+- compile_price_vector() turns a court's price rules, venue hours and
+  recurring unavailability into a 48-entry vector of 30-min prices (None where
+  the slot is not offered), with the rules parsed once instead of per slot.
+
+Slot visibility and prices follow generate_allowed_slots_map (both use the
+rule helpers in utils/booking_utils.py); the per-user slice and capacity
+details that map also builds are not needed here and are skipped.
+"""
+
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+import models
+from utils.booking_utils import (
+    compile_price_rules,
+    get_booking_slot_starts,
+    get_now_ist,
+    get_venue_hours,
+    has_specific_timings,
+    match_price_rule,
+    unavailable_slot_starts,
+)
+
+SLOTS_PER_DAY = 48
+# Booking statuses that hold a slot for partner availability
+PARTNER_ACTIVE_STATUSES = ('confirmed', 'pending', 'locked')
+# Bitmask of a block without slices: overlaps every court of the group
+FULL_MASK = -1
+
+
+def slot_index(slot_start: float) -> Optional[int]:
+    """10.5 -> 21; None for starts off the 30-min grid."""
+    doubled = slot_start * 2
+    if doubled != int(doubled) or not 0 <= doubled < SLOTS_PER_DAY:
+        return None
+    return int(doubled)
+
+
+def _time_index(t: time) -> float:
+    return (t.hour + t.minute / 60.0) * 2
+
+
+def _is_capacity(court: Optional[models.Court]) -> bool:
+    return court is not None and court.logic_type == 'capacity'
+
+
+def slot_span(start: time, end: time) -> Optional[range]:
+    """
+    Slot indices of a [start, end) booking window, end 00:00 meaning midnight.
+    None when either bound is off the 30-min grid or the window is empty.
+    """
+    first, last = _time_index(start), _time_index(end) or SLOTS_PER_DAY
+    if first != int(first) or last != int(last) or first >= last:
+        return None
+    return range(int(first), int(last))
+
+
+def load_global_price_rules(db: Session) -> List[tuple]:
+    rows = db.query(models.GlobalPriceCondition).filter(models.GlobalPriceCondition.is_active == True).all()
+    return compile_price_rules([
+        {
+            'dates': gr.dates or [],
+            'days': gr.days or [],
+            'slotFrom': gr.slot_from,
+            'slotTo': gr.slot_to,
+            'price': float(gr.price),
+        }
+        for gr in rows
+    ])
+
+
+def compile_price_vector(court: models.Court, branch: models.Branch, booking_date: date,
+                         global_rules: List[tuple], now_ist: datetime = None) -> List[Optional[float]]:
+    """
+    30-min price for each of the 48 slots, or None when the slot is not offered:
+    outside venue hours, outside the court's own timings for the day, already
+    past (today) or closed by the court's recurring unavailability.
+    Manual blocks are occupancy and are applied by OccupancySnapshot.
+    """
+    date_str = booking_date.isoformat()
+    day_short = booking_date.strftime("%a").lower()
+    court_rules = compile_price_rules(court.price_conditions)
+    specific = has_specific_timings(court_rules, date_str, day_short)
+    closed = unavailable_slot_starts(court.unavailability_slots, date_str, day_short)
+    intervals = get_venue_hours(branch.opening_hours if branch else None, booking_date)
+    base_price = float(court.price_per_hour)
+
+    now_ist = now_ist or get_now_ist()
+    first_slot = 0
+    if booking_date == now_ist.date():
+        now_f = now_ist.hour + now_ist.minute / 60.0
+        first_slot = next((i for i in range(SLOTS_PER_DAY) if i * 0.5 >= now_f), SLOTS_PER_DAY)
+
+    prices: List[Optional[float]] = [None] * SLOTS_PER_DAY
+    for i in range(first_slot, SLOTS_PER_DAY):
+        h_start = i * 0.5
+        if h_start in closed or not any(iv['open'] <= h_start < iv['close'] for iv in intervals):
+            continue
+        rule, source = match_price_rule(court_rules, global_rules, date_str, day_short, h_start)
+        if specific and source not in ('court_date', 'court_day'):
+            continue
+        prices[i] = (float(rule['price']) if rule else base_price) / 2.0
+    return prices
+
+
+class OccupancySnapshot:
+    """
+    Bookings and manual blocks of one date for a set of courts and all of their
+    shared-group siblings, read with three queries and folded into per-group
+    occupancy bitmasks. With pending_orders_at, pending Playo orders still
+    unexpired at that (UTC) time are read with a fourth query and occupy their
+    courts like unsliced bookings. for_dates() builds the snapshots of several
+    dates from the same number of range queries.
+
+    Capacity courts (logic_type 'capacity', e.g. pools) count places instead:
+    bookings take number_of_players, pending orders one place and blocks with
+    a blocked_capacity that many, and a slot is occupied once capacity_limit
+    places are taken, as in get_consolidated_occupied_mask.
+    """
+
+    def __init__(self, db: Session, courts: Iterable[models.Court], booking_date: date,
+                 statuses: Iterable[str] = PARTNER_ACTIVE_STATUSES, pending_orders_at: datetime = None):
+        members = self._members(db, courts)
+        bookings, blocks, orders = self._load(db, members, booking_date, booking_date, statuses, pending_orders_at)
+        self._fold(members, booking_date, bookings, blocks, orders)
+
+    @classmethod
+    def for_dates(cls, db: Session, courts: Iterable[models.Court], dates: Iterable[date],
+                  statuses: Iterable[str] = PARTNER_ACTIVE_STATUSES,
+                  pending_orders_at: datetime = None) -> Dict[date, "OccupancySnapshot"]:
+        """One snapshot per date, from range queries over first..last date."""
+        dates = sorted(set(dates))
+        if not dates:
+            return {}
+        members = cls._members(db, courts)
+        bookings, blocks, orders = cls._load(db, members, dates[0], dates[-1], statuses, pending_orders_at)
+        snapshots = {}
+        for d in dates:
+            snapshot = cls.__new__(cls)
+            snapshot._fold(
+                members, d,
+                [b for b in bookings if b.booking_date == d],
+                [b for b in blocks if b.block_date == d],
+                [o for o in orders if o.booking_date == d],
+            )
+            snapshots[d] = snapshot
+        return snapshots
+
+    @staticmethod
+    def _members(db: Session, courts: Iterable[models.Court]) -> Dict[Any, models.Court]:
+        """The courts plus every sibling of their shared groups, by id."""
+        courts = list(courts)
+        members: Dict[Any, models.Court] = {c.id: c for c in courts}
+        group_ids = {UUID(str(c.shared_group_id)) for c in courts if c.shared_group_id}
+        if group_ids:
+            for sibling in db.query(models.Court).filter(models.Court.shared_group_id.in_(group_ids)).all():
+                members.setdefault(sibling.id, sibling)
+        return members
+
+    @staticmethod
+    def _load(db: Session, members: Dict[Any, models.Court], first: date, last: date,
+              statuses: Iterable[str], pending_orders_at: Optional[datetime]):
+        court_ids = list(members)
+        bookings = db.query(models.Booking).filter(
+            models.Booking.court_id.in_(court_ids),
+            models.Booking.booking_date.between(first, last),
+            models.Booking.status.in_(list(statuses))
+        ).all()
+        blocks = db.query(models.CourtBlock).filter(
+            models.CourtBlock.court_id.in_(court_ids),
+            models.CourtBlock.block_date.between(first, last)
+        ).all()
+        orders = []
+        if pending_orders_at is not None:
+            orders = db.query(models.PlayoOrder).filter(
+                models.PlayoOrder.court_id.in_(court_ids),
+                models.PlayoOrder.booking_date.between(first, last),
+                models.PlayoOrder.status == 'pending',
+                models.PlayoOrder.expires_at > pending_orders_at
+            ).all()
+        return bookings, blocks, orders
+
+    def _fold(self, members: Dict[Any, models.Court], booking_date: date,
+              bookings: Iterable, blocks: Iterable, orders: Iterable) -> None:
+        self.booking_date = booking_date
+        self._group_of = {cid: self.group_key(c) for cid, c in members.items()}
+
+        self._masks: Dict[str, List[int]] = {}
+        # Unsliced manual blocks per group, for the "court fully blocked" check
+        self._blocks: Dict[str, List[tuple]] = {}
+        # Capacity courts: places taken per slot, and the slots of partial blocks
+        self._places: Dict[str, List[int]] = {}
+        self._partial_blocks: Dict[str, List[List[int]]] = {}
+
+        for b in bookings:
+            court = members.get(b.court_id)
+            slots = [i for i in (slot_index(s) for s in get_booking_slot_starts(b)) if i is not None]
+            if _is_capacity(court):
+                self._take_places(court, slots, b.number_of_players or 1)
+                continue
+            # slice_mask 0/None means the entire court
+            mask = b.slice_mask or (1 << ((court.total_zones if court else None) or 1)) - 1
+            masks = self._group_masks(self._group_of.get(b.court_id, str(b.court_id)))
+            for i in slots:
+                masks[i] |= mask
+
+        for block in blocks:
+            group = self._group_of.get(block.court_id, str(block.court_id))
+            start, end = _time_index(block.start_time), _time_index(block.end_time)
+            # Slot i is covered when start_time <= slot time < end_time
+            covered = [i for i in range(SLOTS_PER_DAY) if start <= i < end]
+            court = members.get(block.court_id)
+            # blocked_capacity None/0 blocks the whole facility
+            if _is_capacity(court) and block.blocked_capacity:
+                self._take_places(court, covered, block.blocked_capacity)
+                self._partial_blocks.setdefault(group, []).append(covered)
+                continue
+            mask = block.slice_mask if block.slice_mask is not None and block.slice_mask > 0 else FULL_MASK
+            masks = self._group_masks(group)
+            for i in covered:
+                masks[i] |= mask
+            self._blocks.setdefault(group, []).append((covered, block.slice_mask))
+
+        for order in orders:
+            court = members.get(order.court_id)
+            if court is None:
+                continue
+            # An order ending at 00:00 runs to midnight
+            start, end = _time_index(order.start_time), _time_index(order.end_time) or SLOTS_PER_DAY
+            self.hold(court, [i for i in range(SLOTS_PER_DAY) if start <= i < end], places=1)
+
+    @staticmethod
+    def group_key(court: models.Court) -> str:
+        return f"group:{court.shared_group_id}" if court.shared_group_id else f"court:{court.id}"
+
+    def _group_masks(self, group: str) -> List[int]:
+        if group not in self._masks:
+            self._masks[group] = [0] * SLOTS_PER_DAY
+        return self._masks[group]
+
+    def _take_places(self, court: models.Court, slots: Iterable[int], count: int) -> None:
+        """Adds places taken on a capacity court; a slot whose places reach capacity_limit is occupied."""
+        group = self._group_of.get(court.id, self.group_key(court))
+        places = self._places.setdefault(group, [0] * SLOTS_PER_DAY)
+        limit = court.capacity_limit or 1
+        mask = (1 << (court.total_zones or 1)) - 1
+        masks = self._group_masks(group)
+        for i in slots:
+            places[i] += count
+            if places[i] >= limit:
+                masks[i] |= mask
+
+    def hold(self, court: models.Court, slots: Iterable[int], places: Optional[int] = None) -> None:
+        """
+        Marks slots of the whole court as taken, e.g. by an earlier item of the
+        same order. With places, a capacity court only loses that many places.
+        """
+        if places is not None and _is_capacity(court):
+            self._take_places(court, list(slots), places)
+            return
+        mask = (1 << (court.total_zones or 1)) - 1
+        masks = self._group_masks(self._group_of.get(court.id, self.group_key(court)))
+        for i in slots:
+            masks[i] |= mask
+
+    def occupied_masks(self, court: models.Court) -> List[int]:
+        """Aggregate occupancy bitmask per slot of the court's shared group."""
+        return self._masks.get(self.group_key(court)) or [0] * SLOTS_PER_DAY
+
+    def booked(self, court: models.Court) -> List[bool]:
+        """Per slot: does any booking or block in the group overlap one of this court's zones?"""
+        court_mask = (1 << (court.total_zones or 1)) - 1
+        return [(m & court_mask) != 0 for m in self.occupied_masks(court)]
+
+    def booked_places(self, court: models.Court) -> List[int]:
+        """Per slot: places taken by bookings, holds and partial blocks (capacity courts)."""
+        return list(self._places.get(self.group_key(court)) or [0] * SLOTS_PER_DAY)
+
+    def block_covered(self, court: models.Court) -> List[bool]:
+        """Per slot: is any manual block in the court's shared group active, whatever its slices?"""
+        group = self.group_key(court)
+        covered_slots = [False] * SLOTS_PER_DAY
+        for covered in [c for c, _ in self._blocks.get(group, [])] + self._partial_blocks.get(group, []):
+            for i in covered:
+                covered_slots[i] = True
+        return covered_slots
+
+    def fully_blocked(self, court: models.Court) -> List[bool]:
+        """
+        Per slot: is the court hidden by a manual block covering all its zones?
+        Unsliced blocks count as the default full mask (15), as in
+        generate_allowed_slots_map.
+        """
+        full = (1 << (court.total_zones or 1)) - 1
+        hidden = [False] * SLOTS_PER_DAY
+        for covered, slice_mask in self._blocks.get(self.group_key(court), []):
+            block_mask = slice_mask if slice_mask is not None else 15
+            if (block_mask & full) == full:
+                for i in covered:
+                    hidden[i] = True
+        return hidden
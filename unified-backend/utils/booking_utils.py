@@ -1,8 +1,15 @@
 from datetime import datetime, time, date, timedelta
 import json
+import logging
 import re
+from time import perf_counter
 from typing import List, Dict, Any, Optional, Set
 from sqlalchemy.orm import Session
+from utils.logger import get_logger, get_sampled_logger
+from utils.metrics import SLOT_ENGINE_SECONDS, timed
+
+logger = get_logger(__name__)
+slot_logger = get_sampled_logger(__name__)
 
 def get_now_ist() -> datetime:
     """Get current time in Indian Standard Time (IST) using UTC offset."""
@@ -29,7 +36,7 @@ def validate_slot_not_past(booking_date: date, start_time_str: str):
         grace_limit = now_ist - timedelta(minutes=45)
         
         if slot_dt < grace_limit:
-            print(f"[PAST CHECK FAIL] Slot {start_time_str} is too old. Now={now_ist}, Limit={grace_limit}")
+            logger.warning(f"[PAST CHECK FAIL] Slot {start_time_str} is too old. Now={now_ist}, Limit={grace_limit}")
             raise HTTPException(status_code=400, detail="This slot has already started or passed. Please choose a later time.")
 
 def safe_parse_time_float(time_str: str) -> float:
@@ -75,52 +82,122 @@ def safe_parse_time_float(time_str: str) -> float:
 def safe_parse_hour(time_str: str) -> int:
     return int(safe_parse_time_float(time_str))
 
+def get_booking_slot_starts(b) -> Set[float]:
+    """
+    30-min slot start times (floats like 10.0, 10.5) held by one booking:
+    its time_slots JSON, or start time + duration for legacy bookings.
+    """
+    slot_starts = set()
+
+    # 1. Try time_slots JSON
+    t_slots = b.time_slots
+    if isinstance(t_slots, str):
+        try: t_slots = json.loads(t_slots)
+        except: t_slots = []
+
+    if t_slots and isinstance(t_slots, list):
+        for slot in t_slots:
+            if isinstance(slot, dict):
+                t_str = slot.get('start_time') or slot.get('time') or slot.get('start')
+                if t_str:
+                    slot_starts.add(safe_parse_time_float(t_str))
+    else:
+        # 2. Fallback for legacy bookings
+        try:
+            start_val = getattr(b, 'start_time', None) or getattr(b, '_old_start_time', None)
+            duration = getattr(b, 'duration_minutes', None) or getattr(b, '_old_duration_minutes', None) or 60
+
+            if start_val:
+                if isinstance(start_val, str):
+                    start_f = safe_parse_time_float(start_val)
+                else:
+                    start_f = start_val.hour + (start_val.minute / 60.0)
+
+                num_half_hours = (int(duration) + 29) // 30
+                for i in range(num_half_hours):
+                    slot_starts.add((start_f + (i * 0.5)) % 24)
+        except Exception as e:
+            logger.error(f"[BOOKING UTILS] Error parsing legacy booking {getattr(b, 'id', 'unknown')}: {e}")
+
+    return slot_starts
+
 def get_booked_slots(active_bookings: list) -> set:
     """
     Unified logic for extracting booked 30-min slots from a list of booking models.
     Returns a set of slot start times (floats like 10.0, 10.5).
     """
     booked_slots = set()
-    print(f"[BOOKING UTILS] Processing {len(active_bookings)} active bookings for 30-min granularity...")
+    logger.debug("[BOOKING UTILS] Processing %d active bookings for 30-min granularity", len(active_bookings))
     
     for b in active_bookings:
-        # 1. Try time_slots JSON
-        t_slots = b.time_slots
-        if isinstance(t_slots, str):
-            try: t_slots = json.loads(t_slots)
-            except: t_slots = []
-        
-        if t_slots and isinstance(t_slots, list):
-            for slot in t_slots:
-                if isinstance(slot, dict):
-                    t_str = slot.get('start_time') or slot.get('time') or slot.get('start')
-                    if t_str:
-                        slot_start = safe_parse_time_float(t_str)
-                        booked_slots.add(slot_start)
-                        print(f"  Booking {getattr(b, 'booking_display_id', b.id)}: Slot {t_str} -> {slot_start}")
-        else:
-            # 2. Fallback for legacy bookings
-            try:
-                start_val = getattr(b, 'start_time', None) or getattr(b, '_old_start_time', None)
-                duration = getattr(b, 'duration_minutes', None) or getattr(b, '_old_duration_minutes', None) or 60
-                
-                if start_val:
-                    if isinstance(start_val, str):
-                        start_f = safe_parse_time_float(start_val)
-                    else:
-                        start_f = start_val.hour + (start_val.minute / 60.0)
-                    
-                    num_half_hours = (int(duration) + 29) // 30
-                    for i in range(num_half_hours):
-                        s = (start_f + (i * 0.5)) % 24
-                        booked_slots.add(s)
-                        print(f"  Booking {getattr(b, 'booking_display_id', b.id)} (Legacy): {start_val} + {duration}m -> Slot {s}")
-            except Exception as e:
-                print(f"[BOOKING UTILS] Error parsing legacy booking {getattr(b, 'id', 'unknown')}: {e}")
+        slot_starts = get_booking_slot_starts(b)
+        booked_slots |= slot_starts
+        slot_logger.debug("[BOOKING UTILS] Booking %s: Slots %s", getattr(b, 'booking_display_id', b.id), sorted(slot_starts))
                 
-    print(f"[BOOKING UTILS] Final booked slots: {sorted(list(booked_slots))}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[BOOKING UTILS] Final booked slots: %s", sorted(booked_slots))
     return booked_slots
 
+def compile_price_rules(rules: Any) -> List[tuple]:
+    """
+    Pre-parses price conditions (a court's price_conditions or the global
+    rules) into (rule, slot_from, slot_to, dates, days) tuples, so matching a
+    slot does no string parsing.
+    """
+    if isinstance(rules, str):
+        try: rules = json.loads(rules)
+        except: rules = []
+    compiled = []
+    for r in rules or []:
+        compiled.append((
+            r,
+            safe_parse_time_float(r.get('slotFrom') or r.get('slot_from')),
+            safe_parse_time_float(r.get('slotTo') or r.get('slot_to')) or 24.0,
+            set(r.get('dates') or []),
+            {d.lower()[:3] for d in (r.get('days') or [])},
+        ))
+    return compiled
+
+def match_price_rule(court_rules: List[tuple], global_rules: List[tuple], date_str: str, day_short: str, h_start: float):
+    """
+    Priority: Court Date > Court Day > Global Date > Global Day.
+    Returns (rule, source), or (None, None) when no rule covers the slot.
+    """
+    for rules, by_date, source in (
+        (court_rules, True, 'court_date'),
+        (court_rules, False, 'court_day'),
+        (global_rules, True, 'global_date'),
+        (global_rules, False, 'global_day'),
+    ):
+        for rule, r_from, r_to, dates, days in rules:
+            if (date_str in dates if by_date else day_short in days) and r_from <= h_start < r_to:
+                return rule, source
+    return None, None
+
+def has_specific_timings(court_rules: List[tuple], date_str: str, day_short: str) -> bool:
+    """A court with rules for the day only offers slots those rules cover."""
+    return any(date_str in dates or day_short in days for _, _, _, dates, days in court_rules)
+
+def unavailable_slot_starts(unavailability: Any, date_str: str, day_short: str) -> Set[float]:
+    """Slot starts closed by a court's recurring or date-specific unavailability_slots."""
+    if isinstance(unavailability, str):
+        try: unavailability = json.loads(unavailability)
+        except: unavailability = []
+    if not isinstance(unavailability, list):
+        return set()
+
+    closed = set()
+    for un in unavailability:
+        # Date specific block
+        if un.get('date') == date_str:
+            un_from = safe_parse_time_float(un.get('from') or un.get('slot_from') or un.get('slotFrom'))
+            un_to = safe_parse_time_float(un.get('to') or un.get('slot_to') or un.get('slotTo')) or 24.0
+            closed.update(i * 0.5 for i in range(48) if un_from <= i * 0.5 < un_to)
+        # Recurring block
+        if (date_str in (un.get('dates') or [])) or (day_short in [d.lower()[:3] for d in (un.get('days') or [])]):
+            closed.update(safe_parse_time_float(t) for t in (un.get('times') or []))
+    return closed
+
 def get_venue_hours(opening_hours: Any, booking_date: date) -> List[Dict[str, float]]:
     """
     Extract opening and closing operating intervals for a specific date (HH.F format).
@@ -195,6 +272,7 @@ def get_venue_hours(opening_hours: Any, booking_date: date) -> List[Dict[str, fl
 
     return [{'open': start_h, 'close': end_h}]
 
+@timed(SLOT_ENGINE_SECONDS, stage="occupancy")
 def get_consolidated_occupied_mask(db: Session, booking_date: date, shared_group_id: Any = None, court_id: Any = None, exclude_user_id: Optional[str] = None) -> Dict[str, int]:
     """
     Calculate the aggregate occupied mask for a shared group OR a specific court.
@@ -254,8 +332,8 @@ def get_consolidated_occupied_mask(db: Session, booking_date: date, shared_group
     }).fetchall()
     
     if exclude_user_id:
-        print(f"[BOOKING UTILS] Calculating personalized mask for user {exclude_user_id} on {booking_date}")
-    print(f"[BOOKING UTILS] Found {len(group_bookings)} active bookings (others + own confirmed) to build occupancy mask.")
+        logger.debug("[BOOKING UTILS] Calculating personalized mask for user %s on %s", exclude_user_id, booking_date)
+    logger.debug("[BOOKING UTILS] Found %d active bookings (others + own confirmed) to build occupancy mask.", len(group_bookings))
 
     # 2.5 Fetch manual blocks from Admin Panel
     sql_blocks = text("""
@@ -402,6 +480,7 @@ def ensure_slots_for_date(db: Session, court_id: Any, booking_date: date):
     
     return {s.start_time.strftime("%H:%M"): s for s in existing_slots}
 
+@timed(SLOT_ENGINE_SECONDS, stage="court")
 def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, user_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
     """
     30-Minute Slot Engine. 
@@ -420,10 +499,7 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
     sport_slices = db.query(models.SportSlice).filter(models.SportSlice.court_id == court_id).all()
     slices_data = [{"id": str(s.id), "name": s.name, "mask": s.mask, "sport_id": str(s.sport_id), "sport_name": s.sport.name if s.sport else None, "price_per_hour": float(s.price_per_hour) if s.price_per_hour is not None else None} for s in sport_slices]
     
-    price_rules = court.price_conditions or []
-    if isinstance(price_rules, str):
-        try: price_rules = json.loads(price_rules)
-        except: price_rules = []
+    price_rules = compile_price_rules(court.price_conditions)
     
     # NEW: Fetch Consolidated Occupied Mask (Source of Truth)
     # This replaces the need for per-court caching in the 'slots' table
@@ -447,6 +523,7 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
             'price': float(gr.price),
             'source': 'global'
         })
+    global_rules = compile_price_rules(global_rules)
 
     allowed_slots = {}
     branch = db.query(models.Branch).filter(models.Branch.id == court.branch_id).first()
@@ -471,7 +548,14 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
             models.CourtBlock.block_date == booking_date
         ).all()
 
+    # Determine if court has ANY specific timings (rules) for this day
+    # If it does, we should ONLY allow slots that match those rules.
+    # If it doesn't, we follow the Branch hours.
+    court_has_specific_timings = has_specific_timings(price_rules, date_str, day_short)
+    unavailable_starts = unavailable_slot_starts(court.unavailability_slots, date_str, day_short)
+
     # Generate 48 slots
+    pricing_started = perf_counter()
     for i in range(0, 48):
         h_start = i * 0.5
         
@@ -485,52 +569,8 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
         mm = int((h_start % 1) * 60)
         time_key = f"{hh:02d}:{mm:02d}"
         
-        matched_rule = None
-        
         # Priority: Court Date > Court Day > Global Date > Global Day
-        # 1. Court Date
-        for pc in price_rules:
-            if date_str in (pc.get('dates') or []):
-                pc_from = pc.get('slotFrom') or pc.get('slot_from')
-                pc_to = pc.get('slotTo') or pc.get('slot_to')
-                if safe_parse_time_float(pc_from) <= h_start < (safe_parse_time_float(pc_to) or 24.0):
-                    matched_rule = pc; matched_rule['source'] = 'court_date'; break
-        
-        # 2. Court Day
-        if not matched_rule:
-            for pc in price_rules:
-                if day_short in [d.lower()[:3] for d in (pc.get('days') or [])]:
-                    pc_from = pc.get('slotFrom') or pc.get('slot_from')
-                    pc_to = pc.get('slotTo') or pc.get('slot_to')
-                    if safe_parse_time_float(pc_from) <= h_start < (safe_parse_time_float(pc_to) or 24.0):
-                        matched_rule = pc; matched_rule['source'] = 'court_day'; break
-
-        # 3. Global Date
-        if not matched_rule:
-            for gr in global_rules:
-                if date_str in (gr.get('dates') or []):
-                    gr_from = gr.get('slotFrom') or gr.get('slot_from')
-                    gr_to = gr.get('slotTo') or gr.get('slot_to')
-                    if safe_parse_time_float(gr_from) <= h_start < (safe_parse_time_float(gr_to) or 24.0):
-                        matched_rule = gr; matched_rule['source'] = 'global_date'; break
-
-        # 4. Global Day
-        if not matched_rule:
-            for gr in global_rules:
-                if day_short in (gr.get('days') or []):
-                    gr_from = gr.get('slotFrom') or gr.get('slot_from')
-                    gr_to = gr.get('slotTo') or gr.get('slot_to')
-                    if safe_parse_time_float(gr_from) <= h_start < (safe_parse_time_float(gr_to) or 24.0):
-                        matched_rule = gr; matched_rule['source'] = 'global_day'; break
-        
-        # Determine if court has ANY specific timings (rules) for this day
-        # If it does, we should ONLY allow slots that match those rules.
-        # If it doesn't, we follow the Branch hours.
-        court_has_specific_timings = any(
-            (date_str in (pc.get('dates') or [])) or 
-            (day_short in [d.lower()[:3] for d in (pc.get('days') or [])])
-            for pc in price_rules
-        )
+        matched_rule, source = match_price_rule(price_rules, global_rules, date_str, day_short, h_start)
         
         # Check Venue Hours Boundary
         is_venue_open_now = any(iv['open'] <= h_start < iv['close'] for iv in v_intervals)
@@ -542,7 +582,7 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
         is_allowed = is_venue_open_now
         if is_allowed and court_has_specific_timings:
             # If rules exist, only allow if matched_rule is from a court-specific source
-            is_allowed = (matched_rule and matched_rule['source'] in ('court_date', 'court_day'))
+            is_allowed = source in ('court_date', 'court_day')
 
         if is_allowed:
             is_blocked = False
@@ -560,24 +600,8 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
                         break
             
             # 2. Check Recurring Unavailability
-            if not is_blocked:
-                un_slots = court.unavailability_slots or []
-                if isinstance(un_slots, str):
-                    try: un_slots = json.loads(un_slots)
-                    except: un_slots = []
-                
-                if isinstance(un_slots, list):
-                    for un in un_slots:
-                        # Date specific block
-                        if un.get('date') == date_str:
-                            un_from = un.get('from') or un.get('slot_from') or un.get('slotFrom')
-                            un_to = un.get('to') or un.get('slot_to') or un.get('slotTo')
-                            if safe_parse_time_float(un_from) <= h_start < (safe_parse_time_float(un_to) or 24.0):
-                                is_blocked = True; break
-                        # Recurring block
-                        match = (date_str in (un.get('dates') or [])) or (day_short in [d.lower()[:3] for d in (un.get('days') or [])])
-                        if match and any(safe_parse_time_float(t) == h_start for t in (un.get('times') or [])):
-                            is_blocked = True; break
+            if not is_blocked and h_start in unavailable_starts:
+                is_blocked = True
             
             if not is_blocked:
                 base_price = float(court.price_per_hour)
@@ -620,7 +644,7 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
                     "display_time": f"{sh_disp:02d}:{mm:02d} {ampm_s} - {eh_disp:02d}:{m_e:02d} {ampm_e}",
                     "price": (float(matched_rule['price']) if matched_rule else float(court.price_per_hour)) / 2.0,
                     "is_blocked": is_blocked,
-                    "source": matched_rule.get('source', 'venue_hours') if matched_rule else 'venue_hours',
+                    "source": source or 'venue_hours',
                     "slot_id": str(slot_row.id) if slot_row else None,
                     "occupied_mask": occupied,
                     "booked_capacity": booked_capacity,
@@ -630,7 +654,8 @@ def generate_allowed_slots_map(db: Session, court_id: Any, booking_date: date, u
                     "slices": slices_status
                 }
 
-    print(f"[SLOT ENGINE] 30-MIN MODEL: Found {len(allowed_slots)} slots for {booking_date}")
+    SLOT_ENGINE_SECONDS.observe(perf_counter() - pricing_started, stage="pricing")
+    logger.debug("[SLOT ENGINE] 30-MIN MODEL: Found %d slots for %s", len(allowed_slots), booking_date)
     return allowed_slots
 
 def validate_booking_duration(slots: list):
@@ -2,16 +2,15 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-import logging
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 from utils.invoice_utils import render_invoice_html
 
 load_dotenv(override=True)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def send_admin_credentials_email(to_email, name, mobile, password):
     """
@@ -27,11 +26,9 @@ def send_admin_credentials_email(to_email, name, mobile, password):
     
     if not smtp_username or not smtp_password:
         logger.warning("SMTP credentials not found in environment variables. Email will NOT be sent.")
-        print("----------------------------------------------------------------")
-        print(f"MOCK EMAIL TO: {to_email}")
-        print(f"SUBJECT: Welcome to MyRush Admin Panel")
-        print(f"BODY: Hello {name},\nYour admin account has been created.\nMobile/User ID: {mobile}\nPassword: {password}\n\nPlease change your password within 24 hours.")
-        print("----------------------------------------------------------------")
+        logger.info(f"MOCK EMAIL TO: {to_email}")
+        logger.info(f"SUBJECT: Welcome to MyRush Admin Panel")
+        logger.info(f"BODY: Hello {name},\nYour admin account has been created.\nMobile/User ID: {mobile}\nPassword: {password}\n\nPlease change your password within 24 hours.")
         return False
 
     sender_email = smtp_username
@@ -92,11 +89,9 @@ def send_academy_application_email(data: dict):
 
     if not smtp_username or not smtp_password:
         logger.warning("SMTP credentials not found. Academy submission logged only.")
-        print("----------------------------------------------------------------")
-        print(f"MOCK ACADEMY EMAIL TO: {to_email}")
-        print(f"SUBJECT: New Academy Application: {data.get('athlete_name')}")
-        print(f"DETAILS: {data}")
-        print("----------------------------------------------------------------")
+        logger.info(f"MOCK ACADEMY EMAIL TO: {to_email}")
+        logger.info(f"SUBJECT: New Academy Application: {data.get('athlete_name')}")
+        logger.info(f"DETAILS: {data}")
         return True # Return true mimicking success for mock
 
     sender_email = smtp_username
@@ -175,11 +170,9 @@ def send_contact_email(data: dict):
 
     if not smtp_username or not smtp_password:
         logger.warning("SMTP credentials not found. Contact submission logged only.")
-        print("----------------------------------------------------------------")
-        print(f"MOCK CONTACT EMAIL TO: {to_email}")
-        print(f"SUBJECT: New Contact Inquiry: {data.get('form_type')} - {data.get('name')}")
-        print(f"DETAILS: {data}")
-        print("----------------------------------------------------------------")
+        logger.info(f"MOCK CONTACT EMAIL TO: {to_email}")
+        logger.info(f"SUBJECT: New Contact Inquiry: {data.get('form_type')} - {data.get('name')}")
+        logger.info(f"DETAILS: {data}")
         return True # Return true mimicking success for mock
 
     sender_email = smtp_username
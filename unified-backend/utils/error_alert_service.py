@@ -3,6 +3,9 @@ Error Alert Service
 
 This module handles sending email alerts for critical backend errors.
 Uses the existing SMTP configuration from utils.email_sender.
+
+Request handlers should call enqueue_error_alert(); alerts are aggregated and
+sent as digests by a background worker so error handling never waits on SMTP.
 """
 
 import smtplib
@@ -10,11 +13,21 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import json
+import atexit
+import hashlib
+import queue
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 import traceback
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows: rate-limit state is shared between threads only
+    fcntl = None
+
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -40,6 +53,18 @@ def send_error_alert_email(
         bool: True if email was sent successfully, False otherwise
     """
     
+    # Create detailed error report
+    error_report = create_error_report(error, request_context, extra_context)
+
+    subject = f"🚨 MyRush Backend Error Alert - {error.__class__.__name__}"
+    html_content = create_html_email_content(error, error_report)
+    text_content = create_text_email_content(error, error_report)
+
+    return _deliver_alert_email(subject, text_content, html_content)
+
+def _deliver_alert_email(subject: str, text_content: str, html_content: str) -> bool:
+    """Send an already-rendered alert email over SMTP. Blocking; call from the alert worker."""
+
     # Get SMTP configuration
     smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     smtp_port = int(os.getenv("SMTP_PORT", "587"))
@@ -62,18 +87,6 @@ def send_error_alert_email(
     # Parse recipients (comma-separated)
     recipients = [email.strip() for email in alert_recipients.split(',') if email.strip()]
     
-    # Prepare email content
-    subject = f"🚨 MyRush Backend Error Alert - {error.__class__.__name__}"
-    
-    # Create detailed error report
-    error_report = create_error_report(error, request_context, extra_context)
-    
-    # Create HTML email content
-    html_content = create_html_email_content(error, error_report)
-    
-    # Create plain text version
-    text_content = create_text_email_content(error, error_report)
-    
     try:
         # Create message
         msg = MIMEMultipart('alternative')
@@ -115,7 +128,7 @@ def create_error_report(
         'error_type': error.__class__.__name__,
         'error_module': error.__class__.__module__,
         'error_message': str(error),
-        'traceback': traceback.format_exc(),
+        'traceback': ''.join(traceback.format_exception(type(error), error, error.__traceback__)) if error.__traceback__ else traceback.format_exc(),
         'environment': os.getenv("ENVIRONMENT", "development"),
         'server_info': {
             'hostname': os.getenv("HOSTNAME", "unknown"),
@@ -288,6 +301,309 @@ Please investigate this error promptly to ensure system stability.
     
     return text
 
+# ============================================================================
+# ASYNC ALERT PIPELINE
+# ============================================================================
+#
+# Failing requests only enqueue a report (no I/O). A background worker thread
+# collects reports for ALERT_DIGEST_WINDOW_SECONDS, groups them by fingerprint
+# and sends one digest email with counts. The per-fingerprint budget is kept in
+# a lock-protected state file so every worker process on the host shares it.
+
+ALERT_DIGEST_WINDOW_SECONDS = int(os.getenv("ERROR_ALERT_DIGEST_WINDOW_SECONDS", "60"))
+ALERT_QUEUE_MAX_SIZE = int(os.getenv("ERROR_ALERT_QUEUE_MAX_SIZE", "1000"))
+ALERT_RATE_WINDOW_MINUTES = int(os.getenv("ERROR_ALERT_RATE_WINDOW_MINUTES", "5"))
+ALERT_RATE_MAX_ALERTS = int(os.getenv("ERROR_ALERT_RATE_MAX_ALERTS", "3"))
+ALERT_STATE_FILE = os.getenv("ERROR_ALERT_STATE_FILE", os.path.join("logs", "error_alert_state.json"))
+
+def error_fingerprint(error: Exception, request_context: Optional[Dict[str, Any]] = None) -> str:
+    """Groups errors by exception class, innermost raising frame and request path."""
+    location = ""
+    tb = error.__traceback__
+    while tb is not None:
+        location = f"{tb.tb_frame.f_code.co_filename}:{tb.tb_lineno}"
+        tb = tb.tb_next
+    path = (request_context or {}).get('path', '')
+    raw = f"{error.__class__.__module__}.{error.__class__.__name__}|{location}|{path}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+class SharedAlertRateLimiter:
+    """
+    Allows at most `max_alerts` alerts per fingerprint per window across all
+    worker processes, using a state file guarded by an exclusive file lock.
+    Occurrences that are suppressed are carried over into the next alert.
+    """
+
+    def __init__(self, state_file: str = ALERT_STATE_FILE, window_minutes: int = ALERT_RATE_WINDOW_MINUTES, max_alerts: int = ALERT_RATE_MAX_ALERTS):
+        self.state_file = state_file
+        self.window_seconds = window_minutes * 60
+        self.max_alerts = max_alerts
+        self._thread_lock = threading.Lock()
+
+    def _locked_update(self, update):
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._thread_lock, open(self.state_file + ".lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.state_file, "r") as f:
+                        state = json.load(f)
+                except (OSError, ValueError):
+                    state = {}
+                result = update(state)
+                tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.state_file)
+                return result
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def acquire(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """
+        Takes {fingerprint: occurrences in this window} and returns the
+        fingerprints allowed to alert now, mapped to the occurrences to report
+        (including ones suppressed earlier).
+        """
+        now = time.time()
+        cutoff = now - self.window_seconds
+
+        def update(state):
+            allowed = {}
+            for fingerprint, count in counts.items():
+                entry = state.get(fingerprint) or {"sent": [], "suppressed": 0}
+                entry["sent"] = [ts for ts in entry["sent"] if ts > cutoff]
+                if len(entry["sent"]) < self.max_alerts:
+                    entry["sent"].append(now)
+                    allowed[fingerprint] = count + entry["suppressed"]
+                    entry["suppressed"] = 0
+                else:
+                    entry["suppressed"] += count
+                state[fingerprint] = entry
+            # Forget fingerprints that have been quiet for a full window
+            for fingerprint in [fp for fp, e in state.items() if not e["sent"] and not e["suppressed"]]:
+                del state[fingerprint]
+            return allowed
+
+        try:
+            return self._locked_update(update)
+        except OSError as e:
+            # Shared state unavailable: fall back to alerting rather than going silent
+            logger.error(f"Error alert rate-limit state unavailable ({e}); alerting without throttling")
+            return dict(counts)
+
+class ErrorAlertPipeline:
+    """In-memory alert queue drained by a background thread into digest emails."""
+
+    def __init__(
+        self,
+        rate_limiter: Optional[SharedAlertRateLimiter] = None,
+        window_seconds: int = ALERT_DIGEST_WINDOW_SECONDS,
+        max_queue_size: int = ALERT_QUEUE_MAX_SIZE,
+        sender=None,
+    ):
+        self.rate_limiter = rate_limiter or SharedAlertRateLimiter()
+        self.window_seconds = window_seconds
+        self.sender = sender or _deliver_alert_email
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(
+        self,
+        error: Exception,
+        request_context: Optional[Dict[str, Any]] = None,
+        extra_context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Queue an alert. Never blocks; returns False if the queue is full."""
+        item = {
+            'fingerprint': error_fingerprint(error, request_context),
+            'report': create_error_report(error, request_context, extra_context),
+            'seen_at': datetime.utcnow().isoformat() + 'Z',
+        }
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.start()
+        return True
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="error-alert-worker", daemon=True)
+                self._thread.start()
+
+    def _collect(self, item: Dict[str, Any]):
+        with self._pending_lock:
+            group = self._pending.get(item['fingerprint'])
+            if group is None:
+                self._pending[item['fingerprint']] = {
+                    'count': 1,
+                    'first_seen': item['seen_at'],
+                    'last_seen': item['seen_at'],
+                    'report': item['report'],
+                }
+            else:
+                group['count'] += 1
+                group['last_seen'] = item['seen_at']
+
+    def _drain_queue(self):
+        while True:
+            try:
+                self._collect(self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def _run(self):
+        while True:
+            self._collect(self._queue.get())
+            deadline = time.monotonic() + self.window_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self._collect(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error alert worker failed to flush: {e}")
+
+    def flush(self) -> bool:
+        """Send one email for everything collected so far. Returns True if an email was sent."""
+        self._drain_queue()
+        with self._pending_lock:
+            groups, self._pending = self._pending, {}
+        if not groups:
+            return False
+
+        allowed = self.rate_limiter.acquire({fp: g['count'] for fp, g in groups.items()})
+        groups = {fp: dict(groups[fp], count=total) for fp, total in allowed.items()}
+        if not groups:
+            return False
+
+        if len(groups) == 1:
+            (group,) = groups.values()
+            if group['count'] == 1:
+                report = group['report']
+                subject = f"🚨 MyRush Backend Error Alert - {report['error_type']}"
+                return self.sender(subject, create_text_email_content(None, report), create_html_email_content(None, report))
+
+        total = sum(g['count'] for g in groups.values())
+        subject = f"🚨 MyRush Backend Error Digest - {total} errors ({len(groups)} distinct)"
+        return self.sender(subject, create_digest_text_content(groups), create_digest_html_content(groups))
+
+def create_digest_html_content(groups: Dict[str, Dict[str, Any]]) -> str:
+    """Create HTML content for a digest of grouped error alerts"""
+
+    rows = ""
+    details = ""
+    for fingerprint, group in sorted(groups.items(), key=lambda kv: -kv[1]['count']):
+        report = group['report']
+        request_info = report.get('request', {})
+        rows += f"""
+                    <tr>
+                        <td>{group['count']}</td>
+                        <td>{report['error_type']}</td>
+                        <td>{request_info.get('method', 'N/A')} {request_info.get('path', 'N/A')}</td>
+                        <td>{group['first_seen']} &rarr; {group['last_seen']}</td>
+                    </tr>"""
+        details += f"""
+                <h3>{report['error_type']} <span class="timestamp">({fingerprint})</span></h3>
+                <div class="error-section">
+                    <strong>Error Message:</strong> {report['error_message']}<br>
+                    <strong>URL:</strong> {request_info.get('url', 'N/A')}
+                </div>
+                <div class="code-block">
+                    <pre>{report['traceback']}</pre>
+                </div>"""
+
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>MyRush Backend Error Digest</title>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 800px; margin: 0 auto; padding: 20px; }}
+            .header {{ background-color: #d32f2f; color: white; padding: 15px; border-radius: 5px; }}
+            .content {{ background-color: #f5f5f5; padding: 20px; border-radius: 5px; margin: 20px 0; }}
+            .error-section {{ background-color: #ffebee; border-left: 4px solid #d32f2f; padding: 15px; margin: 15px 0; }}
+            .code-block {{ background-color: #f4f4f4; border: 1px solid #ddd; padding: 15px; border-radius: 5px; overflow-x: auto; }}
+            .timestamp {{ color: #666; font-size: 0.9em; }}
+            table {{ width: 100%; border-collapse: collapse; }}
+            th, td {{ text-align: left; padding: 6px; border-bottom: 1px solid #ddd; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h2>🚨 MyRush Backend Error Digest</h2>
+                <p class="timestamp">Generated: {datetime.utcnow().isoformat()}Z &middot; Environment: {os.getenv("ENVIRONMENT", "development")}</p>
+            </div>
+
+            <div class="content">
+                <h3>Summary</h3>
+                <table>
+                    <tr><th>Count</th><th>Error Type</th><th>Request</th><th>Seen</th></tr>{rows}
+                </table>
+                {details}
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+def create_digest_text_content(groups: Dict[str, Dict[str, Any]]) -> str:
+    """Create plain text content for a digest of grouped error alerts"""
+
+    text = f"""
+MyRush Backend Error Digest
+===========================
+
+Generated: {datetime.utcnow().isoformat()}Z
+Environment: {os.getenv("ENVIRONMENT", "development")}
+
+"""
+    for fingerprint, group in sorted(groups.items(), key=lambda kv: -kv[1]['count']):
+        report = group['report']
+        request_info = report.get('request', {})
+        text += f"""[{group['count']}x] {report['error_type']} ({fingerprint})
+Request: {request_info.get('method', 'N/A')} {request_info.get('url', 'N/A')}
+Seen: {group['first_seen']} -> {group['last_seen']}
+Error Message: {report['error_message']}
+
+{report['traceback']}
+-------------------
+"""
+    return text
+
+# Global pipeline instance
+alert_pipeline = ErrorAlertPipeline()
+atexit.register(alert_pipeline.flush)
+
+def enqueue_error_alert(
+    error: Exception,
+    request_context: Optional[Dict[str, Any]] = None,
+    extra_context: Optional[Dict[str, Any]] = None
+) -> bool:
+    """Queue an error alert for the background digest worker (non-blocking)."""
+    return alert_pipeline.enqueue(error, request_context, extra_context)
+
 # Configuration helper functions
 def configure_error_alerts():
     """Configure error alert settings"""
@@ -1,16 +1,15 @@
 import os
-import requests
 import json
-import logging
 from fastapi import HTTPException
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from utils import http_client
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class ExotelWhatsAppClient:
     def __init__(self):
@@ -57,7 +56,7 @@ class ExotelWhatsAppClient:
             }
             
             # Auth is handled via Basic Auth (API Key, API Token)
-            response = requests.post(
+            response = http_client.post(
                 self.base_url, 
                 auth=(self.api_key, self.api_token), 
                 json=payload
@@ -106,7 +105,7 @@ class ExotelWhatsAppClient:
                 }
             }
             
-            response = requests.post(
+            response = http_client.post(
                 self.base_url, 
                 auth=(self.api_key, self.api_token), 
                 json=payload
@@ -0,0 +1,225 @@
+"""
+Shared outbound HTTP layer.
+
+Partner gateways, partner webhooks, the Vriksha payment forward and Exotel
+all talk to a handful of hosts. Opening a fresh TCP + TLS connection per call
+(module-level requests.get/post) made the handshake most of their latency, so
+calls go through keep-alive sessions pooled per host instead:
+
+    from utils import http_client
+    response = http_client.post(url, json=payload, headers=headers)
+    response = await http_client.apost(url, json=payload)   # async (httpx)
+
+Settings (env):
+- HTTP_POOL_MAXSIZE          connections kept alive per host (default 20)
+- HTTP_CONNECT_TIMEOUT       seconds to establish a connection (default 5)
+- HTTP_READ_TIMEOUT          seconds to wait for a response (default 30)
+- HTTP_MAX_RETRIES           retries after the first attempt (default 2)
+- HTTP_RETRY_BACKOFF         base backoff in seconds, doubled per retry
+                             and jittered (default 0.3)
+
+Connection failures are retried for every method (the request never reached
+the server). Read timeouts and 502/503/504 responses are only retried for
+idempotent methods, so a webhook POST is never delivered twice by this layer.
+Latency is recorded per host in outbound_http_duration_seconds.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from utils.logger import get_logger
+from utils.metrics import OUTBOUND_HTTP_SECONDS
+
+logger = get_logger(__name__)
+
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.3"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {502, 503, 504}
+
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: Dict[Tuple[str, int, bool], "httpx.AsyncClient"] = {}
+_lock = threading.Lock()
+
+
+def host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _timeout(timeout) -> Tuple[float, float]:
+    """Accepts None (defaults), a read timeout, or a (connect, read) tuple."""
+    if timeout is None:
+        return HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+    if isinstance(timeout, tuple):
+        return timeout
+    return min(HTTP_CONNECT_TIMEOUT, float(timeout)), float(timeout)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full +/-50% jitter, so callers don't retry in lockstep."""
+    return HTTP_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def _should_retry(method: str, attempt: int, retries: int, status: Optional[int] = None,
+                  connect_error: bool = False) -> bool:
+    if attempt >= retries:
+        return False
+    if connect_error:
+        return True
+    return method in IDEMPOTENT_METHODS and (status is None or status in RETRY_STATUSES)
+
+
+def _is_connect_failure(error: Exception) -> bool:
+    """True when no connection was established, i.e. the request was never sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _error_outcome(error: Exception, connect_error: bool) -> str:
+    if connect_error:
+        return "connect_error"
+    return "timeout" if "Timeout" in error.__class__.__name__ else "error"
+
+
+def _observe(host: str, method: str, outcome, started: float) -> None:
+    OUTBOUND_HTTP_SECONDS.observe(time.perf_counter() - started, host=host, method=method, outcome=outcome)
+
+
+def get_session(url: str) -> requests.Session:
+    """Keep-alive session for the URL's host (created on first use, shared across threads)."""
+    key = host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[key] = session
+    return session
+
+
+def request(method: str, url: str, timeout=None, retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """requests.request() over the host's pooled session, with retries and metrics."""
+    method = method.upper()
+    host = host_key(url)
+    retries = HTTP_MAX_RETRIES if retries is None else retries
+    session = get_session(url)
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=_timeout(timeout), **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            connect_error = _is_connect_failure(e)
+            _observe(host, method, _error_outcome(e, connect_error), started)
+            if not _should_retry(method, attempt, retries, connect_error=connect_error):
+                raise
+            logger.warning(f"[HTTP] {method} {host} failed ({e.__class__.__name__}), retry {attempt + 1}/{retries}")
+        else:
+            _observe(host, method, response.status_code, started)
+            if not (response.status_code in RETRY_STATUSES and _should_retry(method, attempt, retries, response.status_code)):
+                return response
+            logger.warning(f"[HTTP] {method} {host} returned {response.status_code}, retry {attempt + 1}/{retries}")
+            response.close()
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def get_async_client(url: str, verify: bool = True):
+    """
+    Keep-alive httpx.AsyncClient for the URL's host. Clients are bound to the
+    running event loop, so each loop gets its own; httpx fixes TLS
+    verification per client, so it is part of the key too.
+    """
+    import httpx
+
+    key = (host_key(url), id(asyncio.get_running_loop()), verify)
+    client = _async_clients.get(key)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=HTTP_POOL_MAXSIZE, max_keepalive_connections=HTTP_POOL_MAXSIZE)
+        client = httpx.AsyncClient(limits=limits, verify=verify)
+        _async_clients[key] = client
+    return client
+
+
+async def arequest(method: str, url: str, timeout=None, retries: Optional[int] = None, verify: bool = True, **kwargs):
+    """Async counterpart of request(); returns an httpx.Response."""
+    import httpx
+
+    method = method.upper()
+    host = host_key(url)
+    retries = HTTP_MAX_RETRIES if retries is None else retries
+    connect, read = _timeout(timeout)
+    client = get_async_client(url, verify)
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, timeout=httpx.Timeout(read, connect=connect), **kwargs)
+        except httpx.TransportError as e:
+            connect_error = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+            _observe(host, method, _error_outcome(e, connect_error), started)
+            if not _should_retry(method, attempt, retries, connect_error=connect_error):
+                raise
+            logger.warning(f"[HTTP] {method} {host} failed ({e.__class__.__name__}), retry {attempt + 1}/{retries}")
+        else:
+            _observe(host, method, response.status_code, started)
+            if not (response.status_code in RETRY_STATUSES and _should_retry(method, attempt, retries, response.status_code)):
+                return response
+            logger.warning(f"[HTTP] {method} {host} returned {response.status_code}, retry {attempt + 1}/{retries}")
+        await asyncio.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+async def aget(url: str, **kwargs):
+    return await arequest("GET", url, **kwargs)
+
+
+async def apost(url: str, **kwargs):
+    return await arequest("POST", url, **kwargs)
+
+
+def close_all() -> None:
+    """Closes pooled sync sessions (async clients are closed by aclose_all)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+async def aclose_all() -> None:
+    """Closes the async clients owned by the running loop."""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _async_clients if k[1] == loop_id]:
+        client = _async_clients.pop(key)
+        await client.aclose()
@@ -1,49 +1,165 @@
+"""
+Invoice rendering service.
+
+Invoices are viewed from the user app and emailed after payment, often several
+times for the same booking. To keep that cheap:
+
+- the booking, user, court, branch and city are loaded with one joined query
+- SiteSetting is held as a detached snapshot with a TTL
+- the Jinja template is compiled once per process, with a bytecode cache on disk
+- rendered HTML is cached by a digest of everything that goes into it,
+  computed from the freshly loaded rows: a hit still costs the one query, but
+  any change to the booking (status, payment, refund) in any worker yields a
+  new digest, so no write path has to invalidate anything
+"""
+
 import os
-from jinja2 import Environment, FileSystemLoader
-from sqlalchemy.orm import Session
+import hashlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from sqlalchemy.orm import Session, contains_eager
 from uuid import UUID
 import models
 
-# Setup Jinja2 environment
+INVOICE_TEMPLATE = 'invoice_template.html'
+
+# Seconds a SiteSetting snapshot is trusted before re-reading it
+SITE_SETTINGS_TTL_SECONDS = int(os.getenv("SITE_SETTINGS_TTL_SECONDS", "300"))
+INVOICE_CACHE_MAX_ENTRIES = int(os.getenv("INVOICE_CACHE_MAX_ENTRIES", "512"))
+
+# Setup Jinja2 environment (templates never change at runtime, so skip the mtime checks)
 template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
-jinja_env = Environment(loader=FileSystemLoader(template_dir))
+bytecode_dir = os.getenv("JINJA_BYTECODE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "myrush-jinja-cache"))
+os.makedirs(bytecode_dir, exist_ok=True)
+jinja_env = Environment(
+    loader=FileSystemLoader(template_dir),
+    bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+    auto_reload=False,
+)
+invoice_template = jinja_env.get_template(INVOICE_TEMPLATE)
+
+_lock = threading.Lock()
+_site_snapshot = None
+_site_snapshot_expires_at = 0.0
+# digest -> rendered html (LRU)
+_html_by_digest = OrderedDict()
+
+
+def _column_values(obj):
+    if obj is None:
+        return None
+    return tuple((c.key, getattr(obj, c.key, None)) for c in obj.__table__.columns)
+
+
+def get_site_settings_snapshot(db: Session):
+    """
+    Returns a detached, read-only copy of the SiteSetting row (or None),
+    re-read at most every SITE_SETTINGS_TTL_SECONDS.
+    """
+    global _site_snapshot, _site_snapshot_expires_at
+
+    now = time.monotonic()
+    with _lock:
+        if now < _site_snapshot_expires_at:
+            return _site_snapshot
+
+    site = db.query(models.SiteSetting).first()
+    snapshot = SimpleNamespace(**dict(_column_values(site))) if site else None
+
+    with _lock:
+        _site_snapshot = snapshot
+        _site_snapshot_expires_at = now + SITE_SETTINGS_TTL_SECONDS
+    return snapshot
+
+
+def invalidate_site_settings_snapshot():
+    """Drops the SiteSetting snapshot; invoices rendered with it no longer match its digest."""
+    global _site_snapshot, _site_snapshot_expires_at
+    with _lock:
+        _site_snapshot = None
+        _site_snapshot_expires_at = 0.0
+
+
+def load_invoice_context(db: Session, booking_id: str):
+    """
+    Loads booking, user, court, branch and the branch's city in a single query.
+    Returns (booking, user, court, branch) or None if the booking does not exist.
+    """
+    row = (
+        db.query(models.Booking, models.User, models.Court, models.Branch)
+        .outerjoin(models.User, models.User.id == models.Booking.user_id)
+        .outerjoin(models.Court, models.Court.id == models.Booking.court_id)
+        .outerjoin(models.Branch, models.Branch.id == models.Court.branch_id)
+        .outerjoin(models.City, models.City.id == models.Branch.city_id)
+        .options(contains_eager(models.Branch.city))
+        .filter(models.Booking.id == booking_id)
+        .first()
+    )
+    return tuple(row) if row else None
+
+
+def _context_digest(booking, user, court, branch, site, auto_print):
+    city = branch.city if branch is not None else None
+    material = repr((
+        _column_values(booking), _column_values(user), _column_values(court),
+        _column_values(branch), _column_values(city),
+        tuple(sorted(vars(site).items())) if site else None,
+        auto_print,
+    ))
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _cached_html(digest):
+    with _lock:
+        html = _html_by_digest.get(digest)
+        if html is not None:
+            _html_by_digest.move_to_end(digest)
+        return html
+
+
+def _store_html(digest, html):
+    with _lock:
+        _html_by_digest[digest] = html
+        _html_by_digest.move_to_end(digest)
+        while len(_html_by_digest) > INVOICE_CACHE_MAX_ENTRIES:
+            _html_by_digest.popitem(last=False)
+
 
 def render_invoice_html(db: Session, booking_id: str, auto_print: bool = False):
     """
     Fetches booking, user, court, branch, and site details and renders the invoice template.
+    Served from the rendered-HTML cache when nothing that goes into it changed.
     """
-    # 1. Fetch Booking
-    booking = db.query(models.Booking).filter(models.Booking.id == booking_id).first()
-    if not booking:
+    # 1. Fetch booking, user, court and branch in one round-trip
+    context_row = load_invoice_context(db, booking_id)
+    if not context_row:
         return None
+    booking, user, court, branch = context_row
 
-    # 2. Fetch User
-    user = db.query(models.User).filter(models.User.id == booking.user_id).first()
-
-    # 3. Fetch Court
-    court = db.query(models.Court).filter(models.Court.id == booking.court_id).first()
+    # 2. Site settings (snapshot)
+    site = get_site_settings_snapshot(db)
 
-    # 4. Fetch Branch
-    branch = None
-    if court:
-        branch = db.query(models.Branch).filter(models.Branch.id == court.branch_id).first()
+    # 3. Reuse an identical render if one is cached
+    digest = _context_digest(booking, user, court, branch, site, bool(auto_print))
+    html = _cached_html(digest)
+    if html is not None:
+        return html
 
-    # 5. Fetch Site Settings
-    site = db.query(models.SiteSetting).first()
-
-    # 6. Prepare Template Context
-    template = jinja_env.get_template('invoice_template.html')
-    
+    # 4. Prepare Template Context
     # Construct base URL for images and links
     base_url = getattr(site, 'site_url', None) or "https://myrush.in"
     if base_url.endswith('/'):
         base_url = base_url[:-1]
-    
+
     # Construct absolute logo URL
     logo_url = None
     if site and getattr(site, 'site_logo', None):
         logo_url = f"{base_url}/uploads/{site.site_logo}"
-    
+
     context = {
         "booking": booking,
         "user": user,
@@ -55,4 +171,6 @@ def render_invoice_html(db: Session, booking_id: str, auto_print: bool = False):
         "logo_url": logo_url
     }
 
-    return template.render(context)
+    html = invoice_template.render(context)
+    _store_html(digest, html)
+    return html
@@ -6,9 +6,12 @@ Follows DoD standards and production best practices for error monitoring.
 
 Features:
 - Structured logging with full context
-- Automatic email alerts for 5xx errors in production
+- Non-blocking output: records go through a QueueHandler/QueueListener pipeline
+- Per-module log levels (LOG_LEVELS env var, changeable at runtime)
+- Sampling for high-volume per-slot debug events
+- Automatic email alerts for 5xx errors in production, queued and sent as digests
 - Sensitive data masking
-- Rate limiting to prevent email spam
+- Rate limiting shared across worker processes to prevent email spam
 - Integration with existing SMTP setup
 """
 
@@ -17,13 +20,18 @@ import json
 import traceback
 import hashlib
 import time
+import copy
+import queue
+import random
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import os
 from functools import wraps
 
-from utils.error_alert_service import send_error_alert_email
+from utils.error_alert_service import enqueue_error_alert
 from fastapi import Request
 
 # Configure structured logging
@@ -59,9 +67,12 @@ class StructuredFormatter(logging.Formatter):
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
-# Configure the main logger
-logger = logging.getLogger("myrush_backend")
-logger.setLevel(logging.DEBUG)
+# Default level for every logger, plus per-module overrides, e.g.
+# LOG_LEVELS="utils.booking_utils=DEBUG,services.integrations=WARNING"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Fraction of per-slot debug events that are actually emitted
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
 
 # Create console handler
 console_handler = logging.StreamHandler()
@@ -78,43 +89,95 @@ error_handler = logging.FileHandler(LOGS_DIR / "errors.log")
 error_handler.setLevel(logging.ERROR)
 error_handler.setFormatter(StructuredFormatter())
 
-# Add handlers to logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
-logger.addHandler(error_handler)
+class LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for a same-process listener: merges args into the message but
+    keeps exc_info, so StructuredFormatter can still render the exception.
+    """
 
-# Rate limiting for email alerts
-class RateLimiter:
-    """Simple rate limiter to prevent email spam"""
-    
-    def __init__(self, window_minutes: int = 5, max_alerts: int = 3):
-        self.window_minutes = window_minutes
-        self.max_alerts = max_alerts
-        self.alert_counts: Dict[str, List[datetime]] = {}
-    
-    def should_send_alert(self, error_type: str) -> bool:
-        """Check if an alert should be sent for this error type"""
-        now = datetime.utcnow()
-        cutoff = now - timedelta(minutes=self.window_minutes)
-        
-        # Clean old entries
-        if error_type in self.alert_counts:
-            self.alert_counts[error_type] = [
-                timestamp for timestamp in self.alert_counts[error_type] 
-                if timestamp > cutoff
-            ]
-        else:
-            self.alert_counts[error_type] = []
-        
-        # Check if we can send more alerts
-        if len(self.alert_counts[error_type]) < self.max_alerts:
-            self.alert_counts[error_type].append(now)
-            return True
-        
-        return False
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+# Request threads only put records on this queue; formatting and the actual
+# stdout/file writes happen on the listener's thread.
+log_queue = queue.SimpleQueue()
+queue_handler = LocalQueueHandler(log_queue)
+queue_listener = QueueListener(log_queue, console_handler, file_handler, error_handler, respect_handler_level=True)
+
+root_logger = logging.getLogger()
+for existing in list(root_logger.handlers):
+    if isinstance(existing, QueueHandler):
+        root_logger.removeHandler(existing)
+root_logger.addHandler(queue_handler)
+root_logger.setLevel(LOG_LEVEL)
+
+queue_listener.start()
+atexit.register(queue_listener.stop)
+
+# Configure the main logger (propagates to the queue handler on the root logger)
+logger = logging.getLogger("myrush_backend")
+logger.setLevel(logging.DEBUG)
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a module logger wired into the queued pipeline. Use get_logger(__name__)."""
+    return logging.getLogger(name)
+
+def set_log_level(name: str, level: str) -> None:
+    """Change a logger's level at runtime ('' or 'root' targets the root logger)."""
+    level = level.upper()
+    if level not in logging._nameToLevel:
+        raise ValueError(f"Unknown log level: {level}")
+    target = logging.getLogger() if name in ("", "root") else logging.getLogger(name)
+    target.setLevel(level)
+
+def get_log_levels() -> Dict[str, str]:
+    """Explicitly configured levels of the root logger and every named logger."""
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, candidate in sorted(logging.root.manager.loggerDict.items()):
+        if isinstance(candidate, logging.Logger) and candidate.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(candidate.level)
+    return levels
+
+def _apply_log_levels(spec: str) -> None:
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        try:
+            set_log_level(name.strip(), level.strip())
+        except ValueError as e:
+            logger.warning(f"Ignoring LOG_LEVELS entry '{item}': {e}")
+
+_apply_log_levels(LOG_LEVELS)
+
+class SampledLogger:
+    """
+    Emits only a fraction of calls, for events that fire once per slot or per
+    court. The level check comes first, so disabled levels cost nothing.
+    """
+
+    def __init__(self, target: logging.Logger, rate: float = LOG_SAMPLE_RATE):
+        self.logger = target
+        self.rate = rate
+
+    def _log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(level) and random.random() < self.rate:
+            kwargs.setdefault("stacklevel", 3)
+            self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        self._log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs) -> None:
+        self._log(logging.INFO, msg, *args, **kwargs)
 
-# Global rate limiter instance
-rate_limiter = RateLimiter()
+def get_sampled_logger(name: str, rate: float = LOG_SAMPLE_RATE) -> SampledLogger:
+    """Sampled variant of get_logger() for per-slot debug events."""
+    return SampledLogger(get_logger(name), rate)
 
 def mask_sensitive_data(data: Any) -> Any:
     """Mask sensitive data in request/response data"""
@@ -200,19 +263,19 @@ def log_error(
         extra={'extra_fields': log_data}
     )
     
-    # Check if we should send an email alert
+    # Queue an email alert; deduplication, digests and rate limiting happen in the background worker
     should_alert = (
         level == "ERROR" and 
-        os.getenv("ENVIRONMENT", "development").lower() == "production" and
-        rate_limiter.should_send_alert(get_error_type(error))
+        os.getenv("ENVIRONMENT", "development").lower() == "production"
     )
     
     if should_alert:
         try:
-            send_error_alert_email(error, request_context, extra_context)
+            if not enqueue_error_alert(error, request_context, extra_context):
+                logger.warning("Error alert queue is full; alert dropped")
         except Exception as alert_error:
             # Log alert failure but don't raise - we don't want to break the main error handling
-            logger.error(f"Failed to send error alert email: {alert_error}")
+            logger.error(f"Failed to queue error alert: {alert_error}")
 
 def log_info(message: str, context: Optional[Dict[str, Any]] = None) -> None:
     """Log an info message with context"""
@@ -0,0 +1,298 @@
+"""
+In-process metrics with a Prometheus text exposition.
+
+Counters, gauges and histograms are kept in memory per worker process and
+rendered by GET /metrics. There is no external dependency and nothing is
+pushed anywhere; scrape each worker (or run a single worker per port) to
+aggregate.
+
+Instrumented today:
+- HTTP: per-route latency histogram, in-flight requests, queries per request
+- Database: pool checked-out/overflow/size, connection acquire time, query count
+- Slot engine: occupancy build, pricing loop and per-court generation time
+- Outbox: pending depth and lag of the oldest pending event (read at scrape time)
+- Scheduler: job run durations and failures
+- Outbound HTTP: per-host latency by method and outcome (utils/http_client.py)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+        lines = self._header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Registers a callable that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"[METRICS] Collector {getattr(collector, '__name__', collector)} failed: {e}")
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "Requests currently being served")
+HTTP_REQUEST_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+
+# Database
+DB_QUERIES_TOTAL = REGISTRY.counter("db_queries_total", "SQL statements executed")
+DB_POOL_ACQUIRE_SECONDS = REGISTRY.histogram(
+    "db_pool_acquire_seconds", "Time spent waiting for a pooled connection (including connects)")
+DB_POOL_CHECKOUTS_TOTAL = REGISTRY.counter("db_pool_checkouts_total", "Connections checked out of the pool")
+DB_POOL_INVALIDATIONS_TOTAL = REGISTRY.counter("db_pool_invalidations_total", "Pooled connections invalidated")
+DB_POOL_CHECKED_OUT = REGISTRY.gauge("db_pool_checked_out", "Connections currently checked out")
+DB_POOL_OVERFLOW = REGISTRY.gauge("db_pool_overflow", "Connections open beyond pool_size")
+DB_POOL_SIZE = REGISTRY.gauge("db_pool_size", "Configured pool_size")
+
+# Slot engine
+SLOT_ENGINE_SECONDS = REGISTRY.histogram(
+    "slot_engine_duration_seconds", "Slot engine stage duration (occupancy, pricing, court)", ("stage",))
+
+# Outbox
+OUTBOX_PENDING = REGISTRY.gauge("outbox_pending_events", "Outbox events waiting for delivery")
+OUTBOX_LAG_SECONDS = REGISTRY.gauge("outbox_oldest_pending_age_seconds", "Age of the oldest pending outbox event")
+OUTBOX_DELIVERY_SECONDS = REGISTRY.histogram(
+    "outbox_delivery_duration_seconds", "Webhook delivery time by partner and outcome", ("partner", "outcome"))
+
+# Outbound HTTP (partner gateways, webhooks, payment forwards, WhatsApp)
+OUTBOUND_HTTP_SECONDS = REGISTRY.histogram(
+    "outbound_http_duration_seconds", "Outbound HTTP call latency by host, method and status/outcome",
+    ("host", "method", "outcome"))
+
+# Scheduler
+SCHEDULER_JOB_SECONDS = REGISTRY.histogram(
+    "scheduler_job_duration_seconds", "Background job run duration", ("job",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300))
+SCHEDULER_JOB_FAILURES = REGISTRY.counter("scheduler_job_failures_total", "Background job runs that raised", ("job",))
+
+
+@contextmanager
+def timer(histogram: Histogram, **labels):
+    """Observes the wall time of the enclosed block."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator form of timer()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(histogram, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Per-request SQL statement counter. Holds a one-element list so that sync
+# endpoints running in the threadpool (which get a copy of the context)
+# increment the same object the middleware reads.
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+
+def start_query_count():
+    counter = [0]
+    return counter, _request_queries.set(counter)
+
+
+def stop_query_count(token) -> None:
+    _request_queries.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Hooks query counting and pool statistics into a SQLAlchemy engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        DB_QUERIES_TOTAL.inc()
+        counter = _request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS_TOTAL.inc()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS_TOTAL.inc()
+
+    # The pool has no "before checkout" event, so time Pool.connect() itself
+    pool = engine.pool
+    pool_connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return pool_connect()
+        finally:
+            DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+    def collect_pool_stats():
+        current = engine.pool
+        if hasattr(current, "checkedout"):
+            DB_POOL_CHECKED_OUT.set(current.checkedout())
+        if hasattr(current, "overflow"):
+            DB_POOL_OVERFLOW.set(max(current.overflow(), 0))
+        if hasattr(current, "size"):
+            DB_POOL_SIZE.set(current.size())
+
+    REGISTRY.add_collector(collect_pool_stats)
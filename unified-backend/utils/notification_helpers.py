@@ -5,6 +5,9 @@ import models
 import schemas
 from utils.notifier import Notifier
 from typing import Optional, Dict, Any
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 async def notify_booking_event(
     event_type: str, # 'booking_confirmed' or 'booking_cancelled'
@@ -17,11 +20,11 @@ async def notify_booking_event(
     """
     db = SessionLocal()
     try:
-        print(f"[BG-NOTIFY] Starting {event_type} for booking {booking_id}")
+        logger.info(f"[BG-NOTIFY] Starting {event_type} for booking {booking_id}")
         # 1. Fetch Booking and context
         booking = db.query(models.Booking).filter(models.Booking.id == booking_id).first()
         if not booking:
-            print(f"[BG-NOTIFY ERROR] Booking {booking_id} not found")
+            logger.error(f"[BG-NOTIFY ERROR] Booking {booking_id} not found")
             return
 
         court = db.query(models.Court).filter(models.Court.id == booking.court_id).first()
@@ -69,7 +72,7 @@ async def notify_booking_event(
         # Merge lists (using set for uniqueness)
         all_admin_ids = set([str(a.id) for a in admins_to_notify] + [str(a.id) for a in secondary_admins])
         
-        print(f"[BG-NOTIFY] Notifying {len(all_admin_ids)} admins")
+        logger.info(f"[BG-NOTIFY] Notifying {len(all_admin_ids)} admins")
         
         for aid in all_admin_ids:
             await Notifier.send_notification(
@@ -82,8 +85,7 @@ async def notify_booking_event(
             )
 
     except Exception as e:
-        print(f"[BG-NOTIFY ERROR] Critical failure: {e}")
+        logger.error(f"[BG-NOTIFY ERROR] Critical failure: {e}", exc_info=True)
         import traceback
-        traceback.print_exc()
     finally:
         db.close()
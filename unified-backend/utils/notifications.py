@@ -1,6 +1,9 @@
 from firebase_admin import messaging
 import models, crud, schemas
 from sqlalchemy.orm import Session
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def send_fcm_notification(device_token: str, title: str, body: str, data: dict = None):
     """Send FCM notification to a single device using V1 API"""
@@ -21,10 +24,10 @@ def send_fcm_notification(device_token: str, title: str, body: str, data: dict =
         )
 
         response = messaging.send(message)
-        print(f'[FIREBASE] Successfully sent message: {response}')
+        logger.info(f'[FIREBASE] Successfully sent message: {response}')
         return {"success": 1, "message_id": response}
     except Exception as e:
-        print(f"[FIREBASE ERROR] Failed to send notification: {e}")
+        logger.error(f"[FIREBASE ERROR] Failed to send notification: {e}")
         return {"success": 0, "error": str(e)}
 
 def notify_user(db: Session, user_id: str, title: str, body: str, notification_type: str = 'system', metadata_json: dict = None):
@@ -3,6 +3,9 @@ import crud, schemas, models
 from utils.websocket_manager import manager
 from utils.notifications import send_fcm_notification
 from typing import Optional, List, Dict, Any
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class Notifier:
     @staticmethod
@@ -65,7 +68,7 @@ class Notifier:
                                 metadata_json
                             )
                         except Exception as e:
-                            print(f"[NOTIFIER] User push failed for token: {e}")
+                            logger.warning(f"[NOTIFIER] User push failed for token: {e}")
                 
                 # 3b. Admin Push
                 if admin_id:
@@ -79,10 +82,10 @@ class Notifier:
                                 metadata_json
                             )
                         except Exception as e:
-                            print(f"[NOTIFIER] Admin push failed for token: {e}")
+                            logger.warning(f"[NOTIFIER] Admin push failed for token: {e}")
                     
             except Exception as e:
-                print(f"[NOTIFIER] Could not fetch tokens or send push: {e}")
+                logger.info(f"[NOTIFIER] Could not fetch tokens or send push: {e}")
 
         return db_notification
 
@@ -1,6 +1,9 @@
 from fastapi import WebSocket
 from typing import Dict, List, Set, Any
 import json
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class ConnectionManager:
     def __init__(self):
@@ -12,7 +15,7 @@ class ConnectionManager:
         if identifier not in self.active_connections:
             self.active_connections[identifier] = []
         self.active_connections[identifier].append(websocket)
-        print(f"[WS] New connection for {identifier}. Total connections: {len(self.active_connections[identifier])}")
+        logger.info(f"[WS] New connection for {identifier}. Total connections: {len(self.active_connections[identifier])}")
 
     def disconnect(self, identifier: str, websocket: WebSocket):
         if identifier in self.active_connections:
@@ -20,7 +23,7 @@ class ConnectionManager:
                 self.active_connections[identifier].remove(websocket)
             if not self.active_connections[identifier]:
                 del self.active_connections[identifier]
-        print(f"[WS] Disconnected {identifier}")
+        logger.info(f"[WS] Disconnected {identifier}")
 
     async def send_personal_message(self, message: Any, identifier: str):
         if identifier in self.active_connections:
@@ -29,7 +32,7 @@ class ConnectionManager:
                 try:
                     await connection.send_text(msg_str)
                 except Exception as e:
-                    print(f"[WS] Error sending to {identifier}: {e}")
+                    logger.error(f"[WS] Error sending to {identifier}: {e}")
 
     async def broadcast(self, message: Any):
         msg_str = json.dumps(message) if not isinstance(message, str) else message
@@ -38,7 +41,7 @@ class ConnectionManager:
                 try:
                     await connection.send_text(msg_str)
                 except Exception as e:
-                    print(f"[WS] Error broadcasting to {identifier}: {e}")
+                    logger.error(f"[WS] Error broadcasting to {identifier}: {e}")
 
 # Global manager instance
 manager = ConnectionManager()